@@ -1,5 +1,38 @@
-from .core.evaluator import Evaluator
-from .core.models.symptom_rule import SymptomRule
-from .core.ruleset import SymptomRuleset
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["SymptomRule", "SymptomRuleset", "Evaluator"]
+if TYPE_CHECKING:
+    from .core.evaluator import Evaluator
+    from .core.models.symptom_rule import SymptomRule
+    from .core.multi_evaluator import MultiEvaluator
+    from .core.ruleset import SymptomRuleset
+
+_LAZY_IMPORTS = {
+    "SymptomRule": ".core.models.symptom_rule",
+    "SymptomRuleset": ".core.ruleset",
+    "Evaluator": ".core.evaluator",
+    "MultiEvaluator": ".core.multi_evaluator",
+}
+
+__all__ = ["SymptomRule", "SymptomRuleset", "Evaluator", "MultiEvaluator"]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import public classes on first access, so `import diagnostipy` stays cheap.
+
+    None of them loads NumPy: single records are matched and scored with the
+    pure-Python `RuleIndex`, and NumPy is imported on the first batch, mapped or
+    sink run.
+    """
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
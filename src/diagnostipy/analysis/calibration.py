@@ -0,0 +1,493 @@
+from collections import deque
+from itertools import zip_longest
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+import numpy as np
+
+from diagnostipy.core.compiled import RecordBatch
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.chunking import iter_chunks
+from diagnostipy.utils.enums import EvaluationFunctionEnum
+from diagnostipy.utils.scoring.thresholds import ThresholdTable
+
+MIN_PROBABILITY = 1e-12
+LBFGS_MEMORY = 10
+
+
+def _reference_weight(rule: SymptomRule) -> float:
+    """
+    Largest absolute weight a rule can contribute, or 0 if it is zero everywhere.
+    """
+    values = [rule.weight or 0.0]
+    if rule.graded_weight is not None:
+        values.extend(weight for _, weight in rule.graded_weight.points)
+    return max(abs(value) for value in values)
+
+
+def _scale_rule(rule: SymptomRule, reference: float, weight: float) -> SymptomRule:
+    """
+    Rescale a rule so its reference weight becomes `weight`, keeping the shape of
+    a graded weight. Rules that are zero everywhere get a plain weight.
+    """
+    if not reference:
+        return rule.model_copy(update={"weight": weight, "graded_weight": None})
+
+    factor = weight / reference
+    update: dict[str, Any] = {"weight": (rule.weight or 0.0) * factor}
+    if rule.graded_weight is not None:
+        points = tuple((x, y * factor) for x, y in rule.graded_weight.points)
+        update["graded_weight"] = rule.graded_weight.model_copy(
+            update={"points": points}
+        )
+    return rule.model_copy(update=update)
+
+
+class CalibrationResult:
+    """
+    Rule weights and score thresholds fitted from labeled records.
+
+    Attributes:
+        ruleset (SymptomRuleset): Copy of the ruleset with the fitted weights.
+        labels (tuple[str, ...]): Labels in ascending order of severity.
+        thresholds (np.ndarray): Ascending total scores separating consecutive \
+        labels.
+        log_loss (float): Mean negative log-likelihood of the labels under the \
+        fitted model.
+        n_records (int): Number of records the model was fitted on.
+        n_patterns (int): Number of distinct rows of the rule design matrix.
+        n_iter (int): Number of optimizer iterations.
+        converged (bool): Whether the gradient fell below the tolerance.
+    """
+
+    def __init__(
+        self,
+        ruleset: SymptomRuleset,
+        labels: tuple[str, ...],
+        thresholds: np.ndarray,
+        log_loss: float,
+        n_records: int,
+        n_patterns: int,
+        n_iter: int,
+        converged: bool,
+    ):
+        self.ruleset = ruleset
+        self.labels = labels
+        self.thresholds = thresholds
+        self.log_loss = log_loss
+        self.n_records = n_records
+        self.n_patterns = n_patterns
+        self.n_iter = n_iter
+        self.converged = converged
+
+    @property
+    def threshold_label_map(self) -> dict[float, str]:
+        """
+        Fitted thresholds in the format of `multiclass_scoring_based`, for an
+        identity score function.
+        """
+        bounds = [*self.thresholds.tolist(), float("inf")]
+        return dict(zip(bounds, self.labels))
+
+    def evaluator(self, **kwargs) -> Evaluator:
+        """
+        Create an evaluator labelling records with the fitted weights and
+        thresholds.
+
+        Args:
+            **kwargs: Keyword arguments passed to `Evaluator`.
+
+        Returns:
+            An evaluator using `multiclass_scoring_based` on the raw total score.
+        """
+        return Evaluator(
+            self.ruleset,
+            evaluation_function=EvaluationFunctionEnum.MULTICLASS_SCORING_BASED,
+            evaluation_params={
+                "score_function": float,
+                "threshold_label_map": ThresholdTable(
+                    self.thresholds.tolist(), self.labels
+                ),
+            },
+            **kwargs,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CalibrationResult(labels={self.labels}, "
+            f"thresholds={self.thresholds.tolist()}, log_loss={self.log_loss:.6g}, "
+            f"n_records={self.n_records}, converged={self.converged})"
+        )
+
+
+class _OrdinalLogit:
+    """
+    Penalised negative log-likelihood of a proportional-odds model over weighted
+    design matrix rows, with its gradient.
+
+    The probability that a record with total score `s` has a label at most `k`
+    is `sigmoid(cut_k - s)`. Cuts are parameterised by the first cut and the
+    logarithms of the gaps between consecutive cuts, so they stay ascending.
+    """
+
+    def __init__(
+        self,
+        patterns: np.ndarray,
+        counts: np.ndarray,
+        l2: float,
+        fixed_weights: Optional[np.ndarray],
+    ):
+        self.patterns = patterns
+        self.counts = counts
+        self.n_records = float(counts.sum())
+        self.l2 = l2
+        self.fixed_weights = fixed_weights
+
+    def split(self, params: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if self.fixed_weights is not None:
+            return self.fixed_weights, params
+        n_rules = self.patterns.shape[1]
+        return params[:n_rules], params[n_rules:]
+
+    @staticmethod
+    def cuts(gaps: np.ndarray) -> np.ndarray:
+        return gaps[0] + np.concatenate([[0.0], np.cumsum(np.exp(gaps[1:]))])
+
+    def log_loss(self, params: np.ndarray) -> float:
+        weights, gaps = self.split(params)
+        probs, _ = self._probabilities(self.patterns @ weights, self.cuts(gaps))
+        return float(-(self.counts * np.log(probs)).sum() / self.n_records)
+
+    def _probabilities(
+        self, scores: np.ndarray, cuts: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the label probabilities and the sigmoid derivative at every cut,
+        padded with zeros for the open ends.
+        """
+        cumulative = np.exp(-np.logaddexp(0.0, scores[:, None] - cuts[None, :]))
+        edges = np.zeros((len(scores), 1))
+        bounds = np.hstack([edges, cumulative, edges + 1.0])
+        derivatives = np.hstack([edges, cumulative * (1.0 - cumulative), edges])
+        return np.maximum(np.diff(bounds, axis=1), MIN_PROBABILITY), derivatives
+
+    def __call__(self, params: np.ndarray) -> tuple[float, np.ndarray]:
+        weights, gaps = self.split(params)
+        probs, derivatives = self._probabilities(
+            self.patterns @ weights, self.cuts(gaps)
+        )
+        ratios = self.counts / probs / self.n_records
+        loss = -(self.counts * np.log(probs)).sum() / self.n_records
+
+        cut_grad = ((ratios[:, 1:] - ratios[:, :-1]) * derivatives[:, 1:-1]).sum(0)
+        tail = np.cumsum(cut_grad[::-1])[::-1]
+        gap_grad = np.concatenate([[tail[0]], np.exp(gaps[1:]) * tail[1:]])
+        if self.fixed_weights is not None:
+            return float(loss), gap_grad
+
+        score_grad = (ratios * (derivatives[:, 1:] - derivatives[:, :-1])).sum(1)
+        weight_grad = self.patterns.T @ score_grad + self.l2 * weights
+        loss += 0.5 * self.l2 * float(weights @ weights)
+        return float(loss), np.concatenate([weight_grad, gap_grad])
+
+
+def _line_search(
+    objective: Callable[[np.ndarray], tuple[float, np.ndarray]],
+    params: np.ndarray,
+    loss: float,
+    slope: float,
+    direction: np.ndarray,
+) -> Optional[tuple[np.ndarray, float, np.ndarray]]:
+    """
+    Backtrack along a descent direction until the Armijo condition holds.
+
+    Returns:
+        The new parameters, loss and gradient, or None if no step decreased the \
+        loss.
+    """
+    step = 1.0
+    while step > 1e-12:
+        candidate = params + step * direction
+        new_loss, gradient = objective(candidate)
+        if new_loss <= loss + 1e-4 * step * slope:
+            return candidate, new_loss, gradient
+        step *= 0.5
+    return None
+
+
+def _lbfgs_direction(
+    gradient: np.ndarray, history: "deque[tuple[np.ndarray, np.ndarray, float]]"
+) -> np.ndarray:
+    """
+    Apply the L-BFGS inverse Hessian approximation to the negative gradient with
+    the two-loop recursion over the stored (step, gradient change, 1 / curvature)
+    updates, oldest first.
+    """
+    direction = -gradient
+    alphas = []
+    for delta, change, rho in reversed(history):
+        alpha = rho * (delta @ direction)
+        direction = direction - alpha * change
+        alphas.append(alpha)
+    if history:
+        delta, change, _ = history[-1]
+        direction = direction * (delta @ change) / (change @ change)
+    for (delta, change, rho), alpha in zip(history, reversed(alphas)):
+        beta = rho * (change @ direction)
+        direction = direction + (alpha - beta) * delta
+    return direction
+
+
+def _minimize_lbfgs(
+    objective: Callable[[np.ndarray], tuple[float, np.ndarray]],
+    params: np.ndarray,
+    max_iter: int,
+    tol: float,
+    memory: int = LBFGS_MEMORY,
+) -> tuple[np.ndarray, int, bool]:
+    """
+    Minimise a smooth function with L-BFGS and a backtracking line search.
+
+    Only the last `memory` updates are kept, so each iteration costs
+    O(memory * n_params) on top of the objective instead of the O(n_params²)
+    memory and O(n_params³) updates of a dense inverse Hessian.
+
+    Returns:
+        The parameters, the number of iterations and whether the largest \
+        gradient component fell below `tol`.
+    """
+    loss, gradient = objective(params)
+    history: deque[tuple[np.ndarray, np.ndarray, float]] = deque(maxlen=memory)
+    for iteration in range(max_iter):
+        if np.abs(gradient).max(initial=0.0) < tol:
+            return params, iteration, True
+
+        direction = _lbfgs_direction(gradient, history)
+        if gradient @ direction >= 0:
+            history.clear()
+            direction = -gradient
+        step = _line_search(objective, params, loss, gradient @ direction, direction)
+        if step is None:
+            return params, iteration, False
+
+        new_params, loss, new_gradient = step
+        delta, change = new_params - params, new_gradient - gradient
+        curvature = delta @ change
+        if curvature > 1e-12:
+            history.append((delta, change, 1.0 / curvature))
+        params, gradient = new_params, new_gradient
+
+    return params, max_iter, bool(np.abs(gradient).max(initial=0.0) < tol)
+
+
+class RuleWeightCalibrator:
+    """
+    Fits rule weights and label thresholds of a ruleset to labeled records.
+
+    Records are added in chunks. Each chunk is matched once with the compiled
+    ruleset, overlap exclusion included, and reduced to its distinct rows of the
+    applicable-rule design matrix with per-label counts, so memory grows with the
+    number of distinct symptom patterns rather than the number of records. The
+    fit is an ordinal (proportional-odds) logistic regression of the labels on
+    the total score, solved with NumPy-only L-BFGS.
+
+    Each rule's design column is its record weight divided by its largest
+    absolute weight, so graded weights keep their shape and are rescaled as a
+    whole. Rules whose weight is zero everywhere are fitted as plain indicators.
+
+    Attributes:
+        ruleset (SymptomRuleset): The ruleset to calibrate.
+        labels (tuple[str, ...]): Labels in ascending order of severity.
+        n_records (int): Number of records added so far.
+    """
+
+    def __init__(self, ruleset: SymptomRuleset, labels: Sequence[str]):
+        if len(labels) < 2:
+            raise ValueError("At least two labels are required for calibration.")
+
+        self.ruleset = ruleset
+        self.labels = tuple(labels)
+        self.n_records = 0
+        self._compiled = ruleset.compile()
+        self._codes = {label: code for code, label in enumerate(self.labels)}
+        self._references = np.array(
+            [_reference_weight(rule) for rule in self._compiled.rules]
+        )
+        self._rows: dict[bytes, int] = {}
+        self._patterns: list[np.ndarray] = []
+        self._counts: list[np.ndarray] = []
+
+    def _design(self, records: RecordBatch) -> np.ndarray:
+        """
+        Build the design matrix rows of a chunk of records.
+        """
+        compiled = self._compiled
+        mask = compiled.exclude(compiled.match(records))
+        weights = (
+            compiled.record_weights(records)
+            if compiled.graded_rules
+            else compiled.weights
+        )
+        indicator = self._references == 0
+        scaled = np.where(
+            indicator, 1.0, weights / np.where(indicator, 1.0, self._references)
+        )
+        return np.where(mask, scaled, 0.0)
+
+    def add(self, records: RecordBatch, outcomes: Sequence[Any]) -> None:
+        """
+        Add a chunk of labeled records.
+
+        Args:
+            records: Input records, an encoded matrix, or `SparseRecords`.
+            outcomes: The observed label of each record.
+
+        Raises:
+            ValueError: If the numbers of records and outcomes differ, or an \
+            outcome is not one of `labels`.
+        """
+        if len(records) != len(outcomes):
+            raise ValueError("Every record needs exactly one outcome.")
+        unknown = set(outcomes) - self._codes.keys()
+        if unknown:
+            raise ValueError(f"Unknown labels: {sorted(map(str, unknown))}.")
+        if not len(outcomes):
+            return
+
+        design = self._design(records)
+        codes = np.fromiter((self._codes[label] for label in outcomes), dtype=np.intp)
+        patterns, inverse = np.unique(design, axis=0, return_inverse=True)
+        counts = np.zeros((len(patterns), len(self.labels)))
+        np.add.at(counts, (inverse.reshape(-1), codes), 1.0)
+
+        for pattern, pattern_counts in zip(patterns, counts):
+            row = self._rows.setdefault(pattern.tobytes(), len(self._patterns))
+            if row == len(self._patterns):
+                self._patterns.append(pattern)
+                self._counts.append(pattern_counts)
+            else:
+                self._counts[row] += pattern_counts
+        self.n_records += len(outcomes)
+
+    def _initial_gaps(self, counts: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Place the cuts at the logits of the cumulative label frequencies, around
+        the mean score.
+        """
+        frequencies = counts.sum(axis=0) / counts.sum()
+        cumulative = np.clip(np.cumsum(frequencies)[:-1], 1e-3, 1.0 - 1e-3)
+        cuts = np.log(cumulative / (1.0 - cumulative))
+        cuts += float(counts.sum(axis=1) @ scores / counts.sum())
+        spacing = np.maximum(np.diff(cuts), 1e-3)
+        return np.concatenate([cuts[:1], np.log(spacing)])
+
+    def fit(
+        self,
+        fit_weights: bool = True,
+        l2: float = 1e-3,
+        max_iter: int = 500,
+        tol: float = 1e-7,
+    ) -> CalibrationResult:
+        """
+        Fit the weights and thresholds to the records added so far.
+
+        Args:
+            fit_weights: Whether to fit the rule weights. If False, only the \
+            thresholds are fitted for the current weights.
+            l2: Strength of the L2 penalty on the fitted weights, per record.
+            max_iter: Maximum number of optimizer iterations.
+            tol: Gradient tolerance at which the optimizer stops.
+
+        Returns:
+            The calibration result.
+
+        Raises:
+            ValueError: If no records were added.
+        """
+        if not self.n_records:
+            raise ValueError("No labeled records were added.")
+
+        patterns, counts = np.array(self._patterns), np.array(self._counts)
+        current = np.where(self._references == 0, 0.0, self._references)
+        objective = _OrdinalLogit(
+            patterns, counts, l2, None if fit_weights else current
+        )
+        initial_weights = np.zeros(len(current)) if fit_weights else current
+        gaps = self._initial_gaps(counts, patterns @ initial_weights)
+        params, n_iter, converged = _minimize_lbfgs(
+            objective,
+            np.concatenate([initial_weights, gaps]) if fit_weights else gaps,
+            max_iter,
+            tol,
+        )
+
+        weights, gaps = objective.split(params)
+        rules = [
+            _scale_rule(rule, float(reference), float(weight)) if fit_weights else rule
+            for rule, reference, weight in zip(
+                self._compiled.rules, self._references, weights
+            )
+        ]
+        return CalibrationResult(
+            SymptomRuleset(
+                rules,
+                exclude_overlaps=self.ruleset.exclude_overlaps,
+                solver_mode=self.ruleset.solver_mode,
+            ),
+            self.labels,
+            objective.cuts(gaps),
+            objective.log_loss(params),
+            self.n_records,
+            len(patterns),
+            n_iter,
+            converged,
+        )
+
+
+def calibrate_ruleset(
+    ruleset: SymptomRuleset,
+    records: Iterable[Any] | RecordBatch,
+    outcomes: Iterable[Any],
+    labels: Sequence[str],
+    *,
+    fit_weights: bool = True,
+    l2: float = 1e-3,
+    chunk_size: int = 10_000,
+    max_iter: int = 500,
+    tol: float = 1e-7,
+) -> CalibrationResult:
+    """
+    Fit rule weights and `multiclass_scoring_based` thresholds to labeled records.
+
+    Records and outcomes are streamed in chunks of `chunk_size`; see
+    `RuleWeightCalibrator` for the model.
+
+    Args:
+        ruleset: The ruleset to calibrate.
+        records: Input records, `SparseRecords`, or any iterable of records.
+        outcomes: The observed label of each record, in the same order.
+        labels: Labels in ascending order of severity.
+        fit_weights: Whether to fit the rule weights. If False, only the \
+        thresholds are fitted for the current weights.
+        l2: Strength of the L2 penalty on the fitted weights, per record.
+        chunk_size: Maximum number of records matched at once.
+        max_iter: Maximum number of optimizer iterations.
+        tol: Gradient tolerance at which the optimizer stops.
+
+    Returns:
+        The calibration result, with the updated ruleset.
+
+    Raises:
+        ValueError: If the numbers of records and outcomes differ, or an outcome \
+        is not one of `labels`.
+    """
+    calibrator = RuleWeightCalibrator(ruleset, labels)
+    for chunk, chunk_outcomes in zip_longest(
+        iter_chunks(records, chunk_size), iter_chunks(outcomes, chunk_size)
+    ):
+        if chunk is None or chunk_outcomes is None:
+            raise ValueError("Every record needs exactly one outcome.")
+        calibrator.add(chunk, list(chunk_outcomes))
+
+    return calibrator.fit(fit_weights=fit_weights, l2=l2, max_iter=max_iter, tol=tol)
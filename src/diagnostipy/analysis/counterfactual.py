@@ -0,0 +1,378 @@
+import time
+from itertools import islice
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from diagnostipy.core.compiled import CompiledRuleset
+from diagnostipy.core.conditions import get_field_value
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.utils.scoring.batch_functions import BayesianBatchEvaluation
+
+GRID_SIZE = 4097
+
+
+class Counterfactual(BaseModel, frozen=True):
+    """
+    A set of symptom changes and the diagnosis it leads to.
+
+    Attributes:
+        added (tuple[str, ...]): Condition fields switched on.
+        removed (tuple[str, ...]): Condition fields switched off.
+        label (Any): The label of the changed record.
+        score (float): The evaluation score of the changed record.
+    """
+
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    label: Any = None
+    score: float = 0.0
+
+    @property
+    def n_changes(self) -> int:
+        """
+        Number of changed symptoms.
+        """
+        return len(self.added) + len(self.removed)
+
+
+class CounterfactualResult:
+    """
+    Outcome of a counterfactual search.
+
+    Attributes:
+        counterfactuals (list[Counterfactual]): Smallest change sets reaching the \
+        target label, up to `max_results`, in search order.
+        complete (bool): False if the time budget ran out before the search space \
+        was exhausted, in which case smaller change sets may exist beyond the \
+        ones found.
+        explored (int): Number of evaluated change sets.
+        pruned (int): Number of change sets whose extensions were skipped because \
+        their score bound could not reach the target label.
+    """
+
+    def __init__(self) -> None:
+        self.counterfactuals: list[Counterfactual] = []
+        self.complete = True
+        self.explored = 0
+        self.pruned = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"CounterfactualResult(counterfactuals={self.counterfactuals!r}, "
+            f"complete={self.complete}, explored={self.explored}, "
+            f"pruned={self.pruned})"
+        )
+
+
+def _affected_rules(compiled: CompiledRuleset, field: str) -> np.ndarray:
+    """
+    Find the rules whose firing can change when a field is switched: rules
+    reading the field, callable rules, and rules those can shadow.
+    """
+    direct = set(compiled.callable_rules)
+    column = compiled.field_index.get(field)
+    if column is not None:
+        offsets, rule_indices = compiled.field_rules
+        direct.update(rule_indices[offsets[column] : offsets[column + 1]].tolist())
+    for idx in compiled.expression_rules:
+        expression = compiled.rules[idx].compiled_condition
+        if expression is not None and field in expression.fields:
+            direct.add(idx)
+
+    direct_array = np.fromiter(direct, dtype=np.intp, count=len(direct))
+    shadowed = compiled.shadowed[np.isin(compiled.shadowing, direct_array)]
+    return np.union1d(direct_array, shadowed)
+
+
+def _change_bounds(compiled: CompiledRuleset, fields: Sequence[str]) -> np.ndarray:
+    """
+    Bound how much switching each field can change the total score.
+    """
+    magnitudes = np.abs(compiled.weights)
+    return np.array(
+        [magnitudes[_affected_rules(compiled, field)].sum() for field in fields],
+        dtype=np.float64,
+    )
+
+
+def _target_interval(
+    evaluator: Evaluator,
+    compiled: CompiledRuleset,
+    target_label: Any,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Optional[tuple[float, float]]:
+    """
+    Find the range of total scores labelled `target_label`, widened by one grid
+    step on each side, or None if it cannot be derived from total scores.
+    """
+    strategy = evaluator._evaluation_strategy
+    if strategy.batch_function is None:
+        return None
+
+    weights = compiled.weights
+    low, high = float(weights[weights < 0].sum()), float(weights[weights > 0].sum())
+    grid = np.linspace(low, high, GRID_SIZE)
+    strategy.bind(compiled)
+    evaluations = strategy.batch(
+        grid,
+        *args,
+        mask=np.zeros((len(grid), len(compiled.rules)), dtype=bool),
+        **kwargs,
+    )
+    if evaluations is None or isinstance(evaluations, BayesianBatchEvaluation):
+        return None
+
+    hits = np.flatnonzero(evaluations.labels == target_label)
+    if not len(hits):
+        return None
+    step = grid[1] - grid[0] if len(grid) > 1 else 0.0
+    return float(grid[hits[0]] - step), float(grid[hits[-1]] + step)
+
+
+class _Search:
+    """
+    Breadth-first branch-and-bound over sets of symptom changes.
+    """
+
+    def __init__(
+        self,
+        evaluator: Evaluator,
+        record: dict[str, Any],
+        changes: list[tuple[str, bool]],
+        target_label: Any,
+        interval: Optional[tuple[float, float]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ):
+        self.evaluator = evaluator
+        self.compiled = evaluator.ruleset.compile()
+        self.record = record
+        self.target_label = target_label
+        self.interval = interval
+        self.args = args
+        self.kwargs = kwargs
+
+        bounds = _change_bounds(self.compiled, [field for field, _ in changes])
+        order = np.argsort(-bounds, kind="stable")
+        self.changes = [changes[idx] for idx in order]
+        self.bounds = bounds[order]
+
+    def apply(self, node: tuple[int, ...]) -> dict[str, Any]:
+        changed = dict(self.record)
+        for idx in node:
+            field, value = self.changes[idx]
+            changed[field] = value
+        return changed
+
+    def evaluate(
+        self, nodes: list[tuple[int, ...]]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate change sets in one batch.
+
+        Returns:
+            The labels, evaluation scores and total scores of the changed records.
+        """
+        compiled = self.compiled
+        records = [self.apply(node) for node in nodes]
+        applies = compiled.match(records)
+        weights = compiled.record_weights(records) if compiled.graded_rules else None
+        labels, scores = self.evaluator._label_matches(
+            compiled, applies, self.args, self.kwargs, weights
+        )
+        return labels, scores, compiled.total_scores(compiled.exclude(applies), weights)
+
+    def can_reach(self, node: tuple[int, ...], total: float, remaining: int) -> bool:
+        """
+        Check whether extending a change set by up to `remaining` later changes
+        can bring the total score into the target interval.
+        """
+        if self.interval is None:
+            return True
+        start = node[-1] + 1 if node else 0
+        reach = float(self.bounds[start : start + remaining].sum())
+        low, high = self.interval
+        return total - reach <= high and total + reach >= low
+
+    def counterfactual(
+        self, node: tuple[int, ...], label: Any, score: float
+    ) -> Counterfactual:
+        changes = [self.changes[idx] for idx in node]
+        return Counterfactual(
+            added=tuple(sorted(field for field, value in changes if value)),
+            removed=tuple(sorted(field for field, value in changes if not value)),
+            label=label,
+            score=float(score),
+        )
+
+
+def _candidate_changes(
+    compiled: CompiledRuleset,
+    record: Mapping[str, Any],
+    fields: Optional[Iterable[str]],
+    allow_additions: bool,
+    allow_removals: bool,
+) -> list[tuple[str, bool]]:
+    """
+    List the possible single changes: absent symptoms to add, present ones to
+    remove.
+    """
+    if fields is None:
+        fields = [
+            field
+            for field, column in compiled.field_index.items()
+            if column not in compiled.predicates
+        ]
+    changes = []
+    for field in fields:
+        present = bool(get_field_value(record, field))
+        if present and allow_removals:
+            changes.append((field, False))
+        elif not present and allow_additions:
+            changes.append((field, True))
+    return changes
+
+
+def _expired(deadline: Optional[float]) -> bool:
+    """
+    Check whether the search deadline has passed.
+    """
+    return deadline is not None and time.perf_counter() > deadline
+
+
+def _expand(
+    search: _Search,
+    frontier: list[tuple[tuple[int, ...], float]],
+    remaining: int,
+    result: CounterfactualResult,
+    deadline: Optional[float],
+) -> Iterator[tuple[int, ...]]:
+    """
+    Extend every reachable change set of the frontier by one later change.
+
+    Children are generated lazily, so a level is never held in memory at once.
+    Generation stops, marking the result incomplete, once the deadline passes.
+    """
+    for node, total in frontier:
+        if _expired(deadline):
+            result.complete = False
+            return
+        if not search.can_reach(node, total, remaining):
+            result.pruned += 1
+            continue
+        start = node[-1] + 1 if node else 0
+        yield from (node + (idx,) for idx in range(start, len(search.changes)))
+
+
+def _evaluate_level(
+    search: _Search,
+    level: Iterable[tuple[int, ...]],
+    result: CounterfactualResult,
+    max_results: int,
+    batch_size: int,
+    deadline: Optional[float],
+) -> Optional[list[tuple[tuple[int, ...], float]]]:
+    """
+    Evaluate the change sets of one size batch by batch, collecting the ones
+    reaching the target.
+
+    Returns:
+        The change sets that missed the target with their total scores, or None \
+        if the time budget ran out.
+    """
+    frontier = []
+    pending = iter(level)
+    while nodes := list(islice(pending, batch_size)):
+        if _expired(deadline):
+            return None
+        labels, scores, totals = search.evaluate(nodes)
+        result.explored += len(nodes)
+        for node, label, score, total in zip(nodes, labels, scores, totals):
+            if label != search.target_label:
+                frontier.append((node, float(total)))
+            elif len(result.counterfactuals) < max_results:
+                result.counterfactuals.append(search.counterfactual(node, label, score))
+    return frontier if result.complete else None
+
+
+def find_counterfactuals(
+    evaluator: Evaluator,
+    record: Any,
+    target_label: Any,
+    *args,
+    max_changes: int = 3,
+    fields: Optional[Iterable[str]] = None,
+    allow_additions: bool = True,
+    allow_removals: bool = True,
+    max_results: int = 5,
+    time_budget: Optional[float] = 1.0,
+    batch_size: int = 4096,
+    prune: bool = True,
+    **kwargs,
+) -> CounterfactualResult:
+    """
+    Find the smallest sets of symptom additions or removals that give a record
+    the target label.
+
+    Change sets are explored by increasing size, so the first sets found are
+    minimal; the search stops after the first size with a solution. Each level
+    is evaluated in vectorized batches with the compiled ruleset and the batch
+    evaluation function, honouring overlap exclusion. Switching a symptom can
+    only change the firing of the rules reading it and of the rules those
+    shadow, which bounds how far the total score can move; change sets that
+    cannot reach the total scores of the target label even with the most
+    influential remaining changes are not extended.
+
+    Args:
+        evaluator: The evaluator whose ruleset and evaluation function are used.
+        record: The input record, a dictionary or an object with attributes.
+        target_label: The label to reach.
+        *args: Positional arguments to pass to the evaluation function.
+        max_changes: Maximum number of changed symptoms.
+        fields: Condition fields that may change. Defaults to every boolean \
+        condition field of the ruleset.
+        allow_additions: Whether absent symptoms may be added.
+        allow_removals: Whether present symptoms may be removed.
+        max_results: Maximum number of counterfactuals returned.
+        time_budget: Seconds after which the search stops with the results found \
+        so far, or None for no limit.
+        batch_size: Maximum number of change sets evaluated at once.
+        prune: Whether to skip change sets by their score bound. Pruning is \
+        disabled automatically for evaluation functions that do not label by \
+        total score, such as the Bayesian one.
+        **kwargs: Keyword arguments to pass to the evaluation function.
+
+    Returns:
+        The search result. A record that already has the target label yields a \
+        single counterfactual without changes.
+    """
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    compiled = evaluator.ruleset.compile()
+    data = dict(record) if isinstance(record, Mapping) else dict(vars(record))
+    changes = _candidate_changes(
+        compiled, data, fields, allow_additions, allow_removals
+    )
+    interval = (
+        _target_interval(evaluator, compiled, target_label, args, kwargs)
+        if prune
+        else None
+    )
+    search = _Search(evaluator, data, changes, target_label, interval, args, kwargs)
+    result = CounterfactualResult()
+
+    level: Iterable[tuple[int, ...]] = [()]
+    for size in range(max_changes + 1):
+        frontier = _evaluate_level(
+            search, level, result, max_results, batch_size, deadline
+        )
+        if frontier is None:
+            result.complete = False
+            break
+        if result.counterfactuals or size == max_changes:
+            break
+        level = _expand(search, frontier, max_changes - size, result, deadline)
+
+    return result
@@ -0,0 +1,184 @@
+from collections import Counter
+from functools import partial
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from diagnostipy.core.compiled import CompiledRuleset, RecordBatch
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.chunking import iter_chunks, map_chunks
+from diagnostipy.utils.enums import Parallelism
+
+
+class RuleCoverageReport:
+    """
+    Per-rule firing statistics collected over a dataset.
+
+    Attributes:
+        rule_names (tuple[str, ...]): Rule names, in ruleset order.
+        n_records (int): Number of analysed records.
+        match_counts (np.ndarray): How often each rule matched, before overlap \
+        exclusion.
+        fire_counts (np.ndarray): How often each rule contributed to the score.
+        co_firing (Optional[np.ndarray]): Matrix counting how often two rules \
+        contributed to the same record, if requested.
+        label_counts (dict[str, int]): Label distribution, if an evaluator was used.
+    """
+
+    def __init__(self, rule_names: tuple[str, ...], co_firing: bool = True):
+        n_rules = len(rule_names)
+        self.rule_names = rule_names
+        self.n_records = 0
+        self.match_counts = np.zeros(n_rules, dtype=np.int64)
+        self.fire_counts = np.zeros(n_rules, dtype=np.int64)
+        self.co_firing: Optional[np.ndarray] = (
+            np.zeros((n_rules, n_rules), dtype=np.int64) if co_firing else None
+        )
+        self.label_counts: dict[str, int] = {}
+
+    @property
+    def shadow_counts(self) -> np.ndarray:
+        """
+        How often each rule matched but was excluded by a more specific rule.
+        """
+        return self.match_counts - self.fire_counts
+
+    def never_fired(self) -> list[str]:
+        """
+        List the rules that never contributed to a score.
+
+        Returns:
+            Names of rules with a fire count of zero.
+        """
+        return [
+            name for name, count in zip(self.rule_names, self.fire_counts) if count == 0
+        ]
+
+    def merge(self, other: "RuleCoverageReport") -> None:
+        """
+        Add the statistics of another report over the same ruleset.
+
+        Args:
+            other: The report to merge into this one.
+        """
+        self.n_records += other.n_records
+        self.match_counts += other.match_counts
+        self.fire_counts += other.fire_counts
+        if self.co_firing is not None and other.co_firing is not None:
+            self.co_firing += other.co_firing
+        for label, count in other.label_counts.items():
+            self.label_counts[label] = self.label_counts.get(label, 0) + count
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarise the report per rule.
+
+        Returns:
+            A dictionary with the record count, per-rule statistics and the label \
+            distribution.
+        """
+        return {
+            "n_records": self.n_records,
+            "rules": {
+                name: {
+                    "matched": int(matched),
+                    "fired": int(fired),
+                    "shadowed": int(matched - fired),
+                }
+                for name, matched, fired in zip(
+                    self.rule_names, self.match_counts, self.fire_counts
+                )
+            },
+            "label_counts": dict(self.label_counts),
+        }
+
+
+def _analyze_chunk(
+    compiled: CompiledRuleset,
+    chunk: RecordBatch,
+    *,
+    evaluator: Optional[Evaluator],
+    co_firing: bool,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> RuleCoverageReport:
+    """
+    Collect the statistics of a single chunk.
+    """
+    report = RuleCoverageReport(tuple(rule.name for rule in compiled.rules), co_firing)
+    applies = compiled.match(chunk)
+    mask = compiled.exclude(applies)
+
+    report.n_records = len(mask)
+    report.match_counts += applies.sum(axis=0)
+    report.fire_counts += mask.sum(axis=0)
+    if report.co_firing is not None:
+        fired = mask.astype(np.float64)
+        report.co_firing += np.rint(fired.T @ fired).astype(np.int64)
+
+    if evaluator is not None:
+        weights = compiled.record_weights(chunk) if compiled.graded_rules else None
+        labels, _ = evaluator._label_matches(compiled, applies, args, kwargs, weights)
+        for label, count in Counter(labels.tolist()).items():
+            report.label_counts[label] = report.label_counts.get(label, 0) + count
+
+    return report
+
+
+def analyze_rule_coverage(
+    source: SymptomRuleset | Evaluator,
+    records: Iterable[Any] | RecordBatch,
+    *args,
+    chunk_size: int = 10_000,
+    n_jobs: int = 1,
+    parallelism: Parallelism | str = Parallelism.THREADS,
+    co_firing: bool = True,
+    **kwargs,
+) -> RuleCoverageReport:
+    """
+    Measure how often each rule fires over a dataset.
+
+    Records are streamed in chunks of `chunk_size`, so memory stays bounded by the
+    chunk size and the number of in-flight chunks. Chunks are matched with the
+    compiled ruleset and labelled with the evaluator's batch path, graded weights
+    included, so labels agree with `Evaluator.run`.
+
+    `n_jobs > 1` adds CPU parallelism only with `Parallelism.PROCESSES`, which
+    requires a picklable ruleset and evaluator: no lambda `apply_condition` and
+    no timeouts. With the default `Parallelism.THREADS`, threads share the GIL
+    and only NumPy operations on large chunks overlap; see `map_chunks`.
+
+    Args:
+        source: The ruleset to analyse, or an evaluator whose evaluation function \
+        is also used to collect the label distribution.
+        records: Input records, an encoded matrix, `SparseRecords`, or any \
+        iterable of records.
+        *args: Positional arguments to pass to the evaluation function.
+        chunk_size: Maximum number of records processed at once.
+        n_jobs: Number of workers.
+        parallelism: Whether the workers are threads or processes.
+        co_firing: Whether to collect the rules x rules co-firing matrix.
+        **kwargs: Keyword arguments to pass to the evaluation function.
+
+    Returns:
+        The coverage report.
+    """
+    evaluator = source if isinstance(source, Evaluator) else None
+    ruleset = source.ruleset if isinstance(source, Evaluator) else source
+    compiled = ruleset.compile()
+
+    report = RuleCoverageReport(tuple(rule.name for rule in compiled.rules), co_firing)
+    analyze = partial(
+        _analyze_chunk,
+        compiled,
+        evaluator=evaluator,
+        co_firing=co_firing,
+        args=args,
+        kwargs=kwargs,
+    )
+    chunks = iter_chunks(records, chunk_size)
+    for chunk_report in map_chunks(analyze, chunks, n_jobs, parallelism):
+        report.merge(chunk_report)
+
+    return report
@@ -0,0 +1,320 @@
+import math
+from functools import partial
+from typing import Any, Iterable
+
+import numpy as np
+
+from diagnostipy.core.compiled import CompiledRuleset, RecordBatch
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.chunking import iter_chunks, map_chunks
+from diagnostipy.utils.enums import Parallelism
+
+
+class RulesetDiffReport:
+    """
+    Differences between the diagnoses of two ruleset versions over a dataset.
+
+    Attributes:
+        removed_rules (tuple[str, ...]): Rules of the old version without an \
+        identical rule in the new version.
+        added_rules (tuple[str, ...]): Rules of the new version without an \
+        identical rule in the old version. A modified rule is both removed and \
+        added.
+        n_records (int): Number of compared records.
+        transitions (dict[tuple[Any, Any], int]): Record counts per (old label, \
+        new label) pair, including unchanged labels.
+        n_score_changed (int): Records whose score changed.
+        rule_matches (dict[str, int]): For removed and added rules, the number of \
+        records they matched, keyed "-name" and "+name".
+        changed_records (list[int]): Positions of records whose label changed, \
+        up to `max_examples`.
+        max_examples (int): Maximum number of stored record positions.
+    """
+
+    def __init__(
+        self,
+        removed_rules: tuple[str, ...],
+        added_rules: tuple[str, ...],
+        max_examples: int = 1000,
+    ):
+        self.removed_rules = removed_rules
+        self.added_rules = added_rules
+        self.max_examples = max_examples
+        self.n_records = 0
+        self.transitions: dict[tuple[Any, Any], int] = {}
+        self.n_score_changed = 0
+        self.rule_matches: dict[str, int] = {
+            **{f"-{name}": 0 for name in removed_rules},
+            **{f"+{name}": 0 for name in added_rules},
+        }
+        self.changed_records: list[int] = []
+        self._delta_sum = 0.0
+        self._delta_sq_sum = 0.0
+        self._delta_min = math.inf
+        self._delta_max = -math.inf
+
+    @property
+    def n_label_changed(self) -> int:
+        """
+        Number of records whose label changed.
+        """
+        return sum(
+            count for (old, new), count in self.transitions.items() if old != new
+        )
+
+    def score_delta_stats(self) -> dict[str, float]:
+        """
+        Summarise the score differences, new minus old, over all records.
+
+        Returns:
+            The mean, standard deviation, minimum and maximum difference, NaN if \
+            no record was compared.
+        """
+        if not self.n_records:
+            return dict.fromkeys(("mean", "std", "min", "max"), math.nan)
+        mean = self._delta_sum / self.n_records
+        variance = max(self._delta_sq_sum / self.n_records - mean**2, 0.0)
+        return {
+            "mean": mean,
+            "std": math.sqrt(variance),
+            "min": self._delta_min,
+            "max": self._delta_max,
+        }
+
+    def add(
+        self,
+        old_labels: np.ndarray,
+        new_labels: np.ndarray,
+        old_scores: np.ndarray,
+        new_scores: np.ndarray,
+    ) -> None:
+        """
+        Add the results of a batch of records, in dataset order.
+
+        Args:
+            old_labels: Labels under the old ruleset.
+            new_labels: Labels under the new ruleset.
+            old_scores: Scores under the old ruleset.
+            new_scores: Scores under the new ruleset.
+        """
+        if len(old_labels):
+            _, first, counts = np.unique(
+                np.stack([old_labels.astype(str), new_labels.astype(str)], axis=1),
+                axis=0,
+                return_index=True,
+                return_counts=True,
+            )
+            for row, count in zip(first.tolist(), counts.tolist()):
+                key = (old_labels[row], new_labels[row])
+                self.transitions[key] = self.transitions.get(key, 0) + count
+
+        deltas = np.nan_to_num(new_scores - old_scores)
+        if len(deltas):
+            self.n_score_changed += int(np.count_nonzero(deltas))
+            self._delta_sum += float(deltas.sum())
+            self._delta_sq_sum += float(np.square(deltas).sum())
+            self._delta_min = min(self._delta_min, float(deltas.min()))
+            self._delta_max = max(self._delta_max, float(deltas.max()))
+
+        room = self.max_examples - len(self.changed_records)
+        if room > 0:
+            changed = np.flatnonzero(old_labels != new_labels)[:room]
+            self.changed_records.extend((changed + self.n_records).tolist())
+        self.n_records += len(old_labels)
+
+    def merge(self, other: "RulesetDiffReport") -> None:
+        """
+        Add the statistics of a report over the records following this one's.
+
+        Args:
+            other: The report to merge into this one.
+        """
+        for pair, count in other.transitions.items():
+            self.transitions[pair] = self.transitions.get(pair, 0) + count
+        for name, count in other.rule_matches.items():
+            self.rule_matches[name] = self.rule_matches.get(name, 0) + count
+        room = self.max_examples - len(self.changed_records)
+        self.changed_records.extend(
+            position + self.n_records for position in other.changed_records[:room]
+        )
+        self.n_records += other.n_records
+        self.n_score_changed += other.n_score_changed
+        self._delta_sum += other._delta_sum
+        self._delta_sq_sum += other._delta_sq_sum
+        self._delta_min = min(self._delta_min, other._delta_min)
+        self._delta_max = max(self._delta_max, other._delta_max)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarise the report.
+
+        Returns:
+            A dictionary with the rule changes, record counts, label transitions \
+            and score difference statistics.
+        """
+        return {
+            "removed_rules": list(self.removed_rules),
+            "added_rules": list(self.added_rules),
+            "n_records": self.n_records,
+            "n_label_changed": self.n_label_changed,
+            "n_score_changed": self.n_score_changed,
+            "transitions": [
+                {"old": old, "new": new, "count": count}
+                for (old, new), count in sorted(
+                    self.transitions.items(), key=lambda item: -item[1]
+                )
+            ],
+            "score_delta": self.score_delta_stats(),
+            "rule_matches": dict(self.rule_matches),
+            "changed_records": list(self.changed_records),
+        }
+
+
+class _DiffPlan:
+    """
+    Merged compilation of two rulesets in which identical rules share a column,
+    so they are matched once per record.
+
+    Old rules are indexed by type and name, so each new rule is only compared
+    with the few old rules that could equal it.
+    """
+
+    def __init__(self, old: CompiledRuleset, new: CompiledRuleset):
+        self.old = old
+        self.new = new
+        rules: list[SymptomRule] = list(old.rules)
+        candidates: dict[tuple[type, str], list[int]] = {}
+        for idx, rule in enumerate(old.rules):
+            candidates.setdefault((type(rule), rule.name), []).append(idx)
+
+        self.new_columns: list[int] = []
+        for rule in new.rules:
+            column = next(
+                (
+                    idx
+                    for idx in candidates.get((type(rule), rule.name), ())
+                    if old.rules[idx] == rule
+                ),
+                None,
+            )
+            if column is None:
+                column = len(rules)
+                rules.append(rule)
+            self.new_columns.append(column)
+
+        shared = set(self.new_columns)
+        self.removed = [idx for idx in range(len(old.rules)) if idx not in shared]
+        self.added = list(range(len(old.rules), len(rules)))
+        self.merged = CompiledRuleset(rules, exclude_overlaps=False)
+
+    def rule_names(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        names = [rule.name for rule in self.merged.rules]
+        return (
+            tuple(names[idx] for idx in self.removed),
+            tuple(names[idx] for idx in self.added),
+        )
+
+
+def _diff_chunk(
+    plan: _DiffPlan,
+    chunk: RecordBatch,
+    *,
+    old: Evaluator,
+    new: Evaluator,
+    max_examples: int,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> RulesetDiffReport:
+    """
+    Compare the diagnoses of a single chunk.
+    """
+    report = RulesetDiffReport(*plan.rule_names(), max_examples=max_examples)
+    applies = plan.merged.match(chunk)
+    weights = plan.merged.record_weights(chunk) if plan.merged.graded_rules else None
+
+    n_old = len(plan.old.rules)
+    old_labels, old_scores = old._label_matches(
+        plan.old,
+        applies[:, :n_old],
+        args,
+        kwargs,
+        weights[:, :n_old] if weights is not None else None,
+    )
+    new_labels, new_scores = new._label_matches(
+        plan.new,
+        applies[:, plan.new_columns],
+        args,
+        kwargs,
+        weights[:, plan.new_columns] if weights is not None else None,
+    )
+    report.add(old_labels, new_labels, old_scores, new_scores)
+
+    counts = applies.sum(axis=0)
+    for name, idx in zip(report.removed_rules, plan.removed):
+        report.rule_matches[f"-{name}"] += int(counts[idx])
+    for name, idx in zip(report.added_rules, plan.added):
+        report.rule_matches[f"+{name}"] += int(counts[idx])
+    return report
+
+
+def diff_rulesets(
+    old: SymptomRuleset | Evaluator,
+    new: SymptomRuleset | Evaluator,
+    records: Iterable[Any] | RecordBatch,
+    *args,
+    chunk_size: int = 10_000,
+    n_jobs: int = 1,
+    parallelism: Parallelism | str = Parallelism.THREADS,
+    max_examples: int = 1000,
+    **kwargs,
+) -> RulesetDiffReport:
+    """
+    Compare the labels and scores two ruleset versions give to a dataset.
+
+    Both versions are compiled over a merged vocabulary in which identical rules
+    share a column, so every record's fields are read once and shared rules are
+    matched once; only the rules that differ are matched on top. Labels and
+    scores come from the batch evaluation functions, so no diagnosis objects are
+    built. Records are streamed in chunks of `chunk_size`.
+
+    `n_jobs > 1` adds CPU parallelism only with `Parallelism.PROCESSES`, which
+    requires picklable rulesets and evaluators: no lambda `apply_condition` and
+    no timeouts. With the default `Parallelism.THREADS`, threads share the GIL
+    and only NumPy operations on large chunks overlap; see `map_chunks`.
+
+    Args:
+        old: The current ruleset, or an evaluator with its scoring functions.
+        new: The candidate ruleset, or an evaluator with its scoring functions. \
+        Rulesets are scored with a default `Evaluator`.
+        records: Input records, `SparseRecords`, or any iterable of records.
+        *args: Positional arguments to pass to the evaluation functions.
+        chunk_size: Maximum number of records processed at once.
+        n_jobs: Number of workers.
+        parallelism: Whether the workers are threads or processes.
+        max_examples: Maximum number of changed record positions to keep.
+        **kwargs: Keyword arguments to pass to the evaluation functions.
+
+    Returns:
+        The diff report.
+    """
+    old_evaluator = old if isinstance(old, Evaluator) else Evaluator(old)
+    new_evaluator = new if isinstance(new, Evaluator) else Evaluator(new)
+    plan = _DiffPlan(old_evaluator.ruleset.compile(), new_evaluator.ruleset.compile())
+
+    report = RulesetDiffReport(*plan.rule_names(), max_examples=max_examples)
+    compare = partial(
+        _diff_chunk,
+        plan,
+        old=old_evaluator,
+        new=new_evaluator,
+        max_examples=max_examples,
+        args=args,
+        kwargs=kwargs,
+    )
+    chunks = iter_chunks(records, chunk_size)
+    for chunk_report in map_chunks(compare, chunks, n_jobs, parallelism):
+        report.merge(chunk_report)
+
+    return report
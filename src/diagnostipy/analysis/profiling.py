@@ -0,0 +1,311 @@
+import json
+import random
+import tracemalloc
+from time import perf_counter_ns
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+
+STAGES = ("matching", "overlap_exclusion", "scoring")
+
+
+def _rule_kind(rule: SymptomRule) -> str:
+    """
+    Name the code path that decides whether a rule applies.
+    """
+    if rule.apply_condition:
+        return "apply_condition"
+    if rule.condition is not None or rule.numeric_conditions:
+        return "expression"
+    return "conditions"
+
+
+class ProfileReport:
+    """
+    Timings and allocations of a ruleset evaluated record by record.
+
+    Attributes:
+        rule_names (tuple[str, ...]): Rule names, in ruleset order.
+        rule_kinds (tuple[str, ...]): How each rule is matched: "apply_condition" \
+        for callables, "expression" for condition expressions and numeric \
+        conditions, "conditions" for condition fields only.
+        n_records (int): Number of profiled records.
+        rule_ns (np.ndarray): Total time spent in each rule's `applies`, in \
+        nanoseconds. For callable rules this is the time of `apply_condition`.
+        match_counts (np.ndarray): How often each rule applied.
+        stage_ns (dict[str, int]): Total time of matching, overlap exclusion and \
+        scoring, in nanoseconds.
+        allocated_blocks (Optional[int]): Memory blocks still allocated by the \
+        diagnoses of all records, if allocations were traced.
+        allocated_bytes (Optional[int]): Size of those blocks, in bytes.
+        peak_bytes (Optional[int]): Highest memory peak of a single record, in bytes.
+    """
+
+    def __init__(self, rules: list[SymptomRule]):
+        self.rule_names = tuple(rule.name for rule in rules)
+        self.rule_kinds = tuple(_rule_kind(rule) for rule in rules)
+        self.n_records = 0
+        self.rule_ns = np.zeros(len(rules), dtype=np.int64)
+        self.match_counts = np.zeros(len(rules), dtype=np.int64)
+        self.stage_ns = dict.fromkeys(STAGES, 0)
+        self.allocated_blocks: Optional[int] = None
+        self.allocated_bytes: Optional[int] = None
+        self.peak_bytes: Optional[int] = None
+
+    @property
+    def stage_shares(self) -> dict[str, float]:
+        """
+        Share of the total time spent in each stage.
+        """
+        total = sum(self.stage_ns.values())
+        return {
+            stage: elapsed / total if total else 0.0
+            for stage, elapsed in self.stage_ns.items()
+        }
+
+    def top_rules(self, n: Optional[int] = 10) -> list[tuple[str, int]]:
+        """
+        Rank the rules by the time spent matching them.
+
+        Args:
+            n: Maximum number of rules, or None for all rules.
+
+        Returns:
+            (rule name, total nanoseconds) pairs, most expensive first. Ties keep \
+            ruleset order.
+        """
+        order = np.argsort(-self.rule_ns, kind="stable")[:n]
+        return [(self.rule_names[idx], int(self.rule_ns[idx])) for idx in order]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarise the report.
+
+        Returns:
+            A dictionary with the record count, per-stage times and shares, \
+            allocations, and per-rule statistics ranked by total time.
+        """
+        return {
+            "n_records": self.n_records,
+            "stages": {
+                stage: {"total_ns": self.stage_ns[stage], "share": share}
+                for stage, share in self.stage_shares.items()
+            },
+            "allocations": {
+                "blocks_per_record": self._per_record(self.allocated_blocks),
+                "bytes_per_record": self._per_record(self.allocated_bytes),
+                "peak_bytes": self.peak_bytes,
+            },
+            "rules": [
+                {
+                    "name": self.rule_names[idx],
+                    "kind": self.rule_kinds[idx],
+                    "calls": self.n_records,
+                    "matched": int(self.match_counts[idx]),
+                    "total_ns": int(self.rule_ns[idx]),
+                    "mean_ns": self._per_record(int(self.rule_ns[idx])),
+                }
+                for idx in np.argsort(-self.rule_ns, kind="stable")
+            ],
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Serialize the report as JSON.
+
+        Args:
+            **kwargs: Keyword arguments passed to `json.dumps`, e.g. `indent`.
+
+        Returns:
+            The JSON document of `to_dict`.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_text(self, top: int = 10) -> str:
+        """
+        Format the report for reading in a terminal.
+
+        Args:
+            top: Number of rules in the ranking.
+
+        Returns:
+            The text report.
+        """
+        lines = [f"Profiled {self.n_records} records", "", "Stage time:"]
+        for stage, share in self.stage_shares.items():
+            label = stage.replace("_", " ")
+            lines.append(
+                f"  {label:<20}{self.stage_ns[stage] / 1e6:>12.3f} ms{share:>8.1%}"
+            )
+
+        if self.allocated_blocks is not None:
+            lines += [
+                "",
+                "Allocations per record:",
+                f"  retained blocks {self._per_record(self.allocated_blocks):>14.1f}",
+                f"  retained bytes  {self._per_record(self.allocated_bytes):>14.1f}",
+                f"  peak bytes      {self.peak_bytes:>14}",
+            ]
+
+        width = max((len(name) for name in self.rule_names), default=4)
+        lines += [
+            "",
+            f"Most expensive rules (top {top}):",
+            f"  {'rule':<{width}}  {'kind':<15}{'total ms':>12}{'mean us':>12}",
+        ]
+        for name, elapsed in self.top_rules(top):
+            kind = self.rule_kinds[self.rule_names.index(name)]
+            mean = self._per_record(elapsed) / 1e3
+            lines.append(
+                f"  {name:<{width}}  {kind:<15}{elapsed / 1e6:>12.3f}{mean:>12.2f}"
+            )
+        return "\n".join(lines)
+
+    def _per_record(self, value: Optional[int]) -> float:
+        if value is None or not self.n_records:
+            return 0.0
+        return value / self.n_records
+
+
+def _sample(records: Iterable[Any], sample_size: Optional[int], seed: int) -> list[Any]:
+    """
+    Draw a reproducible sample of records, kept in input order.
+    """
+    records = list(records)
+    if sample_size is None or sample_size >= len(records):
+        return records
+    chosen = sorted(random.Random(seed).sample(range(len(records)), sample_size))
+    return [records[idx] for idx in chosen]
+
+
+def _profile_record(
+    evaluator: Evaluator,
+    record: Any,
+    report: ProfileReport,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> None:
+    """
+    Evaluate a single record, adding its timings to the report.
+    """
+    ruleset = evaluator.ruleset
+    suppressed: Optional[dict[int, int]] = {} if evaluator.explain else None
+
+    start = perf_counter_ns()
+    matched = []
+    for idx, rule in enumerate(ruleset.rules):
+        rule_start = perf_counter_ns()
+        applies = rule.applies(record)
+        report.rule_ns[idx] += perf_counter_ns() - rule_start
+        if applies:
+            matched.append(idx)
+    matched_at = perf_counter_ns()
+    fired = ruleset._exclude_indices(matched, suppressed)
+    excluded_at = perf_counter_ns()
+    evaluator._diagnose(
+        fired,
+        suppressed,
+        args,
+        kwargs,
+        weights=evaluator._graded_weights(fired, record),
+    )
+    scored_at = perf_counter_ns()
+
+    report.match_counts[matched] += 1
+    report.stage_ns["matching"] += matched_at - start
+    report.stage_ns["overlap_exclusion"] += excluded_at - matched_at
+    report.stage_ns["scoring"] += scored_at - excluded_at
+
+
+def _trace_allocations(
+    evaluator: Evaluator,
+    records: list[Any],
+    report: ProfileReport,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> None:
+    """
+    Evaluate the records again under tracemalloc, keeping the diagnoses alive so
+    the blocks they allocated are still traced at the end.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        diagnoses = []
+        suppressed: Optional[dict[int, int]] = {} if evaluator.explain else None
+        peak = 0
+        for record in records:
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            fired = evaluator.ruleset.get_applicable_indices(record, suppressed)
+            weights = evaluator._graded_weights(fired, record)
+            diagnoses.append(
+                evaluator._diagnose(fired, suppressed, args, kwargs, weights=weights)
+            )
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    report.allocated_blocks = max(sum(stat.count_diff for stat in stats), 0)
+    report.allocated_bytes = max(sum(stat.size_diff for stat in stats), 0)
+    report.peak_bytes = peak
+
+
+def profile_ruleset(
+    source: SymptomRuleset | Evaluator,
+    records: Iterable[Any],
+    *args,
+    sample_size: Optional[int] = None,
+    seed: int = 0,
+    trace_allocations: bool = True,
+    **kwargs,
+) -> ProfileReport:
+    """
+    Profile the per-record evaluation of a ruleset over sample data.
+
+    Each rule's `applies` is timed separately, together with the time spent
+    matching, excluding overlaps and scoring. Only the library's own steps are
+    timed, so the report is not diluted by validation internals the way a
+    generic profiler run is. Allocations are measured in a second pass with
+    tracemalloc, so tracing does not inflate the timings.
+
+    Args:
+        source: The ruleset to profile, or an evaluator whose scoring functions \
+        and parameters are used. A ruleset is scored with a default `Evaluator`.
+        records: Input records, either dictionaries or objects with attributes.
+        *args: Positional arguments to pass to evaluation and confidence functions.
+        sample_size: Number of records to profile, drawn reproducibly from \
+        `records`. All records are profiled if omitted.
+        seed: Seed of the sample.
+        trace_allocations: Whether to measure allocations with tracemalloc.
+        **kwargs: Keyword arguments to pass to evaluation and confidence functions.
+
+    Returns:
+        The profile report.
+    """
+    evaluator = source if isinstance(source, Evaluator) else Evaluator(source)
+    sample = _sample(records, sample_size, seed)
+
+    report = ProfileReport(evaluator.ruleset.rules)
+    report.n_records = len(sample)
+    for record in sample:
+        _profile_record(evaluator, record, report, args, kwargs)
+
+    if trace_allocations:
+        _trace_allocations(evaluator, sample, report, args, kwargs)
+
+    return report
@@ -0,0 +1,266 @@
+import copy
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from diagnostipy.core.compiled import RecordBatch
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.core.solver import scaled_max_weights
+
+
+class SensitivityReport:
+    """
+    Per-rule effect of relative weight perturbations on a cohort.
+
+    Attributes:
+        rule_names (tuple[str, ...]): Rule names, in ruleset order.
+        factors (tuple[float, ...]): Multiplicative weight perturbations.
+        n_records (int): Number of records in the cohort.
+        flip_rates (np.ndarray): Rules x factors array with the share of records \
+        whose label changes when the rule's weight is scaled by the factor.
+        elasticities (np.ndarray): Rules x factors array with the relative change \
+        of the cohort's total evaluation score divided by the relative change of \
+        the weight; NaN where the unperturbed total score is zero.
+    """
+
+    def __init__(
+        self,
+        rule_names: tuple[str, ...],
+        factors: tuple[float, ...],
+        n_records: int,
+        flip_rates: np.ndarray,
+        elasticities: np.ndarray,
+    ):
+        self.rule_names = rule_names
+        self.factors = factors
+        self.n_records = n_records
+        self.flip_rates = flip_rates
+        self.elasticities = elasticities
+
+    def most_sensitive(self, n: Optional[int] = 10) -> list[str]:
+        """
+        Rank rules by their highest label-flip rate, then by their highest
+        absolute elasticity.
+
+        Args:
+            n: Maximum number of rules, or None for all rules.
+
+        Returns:
+            Rule names, most sensitive first.
+        """
+        flips = self.flip_rates.max(axis=1, initial=0.0)
+        elasticity = np.nan_to_num(np.abs(self.elasticities)).max(axis=1, initial=0.0)
+        order = np.lexsort((-elasticity, -flips))[:n]
+        return [self.rule_names[idx] for idx in order]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarise the report per rule.
+
+        Returns:
+            A dictionary with the factors, the record count, and per-rule flip \
+            rates and elasticities keyed by factor.
+        """
+        return {
+            "factors": list(self.factors),
+            "n_records": self.n_records,
+            "rules": {
+                name: {
+                    "flip_rate": dict(zip(map(str, self.factors), flips.tolist())),
+                    "elasticity": dict(
+                        zip(map(str, self.factors), elasticities.tolist())
+                    ),
+                }
+                for name, flips, elasticities in zip(
+                    self.rule_names, self.flip_rates, self.elasticities
+                )
+            },
+        }
+
+
+class WeightSensitivity:
+    """
+    Scores weight perturbations of a ruleset against a fixed cohort.
+
+    Which rules apply to a record, overlap exclusion included, does not depend on
+    the weights, so the applicable-rule mask is computed once. Every set of
+    weights is then scored with a matrix product against that mask and labelled
+    with the batch evaluation function.
+
+    Attributes:
+        evaluator (Evaluator): The evaluator whose evaluation function is used.
+        compiled (CompiledRuleset): The compiled ruleset.
+        mask (np.ndarray): Records x rules mask of applicable rules.
+        contributions (np.ndarray): Records x rules weights of the applicable \
+        rules, with the record-specific weight of graded rules.
+        renormalize (bool): Whether normalisers derived from the weights, such as \
+        the maximum possible weight, are recomputed for every set of weights.
+        base_labels (np.ndarray): Labels with the unperturbed weights.
+        base_scores (np.ndarray): Evaluation scores with the unperturbed weights.
+    """
+
+    def __init__(
+        self,
+        source: SymptomRuleset | Evaluator,
+        records: RecordBatch,
+        *args,
+        renormalize: bool = True,
+        **kwargs,
+    ):
+        self.evaluator = source if isinstance(source, Evaluator) else Evaluator(source)
+        if self.evaluator._evaluation_strategy.batch_function is None:
+            raise ValueError(
+                "Sensitivity analysis requires an evaluation function with a batch "
+                "counterpart."
+            )
+
+        self.compiled = self.evaluator.ruleset.compile()
+        self.renormalize = renormalize
+        self._args = args
+        self._kwargs = kwargs
+
+        self.mask = self.compiled.exclude(self.compiled.match(records))
+        weights = (
+            self.compiled.record_weights(records)
+            if self.compiled.graded_rules
+            else self.compiled.weights
+        )
+        self.contributions = np.where(self.mask, weights, 0.0)
+        self.base_labels, self.base_scores = self._label(
+            self.contributions.sum(axis=1), np.ones(len(self.compiled.rules))
+        )
+
+    def _params(
+        self, factors: np.ndarray, max_possible_weight: Optional[float] = None
+    ) -> dict[str, Any]:
+        """
+        Recompute the evaluation function's ruleset-dependent parameters for
+        scaled weights.
+
+        The maximum possible weight is solved for the scaled weights unless
+        given, e.g. from `scaled_max_weights`.
+        """
+        if not self.renormalize or np.all(factors == 1.0):
+            return {}
+
+        view = copy.copy(self.compiled)
+        view.weights = self.compiled.weights * factors
+        view.rule_weights = view.weights.tolist()
+        if max_possible_weight is None:
+            selected = view.solve(view.rule_weights)
+            max_possible_weight = float(view.weights[selected].sum())
+        # Assigning a cached property replaces the value copied from `compiled`.
+        view.max_possible_weight = max_possible_weight
+        return self.evaluator._evaluation_strategy.precompute(view)
+
+    def _label(
+        self,
+        totals: np.ndarray,
+        factors: np.ndarray,
+        max_possible_weight: Optional[float] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        strategy = self.evaluator._evaluation_strategy
+        strategy.bind(self.compiled)
+        evaluations = strategy.batch(
+            totals,
+            *self._args,
+            mask=self.mask,
+            **{**self._kwargs, **self._params(factors, max_possible_weight)},
+        )
+        if evaluations is None:
+            raise ValueError(
+                "Sensitivity analysis requires an evaluation function with a batch "
+                "counterpart."
+            )
+        return evaluations.labels, np.asarray(evaluations.scores, dtype=float)
+
+    def score(self, factors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Score the cohort under several sets of relative weights.
+
+        Args:
+            factors: Array of shape (n_sets, n_rules) scaling each rule's weight.
+
+        Returns:
+            Records x sets arrays of labels and evaluation scores.
+        """
+        factors = np.atleast_2d(np.asarray(factors, dtype=np.float64))
+        totals = self.contributions @ factors.T
+        labels = np.empty(totals.shape, dtype=object)
+        scores = np.empty(totals.shape, dtype=np.float64)
+        for column, row in enumerate(factors):
+            labels[:, column], scores[:, column] = self._label(totals[:, column], row)
+        return labels, scores
+
+    def per_rule(self, factors: Sequence[float] = (0.9, 1.1)) -> SensitivityReport:
+        """
+        Perturb each rule's weight on its own and measure the effect.
+
+        With `renormalize`, the maximum possible weight of every perturbation is
+        derived incrementally from the base solution; see `scaled_max_weights`.
+
+        Args:
+            factors: Multiplicative perturbations applied to one rule at a time.
+
+        Returns:
+            The sensitivity report.
+        """
+        n_records, n_rules = self.mask.shape
+        flip_rates = np.zeros((n_rules, len(factors)))
+        elasticities = np.full((n_rules, len(factors)), np.nan)
+        base_totals = self.contributions.sum(axis=1)
+        base_sum = self.base_scores.sum()
+
+        for column, factor in enumerate(factors):
+            totals = base_totals[:, None] + self.contributions * (factor - 1.0)
+            maxima: list[Optional[float]] = [None] * n_rules
+            if self.renormalize and factor != 1.0:
+                maxima = list(scaled_max_weights(self.compiled, factor))
+            for rule in range(n_rules):
+                scaled = np.ones(n_rules)
+                scaled[rule] = factor
+                labels, scores = self._label(totals[:, rule], scaled, maxima[rule])
+                if n_records:
+                    flip_rates[rule, column] = np.mean(labels != self.base_labels)
+                if base_sum and factor != 1.0:
+                    elasticities[rule, column] = (
+                        (scores.sum() - base_sum) / base_sum / (factor - 1.0)
+                    )
+
+        return SensitivityReport(
+            tuple(rule.name for rule in self.compiled.rules),
+            tuple(float(factor) for factor in factors),
+            n_records,
+            flip_rates,
+            elasticities,
+        )
+
+
+def analyze_weight_sensitivity(
+    source: SymptomRuleset | Evaluator,
+    records: RecordBatch,
+    *args,
+    factors: Sequence[float] = (0.9, 1.1),
+    renormalize: bool = True,
+    **kwargs,
+) -> SensitivityReport:
+    """
+    Measure how sensitive a cohort's labels and scores are to each rule's weight.
+
+    Args:
+        source: The ruleset to analyse, or an evaluator whose evaluation function \
+        and parameters are used. A ruleset is scored with a default `Evaluator`.
+        records: The cohort: input records, an encoded matrix, or `SparseRecords`.
+        *args: Positional arguments to pass to the evaluation function.
+        factors: Multiplicative perturbations applied to one rule at a time.
+        renormalize: Whether normalisers such as the maximum possible weight \
+        follow the perturbed weights.
+        **kwargs: Keyword arguments to pass to the evaluation function.
+
+    Returns:
+        The sensitivity report.
+    """
+    return WeightSensitivity(
+        source, records, *args, renormalize=renormalize, **kwargs
+    ).per_rule(factors)
@@ -0,0 +1,328 @@
+from functools import cached_property
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from diagnostipy.core.conditions import extract_columns, get_field_value
+from diagnostipy.core.index import RuleIndex
+from diagnostipy.core.models.numeric import to_number
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.sparse import SparseRecords
+from diagnostipy.utils.enums import SolverMode
+
+RecordBatch = Sequence[Any] | np.ndarray | SparseRecords
+
+
+class CompiledRuleset(RuleIndex):
+    """
+    Array-based snapshot of a ruleset used for vectorized evaluation.
+
+    Extends `RuleIndex` with arrays of the same rules, columns and overlap pairs,
+    so a batch of records is matched with a few array operations instead of one
+    Python loop per record.
+
+    Attributes:
+        condition_counts (np.ndarray): Number of condition fields of each rule.
+        field_rules (tuple[np.ndarray, np.ndarray]): CSR-style (offsets, rule \
+        indices) listing the rules that use each field.
+        weights (np.ndarray): `rule_weights` as an array.
+        shadowed (np.ndarray): Rules excluded by a later, more specific rule.
+        shadowing (np.ndarray): The rule excluding each `shadowed` rule.
+    """
+
+    vectorized = True
+
+    def __init__(
+        self,
+        rules: Sequence[SymptomRule],
+        exclude_overlaps: bool = True,
+        solver_mode: SolverMode = SolverMode.AUTO,
+    ):
+        super().__init__(rules, exclude_overlaps, solver_mode)
+        self.condition_counts = np.array(
+            [len(columns) for columns in self.rule_fields], dtype=np.float32
+        )
+        self.weights = np.array(self.rule_weights, dtype=np.float64)
+        self.field_rules = (
+            np.cumsum([0] + [len(rules) for rules in self._field_rules]),
+            np.array(
+                [idx for rules in self._field_rules for idx in rules], dtype=np.intp
+            ),
+        )
+        self.shadowed = np.array([a for a, _ in self.overlaps], dtype=np.intp)
+        self.shadowing = np.array([b for _, b in self.overlaps], dtype=np.intp)
+        self._shadowed_rules, self._shadow_starts = np.unique(
+            self.shadowed, return_index=True
+        )
+
+    @cached_property
+    def incidence(self) -> np.ndarray:
+        """
+        Dense rules x fields incidence matrix, built on first use.
+        """
+        incidence = np.zeros((len(self.rules), len(self.fields)), dtype=np.float32)
+        for idx, columns in enumerate(self.rule_fields):
+            incidence[idx, columns] = 1.0
+        return incidence
+
+    def encode(self, records: Sequence[Any]) -> np.ndarray:
+        """
+        Encode records as a boolean matrix of records x condition fields.
+
+        A cell is True when the field's value is truthy, matching
+        `SymptomRule.applies`. Numeric condition columns are evaluated in bulk on
+        the numeric values of their fields.
+
+        Args:
+            records: Input records, either dictionaries or objects with attributes.
+
+        Returns:
+            A boolean array of shape (len(records), len(fields)).
+        """
+        encoded = np.zeros((len(records), len(self.fields)), dtype=bool)
+        index = self._plain_index
+
+        for row, record in enumerate(records):
+            if isinstance(record, dict):
+                if len(record) < len(index):
+                    for key, value in record.items():
+                        column = index.get(key)
+                        if column is not None and value:
+                            encoded[row, column] = True
+                    continue
+                columns = [c for f, c in index.items() if record.get(f)]
+            else:
+                columns = [c for f, c in index.items() if getattr(record, f, None)]
+            encoded[row, columns] = True
+
+        self._encode_predicates(records, encoded)
+        return encoded
+
+    def _encode_predicates(self, records: Sequence[Any], encoded: np.ndarray) -> None:
+        """
+        Fill the numeric condition columns of encoded records.
+        """
+        if not self.predicates:
+            return
+        values = self.numeric_columns(
+            records, [numeric.field for numeric in self.predicates.values()]
+        )
+        for column, numeric in self.predicates.items():
+            encoded[:, column] = numeric.evaluate(values[numeric.field])
+
+    @staticmethod
+    def numeric_columns(
+        records: Sequence[Any], fields: Sequence[str]
+    ) -> dict[str, np.ndarray]:
+        """
+        Read numeric fields from every record once.
+
+        Args:
+            records: Input records, either dictionaries or objects with attributes.
+            fields: The numeric fields to read.
+
+        Returns:
+            A dictionary mapping fields to float arrays, with NaN for missing or \
+            non-numeric values.
+        """
+        return {
+            field: np.fromiter(
+                (to_number(get_field_value(record, field)) for record in records),
+                dtype=np.float64,
+                count=len(records),
+            )
+            for field in dict.fromkeys(fields)
+        }
+
+    def record_weights(self, records: RecordBatch) -> np.ndarray:
+        """
+        Compute the weight of every rule for every record, applying graded weights.
+
+        Args:
+            records: Input records or sparse records.
+
+        Returns:
+            A float array of shape (n_records, n_rules).
+
+        Raises:
+            ValueError: If an encoded matrix is given, which has no numeric values.
+        """
+        if isinstance(records, np.ndarray):
+            raise ValueError(
+                "Rules with `graded_weight` require raw records, not an encoded matrix."
+            )
+
+        rows = records if isinstance(records, Sequence) else list(records)
+        weights = np.tile(
+            np.array([rule.weight or 0.0 for rule in self.rules]), (len(rows), 1)
+        )
+        values = self.numeric_columns(
+            rows, [graded.field for _, graded in self._graded]
+        )
+        for idx, graded in self._graded:
+            column = values[graded.field]
+            weights[:, idx] = np.where(
+                np.isnan(column), weights[:, idx], graded.weights(column)
+            )
+        return weights
+
+    def _count_sparse(self, records: SparseRecords) -> np.ndarray:
+        """
+        Count the present condition fields of each rule for sparse records.
+
+        Every stored entry is expanded to the rules using its field, so the work
+        and memory scale with the number of present fields.
+
+        Args:
+            records: Sparse records with any vocabulary.
+
+        Returns:
+            A float array of shape (len(records), n_rules).
+        """
+        n_rules = len(self.rules)
+        column_map = np.array(
+            [self.field_index.get(code, -1) for code in records.vocabulary],
+            dtype=np.intp,
+        )
+        fields = column_map[records.indices]
+        known = fields >= 0
+        rows, fields = records.rows()[known], fields[known]
+
+        offsets, field_rules = self.field_rules
+        fan_out = offsets[fields + 1] - offsets[fields]
+        entry = np.repeat(np.arange(len(fields)), fan_out)
+        position = np.arange(len(entry)) - np.repeat(
+            np.cumsum(fan_out) - fan_out, fan_out
+        )
+        rules = field_rules[offsets[fields][entry] + position]
+
+        counts = np.bincount(
+            rows[entry] * n_rules + rules, minlength=len(records) * n_rules
+        )
+        return counts.reshape(len(records), n_rules).astype(np.float32)
+
+    def match(self, records: RecordBatch, callables: bool = True) -> np.ndarray:
+        """
+        Determine which rules apply to each record, before overlap exclusion.
+
+        Args:
+            records: Input records, an already encoded boolean matrix aligned to \
+            `fields`, or sparse records.
+            callables: Whether to call the `apply_condition` of callable rules. \
+            If False, their columns are left False for the caller to fill.
+
+        Returns:
+            A boolean array of shape (n_records, n_rules).
+
+        Raises:
+            ValueError: If an encoded matrix is given for rules with \
+            `apply_condition` or `condition`, which need the raw records.
+        """
+        if isinstance(records, np.ndarray):
+            if self.callable_rules or self.expression_rules:
+                raise ValueError(
+                    "Rules with `apply_condition` or `condition` require raw "
+                    "records, not an encoded matrix."
+                )
+            hits = records.astype(np.float32) @ self.incidence.T
+        elif isinstance(records, SparseRecords):
+            hits = self._count_sparse(records)
+        else:
+            hits = self.encode(records).astype(np.float32) @ self.incidence.T
+
+        applies = hits == self.condition_counts
+
+        if self._expressions:
+            rows = records if isinstance(records, Sequence) else list(records)
+            columns = extract_columns(rows, self.expression_fields)
+            for idx, condition in self._expressions:
+                applies[:, idx] &= condition.evaluate(columns)
+
+        for idx in self.callable_rules:
+            rule = self.rules[idx]
+            applies[:, idx] = (
+                [bool(rule.applies(record)) for record in records]
+                if callables
+                else False
+            )
+
+        return applies
+
+    def exclude(self, applies: np.ndarray) -> np.ndarray:
+        """
+        Apply overlap exclusion to a matrix of matching rules.
+
+        A rule is excluded when a later matching rule is at least as specific.
+
+        Args:
+            applies: Boolean array of shape (n_records, n_rules).
+
+        Returns:
+            A boolean array of the same shape with overlapping rules removed.
+        """
+        if not self.exclude_overlaps or not len(self.shadowed):
+            return applies
+
+        excluded = np.logical_or.reduceat(
+            applies[:, self.shadowing], self._shadow_starts, axis=1
+        )
+        final = applies.copy()
+        final[:, self._shadowed_rules] &= ~excluded
+        return final
+
+    def applicable_mask(self, records: RecordBatch) -> np.ndarray:
+        """
+        Determine the applicable rules of each record, matching
+        `SymptomRuleset.get_applicable_rules`.
+
+        Args:
+            records: Input records, an already encoded boolean matrix, or sparse \
+            records.
+
+        Returns:
+            A boolean array of shape (n_records, n_rules).
+        """
+        return self.exclude(self.match(records))
+
+    def total_scores(
+        self, mask: np.ndarray, weights: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Sum the weights of the applicable rules of each record.
+
+        Weights are accumulated left to right, so the totals are identical to
+        summing the weights of `get_applicable_rules` in Python.
+
+        Args:
+            mask: Boolean array of shape (n_records, n_rules).
+            weights: Per-record weights from `record_weights`. Defaults to \
+            `weights`.
+
+        Returns:
+            A float array of total scores.
+        """
+        if not len(self.rules):
+            return np.zeros(len(mask))
+        if weights is None:
+            weights = self.weights
+        return np.cumsum(np.where(mask, weights, 0.0), axis=1)[:, -1]
+
+    def suppressors(self, applies: np.ndarray) -> dict[int, int]:
+        """
+        Find the rule that suppressed each excluded rule of a single record.
+
+        Args:
+            applies: Boolean vector of matching rules, before overlap exclusion.
+
+        Returns:
+            A dictionary mapping suppressed rule indices to the first later rule \
+            that suppressed them.
+        """
+        if not self.exclude_overlaps:
+            return {}
+
+        active = applies[self.shadowed] & applies[self.shadowing]
+        suppressed: dict[int, int] = {}
+        for idx, by in zip(self.shadowed[active], self.shadowing[active]):
+            suppressed.setdefault(int(idx), int(by))
+        return suppressed
@@ -0,0 +1,336 @@
+import ast
+import numbers
+import operator
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_COMPARISONS: dict[type[ast.cmpop], tuple[str, Callable[[Any, Any], Any]]] = {
+    ast.Gt: (">", operator.gt),
+    ast.GtE: (">=", operator.ge),
+    ast.Lt: ("<", operator.lt),
+    ast.LtE: ("<=", operator.le),
+    ast.Eq: ("==", operator.eq),
+    ast.NotEq: ("!=", operator.ne),
+}
+_MEMBERSHIP = (ast.In, ast.NotIn)
+_COLLECTIONS = (ast.List, ast.Tuple, ast.Set)
+_LITERALS = (int, float, str, bool)
+_SIGNS: dict[type[ast.unaryop], Callable[[Any], Any]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def get_field_value(data: Any, field: str) -> Any:
+    """
+    Retrieve a field's value from a dictionary or an object with attributes.
+
+    Args:
+        data: The input record.
+        field: The name of the field.
+
+    Returns:
+        The value of the field, or None if it is missing.
+    """
+    if isinstance(data, dict):
+        return data.get(field)
+    return getattr(data, field, None)
+
+
+def _condition_value(data: Any, field: str) -> Any:
+    """
+    Retrieve a field's value for condition evaluation, reading NaN as missing.
+    """
+    value = get_field_value(data, field)
+    if isinstance(value, numbers.Real) and value != value:
+        return None
+    return value
+
+
+def _literal_value(node: ast.expr) -> Any:
+    """
+    Read the value of a literal node, allowing a sign before numbers.
+
+    Raises:
+        ValueError: If the node is not a supported literal.
+    """
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _SIGNS:
+        operand = node.operand
+        if (
+            isinstance(operand, ast.Constant)
+            and isinstance(operand.value, (int, float))
+            and not isinstance(operand.value, bool)
+        ):
+            return _SIGNS[type(node.op)](operand.value)
+    elif isinstance(node, ast.Constant) and isinstance(node.value, _LITERALS):
+        return node.value
+    raise ValueError(ast.unparse(node))
+
+
+class Condition:
+    """
+    A parsed condition expression.
+
+    Expressions use a small subset of Python syntax: field names, number, string
+    and boolean literals, comparisons (`temperature > 38.5`, `base_excess < -2`),
+    ranges (`38 <= temperature < 40`), categorical membership (`blood_type in
+    ["A", "AB"]`), and `and`, `or`, `not` with parentheses. A bare field name
+    checks the field's truthiness. Missing fields and NaN values are treated
+    alike: comparisons with them are False.
+
+    The expression is validated and compiled to a Python function once. Batches
+    are evaluated with NumPy over columns of field values.
+
+    Attributes:
+        source (str): The expression.
+        fields (tuple[str, ...]): Fields used by the expression, in order of \
+        appearance.
+    """
+
+    __slots__ = ("source", "fields", "_tree", "_function")
+
+    def __init__(self, source: str):
+        try:
+            tree = ast.parse(source.strip(), mode="eval").body
+        except SyntaxError as error:
+            raise ValueError(f"Invalid condition {source!r}: {error.msg}") from None
+
+        self.source = source
+        self.fields: tuple[str, ...] = ()
+        self._tree = tree
+        self._function = self._compile(self._to_source(tree))
+
+    def _field(self, node: ast.Name) -> str:
+        if node.id not in self.fields:
+            self.fields += (node.id,)
+        return f"f{self.fields.index(node.id)}"
+
+    def _error(self, node: ast.AST) -> ValueError:
+        return ValueError(
+            f"Unsupported syntax in condition {self.source!r}: {ast.unparse(node)}"
+        )
+
+    def _literal(self, node: ast.expr) -> str:
+        try:
+            return repr(_literal_value(node))
+        except ValueError:
+            raise self._error(node) from None
+
+    def _to_source(self, node: ast.expr) -> str:
+        """
+        Validate a node and translate it to Python source.
+        """
+        if isinstance(node, ast.BoolOp):
+            joiner = " and " if isinstance(node.op, ast.And) else " or "
+            return "(" + joiner.join(map(self._to_source, node.values)) + ")"
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return f"(not {self._to_source(node.operand)})"
+        if isinstance(node, ast.Name):
+            return f"bool({self._field(node)})"
+        if isinstance(node, ast.Compare):
+            return self._compare_source(node)
+        raise self._error(node)
+
+    def _compare_source(self, node: ast.Compare) -> str:
+        operands = [node.left, *node.comparators]
+        if not any(isinstance(operand, ast.Name) for operand in operands):
+            raise self._error(node)
+
+        parts = []
+        for left, op, right in zip(operands, node.ops, operands[1:]):
+            if isinstance(op, _MEMBERSHIP):
+                parts.append(self._membership_source(node, left, op, right))
+                continue
+            if type(op) not in _COMPARISONS:
+                raise self._error(node)
+            symbol = _COMPARISONS[type(op)][0]
+            sides = [self._operand_source(left), self._operand_source(right)]
+            guards = [
+                f"{side} is not None"
+                for side, operand in zip(sides, (left, right))
+                if isinstance(operand, ast.Name)
+            ]
+            parts.append(" and ".join([*guards, f"{sides[0]} {symbol} {sides[1]}"]))
+        return "(" + " and ".join(parts) + ")"
+
+    def _operand_source(self, node: ast.expr) -> str:
+        if isinstance(node, ast.Name):
+            return self._field(node)
+        return self._literal(node)
+
+    def _membership_source(
+        self, node: ast.Compare, left: ast.expr, op: ast.cmpop, right: ast.expr
+    ) -> str:
+        if not isinstance(left, ast.Name) or not isinstance(right, _COLLECTIONS):
+            raise self._error(node)
+        values = ", ".join(self._literal(element) for element in right.elts)
+        field = self._field(left)
+        if isinstance(op, ast.In):
+            return f"{field} in {{{values}}}"
+        return f"{field} is not None and {field} not in {{{values}}}"
+
+    def _compile(self, expression: str) -> Callable[[Any], bool]:
+        loads = "".join(
+            f"    f{idx} = get(record, {field!r})\n"
+            for idx, field in enumerate(self.fields)
+        )
+        source = f"def condition(record, get=get):\n{loads}    return {expression}\n"
+        namespace: dict[str, Any] = {"get": _condition_value}
+        exec(compile(source, f"<condition {self.source!r}>", "exec"), namespace)
+        return namespace["condition"]
+
+    def __call__(self, record: Any) -> bool:
+        """
+        Evaluate the condition for a single record.
+
+        Args:
+            record: A dictionary or an object with attributes.
+
+        Returns:
+            True if the condition holds, False otherwise.
+        """
+        return self._function(record)
+
+    def evaluate(self, columns: Mapping[str, "np.ndarray"]) -> "np.ndarray":
+        """
+        Evaluate the condition for a batch of records.
+
+        Args:
+            columns: Values of every field in `fields`, as built by \
+            `extract_columns`.
+
+        Returns:
+            A boolean array with one entry per record.
+        """
+        return _evaluate(self._tree, columns)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Condition) and other.source == self.source
+
+    def __hash__(self) -> int:
+        return hash(self.source)
+
+    def __repr__(self) -> str:
+        return f"Condition({self.source!r})"
+
+
+@lru_cache(maxsize=1024)
+def parse_condition(source: str) -> Condition:
+    """
+    Parse a condition expression, reusing earlier results for the same source.
+
+    Args:
+        source: The expression.
+
+    Returns:
+        The parsed condition.
+
+    Raises:
+        ValueError: If the expression is invalid or uses unsupported syntax.
+    """
+    return Condition(source)
+
+
+def extract_columns(
+    records: Sequence[Any], fields: Sequence[str]
+) -> dict[str, "np.ndarray"]:
+    """
+    Read the values of the given fields from every record once.
+
+    Fields holding only numbers, booleans and missing values become float columns
+    with NaN for missing values; other fields become object columns with None.
+    NaN values are read as missing in both.
+
+    Args:
+        records: Input records, either dictionaries or objects with attributes.
+        fields: The fields to read.
+
+    Returns:
+        A dictionary mapping fields to columns.
+    """
+    import numpy as np
+
+    columns = {}
+    for field in fields:
+        values = [_condition_value(record, field) for record in records]
+        if all(value is None or isinstance(value, numbers.Real) for value in values):
+            columns[field] = np.array(
+                [np.nan if value is None else value for value in values],
+                dtype=np.float64,
+            )
+        else:
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            columns[field] = column
+    return columns
+
+
+def _present(column: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    if column.dtype.kind == "f":
+        return ~np.isnan(column)
+    return np.fromiter((value is not None for value in column), bool, len(column))
+
+
+def _operand(node: ast.expr, columns: Mapping[str, "np.ndarray"]) -> Any:
+    if isinstance(node, ast.Name):
+        return columns[node.id]
+    return _literal_value(node)
+
+
+def _compare(
+    left: ast.expr,
+    op: ast.cmpop,
+    right: ast.expr,
+    columns: Mapping[str, "np.ndarray"],
+    size: int,
+) -> "np.ndarray":
+    import numpy as np
+
+    if isinstance(op, _MEMBERSHIP):
+        column = columns[left.id]  # type: ignore[attr-defined]
+        values = {_literal_value(element) for element in right.elts}  # type: ignore
+        member = np.fromiter((value in values for value in column), bool, size)
+        return member if isinstance(op, ast.In) else ~member & _present(column)
+
+    func = _COMPARISONS[type(op)][1]
+    operands = [_operand(left, columns), _operand(right, columns)]
+    present = np.ones(size, dtype=bool)
+    for operand in operands:
+        if isinstance(operand, np.ndarray):
+            present &= _present(operand)
+
+    result = np.zeros(size, dtype=bool)
+    selected = [
+        operand[present] if isinstance(operand, np.ndarray) else operand
+        for operand in operands
+    ]
+    result[present] = np.asarray(func(*selected), dtype=bool)
+    return result
+
+
+def _evaluate(node: ast.expr, columns: Mapping[str, "np.ndarray"]) -> "np.ndarray":
+    import numpy as np
+
+    size = len(next(iter(columns.values()))) if columns else 0
+    if isinstance(node, ast.BoolOp):
+        reduce = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return reduce.reduce([_evaluate(value, columns) for value in node.values])
+    if isinstance(node, ast.UnaryOp):
+        return ~_evaluate(node.operand, columns)
+    if isinstance(node, ast.Name):
+        column = columns[node.id]
+        if column.dtype.kind == "f":
+            return (column != 0) & ~np.isnan(column)
+        return np.fromiter((bool(value) for value in column), bool, size)
+
+    assert isinstance(node, ast.Compare)
+    operands = [node.left, *node.comparators]
+    result = np.ones(size, dtype=bool)
+    for left, op, right in zip(operands, node.ops, operands[1:]):
+        result &= _compare(left, op, right, columns, size)
+    return result
@@ -0,0 +1,150 @@
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from diagnostipy.core.conditions import get_field_value
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from diagnostipy.core.compiled import CompiledRuleset
+
+
+class DedupStats:
+    """
+    Running totals of deduplicated batch evaluations.
+
+    Attributes:
+        records (int): Records evaluated.
+        profiles (int): Distinct profiles evaluated.
+    """
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.profiles = 0
+
+    def add(self, records: int, profiles: int) -> None:
+        """
+        Add the totals of one batch.
+
+        Args:
+            records: Records in the batch.
+            profiles: Distinct profiles in the batch.
+        """
+        self.records += records
+        self.profiles += profiles
+
+    @property
+    def ratio(self) -> float:
+        """
+        Records per distinct profile, 1.0 before any record was evaluated.
+        """
+        return self.records / self.profiles if self.profiles else 1.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarise the totals.
+
+        Returns:
+            The record and profile counts and the dedup ratio.
+        """
+        return {"records": self.records, "profiles": self.profiles, "ratio": self.ratio}
+
+    def __repr__(self) -> str:
+        return (
+            f"DedupStats(records={self.records}, profiles={self.profiles}, "
+            f"ratio={self.ratio:.2f})"
+        )
+
+
+def _profile_matrix(
+    compiled: "CompiledRuleset",
+    records: "Sequence[Any] | np.ndarray",
+    extra: Optional["np.ndarray"],
+) -> "np.ndarray":
+    """
+    Build one byte row per record from everything matching and scoring read,
+    except `condition` expressions: the truthiness of condition fields, numeric
+    condition results, graded weight values and the `extra` columns.
+    """
+    import numpy as np
+
+    if isinstance(records, np.ndarray):
+        parts = [np.packbits(records.astype(bool), axis=1)]
+    else:
+        parts = [np.packbits(compiled.encode(records), axis=1)]
+        graded_fields = [graded.field for _, graded in compiled._graded]
+        if graded_fields:
+            values = compiled.numeric_columns(records, graded_fields)
+            numbers = np.column_stack(list(values.values()))
+            parts.append(np.ascontiguousarray(numbers).view(np.uint8))
+    if extra is not None and extra.shape[1]:
+        parts.append(np.packbits(extra, axis=1))
+    return np.ascontiguousarray(np.hstack(parts))
+
+
+def _group_by_value(
+    matrix: "np.ndarray", records: Sequence[Any], fields: Sequence[str]
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Group rows by their bytes and the raw values of `fields`. Records with an
+    unhashable value form groups of their own.
+    """
+    import numpy as np
+
+    groups: dict[Any, int] = {}
+    first: list[int] = []
+    inverse = np.empty(len(records), dtype=np.intp)
+    for row, record in enumerate(records):
+        key: Any = (
+            matrix[row].tobytes(),
+            tuple(get_field_value(record, field) for field in fields),
+        )
+        try:
+            group = groups.setdefault(key, len(first))
+        except TypeError:
+            group = len(first)
+        if group == len(first):
+            first.append(row)
+        inverse[row] = group
+    return np.array(first, dtype=np.intp), inverse
+
+
+def group_profiles(
+    compiled: "CompiledRuleset",
+    records: "Sequence[Any] | np.ndarray",
+    extra: Optional["np.ndarray"] = None,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Group records with identical symptom profiles.
+
+    A record is projected onto what the compiled ruleset reads from it: the
+    truthiness of its condition fields, its numeric condition results, the values
+    of graded weight fields and the raw values of `condition` expression fields.
+    Records with equal projections match the same rules with the same weights.
+
+    Args:
+        compiled: The compiled ruleset.
+        records: Raw input records or an encoded boolean matrix.
+        extra: Optional boolean array with one row per record of additional \
+        columns that must also be equal, such as `apply_condition` results.
+
+    Returns:
+        The position of the first record of each group, ascending, and the group \
+        of every record.
+    """
+    import numpy as np
+
+    if not len(records):
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+    matrix = _profile_matrix(compiled, records, extra)
+    if compiled.expression_fields and not isinstance(records, np.ndarray):
+        return _group_by_value(matrix, records, compiled.expression_fields)
+    if not matrix.shape[1]:
+        return np.zeros(1, dtype=np.intp), np.zeros(len(records), dtype=np.intp)
+
+    keys = matrix.view(np.dtype((np.void, matrix.shape[1]))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse.reshape(-1)]
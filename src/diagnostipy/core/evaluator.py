@@ -1,12 +1,38 @@
-from typing import Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Sequence
 
+from diagnostipy.core.dedup import DedupStats
+from diagnostipy.core.factory import DiagnosisFactory
 from diagnostipy.core.models.diagnosis import Diagnosis, DiagnosisBase
+from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.models.explanation import Explanation
+from diagnostipy.core.models.symptom_rule import SymptomRule
 from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.core.timeouts import ConditionRunner
 from diagnostipy.core.typing import FunctionMap, T
-from diagnostipy.utils.enums import ConfidenceFunctionEnum, EvaluationFunctionEnum
-from diagnostipy.utils.scoring import CONFIDENCE_FUNCTIONS, EVALUATION_FUNCTIONS
+from diagnostipy.utils.enums import (
+    ConfidenceFunctionEnum,
+    EvaluationFunctionEnum,
+    TimeoutPolicy,
+)
+from diagnostipy.utils.scoring import (
+    CONFIDENCE_FUNCTIONS,
+    EVALUATION_FUNCTIONS,
+    build_confidence_strategy,
+    build_evaluation_strategy,
+)
+from diagnostipy.utils.scoring.cache import ScoreCache
+from diagnostipy.utils.scoring.summary import ScoringSummary
 from diagnostipy.utils.scoring.types import ConfidenceFunction, EvaluationFunction
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from diagnostipy.core.compiled import CompiledRuleset, RecordBatch
+    from diagnostipy.core.index import RuleIndex
+    from diagnostipy.core.mapped import MappedRecords, MappedScores, PathLike
+    from diagnostipy.core.timeouts import TimeoutMetrics
+    from diagnostipy.utils.sinks import ResultSink
+
 
 class Evaluator:
     """
@@ -18,6 +44,28 @@ class Evaluator:
         total_score (float): Total score based on applicable rules.
         confidence (Optional[float]): Confidence level of the evaluation.
         risk_level (Optional[str]): Risk level determined by the evaluation.
+        explain (bool): Whether to attach an `Explanation` to the diagnosis \
+        metadata under the "explanation" key.
+        evaluation_params (Optional[dict[str, Any]]): Parameters of the evaluation \
+        function, validated once instead of being passed on every call.
+        confidence_params (Optional[dict[str, Any]]): Parameters of the confidence \
+        function, validated once instead of being passed on every call.
+        cache (Optional[ScoreCache]): LRU cache of evaluation results and \
+        confidences by set of applicable rules, enabled with `cache_size`. Only \
+        enable it with pure evaluation and confidence functions, such as the \
+        built-in ones.
+        condition_runner (Optional[ConditionRunner]): Runs `apply_condition` \
+        callables on a thread pool with bounded waits, enabled with \
+        `rule_timeout` or `evaluation_timeout`. Rules that time out do not apply; \
+        under `TimeoutPolicy.SKIP` and `TimeoutPolicy.DEGRADE` the diagnosis \
+        metadata lists them under the "timeouts" key, and `DEGRADE` also sets \
+        "degraded" to True. `TimeoutPolicy.RAISE` raises `RuleTimeoutError`.
+        dedup_stats (DedupStats): Records and distinct profiles evaluated by \
+        `run_batch` with `deduplicate=True`.
+        diagnosis_factory (DiagnosisFactory): Builds diagnoses of `diagnosis_model`. \
+        Diagnoses are built without per-record validation when the model's schema \
+        allows it; pass `strict=True` to validate every diagnosis, e.g. while \
+        debugging a custom model.
     """
 
     def __init__(
@@ -31,22 +79,51 @@ class Evaluator:
             Optional[ConfidenceFunction] | ConfidenceFunctionEnum
         ) = ConfidenceFunctionEnum.WEIGHTED,
         diagnosis_model: type[DiagnosisBase] = Diagnosis,
+        explain: bool = False,
+        evaluation_params: Optional[dict[str, Any]] = None,
+        confidence_params: Optional[dict[str, Any]] = None,
+        cache_size: int = 0,
+        rule_timeout: Optional[float] = None,
+        evaluation_timeout: Optional[float] = None,
+        timeout_policy: TimeoutPolicy | str = TimeoutPolicy.SKIP,
+        timeout_workers: int = 4,
+        strict: bool = False,
     ):
         self.data = data
         self.ruleset = ruleset
         self.diagnosis_model = diagnosis_model
+        self.explain = explain
         self.diagnosis = self.diagnosis_model()
-        self._evaluation_function = self._resolve_function(
-            evaluation_function,
-            EvaluationFunctionEnum,
-            EVALUATION_FUNCTIONS,
-            "evaluation_function",
+        self.diagnosis_factory = DiagnosisFactory(diagnosis_model, strict)
+        self.cache: Optional[ScoreCache] = None
+        if cache_size:
+            self.cache = ScoreCache(cache_size)
+        self.dedup_stats = DedupStats()
+        self.condition_runner: Optional[ConditionRunner] = None
+        if rule_timeout is not None or evaluation_timeout is not None:
+            self.condition_runner = ConditionRunner(
+                rule_timeout,
+                evaluation_timeout,
+                TimeoutPolicy(timeout_policy),
+                timeout_workers,
+            )
+        self._evaluation_strategy = build_evaluation_strategy(
+            self._resolve_function(
+                evaluation_function,
+                EvaluationFunctionEnum,
+                EVALUATION_FUNCTIONS,
+                "evaluation_function",
+            ),
+            evaluation_params,
         )
-        self._confidence_function = self._resolve_function(
-            confidence_function,
-            ConfidenceFunctionEnum,
-            CONFIDENCE_FUNCTIONS,
-            "confidence_function",
+        self._confidence_strategy = build_confidence_strategy(
+            self._resolve_function(
+                confidence_function,
+                ConfidenceFunctionEnum,
+                CONFIDENCE_FUNCTIONS,
+                "confidence_function",
+            ),
+            confidence_params,
         )
 
     def _resolve_function(
@@ -120,6 +197,42 @@ class Evaluator:
                 f"Available options are: {[e.value for e in enum_type]}"
             )
 
+    @property
+    def timeout_metrics(self) -> Optional["TimeoutMetrics"]:
+        """
+        Timeout statistics, or None if evaluation is not time-bounded.
+        """
+        runner = self.condition_runner
+        return runner.metrics if runner is not None else None
+
+    def check(self, *args, **kwargs) -> None:
+        """
+        Score a record that matches no rule, on the single-record and the batch
+        path, to surface configuration errors before any record is evaluated.
+
+        Use it when records must not be blamed for errors of the evaluator, e.g.
+        `multiclass_simple` without `labels` in `evaluation_params`.
+
+        Args:
+            *args: Positional arguments to pass to evaluation and confidence functions.
+            **kwargs: Keyword arguments to pass to evaluation and confidence functions.
+
+        Raises:
+            TypeError: If the scoring functions are missing required parameters.
+            ValueError: If the scoring parameters are invalid.
+        """
+        import numpy as np
+
+        self._diagnose([], None, args, kwargs)
+        compiled = self.ruleset.compile()
+        self._diagnose_matches(
+            compiled,
+            np.zeros((1, len(compiled.rules)), dtype=bool),
+            args,
+            kwargs,
+            compiled.record_weights([{}]) if compiled.graded_rules else None,
+        )
+
     def evaluate(self, *args, **kwargs) -> None:
         """
         Perform evaluation based on the ruleset and the input data.
@@ -131,22 +244,254 @@ class Evaluator:
         if self.data is None:
             raise ValueError("No data provided for evaluation.")
 
-        applicable_rules = self.ruleset.get_applicable_rules(self.data)
+        self.evaluation_result, self.diagnosis = self._diagnose_record(
+            self.data, args, kwargs
+        )
+
+    def _diagnose_record(
+        self,
+        data: Any,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        matched: Optional[list[int]] = None,
+    ) -> tuple[BaseEvaluation, DiagnosisBase]:
+        """
+        Match and score a single record, without touching the evaluator's `data`
+        and `diagnosis`.
 
-        self.evaluation_result = self._evaluation_function(
-            applicable_rules,
-            self.ruleset.rules,
-            *args,
-            **kwargs,
+        Args:
+            data: The input record.
+            args: Positional arguments for the evaluation and confidence functions.
+            kwargs: Keyword arguments for the evaluation and confidence functions.
+            matched: Ascending indices of the rules without `apply_condition` that \
+            match the record, if already matched against a shared index.
+
+        Returns:
+            The evaluation result and the diagnosis built from it.
+        """
+        compiled = self.ruleset.index()
+        if matched is None:
+            matched = compiled.match_record(data, callables=False)
+        called, metadata = self._call_conditions(compiled, data)
+        suppressed: Optional[dict[int, int]] = {} if self.explain else None
+        fired = self.ruleset._exclude_indices(sorted(matched + called), suppressed)
+
+        return self._diagnose(
+            fired,
+            suppressed,
+            args,
+            kwargs,
+            weights=self._graded_weights(fired, data),
+            metadata=metadata,
+            compiled=compiled,
+        )
+
+    def _call_conditions(
+        self, compiled: "RuleIndex", data: Any
+    ) -> tuple[list[int], Optional[dict[str, Any]]]:
+        """
+        Match the rules using `apply_condition` against a single record, under the
+        evaluator's timeouts.
+
+        Returns:
+            The indices of the matching rules and the timeout metadata, if any.
+        """
+        rules = compiled.rules
+        runner = self.condition_runner
+        if runner is None:
+            return [
+                idx for idx in compiled.callable_rules if rules[idx].applies(data)
+            ], None
+
+        called, timed_out = runner.match_callables(rules, compiled.callable_rules, data)
+        return called, runner.resolve([rules[idx].name for idx in timed_out])
+
+    def _graded_weights(
+        self, fired: Sequence[int], data: Any
+    ) -> dict[int, Optional[float]]:
+        """
+        Compute the record-specific weights of the graded rules among `fired`.
+
+        Args:
+            fired: Indices of the applicable rules.
+            data: The input record.
+
+        Returns:
+            Weights by rule index, for graded rules only.
+        """
+        rules = self.ruleset.rules
+        return {
+            idx: rules[idx].weight_for(data)
+            for idx in fired
+            if rules[idx].graded_weight is not None
+        }
+
+    def _diagnose(
+        self,
+        fired: Sequence[int],
+        suppressed: Optional[dict[int, int]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        evaluation: Optional[BaseEvaluation] = None,
+        weights: Optional[dict[int, Optional[float]]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        compiled: Optional["RuleIndex"] = None,
+    ) -> tuple[BaseEvaluation, DiagnosisBase]:
+        """
+        Score a set of matched rules and build the diagnosis.
+
+        Args:
+            fired: Indices of the applicable rules.
+            suppressed: Suppressed rule indices mapped to their suppressors, or \
+            None if no explanation should be attached.
+            args: Positional arguments for the evaluation and confidence functions.
+            kwargs: Keyword arguments for the evaluation and confidence functions.
+            evaluation: Evaluation result computed beforehand, e.g. for a whole \
+            batch. Computed from the applicable rules if omitted.
+            weights: Record-specific weights of graded rules, by rule index. \
+            The scoring functions see copies of these rules with the given weight.
+            metadata: Entries added to the diagnosis metadata.
+            compiled: The ruleset's snapshot, if the caller already holds it. \
+            Taken from `SymptomRuleset.index` if omitted.
+
+        Returns:
+            The evaluation result and the diagnosis built from it.
+        """
+        if compiled is None:
+            compiled = self.ruleset.index()
+        evaluation, confidence = self._score(
+            compiled, fired, args, kwargs, evaluation, weights
         )
 
-        self.diagnosis = self.diagnosis_model(
-            label=self.evaluation_result.label,
-            total_score=self.evaluation_result.score,
-            confidence=self._confidence_function(
-                applicable_rules, self.ruleset.rules, *args, **kwargs
+        extra_metadata = dict(metadata or {})
+        if suppressed is not None:
+            extra_metadata["explanation"] = self._build_explanation(
+                compiled, evaluation, fired, suppressed, weights
+            )
+        diagnosis = self.diagnosis_factory.build(evaluation, confidence, extra_metadata)
+        return evaluation, diagnosis
+
+    def _score(
+        self,
+        compiled: "RuleIndex",
+        fired: Sequence[int],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        evaluation: Optional[BaseEvaluation] = None,
+        weights: Optional[dict[int, Optional[float]]] = None,
+    ) -> tuple[BaseEvaluation, float]:
+        """
+        Compute the evaluation result and confidence of a set of applicable rules,
+        reusing the cached result of an identical set if caching is enabled.
+
+        Args:
+            compiled: The ruleset's snapshot.
+            fired: Indices of the applicable rules, in ascending order.
+            args: Positional arguments for the evaluation and confidence functions.
+            kwargs: Keyword arguments for the evaluation and confidence functions.
+            evaluation: Evaluation result computed beforehand, if any.
+            weights: Record-specific weights of graded rules, by rule index.
+
+        Returns:
+            The evaluation result and the confidence.
+        """
+        cache, key = self.cache, None
+        if cache is not None:
+            cache.bind(compiled)
+            key = cache.key(tuple(fired), weights, args, kwargs)
+            cached = cache.get(key) if key is not None else None
+            if cached is not None:
+                return evaluation or cached[0], cached[1]
+
+        rules = compiled.rules
+        applicable_rules = [
+            (
+                rules[idx].model_copy(update={"weight": weights[idx]})
+                if weights and idx in weights
+                else rules[idx]
+            )
+            for idx in fired
+        ]
+        summary = ScoringSummary(applicable_rules, compiled)
+        if evaluation is None:
+            evaluation = self._evaluate(
+                applicable_rules, args, kwargs, summary, compiled
+            )
+        confidence = self._confidence(applicable_rules, args, kwargs, summary, compiled)
+
+        if cache is not None and key is not None:
+            cache.put(key, (evaluation, confidence))
+        return evaluation, confidence
+
+    def _evaluate(
+        self,
+        applicable_rules: list[SymptomRule],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        summary: Optional[ScoringSummary] = None,
+        compiled: Optional["RuleIndex"] = None,
+    ) -> BaseEvaluation:
+        """
+        Call the evaluation strategy on a list of applicable rules, sharing the
+        record's scoring summary and compiled snapshot if given.
+        """
+        self._evaluation_strategy.bind(compiled or self.ruleset.index())
+        return self._evaluation_strategy(
+            applicable_rules, self.ruleset.rules, *args, summary=summary, **kwargs
+        )
+
+    def _confidence(
+        self,
+        applicable_rules: list[SymptomRule],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        summary: Optional[ScoringSummary] = None,
+        compiled: Optional["RuleIndex"] = None,
+    ) -> float:
+        """
+        Call the confidence strategy on a list of applicable rules, sharing the
+        record's scoring summary and compiled snapshot if given.
+        """
+        self._confidence_strategy.bind(compiled or self.ruleset.index())
+        return self._confidence_strategy(
+            applicable_rules, self.ruleset.rules, *args, summary=summary, **kwargs
+        )
+
+    def _build_explanation(
+        self,
+        compiled: "RuleIndex",
+        evaluation: BaseEvaluation,
+        fired: Sequence[int],
+        suppressed: dict[int, int],
+        weights: Optional[dict[int, Optional[float]]] = None,
+    ) -> Explanation:
+        """
+        Build an explanation from the indices gathered during rule matching.
+
+        Explanations share the compiled rule snapshot, so they stay valid after
+        later edits to the ruleset.
+
+        Args:
+            compiled: The ruleset's snapshot.
+            evaluation: The evaluation result.
+            fired: Indices of the applicable rules.
+            suppressed: Suppressed rule indices mapped to their suppressors.
+            weights: Record-specific weights of graded rules, by rule index.
+
+        Returns:
+            The explanation for the evaluation.
+        """
+        next_threshold = evaluation.next_threshold
+        return Explanation(
+            compiled.rules,
+            fired=tuple(fired),
+            suppressed=tuple(sorted(suppressed.items())),
+            threshold_distance=(
+                next_threshold - evaluation.score
+                if next_threshold is not None
+                else None
             ),
-            **self.evaluation_result.model_dump(exclude={"label", "score"}),
+            weights=weights,
         )
 
     def get_results(self) -> DiagnosisBase:
@@ -178,3 +523,484 @@ class Evaluator:
 
         self.evaluate(*args, **kwargs)
         return self.get_results()
+
+    def run_batch(
+        self, records: "RecordBatch", *args, deduplicate: bool = False, **kwargs
+    ) -> list[DiagnosisBase]:
+        """
+        Evaluate many records at once.
+
+        Rules are matched for the whole batch with the compiled ruleset. Built-in
+        evaluation functions label all records at once; custom ones and the
+        confidence function are called for each record. The evaluator's `data`
+        and `diagnosis` are left untouched. If evaluation is time-bounded, the
+        evaluation deadline applies to the whole batch.
+
+        With `deduplicate`, records are grouped by their projection onto what the
+        ruleset reads (see `group_profiles`) and each distinct profile is
+        evaluated once. `apply_condition` callables are still called for every
+        record and their results are part of the profile, so callable rules are
+        never shared between records. Records of one profile share the same
+        diagnosis object. `dedup_stats` accumulates the dedup ratio.
+        `SparseRecords` are evaluated without deduplication.
+
+        Args:
+            records: Input records, a boolean matrix encoded against the compiled \
+            ruleset's fields, or `SparseRecords`.
+            *args: Positional arguments to pass to evaluation and confidence functions.
+            deduplicate: Whether to evaluate each distinct profile only once.
+            **kwargs: Keyword arguments to pass to evaluation and confidence functions.
+
+        Returns:
+            list[DiagnosisBase]: One diagnosis per record, in input order.
+        """
+        from diagnostipy.core.sparse import SparseRecords
+
+        compiled = self.ruleset.compile()
+        if deduplicate and not isinstance(records, SparseRecords):
+            return self._run_deduplicated(compiled, records, args, kwargs)
+
+        applies = compiled.match(records, callables=False)
+        missed = self._fill_callables(compiled, records, applies)
+        return self._diagnose_matches(
+            compiled,
+            applies,
+            args,
+            kwargs,
+            compiled.record_weights(records) if compiled.graded_rules else None,
+            self._timeout_metadata(compiled, missed),
+        )
+
+    def _timeout_metadata(
+        self, compiled: "CompiledRuleset", missed: Optional["np.ndarray"]
+    ) -> Optional[list[Optional[dict[str, Any]]]]:
+        """
+        Apply the timeout policy to every record of a batch.
+
+        Args:
+            compiled: The compiled ruleset.
+            missed: Boolean array marking the calls that timed out, or None if \
+            evaluation is not time-bounded.
+
+        Returns:
+            The timeout metadata of each record, or None.
+        """
+        import numpy as np
+
+        runner = self.condition_runner
+        if runner is None or missed is None:
+            return None
+        return [
+            runner.resolve([compiled.rules[idx].name for idx in np.flatnonzero(row)])
+            for row in missed
+        ]
+
+    def _match_callables(
+        self, compiled: "CompiledRuleset", records: Sequence[Any]
+    ) -> tuple["np.ndarray", Optional["np.ndarray"]]:
+        """
+        Call the `apply_condition` of every callable rule for every record.
+
+        Returns:
+            The match matrix, filled only in callable rule columns, and the calls \
+            that timed out, or None if evaluation is not time-bounded.
+        """
+        import numpy as np
+
+        applies = np.zeros((len(records), len(compiled.rules)), dtype=bool)
+        return applies, self._fill_callables(compiled, records, applies)
+
+    def _fill_callables(
+        self, compiled: "CompiledRuleset", records: "RecordBatch", applies: "np.ndarray"
+    ) -> Optional["np.ndarray"]:
+        """
+        Fill the callable rule columns of a match matrix, through the condition
+        runner if evaluation is time-bounded.
+
+        Args:
+            compiled: The compiled ruleset.
+            records: The raw input records.
+            applies: Match matrix of `compiled`'s rules, updated in place.
+
+        Returns:
+            The calls that timed out, or None if evaluation is not time-bounded.
+        """
+        if not compiled.callable_rules:
+            return None
+        runner = self.condition_runner
+        if runner is not None:
+            return runner.match_batch(compiled, records, applies)
+
+        for idx in compiled.callable_rules:
+            rule = compiled.rules[idx]
+            applies[:, idx] = [bool(rule.applies(record)) for record in records]
+        return None
+
+    def _match_profiles(
+        self, compiled: "CompiledRuleset", records: "Sequence[Any] | np.ndarray"
+    ) -> tuple[
+        "Sequence[Any] | np.ndarray", "np.ndarray", Optional["np.ndarray"], "np.ndarray"
+    ]:
+        """
+        Group a batch of records by profile and match each distinct profile once.
+
+        Returns:
+            The first record of each profile, the match matrix and timed-out \
+            calls of the profiles, and the profile of each input record.
+        """
+        import numpy as np
+
+        from diagnostipy.core.dedup import group_profiles
+
+        rows = records if isinstance(records, np.ndarray) else list(records)
+        callables, missed = (
+            self._match_callables(compiled, rows)
+            if not isinstance(rows, np.ndarray)
+            else (np.zeros((len(rows), len(compiled.rules)), dtype=bool), None)
+        )
+        columns = list(compiled.callable_rules)
+        first, inverse = group_profiles(
+            compiled,
+            rows,
+            np.hstack(
+                [callables[:, columns]]
+                + ([missed[:, columns]] if missed is not None else [])
+            ),
+        )
+        self.dedup_stats.add(len(rows), len(first))
+
+        profiles = (
+            rows[first] if isinstance(rows, np.ndarray) else [rows[i] for i in first]
+        )
+        return (
+            profiles,
+            compiled.match(profiles, callables=False) | callables[first],
+            missed[first] if missed is not None else None,
+            inverse,
+        )
+
+    def _run_deduplicated(
+        self,
+        compiled: "CompiledRuleset",
+        records: "Sequence[Any] | np.ndarray",
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> list[DiagnosisBase]:
+        """
+        Evaluate each distinct profile of a batch once and scatter the diagnoses
+        back to input order.
+        """
+        profiles, applies, missed, inverse = self._match_profiles(compiled, records)
+        diagnoses = self._diagnose_matches(
+            compiled,
+            applies,
+            args,
+            kwargs,
+            compiled.record_weights(profiles) if compiled.graded_rules else None,
+            self._timeout_metadata(compiled, missed),
+        )
+        return [diagnoses[group] for group in inverse.tolist()]
+
+    def run_to_sink(
+        self,
+        records: "Iterable[Any] | RecordBatch | MappedRecords",
+        sink: "ResultSink",
+        *args,
+        chunk_size: int = 10_000,
+        deduplicate: bool = False,
+        **kwargs,
+    ) -> "ResultSink":
+        """
+        Evaluate records chunk by chunk and write the diagnoses to a sink.
+
+        Only one chunk is alive at a time, so memory stays bounded for any number
+        of records, including records streamed from an iterator. When the sink
+        only takes labels, total scores and confidences, the evaluation and
+        confidence functions have batch counterparts and the diagnosis model
+        keeps these values as they are, each chunk is written straight from the
+        batch scoring arrays without building diagnoses. Otherwise the chunk's
+        diagnoses are built with `run_batch`.
+
+        Args:
+            records: Input records, an encoded matrix, `SparseRecords`, \
+            `MappedRecords` decoded chunk by chunk, or any iterable of records.
+            sink: Destination of the diagnoses. It is not closed.
+            chunk_size: Number of records evaluated at once.
+            deduplicate: Whether to evaluate each distinct profile of a chunk \
+            only once; see `run_batch`.
+            *args: Positional arguments to pass to evaluation and confidence functions.
+            **kwargs: Keyword arguments to pass to evaluation and confidence functions.
+
+        Returns:
+            ResultSink: The sink, for chaining.
+        """
+        from diagnostipy.utils.chunking import iter_chunks
+
+        columns = self._writes_columns(sink)
+        for chunk in iter_chunks(records, chunk_size):
+            if columns:
+                sink.write_columns(
+                    self._score_columns(chunk, args, kwargs, deduplicate)
+                )
+            else:
+                sink.write(
+                    self.run_batch(chunk, *args, deduplicate=deduplicate, **kwargs)
+                )
+        return sink
+
+    def _writes_columns(self, sink: "ResultSink") -> bool:
+        """
+        Check whether a sink can be written from batch scoring arrays, i.e.
+        whether the arrays hold every field it takes, with the values diagnoses
+        would have.
+        """
+        from diagnostipy.utils.sinks import DEFAULT_FIELDS
+
+        factory = self.diagnosis_factory
+        return (
+            set(sink.fields) <= set(DEFAULT_FIELDS)
+            and factory.fast
+            and not factory.strict
+            and self._evaluation_strategy.batch_function is not None
+            and self._confidence_strategy.batch_function is not None
+        )
+
+    def _score_columns(
+        self,
+        records: "RecordBatch",
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        deduplicate: bool = False,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        Compute the labels, total scores and confidences of a batch of records
+        with the batch evaluation and confidence functions.
+
+        Returns:
+            One array per diagnosis field, in input order.
+        """
+        import numpy as np
+
+        from diagnostipy.core.sparse import SparseRecords
+
+        compiled = self.ruleset.compile()
+        inverse = None
+        if deduplicate and not isinstance(records, SparseRecords):
+            records, applies, missed, inverse = self._match_profiles(compiled, records)
+        else:
+            applies = compiled.match(records, callables=False)
+            missed = self._fill_callables(compiled, records, applies)
+        # Applies the timeout policy; the sink takes no metadata.
+        self._timeout_metadata(compiled, missed)
+
+        weights = compiled.record_weights(records) if compiled.graded_rules else None
+        mask = compiled.exclude(applies)
+        total_scores = compiled.total_scores(mask, weights)
+        self._evaluation_strategy.bind(compiled)
+        self._confidence_strategy.bind(compiled)
+        evaluations = self._evaluation_strategy.batch(
+            total_scores, *args, mask=mask, **kwargs
+        )
+        confidences = self._confidence_strategy.batch(
+            total_scores,
+            *args,
+            mask=mask,
+            weights=compiled.weights if weights is None else weights,
+            **kwargs,
+        )
+        if evaluations is None or confidences is None:
+            raise ValueError(
+                "Writing columns requires evaluation and confidence functions "
+                "with batch counterparts."
+            )
+
+        columns = {
+            "label": evaluations.labels,
+            "total_score": np.asarray(evaluations.scores, dtype=float),
+            "confidence": np.asarray(confidences, dtype=float),
+        }
+        if inverse is None:
+            return columns
+        return {field: values[inverse] for field, values in columns.items()}
+
+    def run_mapped(
+        self,
+        records: "MappedRecords",
+        output: "PathLike",
+        *args,
+        window_size: int = 65_536,
+        **kwargs,
+    ) -> "MappedScores":
+        """
+        Score a memory-mapped encoded matrix window by window into a memory-mapped
+        output.
+
+        Each window of `window_size` records is decoded, matched and labelled with
+        the batch evaluation function, without building diagnoses, then written
+        to the output and flushed. Memory use depends on the window size only, not
+        on the number of records. Confidence is not computed; use `run_to_sink`
+        with the mapped records for full diagnoses.
+
+        Args:
+            records: Records encoded against the compiled ruleset's fields.
+            output: Path of the `.npy` file to write; see `MappedScores`.
+            *args: Positional arguments to pass to the evaluation function.
+            window_size: Number of records evaluated at once.
+            **kwargs: Keyword arguments to pass to the evaluation function.
+
+        Returns:
+            MappedScores: The written labels and total scores.
+
+        Raises:
+            ValueError: If `window_size` is not positive, if the records are not \
+            aligned to the ruleset's fields, checked by field order where the \
+            records know it, or if the ruleset has rules that need raw records.
+        """
+        import numpy as np
+
+        from diagnostipy.core.mapped import SCORE_DTYPE, MappedScores
+
+        if window_size < 1:
+            raise ValueError("`window_size` must be a positive integer.")
+        compiled = self.ruleset.compile()
+        if records.n_fields != len(compiled.fields):
+            raise ValueError(
+                f"Mapped records have {records.n_fields} fields, the ruleset "
+                f"expects {len(compiled.fields)}."
+            )
+        if records.fields is not None and records.fields != compiled.fields:
+            raise ValueError(
+                "Mapped records were encoded for a different field order than the "
+                "ruleset's fields."
+            )
+        if (
+            compiled.callable_rules
+            or compiled.expression_rules
+            or compiled.graded_rules
+        ):
+            raise ValueError(
+                "Rules with `apply_condition`, `condition` or `graded_weight` "
+                "require raw records, not an encoded matrix."
+            )
+
+        scores = np.lib.format.open_memmap(
+            output, mode="w+", dtype=SCORE_DTYPE, shape=(len(records),)
+        )
+        codes: dict[Any, int] = {}
+        for start in range(0, len(records), window_size):
+            window = records[start : start + window_size]
+            labels, totals = self._label_matches(
+                compiled, compiled.match(window), args, kwargs
+            )
+            stop = start + len(window)
+            scores["label"][start:stop] = [
+                codes.setdefault(label, len(codes)) for label in labels.tolist()
+            ]
+            scores["total_score"][start:stop] = totals
+            scores.flush()
+        del scores
+
+        result = MappedScores(output, list(codes))
+        result.save_labels()
+        return result
+
+    def _diagnose_matches(
+        self,
+        compiled: "CompiledRuleset",
+        applies: "np.ndarray",
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        weights: Optional["np.ndarray"] = None,
+        metadata: Optional[Sequence[Optional[dict[str, Any]]]] = None,
+    ) -> list[DiagnosisBase]:
+        """
+        Build the diagnoses of a batch of records from their matching rules.
+
+        Args:
+            compiled: The compiled ruleset.
+            applies: Boolean array of shape (n_records, n_rules) of matching \
+            rules, before overlap exclusion.
+            args: Positional arguments for the evaluation and confidence functions.
+            kwargs: Keyword arguments for the evaluation and confidence functions.
+            weights: Per-record rule weights from `CompiledRuleset.record_weights`, \
+            required if the ruleset has graded rules.
+            metadata: Entries added to the metadata of each record's diagnosis.
+
+        Returns:
+            One diagnosis per record, in input order.
+        """
+        import numpy as np
+
+        mask = compiled.exclude(applies)
+
+        self._evaluation_strategy.bind(compiled)
+        evaluations = self._evaluation_strategy.batch(
+            compiled.total_scores(mask, weights), *args, mask=mask, **kwargs
+        )
+
+        diagnoses = []
+        for row in range(len(mask)):
+            suppressed = compiled.suppressors(applies[row]) if self.explain else None
+            _, diagnosis = self._diagnose(
+                np.flatnonzero(mask[row]).tolist(),
+                suppressed,
+                args,
+                kwargs,
+                evaluations[row] if evaluations is not None else None,
+                (
+                    {
+                        idx: float(weights[row, idx])
+                        for idx in compiled.graded_rules
+                        if mask[row, idx]
+                    }
+                    if weights is not None
+                    else None
+                ),
+                metadata[row] if metadata is not None else None,
+                compiled,
+            )
+            diagnoses.append(diagnosis)
+
+        return diagnoses
+
+    def _label_matches(
+        self,
+        compiled: "CompiledRuleset",
+        applies: "np.ndarray",
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        weights: Optional["np.ndarray"] = None,
+    ) -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Compute only the labels and scores of a batch of records, without building
+        diagnoses when the evaluation function has a batch counterpart.
+
+        Args:
+            compiled: The compiled ruleset.
+            applies: Boolean array of shape (n_records, n_rules) of matching \
+            rules, before overlap exclusion.
+            args: Positional arguments for the evaluation function.
+            kwargs: Keyword arguments for the evaluation function.
+            weights: Per-record rule weights from `CompiledRuleset.record_weights`, \
+            required if the ruleset has graded rules.
+
+        Returns:
+            An object array of labels and a float array of scores, in input order.
+        """
+        import numpy as np
+
+        mask = compiled.exclude(applies)
+        self._evaluation_strategy.bind(compiled)
+        evaluations = self._evaluation_strategy.batch(
+            compiled.total_scores(mask, weights), *args, mask=mask, **kwargs
+        )
+        if evaluations is not None:
+            return evaluations.labels, np.asarray(evaluations.scores, dtype=float)
+
+        diagnoses = self._diagnose_matches(compiled, applies, args, kwargs, weights)
+        labels = np.empty(len(diagnoses), dtype=object)
+        labels[:] = [diagnosis.label for diagnosis in diagnoses]
+        scores = np.array(
+            [diagnosis.total_score for diagnosis in diagnoses], dtype=float
+        )
+        return labels, scores
@@ -0,0 +1,218 @@
+from typing import Any, Optional, get_args
+
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+from diagnostipy.core.models.diagnosis import DiagnosisBase
+from diagnostipy.core.models.evaluation import BaseEvaluation
+
+CONSUMED_FIELDS = frozenset({"label", "score", "next_threshold"})
+IMMUTABLE_DEFAULTS = (type(None), bool, int, float, str, bytes, tuple, frozenset)
+
+TRUSTED_ANNOTATIONS: dict[str, tuple[Any, ...]] = {
+    "total_score": (float, Optional[float]),
+    "label": (str, Optional[str]),
+    "confidence": (Optional[float],),
+    "metadata": (dict, Optional[dict], dict[str, Any], Optional[dict[str, Any]]),
+}
+
+_set = object.__setattr__
+
+
+def _contains_model(annotation: Any) -> bool:
+    """
+    Check whether a type annotation refers to a pydantic model, whose values
+    `model_dump` would convert to dictionaries.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_contains_model(arg) for arg in get_args(annotation))
+
+
+def _unvalidated_safe(model: type[DiagnosisBase]) -> bool:
+    """
+    Check whether instances of a diagnosis model can be built without validation
+    and still equal validated ones: no validators, custom `__init__`, post-init
+    hook, private attributes, required fields or aliases, extra fields allowed,
+    and the diagnosis fields keep types that evaluation results already satisfy.
+    """
+    decorators = model.__pydantic_decorators__
+    if (
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+        or model.__init__ is not BaseModel.__init__
+        or model.__pydantic_post_init__ is not None
+        or model.__private_attributes__
+        or model.model_config.get("extra") != "allow"
+    ):
+        return False
+
+    for name, field in model.model_fields.items():
+        if field.is_required() or field.alias or field.validation_alias:
+            return False
+        allowed = TRUSTED_ANNOTATIONS.get(name)
+        if allowed is not None and field.annotation not in allowed:
+            return False
+    return True
+
+
+class DiagnosisFactory:
+    """
+    Builds diagnoses from evaluation results.
+
+    The diagnosis model's schema is checked once. If it declares nothing that
+    validation would enforce or change beyond the types evaluation results are
+    already validated against, diagnoses are built by assigning the field values
+    directly, skipping both `model_dump` of the evaluation and validation of the
+    diagnosis. Other models, evaluation fields whose declared type differs from
+    the diagnosis model's, and nested models are always validated.
+
+    Attributes:
+        model (type[DiagnosisBase]): The diagnosis model.
+        strict (bool): Whether to validate every diagnosis, e.g. for debugging.
+        fast (bool): Whether the model's schema allows unvalidated construction.
+    """
+
+    def __init__(self, model: type[DiagnosisBase], strict: bool = False):
+        self.model = model
+        self.strict = strict
+        self.fast = _unvalidated_safe(model)
+        self._fields: dict[str, FieldInfo] = dict(model.model_fields)
+        self._static = {
+            name: field.default
+            for name, field in self._fields.items()
+            if field.default_factory is None
+            and isinstance(field.default, IMMUTABLE_DEFAULTS)
+        }
+        self._mappers: dict[type[BaseEvaluation], Optional[tuple[str, ...]]] = {}
+
+    def _mapper(
+        self, evaluation_type: type[BaseEvaluation]
+    ) -> Optional[tuple[str, ...]]:
+        """
+        Find the fields of an evaluation type copied to diagnoses.
+
+        Returns:
+            The field names, or None if diagnoses must be validated.
+        """
+        if evaluation_type in self._mappers:
+            return self._mappers[evaluation_type]
+
+        names = tuple(
+            name for name in evaluation_type.model_fields if name not in CONSUMED_FIELDS
+        )
+        trusted = evaluation_type.model_config.get("extra") != "allow" and all(
+            self._copyable(evaluation_type, name) for name in names
+        )
+        self._mappers[evaluation_type] = names if trusted else None
+        return self._mappers[evaluation_type]
+
+    def _copyable(self, evaluation_type: type[BaseEvaluation], name: str) -> bool:
+        """
+        Check whether an evaluation field can be copied to diagnoses unvalidated:
+        it must not clash with the diagnosis' own fields, hold no nested models
+        and, if the diagnosis model declares it, have the same type.
+        """
+        annotation = evaluation_type.model_fields[name].annotation
+        if (name in TRUSTED_ANNOTATIONS and name != "metadata") or _contains_model(
+            annotation
+        ):
+            return False
+        field = self._fields.get(name)
+        return field is None or field.annotation == annotation
+
+    def validated(
+        self,
+        evaluation: BaseEvaluation,
+        confidence: Optional[float],
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> DiagnosisBase:
+        """
+        Build a diagnosis with full validation.
+
+        Args:
+            evaluation: The evaluation result.
+            confidence: The confidence of the evaluation.
+            metadata: Entries added to the diagnosis metadata.
+
+        Returns:
+            The diagnosis.
+        """
+        extra_fields = evaluation.model_dump(exclude=set(CONSUMED_FIELDS))
+        if metadata:
+            extra_fields["metadata"] = {
+                **(extra_fields.get("metadata") or {}),
+                **metadata,
+            }
+        return self.model(
+            label=evaluation.label,
+            total_score=evaluation.score,
+            confidence=confidence,
+            **extra_fields,
+        )
+
+    def build(
+        self,
+        evaluation: BaseEvaluation,
+        confidence: Optional[float],
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> DiagnosisBase:
+        """
+        Build a diagnosis, without validation where the schema allows it.
+
+        Args:
+            evaluation: The evaluation result.
+            confidence: The confidence of the evaluation.
+            metadata: Entries added to the diagnosis metadata.
+
+        Returns:
+            The diagnosis, equal to the one `validated` builds.
+        """
+        names = None if self.strict or not self.fast else self._mapper(type(evaluation))
+        if names is None:
+            return self.validated(evaluation, confidence, metadata)
+
+        values: dict[str, Any] = {
+            "label": evaluation.label,
+            "total_score": evaluation.score,
+            "confidence": None if confidence is None else float(confidence),
+        }
+        for name in names:
+            value = getattr(evaluation, name)
+            if isinstance(value, BaseModel):
+                return self.validated(evaluation, confidence, metadata)
+            values[name] = (
+                dict(value)
+                if isinstance(value, dict)
+                else list(value) if isinstance(value, list) else value
+            )
+        if metadata:
+            values["metadata"] = {**(values.get("metadata") or {}), **metadata}
+        return self._assemble(values)
+
+    def _assemble(self, values: dict[str, Any]) -> DiagnosisBase:
+        """
+        Create a diagnosis from trusted values, filling in defaults.
+        """
+        state = {
+            name: (
+                values[name]
+                if name in values
+                else (
+                    self._static[name]
+                    if name in self._static
+                    else field.get_default(call_default_factory=True)
+                )
+            )
+            for name, field in self._fields.items()
+        }
+        extra = {name: value for name, value in values.items() if name not in state}
+
+        diagnosis = self.model.__new__(self.model)
+        _set(diagnosis, "__dict__", state)
+        _set(diagnosis, "__pydantic_fields_set__", set(values))
+        _set(diagnosis, "__pydantic_extra__", extra)
+        _set(diagnosis, "__pydantic_private__", None)
+        return diagnosis
@@ -0,0 +1,264 @@
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Sequence
+
+from diagnostipy.core.conditions import Condition, get_field_value
+from diagnostipy.core.models.numeric import NumericCondition
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.solver import solve_max_rules
+from diagnostipy.utils.enums import SolverMode
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class RuleIndex:
+    """
+    Pure-Python snapshot of a ruleset, used to match and score single records
+    without NumPy.
+
+    Rules are indexed by their position in the ruleset and condition fields by
+    their first appearance; each distinct numeric condition gets its own column,
+    keyed by `NumericCondition.key`. Overlap exclusion is precomputed as a list of
+    (shadowed, shadowing) rule pairs, and the normalisers of the scoring
+    functions are solved once per snapshot. `CompiledRuleset` extends the index
+    with arrays for batches.
+
+    Attributes:
+        rules (tuple[SymptomRule, ...]): The indexed rules, in evaluation order.
+        exclude_overlaps (bool): Whether overlapping rules are excluded.
+        fields (tuple[str, ...]): Condition fields, in column order.
+        field_index (dict[str, int]): Mapping of condition fields to columns.
+        rule_fields (list[list[int]]): Condition columns of each rule.
+        rule_weights (list[float]): Rule weights, with missing weights as 0 and \
+        the highest reachable weight for graded rules.
+        predicates (dict[int, NumericCondition]): Numeric conditions by column.
+        graded_rules (tuple[int, ...]): Indices of rules with a `graded_weight`.
+        callable_rules (tuple[int, ...]): Indices of rules using `apply_condition`.
+        expression_rules (tuple[int, ...]): Indices of rules with a `condition` \
+        expression and no `apply_condition`.
+        expression_fields (tuple[str, ...]): Fields read by condition expressions.
+        overlaps (list[tuple[int, int]]): (shadowed, shadowing) rule pairs where \
+        the later rule is at least as specific as the earlier one.
+        solver_mode (SolverMode): How the maximum possible weight is solved.
+        vectorized (bool): Whether exact solving enumerates field combinations \
+        with NumPy. False here, so single records never load it.
+    """
+
+    vectorized = False
+
+    def __init__(
+        self,
+        rules: Sequence[SymptomRule],
+        exclude_overlaps: bool = True,
+        solver_mode: SolverMode = SolverMode.AUTO,
+    ):
+        self.rules = tuple(rules)
+        self.exclude_overlaps = exclude_overlaps
+        self.solver_mode = SolverMode(solver_mode)
+
+        self.field_index: dict[str, int] = {}
+        numeric_keys = {
+            numeric.key: numeric
+            for rule in self.rules
+            for numeric in rule.numeric_conditions or ()
+        }
+        self.rule_fields = [
+            [
+                self.field_index.setdefault(field, len(self.field_index))
+                for field in sorted(rule.condition_keys)
+            ]
+            for rule in self.rules
+        ]
+        self.fields = tuple(self.field_index)
+        self.predicates: dict[int, NumericCondition] = {
+            self.field_index[key]: numeric for key, numeric in numeric_keys.items()
+        }
+        self._plain_index = {
+            field: column
+            for field, column in self.field_index.items()
+            if column not in self.predicates
+        }
+
+        self.rule_weights = [
+            (
+                max(rule.graded_weight.max_weight, rule.weight or 0.0)
+                if rule.graded_weight
+                else rule.weight or 0.0
+            )
+            for rule in self.rules
+        ]
+        self._graded = tuple(
+            (idx, rule.graded_weight)
+            for idx, rule in enumerate(self.rules)
+            if rule.graded_weight is not None
+        )
+        self.graded_rules = tuple(idx for idx, _ in self._graded)
+        self.callable_rules = tuple(
+            idx for idx, rule in enumerate(self.rules) if rule.apply_condition
+        )
+        self._expressions = tuple(
+            (idx, rule.compiled_condition)
+            for idx, rule in enumerate(self.rules)
+            if rule.compiled_condition is not None and not rule.apply_condition
+        )
+        self.expression_rules = tuple(idx for idx, _ in self._expressions)
+        self.expression_fields = tuple(
+            dict.fromkeys(
+                field
+                for _, condition in self._expressions
+                for field in condition.fields
+            )
+        )
+        self._index_overlaps()
+
+    def _index_overlaps(self) -> None:
+        """
+        Find every pair of rules where a later rule is at least as specific as an
+        earlier one, mirroring `SymptomRuleset._exclude_indices`.
+        """
+        self._field_rules: list[list[int]] = [[] for _ in self.fields]
+        self._unconditioned: list[int] = []
+        for idx, columns in enumerate(self.rule_fields):
+            for column in columns:
+                self._field_rules[column].append(idx)
+            if not columns:
+                self._unconditioned.append(idx)
+
+        self.overlaps: list[tuple[int, int]] = []
+        for idx, columns in enumerate(self.rule_fields):
+            if not columns:
+                continue
+            conditions = set(columns)
+            candidates = min((self._field_rules[c] for c in columns), key=len)
+            self.overlaps.extend(
+                (idx, other)
+                for other in candidates
+                if other > idx and conditions.issubset(self.rule_fields[other])
+            )
+
+    def match_record(self, data: Any, callables: bool = True) -> list[int]:
+        """
+        Determine which rules apply to a single record, before overlap exclusion.
+
+        Each field is read once and each numeric condition and condition
+        expression is evaluated once, however many rules share it. Rules are
+        only visited when indexed under a present field or unconditioned, so
+        rules on absent fields cost nothing. Matches agree with
+        `SymptomRule.applies`.
+
+        Args:
+            data: The input record.
+            callables: Whether to call `apply_condition` functions. If False, \
+            rules using them do not match.
+
+        Returns:
+            The indices of the matching rules, ascending.
+        """
+        rules = self.rules
+        results: dict[Condition, bool] = {}
+        matched = []
+        for idx in self._candidates(data):
+            rule = rules[idx]
+            if rule.apply_condition:
+                continue
+            condition = rule.compiled_condition
+            if condition is not None:
+                if condition not in results:
+                    results[condition] = condition(data)
+                if not results[condition]:
+                    continue
+            matched.append(idx)
+        if callables:
+            matched.extend(
+                idx for idx in self.callable_rules if rules[idx].applies(data)
+            )
+        return sorted(matched)
+
+    def _candidates(self, data: Any) -> list[int]:
+        """
+        Find the rules whose indexed conditions all hold for a record.
+        """
+        index = self._plain_index
+        if isinstance(data, dict) and len(data) < len(index):
+            present = [
+                index[field]
+                for field, value in data.items()
+                if value and field in index
+            ]
+        else:
+            present = [
+                column
+                for field, column in index.items()
+                if get_field_value(data, field)
+            ]
+        present.extend(
+            column
+            for column, numeric in self.predicates.items()
+            if numeric.holds(get_field_value(data, numeric.field))
+        )
+
+        hits: dict[int, int] = {}
+        for column in present:
+            for idx in self._field_rules[column]:
+                hits[idx] = hits.get(idx, 0) + 1
+        candidates = [
+            idx for idx, count in hits.items() if count == len(self.rule_fields[idx])
+        ]
+        candidates.extend(self._unconditioned)
+        return candidates
+
+    def solve(self, objective: "Sequence[float] | np.ndarray") -> list[int]:
+        """
+        Find the set of rules that can apply together with the highest total
+        objective; see `solve_max_rules`.
+
+        Args:
+            objective: Value of each rule, e.g. its weight, or 1 to count rules.
+
+        Returns:
+            Indices of the selected rules, in ruleset order.
+        """
+        return solve_max_rules(self, objective, self.solver_mode)
+
+    @cached_property
+    def max_possible_rules(self) -> tuple[int, ...]:
+        """
+        Indices of the largest set of rules that can apply together.
+        """
+        return tuple(self.solve([1.0] * len(self.rules)))
+
+    @cached_property
+    def max_possible_weight(self) -> float:
+        """
+        Highest total weight that rules can reach together after overlap
+        exclusion, used to normalise scores.
+        """
+        weights = self.rule_weights
+        return float(sum(weights[idx] for idx in self.solve(weights)))
+
+    def is_stale(
+        self,
+        rules: Sequence[SymptomRule],
+        exclude_overlaps: bool,
+        solver_mode: SolverMode = SolverMode.AUTO,
+    ) -> bool:
+        """
+        Check whether the snapshot no longer matches the given rules.
+
+        Rules are compared by identity; rules mutated in place require an
+        explicit recompilation.
+
+        Args:
+            rules: The current rules of the ruleset.
+            exclude_overlaps: The current overlap exclusion setting.
+            solver_mode: The current solver mode.
+
+        Returns:
+            True if the snapshot must be rebuilt, False otherwise.
+        """
+        return (
+            exclude_overlaps != self.exclude_overlaps
+            or solver_mode != self.solver_mode
+            or len(rules) != len(self.rules)
+            or any(a is not b for a, b in zip(rules, self.rules))
+        )
@@ -0,0 +1,235 @@
+import json
+import os
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+SCORE_DTYPE = np.dtype([("label", np.int32), ("total_score", np.float64)])
+
+PathLike = str | os.PathLike[str]
+
+
+def packed_width(n_fields: int) -> int:
+    """
+    Number of bytes of a bit-packed row of `n_fields` fields.
+    """
+    return (n_fields + 7) // 8
+
+
+class MappedRecords:
+    """
+    Encoded records x fields matrix read from a memory-mapped file.
+
+    Rows are decoded to a boolean matrix only when a range of records is
+    selected, so a dataset larger than memory can be evaluated window by window.
+    Bit-packed rows hold eight fields per byte, most significant bit first, as
+    written by `np.packbits(matrix, axis=1)`. The field order of the columns can
+    be stored next to the file in a `<path>.fields.json` file with
+    `save_fields`, so evaluators can check that the records were encoded for
+    their ruleset.
+
+    Attributes:
+        data (np.ndarray): The memory-mapped rows, boolean or bit-packed.
+        n_fields (int): Number of fields per record.
+        packed (bool): Whether rows are bit-packed.
+        fields (Optional[tuple[str, ...]]): Field of each column, if known.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        n_fields: int,
+        packed: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        if fields is not None and len(fields) != n_fields:
+            raise ValueError(
+                f"Got {len(fields)} field names for {n_fields} fields per record."
+            )
+        if data.ndim != 2:
+            raise ValueError("Mapped records must be a two-dimensional matrix.")
+        width = packed_width(n_fields) if packed else n_fields
+        if data.shape[1] != width:
+            raise ValueError(
+                f"Expected rows of {width} {'bytes' if packed else 'fields'} for "
+                f"{n_fields} fields, got {data.shape[1]}."
+            )
+        self.data = data
+        self.n_fields = n_fields
+        self.packed = packed
+        self.fields = tuple(fields) if fields is not None else None
+
+    @staticmethod
+    def fields_path(path: PathLike) -> str:
+        """
+        Path of the field order file of an encoded matrix.
+        """
+        return f"{os.fspath(path)}.fields.json"
+
+    @classmethod
+    def save_fields(cls, path: PathLike, fields: Sequence[str]) -> None:
+        """
+        Write the field order of an encoded matrix next to it.
+
+        Args:
+            path: Path of the encoded matrix.
+            fields: Field of each column, such as `CompiledRuleset.fields`.
+        """
+        with open(cls.fields_path(path), "w") as file:
+            json.dump(list(fields), file)
+
+    @classmethod
+    def _load_fields(cls, path: PathLike) -> Optional[list[str]]:
+        try:
+            with open(cls.fields_path(path)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def open(cls, path: PathLike, n_fields: Optional[int] = None) -> "MappedRecords":
+        """
+        Memory-map an encoded matrix.
+
+        `.npy` files hold either a records x fields matrix or, for a `uint8`
+        matrix whose width is that of `n_fields` packed fields, bit-packed rows.
+        Any other file is read as raw bit-packed rows without a header. The field
+        order is read from the file's `save_fields` file, if there is one.
+
+        Args:
+            path: Path of the file.
+            n_fields: Number of fields per record, such as the length of \
+            `CompiledRuleset.fields`. Required for raw files without a field \
+            order file.
+
+        Returns:
+            The mapped records.
+
+        Raises:
+            ValueError: If the file does not hold rows of `n_fields` fields.
+        """
+        fields = cls._load_fields(path)
+        if n_fields is None and fields is not None:
+            n_fields = len(fields)
+        if os.fspath(path).endswith(".npy"):
+            data = np.load(path, mmap_mode="r")
+            if data.ndim != 2:
+                raise ValueError("Mapped records must be a two-dimensional matrix.")
+            packed = (
+                n_fields is not None
+                and data.dtype == np.uint8
+                and data.shape[1] != n_fields
+                and data.shape[1] == packed_width(n_fields)
+            )
+            return cls(
+                data, data.shape[1] if n_fields is None else n_fields, packed, fields
+            )
+
+        if n_fields is None:
+            raise ValueError("`n_fields` is required for raw bit-packed files.")
+        width = packed_width(n_fields)
+        size = os.path.getsize(path)
+        if size % width:
+            raise ValueError(
+                f"File size {size} is not a multiple of the row size {width} of "
+                f"{n_fields} packed fields."
+            )
+        data = (
+            np.memmap(path, dtype=np.uint8, mode="r", shape=(size // width, width))
+            if size
+            else np.zeros((0, width), dtype=np.uint8)
+        )
+        return cls(data, n_fields, packed=True, fields=fields)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, item: slice) -> np.ndarray:
+        """
+        Read and decode a contiguous range of records.
+
+        Args:
+            item: A slice with a step of 1.
+
+        Returns:
+            A boolean array of shape (n_selected, n_fields), held in memory.
+        """
+        start, stop, step = item.indices(len(self))
+        if step != 1:
+            raise ValueError("Mapped records only support contiguous slices.")
+        rows = np.asarray(self.data[start:stop])
+        if self.packed:
+            return np.unpackbits(rows, axis=1, count=self.n_fields).astype(bool)
+        return rows.astype(bool)
+
+
+class MappedScores:
+    """
+    Labels and total scores written to a memory-mapped `.npy` file.
+
+    The file holds one record of `SCORE_DTYPE` per input record: the label as a
+    code into `labels` and the total score. The labels are stored next to it in
+    a `<path>.labels.json` file.
+
+    Attributes:
+        path (str): Path of the `.npy` file.
+        labels (tuple[Any, ...]): Label of each code.
+    """
+
+    def __init__(self, path: PathLike, labels: Sequence[Any]):
+        self.path = os.fspath(path)
+        self.labels = tuple(labels)
+
+    @staticmethod
+    def labels_path(path: PathLike) -> str:
+        """
+        Path of the labels file of a scores file.
+        """
+        return f"{os.fspath(path)}.labels.json"
+
+    @classmethod
+    def load(cls, path: PathLike) -> "MappedScores":
+        """
+        Open scores written by `Evaluator.run_mapped`.
+
+        Args:
+            path: Path of the `.npy` file.
+
+        Returns:
+            The scores.
+        """
+        with open(cls.labels_path(path)) as file:
+            return cls(path, json.load(file))
+
+    def save_labels(self) -> None:
+        """
+        Write the labels file.
+        """
+        with open(self.labels_path(self.path), "w") as file:
+            json.dump(list(self.labels), file)
+
+    def array(self) -> np.ndarray:
+        """
+        Memory-map the scores read-only.
+
+        Returns:
+            A structured array with `label` and `total_score` fields.
+        """
+        return np.load(self.path, mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.array())
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Map label codes back to labels.
+
+        Args:
+            codes: Label codes, such as `array()["label"][start:stop]`.
+
+        Returns:
+            An object array of labels.
+        """
+        labels = np.empty(len(self.labels), dtype=object)
+        labels[:] = self.labels
+        return labels[np.asarray(codes)]
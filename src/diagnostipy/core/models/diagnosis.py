@@ -1,6 +1,8 @@
 from typing import Any, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, SerializerFunctionWrapHandler, field_serializer
+
+from diagnostipy.core.models.explanation import Explanation
 
 
 class DiagnosisBase(BaseModel, extra="allow"):
@@ -13,6 +15,21 @@ class DiagnosisBase(BaseModel, extra="allow"):
     label: Optional[str] = None
     confidence: Optional[float] = None
 
+    @field_serializer("metadata", mode="wrap", check_fields=False)
+    def _serialize_metadata(
+        self, metadata: Any, handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        """
+        Serialize explanations in `metadata` as their `to_dict()`, for models that
+        define a `metadata` dictionary.
+        """
+        if isinstance(metadata, dict):
+            metadata = {
+                key: value.to_dict() if isinstance(value, Explanation) else value
+                for key, value in metadata.items()
+            }
+        return handler(metadata)
+
 
 class Diagnosis(DiagnosisBase):
     """
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -8,7 +10,25 @@ class BaseEvaluation(BaseModel):
     All evaluation models must include:
         - label (str): The evaluation label.
         - score (float): The total score of the evaluation.
+
+    Evaluation functions may also report:
+        - next_threshold (Optional[float]): The score at which the next, higher \
+        label would be assigned. None if the label is already the highest one.
     """
 
     label: str
     score: float
+    next_threshold: Optional[float] = None
+
+
+class BayesianEvaluation(BaseEvaluation):
+    """
+    Evaluation result of Bayesian scoring.
+
+    The label is the most probable one and the score its posterior probability.
+
+    Attributes:
+        posteriors (dict[str, float]): Posterior probability of each label.
+    """
+
+    posteriors: dict[str, float]
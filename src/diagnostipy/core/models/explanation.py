@@ -0,0 +1,96 @@
+from typing import Any, Optional, Sequence
+
+from diagnostipy.core.models.symptom_rule import SymptomRule
+
+
+class Explanation:
+    """
+    Compact account of how a diagnosis was reached.
+
+    Only rule indices are stored; rule names and weights are resolved from the
+    shared rule snapshot when accessed, except for graded weights, which vary per
+    record. Attaching an explanation to every diagnosis in a bulk run costs a few
+    small tuples per record.
+
+    Diagnoses serialize an explanation in their `metadata` as its `to_dict()`,
+    so they support `model_dump` and `model_dump_json`. Explanations are equal
+    when they resolve to the same dictionary.
+
+    Attributes:
+        fired (tuple[int, ...]): Indices of the rules that contributed to the score.
+        suppressed (tuple[tuple[int, int], ...]): Pairs of (suppressed rule index, \
+        suppressing rule index) produced by overlap exclusion.
+        threshold_distance (Optional[float]): Distance from the score to the next \
+        label threshold, or None if the score is already in the highest band.
+    """
+
+    __slots__ = ("_rules", "_weights", "fired", "suppressed", "threshold_distance")
+
+    def __init__(
+        self,
+        rules: Sequence[SymptomRule],
+        fired: tuple[int, ...],
+        suppressed: tuple[tuple[int, int], ...] = (),
+        threshold_distance: Optional[float] = None,
+        weights: Optional[dict[int, Optional[float]]] = None,
+    ):
+        self._rules = rules
+        self._weights = weights or {}
+        self.fired = fired
+        self.suppressed = suppressed
+        self.threshold_distance = threshold_distance
+
+    @property
+    def fired_rules(self) -> list[str]:
+        """
+        Names of the rules that contributed to the score.
+        """
+        return [self._rules[idx].name for idx in self.fired]
+
+    @property
+    def suppressed_rules(self) -> dict[str, str]:
+        """
+        Mapping of suppressed rule names to the name of the rule that suppressed them.
+        """
+        return {
+            self._rules[idx].name: self._rules[by].name for idx, by in self.suppressed
+        }
+
+    @property
+    def contributions(self) -> dict[str, float]:
+        """
+        Weight contributed to the total score by each fired rule.
+        """
+        return {
+            self._rules[idx].name: self._weights.get(idx, self._rules[idx].weight)
+            or 0.0
+            for idx in self.fired
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Resolve the explanation into a plain dictionary.
+
+        Returns:
+            A dictionary with fired rules, suppressed rules, contributions and the \
+            distance to the next label threshold.
+        """
+        return {
+            "fired_rules": self.fired_rules,
+            "suppressed_rules": self.suppressed_rules,
+            "contributions": self.contributions,
+            "threshold_distance": self.threshold_distance,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Explanation):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"Explanation(fired={self.fired}, suppressed={self.suppressed}, "
+            f"threshold_distance={self.threshold_distance})"
+        )
@@ -0,0 +1,173 @@
+import math
+import numbers
+import operator
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Any, Callable
+
+from pydantic import BaseModel, field_validator
+
+from diagnostipy.utils.enums import Comparator
+
+if TYPE_CHECKING:
+    import numpy as np
+
+COMPARATORS: dict[Comparator, Callable[[Any, Any], Any]] = {
+    Comparator.GT: operator.gt,
+    Comparator.GE: operator.ge,
+    Comparator.LT: operator.lt,
+    Comparator.LE: operator.le,
+    Comparator.EQ: operator.eq,
+    Comparator.NE: operator.ne,
+}
+
+
+def to_number(value: Any) -> float:
+    """
+    Convert a field value to a float, with NaN for missing or non-numeric values.
+
+    Any real number is numeric, including NumPy scalars such as `np.int64` and
+    `np.float32` found in records built from arrays or data frames.
+
+    Args:
+        value: The field value.
+
+    Returns:
+        The numeric value, or NaN.
+    """
+    if isinstance(value, numbers.Real):
+        return float(value)
+    return math.nan
+
+
+class NumericCondition(BaseModel, frozen=True):
+    """
+    Threshold condition on a numeric field, e.g. temperature > 38.5.
+
+    Each distinct condition is compiled into its own column of the ruleset's
+    index, identified by `key`, so it takes part in overlap exclusion like a
+    boolean condition field. Missing and non-numeric values never satisfy it.
+
+    Attributes:
+        field (str): The numeric field.
+        comparator (Comparator): How the value is compared with the threshold.
+        threshold (float): The threshold.
+    """
+
+    field: str
+    comparator: Comparator
+    threshold: float
+
+    @property
+    def key(self) -> str:
+        """
+        Name of the condition's column in the compiled index.
+
+        The threshold is written exactly, so conditions with thresholds that only
+        differ beyond a few digits get distinct columns.
+        """
+        threshold = f"{self.threshold:g}"
+        if float(threshold) != self.threshold:
+            threshold = repr(self.threshold)
+        return f"{self.field} {self.comparator.value} {threshold}"
+
+    def holds(self, value: Any) -> bool:
+        """
+        Check the condition for a single value.
+
+        Args:
+            value: The field value.
+
+        Returns:
+            True if the value is numeric and satisfies the condition.
+        """
+        number = to_number(value)
+        return not math.isnan(number) and COMPARATORS[self.comparator](
+            number, self.threshold
+        )
+
+    def evaluate(self, column: "np.ndarray") -> "np.ndarray":
+        """
+        Check the condition for a column of values.
+
+        Args:
+            column: Float array with NaN for missing values.
+
+        Returns:
+            A boolean array.
+        """
+        import numpy as np
+
+        return COMPARATORS[self.comparator](column, self.threshold) & ~np.isnan(column)
+
+
+class GradedWeight(BaseModel, frozen=True):
+    """
+    Piecewise-linear weight of a rule as a function of a numeric field.
+
+    The weight is interpolated between consecutive points and held constant
+    beyond the first and last point.
+
+    Attributes:
+        field (str): The numeric field.
+        points (tuple[tuple[float, float], ...]): (value, weight) points with \
+        strictly ascending values.
+    """
+
+    field: str
+    points: tuple[tuple[float, float], ...]
+
+    @field_validator("points")
+    @classmethod
+    def _check_points(
+        cls, points: tuple[tuple[float, float], ...]
+    ) -> tuple[tuple[float, float], ...]:
+        if not points:
+            raise ValueError("A graded weight needs at least one point.")
+        if any(a[0] >= b[0] for a, b in zip(points, points[1:])):
+            raise ValueError("Graded weight points must have ascending values.")
+        return points
+
+    @property
+    def max_weight(self) -> float:
+        """
+        The highest weight the rule can reach.
+        """
+        return max(weight for _, weight in self.points)
+
+    def weight(self, value: float) -> float:
+        """
+        Interpolate the weight of a single value, matching `numpy.interp`.
+
+        Args:
+            value: A numeric, non-missing value.
+
+        Returns:
+            The weight.
+        """
+        xs = [x for x, _ in self.points]
+        ys = [y for _, y in self.points]
+        if value <= xs[0]:
+            return ys[0]
+        if value >= xs[-1]:
+            return ys[-1]
+
+        idx = bisect_right(xs, value) - 1
+        if value == xs[idx]:
+            return ys[idx]
+        slope = (ys[idx + 1] - ys[idx]) / (xs[idx + 1] - xs[idx])
+        return slope * (value - xs[idx]) + ys[idx]
+
+    def weights(self, column: "np.ndarray") -> "np.ndarray":
+        """
+        Interpolate the weights of a column of values.
+
+        Args:
+            column: Float array of values.
+
+        Returns:
+            A float array of weights.
+        """
+        import numpy as np
+
+        xs, ys = zip(*self.points)
+        return np.interp(column, xs, ys)
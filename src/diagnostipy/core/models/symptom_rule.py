@@ -1,6 +1,10 @@
+import math
 from typing import Any, Callable, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+
+from diagnostipy.core.conditions import Condition, get_field_value, parse_condition
+from diagnostipy.core.models.numeric import GradedWeight, NumericCondition, to_number
 
 
 class SymptomRule(BaseModel):
@@ -15,6 +19,15 @@ class SymptomRule(BaseModel):
         critical (bool): Whether the rule is critical (e.g., high-priority).
         apply_condition (Optional[Callable[[dict[str, Any]], bool]]):
             Custom function to determine if the rule applies.
+        condition (Optional[str]): Condition expression that must also hold, \
+        e.g. "temperature > 38.5 and blood_type in ['A', 'AB']". See `Condition`.
+        numeric_conditions (Optional[list[NumericCondition]]): Thresholds on \
+        numeric fields that must also hold. They are indexed and take part in \
+        overlap exclusion like `conditions`.
+        graded_weight (Optional[GradedWeight]): Weight as a piecewise-linear \
+        function of a numeric field. Records without a numeric value use `weight`.
+        log_likelihood_ratios (Optional[dict[str, float]]): Log-likelihood ratio \
+        of the rule for each label, used by Bayesian evaluation.
     """
 
     name: str
@@ -22,6 +35,55 @@ class SymptomRule(BaseModel):
     critical: bool = False
     apply_condition: Optional[Callable[..., bool]] = None
     conditions: Optional[set[str]] = None
+    log_likelihood_ratios: Optional[dict[str, float]] = None
+    condition: Optional[str] = None
+    numeric_conditions: Optional[list[NumericCondition]] = None
+    graded_weight: Optional[GradedWeight] = None
+
+    @field_validator("condition")
+    @classmethod
+    def _parse_condition(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            parse_condition(value)
+        return value
+
+    @property
+    def compiled_condition(self) -> Optional[Condition]:
+        """
+        The parsed `condition` expression, shared by rules with the same source.
+        """
+        return parse_condition(self.condition) if self.condition else None
+
+    @property
+    def condition_keys(self) -> set[str] | frozenset[str]:
+        """
+        Keys of all indexed conditions: the `conditions` fields and the keys of \
+        the `numeric_conditions`.
+        """
+        if not self.numeric_conditions:
+            return self.conditions or frozenset()
+        return frozenset(self.conditions or ()).union(
+            condition.key for condition in self.numeric_conditions
+        )
+
+    def weight_for(self, data: Any) -> Optional[float]:
+        """
+        Return the rule's weight for a record, applying `graded_weight`.
+
+        Args:
+            data: Input data to evaluate.
+
+        Returns:
+            The graded weight, or `weight` if the rule is not graded or the record \
+            has no numeric value for it.
+        """
+        if self.graded_weight is None:
+            return self.weight
+
+        value = to_number(get_field_value(data, self.graded_weight.field))
+        if math.isnan(value):
+            return self.weight
+        return self.graded_weight.weight(value)
 
     def _get_field_value(self, data: Any, field: str) -> Optional[Any]:
         """
@@ -55,6 +117,15 @@ class SymptomRule(BaseModel):
         if self.apply_condition:
             return self.apply_condition(data)
 
+        if self.condition and not parse_condition(self.condition)(data):
+            return False
+
+        if self.numeric_conditions and not all(
+            numeric.holds(get_field_value(data, numeric.field))
+            for numeric in self.numeric_conditions
+        ):
+            return False
+
         if not self.conditions:
             return True
 
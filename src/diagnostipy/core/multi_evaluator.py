@@ -0,0 +1,178 @@
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.index import RuleIndex
+from diagnostipy.core.models.diagnosis import DiagnosisBase
+from diagnostipy.core.ruleset import SymptomRuleset
+
+if TYPE_CHECKING:
+    from diagnostipy.core.compiled import CompiledRuleset, RecordBatch
+
+
+class MultiEvaluator:
+    """
+    Evaluates records against several rulesets in one pass.
+
+    The rules of all rulesets are indexed together over a merged vocabulary, so
+    each record's fields are read once, identical conditions share a column and
+    every record is matched once against all rules. Single records use a merged
+    `RuleIndex`, which only visits the rules indexed under the record's present
+    fields; batches use a merged `CompiledRuleset`, whose matching still costs
+    time linear in the total number of rules but saves the per-ruleset field
+    extraction and array set-up. The matches are then split per ruleset;
+    `apply_condition` callables, overlap exclusion and scoring stay per ruleset,
+    each under its evaluator's timeouts, so every result is identical to running
+    its evaluator on its own.
+
+    Attributes:
+        evaluators (dict[str, Evaluator]): Evaluators by name, each with its own \
+        ruleset, scoring functions and parameters.
+    """
+
+    def __init__(self, evaluators: Mapping[str, Evaluator]):
+        self.evaluators = dict(evaluators)
+        self._compiled: Optional["CompiledRuleset"] = None
+        self._parts: tuple["CompiledRuleset", ...] = ()
+        self._index: Optional[RuleIndex] = None
+
+    @classmethod
+    def from_rulesets(
+        cls, rulesets: Mapping[str, SymptomRuleset], **kwargs
+    ) -> "MultiEvaluator":
+        """
+        Create a multi-evaluator with one evaluator per ruleset.
+
+        Args:
+            rulesets: Rulesets by name.
+            **kwargs: Keyword arguments passed to every `Evaluator`.
+
+        Returns:
+            The multi-evaluator.
+        """
+        return cls(
+            {name: Evaluator(ruleset, **kwargs) for name, ruleset in rulesets.items()}
+        )
+
+    def compile(self) -> "CompiledRuleset":
+        """
+        Compile the rules of all rulesets over a merged vocabulary.
+
+        The merged snapshot is cached and rebuilt when any ruleset recompiles.
+
+        Returns:
+            A compiled ruleset of all rules, in evaluator order, without overlap \
+            exclusion.
+        """
+        from diagnostipy.core.compiled import CompiledRuleset
+
+        parts = tuple(
+            evaluator.ruleset.compile() for evaluator in self.evaluators.values()
+        )
+        if self._compiled is None or any(
+            a is not b for a, b in zip(parts, self._parts)
+        ):
+            self._compiled = CompiledRuleset(
+                [rule for part in parts for rule in part.rules],
+                exclude_overlaps=False,
+            )
+            self._parts = parts
+        return self._compiled
+
+    def index(self) -> RuleIndex:
+        """
+        Index the rules of all rulesets over a merged vocabulary, without NumPy.
+
+        The merged compiled ruleset is returned if it is up to date; otherwise a
+        `RuleIndex` is built and cached until any ruleset changes.
+
+        Returns:
+            An index of all rules, in evaluator order, without overlap exclusion.
+        """
+        rules = [
+            rule
+            for evaluator in self.evaluators.values()
+            for rule in evaluator.ruleset.rules
+        ]
+        for index in (self._compiled, self._index):
+            if index is not None and not index.is_stale(rules, False):
+                return index
+        self._index = RuleIndex(rules, exclude_overlaps=False)
+        return self._index
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """
+        The merged condition fields, in the column order of encoded records.
+        """
+        return self.compile().fields
+
+    def run(self, data: Any, *args, **kwargs) -> dict[str, DiagnosisBase]:
+        """
+        Evaluate a single record against every ruleset.
+
+        The record is matched once against the merged index and the matches are
+        split per evaluator, which then calls its `apply_condition` rules and
+        scores the record without changing its `data` and `diagnosis`.
+
+        Args:
+            data: Input record.
+            *args: Positional arguments to pass to evaluation and confidence functions.
+            **kwargs: Keyword arguments to pass to evaluation and confidence functions.
+
+        Returns:
+            dict[str, DiagnosisBase]: One diagnosis per evaluator name.
+        """
+        matched = self.index().match_record(data, callables=False)
+        results: dict[str, DiagnosisBase] = {}
+
+        start = 0
+        for name, evaluator in self.evaluators.items():
+            stop = start + len(evaluator.ruleset.rules)
+            part = matched[bisect_left(matched, start) : bisect_left(matched, stop)]
+            results[name] = evaluator._diagnose_record(
+                data, args, kwargs, [idx - start for idx in part]
+            )[1]
+            start = stop
+
+        return results
+
+    def run_batch(
+        self, records: "RecordBatch", *args, **kwargs
+    ) -> list[dict[str, DiagnosisBase]]:
+        """
+        Evaluate many records against every ruleset.
+
+        Args:
+            records: Input records, a boolean matrix encoded against `fields`, or \
+            `SparseRecords`.
+            *args: Positional arguments to pass to evaluation and confidence functions.
+            **kwargs: Keyword arguments to pass to evaluation and confidence functions.
+
+        Returns:
+            list[dict[str, DiagnosisBase]]: For each record, in input order, one \
+            diagnosis per evaluator name.
+        """
+        compiled = self.compile()
+        applies = compiled.match(records, callables=False)
+        weights = compiled.record_weights(records) if compiled.graded_rules else None
+        results: list[dict[str, DiagnosisBase]] = [{} for _ in range(len(applies))]
+
+        start = 0
+        for (name, evaluator), part in zip(self.evaluators.items(), self._parts):
+            stop = start + len(part.rules)
+            columns = applies[:, start:stop]
+            missed = evaluator._fill_callables(part, records, columns)
+            diagnoses = evaluator._diagnose_matches(
+                part,
+                columns,
+                args,
+                kwargs,
+                weights[:, start:stop] if weights is not None else None,
+                evaluator._timeout_metadata(part, missed),
+            )
+            for result, diagnosis in zip(results, diagnoses):
+                result[name] = diagnosis
+            start = stop
+
+        return results
@@ -1,6 +1,11 @@
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.enums import SolverMode
+
+if TYPE_CHECKING:
+    from diagnostipy.core.compiled import CompiledRuleset, RecordBatch
+    from diagnostipy.core.index import RuleIndex
 
 
 class SymptomRuleset:
@@ -8,6 +13,7 @@ class SymptomRuleset:
         self,
         rules: Optional[list[SymptomRule]] = None,
         exclude_overlaps: bool = True,
+        solver_mode: SolverMode = SolverMode.AUTO,
     ):
         """
         A collection of rules for evaluating symptoms.
@@ -15,9 +21,14 @@ class SymptomRuleset:
         Args:
             rules: List of rules to apply.
             exclude_overlaps: Whether to exclude overlapping rules by default.
+            solver_mode: How the maximum possible weight used by the scoring \
+            functions is computed: greedily, exactly, or exactly where tractable.
         """
         self.rules: list[SymptomRule] = rules or []
         self.exclude_overlaps: bool = exclude_overlaps
+        self.solver_mode: SolverMode = solver_mode
+        self._compiled: Optional["CompiledRuleset"] = None
+        self._index: Optional["RuleIndex"] = None
 
     def _is_more_specific(self, rule_a: SymptomRule, rule_b: SymptomRule) -> bool:
         """
@@ -30,8 +41,9 @@ class SymptomRuleset:
         Returns:
             True if rule_a is more specific than rule_b, False otherwise.
         """
-        if rule_a.conditions and rule_b.conditions:
-            return rule_a.conditions >= rule_b.conditions
+        keys_a, keys_b = rule_a.condition_keys, rule_b.condition_keys
+        if keys_a and keys_b:
+            return keys_a >= keys_b
         return False
 
     def _exclude_overlaps(
@@ -40,6 +52,9 @@ class SymptomRuleset:
         """
         Exclude overlapping rules that are less specific than the given rule.
 
+        Rules of the ruleset are compared by their condition columns in the
+        rule index; other rules fall back to `_is_more_specific`.
+
         Args:
             applicable_rules: List of currently applicable rules.
             rule: The rule being evaluated.
@@ -47,15 +62,68 @@ class SymptomRuleset:
         Returns:
             A filtered list of rules excluding less specific overlapping rules.
         """
-        filtered_rules = []
-        for r in applicable_rules:
-            if self._is_more_specific(rule, r):
-                continue
-            elif self._is_more_specific(r, rule):
-                filtered_rules.append(r)
-            else:
-                filtered_rules.append(r)
-        return filtered_rules
+        index = self.index()
+        positions = {id(r): idx for idx, r in enumerate(index.rules)}
+        specific = positions.get(id(rule))
+
+        def shadowed(other: SymptomRule) -> bool:
+            position = positions.get(id(other))
+            if specific is None or position is None:
+                return self._is_more_specific(rule, other)
+            columns = index.rule_fields[position]
+            return bool(columns) and set(columns).issubset(index.rule_fields[specific])
+
+        return [r for r in applicable_rules if not shadowed(r)]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Serialize the ruleset to JSON-compatible data.
+
+        Returns:
+            A dictionary with the ruleset settings and its rules.
+
+        Raises:
+            ValueError: If a rule uses `apply_condition`, which cannot be \
+            serialized; use a `condition` expression instead.
+        """
+        rules = []
+        for rule in self.rules:
+            if rule.apply_condition:
+                raise ValueError(
+                    f"Rule '{rule.name}' uses `apply_condition`, which cannot be "
+                    "serialized. Use a `condition` expression instead."
+                )
+            data = {
+                key: value
+                for key, value in rule.model_dump(exclude={"apply_condition"}).items()
+                if value is not None or key == "weight"
+            }
+            if rule.conditions is not None:
+                data["conditions"] = sorted(rule.conditions)
+            rules.append(data)
+
+        return {
+            "exclude_overlaps": self.exclude_overlaps,
+            "solver_mode": SolverMode(self.solver_mode).value,
+            "rules": rules,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SymptomRuleset":
+        """
+        Build a ruleset from data produced by `to_dict`.
+
+        Args:
+            data: The serialized ruleset.
+
+        Returns:
+            The ruleset. Condition expressions are validated while loading.
+        """
+        return cls(
+            rules=[SymptomRule.model_validate(rule) for rule in data.get("rules", [])],
+            exclude_overlaps=data.get("exclude_overlaps", True),
+            solver_mode=SolverMode(data.get("solver_mode", SolverMode.AUTO)),
+        )
 
     def add_rule(self, rule: SymptomRule) -> SymptomRule:
         """
@@ -123,6 +191,57 @@ class SymptomRuleset:
             return True
         return False
 
+    def get_applicable_indices(
+        self, data: Any, suppressed: Optional[dict[int, int]] = None
+    ) -> list[int]:
+        """
+        Return the indices of all rules that apply to the provided data, ensuring
+        that overlapping rules with less specific conditions are excluded.
+
+        Args:
+            data: Input data to evaluate. Can be of any type.
+            suppressed: Optional dictionary that is filled with the index of every \
+            rule removed by overlap exclusion, mapped to the index of the rule that \
+            removed it.
+
+        Returns:
+            A list of indices into `rules`, in evaluation order.
+        """
+        matched = [idx for idx, rule in enumerate(self.rules) if rule.applies(data)]
+        return self._exclude_indices(matched, suppressed)
+
+    def _exclude_indices(
+        self, matched: list[int], suppressed: Optional[dict[int, int]] = None
+    ) -> list[int]:
+        """
+        Apply overlap exclusion to the indices of matched rules.
+
+        Args:
+            matched: Indices of the rules that apply, in ascending order.
+            suppressed: Optional dictionary filled with suppressed rule indices, \
+            mapped to the index of the rule that suppressed them.
+
+        Returns:
+            The indices of the rules that remain, in evaluation order.
+        """
+        if not self.exclude_overlaps:
+            return matched
+
+        applicable: list[int] = []
+        for idx in matched:
+            rule = self.rules[idx]
+            kept: list[int] = []
+            for other in applicable:
+                if self._is_more_specific(rule, self.rules[other]):
+                    if suppressed is not None:
+                        suppressed[other] = idx
+                else:
+                    kept.append(other)
+            applicable = kept
+            applicable.append(idx)
+
+        return applicable
+
     def get_applicable_rules(self, data: Any) -> list[SymptomRule]:
         """
         Return all rules that apply to the provided data, ensuring that overlapping
@@ -134,15 +253,75 @@ class SymptomRuleset:
         Returns:
             A list of applicable rules.
         """
-        applicable_rules: list[SymptomRule] = []
+        return [self.rules[idx] for idx in self.get_applicable_indices(data)]
 
-        for rule in self.rules:
-            if rule.applies(data):
-                if self.exclude_overlaps:
-                    applicable_rules = self._exclude_overlaps(applicable_rules, rule)
-                applicable_rules.append(rule)
+    def get_applicable_rules_batch(
+        self, records: "RecordBatch"
+    ) -> list[list[SymptomRule]]:
+        """
+        Return the applicable rules of every record in a batch, matched with the
+        compiled ruleset.
+
+        Args:
+            records: Input records, a boolean matrix encoded against the compiled \
+            fields, or `SparseRecords`.
+
+        Returns:
+            For each record, the list of applicable rules.
+        """
+        compiled = self.compile()
+        mask = compiled.applicable_mask(records)
+        return [[compiled.rules[idx] for idx in row.nonzero()[0]] for row in mask]
+
+    def compile(self, force: bool = False) -> "CompiledRuleset":
+        """
+        Return an array-based snapshot of the ruleset for batch evaluation.
+
+        The snapshot is cached and rebuilt when rules are added, removed or
+        replaced. Rules mutated in place require `force=True`, which also
+        replaces the snapshot returned by `index`.
+
+        Args:
+            force: Whether to rebuild the snapshot unconditionally.
+
+        Returns:
+            The compiled ruleset.
+        """
+        from diagnostipy.core.compiled import CompiledRuleset
+
+        compiled = self._compiled
+        if (
+            force
+            or compiled is None
+            or compiled.is_stale(self.rules, self.exclude_overlaps, self.solver_mode)
+        ):
+            compiled = CompiledRuleset(
+                self.rules, self.exclude_overlaps, self.solver_mode
+            )
+            self._compiled = compiled
+            self._index = None
+        return compiled
+
+    def index(self) -> "RuleIndex":
+        """
+        Return a pure-Python snapshot of the ruleset for single-record evaluation.
+
+        The compiled snapshot is returned if it is up to date, so single records
+        and batches share normalisers; otherwise a `RuleIndex` is built without
+        NumPy and cached like `compile`.
+
+        Returns:
+            The rule index.
+        """
+        from diagnostipy.core.index import RuleIndex
 
-        return applicable_rules
+        for index in (self._compiled, self._index):
+            if index is not None and not index.is_stale(
+                self.rules, self.exclude_overlaps, self.solver_mode
+            ):
+                return index
+        self._index = RuleIndex(self.rules, self.exclude_overlaps, self.solver_mode)
+        return self._index
 
     def list_rules(self) -> list[str]:
         """
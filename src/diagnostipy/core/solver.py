@@ -0,0 +1,429 @@
+import math
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Sequence
+
+from diagnostipy.utils.enums import SolverMode
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from diagnostipy.core.index import RuleIndex
+
+MAX_EXACT_FIELDS = 16
+_BLOCK_SIZE = 1 << 14
+
+
+def _components(compiled: "RuleIndex") -> list[list[int]]:
+    """
+    Group rules with conditions into components that share condition fields.
+
+    Rules in different components never overlap, so each component can be solved
+    independently.
+
+    Args:
+        compiled: The compiled ruleset.
+
+    Returns:
+        Lists of rule indices, in ruleset order.
+    """
+    parent = list(range(len(compiled.fields)))
+
+    def find(field: int) -> int:
+        while parent[field] != field:
+            parent[field] = parent[parent[field]]
+            field = parent[field]
+        return field
+
+    for columns in compiled.rule_fields:
+        for column in columns[1:]:
+            parent[find(column)] = find(columns[0])
+
+    components: dict[int, list[int]] = {}
+    for idx, columns in enumerate(compiled.rule_fields):
+        if columns:
+            components.setdefault(find(columns[0]), []).append(idx)
+    return list(components.values())
+
+
+def _solve_greedy(
+    compiled: "RuleIndex", rules: list[int], weights: "Sequence[float]"
+) -> list[int]:
+    """
+    Pick rules by descending weight, skipping rules whose conditions are already
+    covered by previously picked rules.
+    """
+    selected = []
+    visited: set[int] = set()
+
+    for idx in sorted(rules, key=weights.__getitem__, reverse=True):
+        columns = compiled.rule_fields[idx]
+        if columns and visited.issuperset(columns):
+            continue
+        selected.append(idx)
+        visited.update(columns)
+
+    return selected
+
+
+def _solve_exact(
+    compiled: "RuleIndex",
+    rules: list[int],
+    pairs: list[tuple[int, int]],
+    objective: "Sequence[float] | np.ndarray",
+) -> list[int]:
+    """
+    Enumerate every combination of present fields of a component and keep the
+    applicable rule set, after overlap exclusion, with the highest objective.
+    """
+    import numpy as np
+
+    fields = sorted({column for idx in rules for column in compiled.rule_fields[idx]})
+    local = {column: bit for bit, column in enumerate(fields)}
+    masks = np.array(
+        [sum(1 << local[c] for c in compiled.rule_fields[idx]) for idx in rules],
+        dtype=np.int64,
+    )
+    position = {idx: pos for pos, idx in enumerate(rules)}
+    local_pairs = [(position[a], position[b]) for a, b in pairs]
+    values = np.array([objective[idx] for idx in rules], dtype=np.float64)
+
+    best_value, best_selection = -np.inf, np.zeros(len(rules), dtype=bool)
+    for start in range(0, 1 << len(fields), _BLOCK_SIZE):
+        present = np.arange(start, min(start + _BLOCK_SIZE, 1 << len(fields)))
+        applies = (present[:, None] & masks) == masks
+        final = applies.copy()
+        for shadowed, shadowing in local_pairs:
+            final[:, shadowed] &= ~applies[:, shadowing]
+        scores = final @ values
+        row = int(np.argmax(scores))
+        if scores[row] > best_value:
+            best_value, best_selection = scores[row], final[row]
+
+    return [rules[pos] for pos in np.flatnonzero(best_selection)]
+
+
+def _solve_exact_python(
+    compiled: "RuleIndex",
+    rules: list[int],
+    pairs: list[tuple[int, int]],
+    objective: "Sequence[float] | np.ndarray",
+) -> list[int]:
+    """
+    Solve a component exactly without NumPy.
+
+    Which rules apply only depends on the union of their conditions, so only the
+    unions of rule conditions are enumerated instead of every combination of
+    fields. Ties go to the smallest combination, as in `_solve_exact`.
+    """
+    fields = sorted({column for idx in rules for column in compiled.rule_fields[idx]})
+    local = {column: bit for bit, column in enumerate(fields)}
+    masks = [sum(1 << local[c] for c in compiled.rule_fields[idx]) for idx in rules]
+    position = {idx: pos for pos, idx in enumerate(rules)}
+    local_pairs = [(position[a], position[b]) for a, b in pairs]
+    values = [float(objective[idx]) for idx in rules]
+
+    unions = {0}
+    for mask in masks:
+        unions.update([union | mask for union in unions])
+
+    best_value, best_selection = -math.inf, [False] * len(rules)
+    for present in sorted(unions):
+        applies = [present & mask == mask for mask in masks]
+        final = list(applies)
+        for shadowed, shadowing in local_pairs:
+            if applies[shadowing]:
+                final[shadowed] = False
+        score = sum(value for value, kept in zip(values, final) if kept)
+        if score > best_value:
+            best_value, best_selection = score, final
+
+    return [rule for rule, kept in zip(rules, best_selection) if kept]
+
+
+def _unconditional_rules(
+    compiled: "RuleIndex", objective: "Sequence[float] | np.ndarray", mode: SolverMode
+) -> list[int]:
+    """
+    Select the rules without conditions, which never overlap with other rules.
+    """
+    return [
+        idx
+        for idx, rule in enumerate(compiled.rules)
+        if not compiled.rule_fields[idx]
+        and (
+            mode == SolverMode.GREEDY or not rule.apply_condition or objective[idx] >= 0
+        )
+    ]
+
+
+def _component_pairs(
+    compiled: "RuleIndex", components: list[list[int]]
+) -> list[list[tuple[int, int]]]:
+    """
+    Split the overlap pairs of the indexed ruleset by component.
+    """
+    component_of = {idx: pos for pos, rules in enumerate(components) for idx in rules}
+    pairs: list[list[tuple[int, int]]] = [[] for _ in components]
+    if compiled.exclude_overlaps:
+        for shadowed, shadowing in compiled.overlaps:
+            pairs[component_of[shadowed]].append((shadowed, shadowing))
+    return pairs
+
+
+def _solves_exactly(
+    compiled: "RuleIndex", rules: list[int], mode: SolverMode, max_exact_fields: int
+) -> bool:
+    """
+    Decide whether a component is solved exactly or greedily.
+    """
+    n_fields = len({c for idx in rules for c in compiled.rule_fields[idx]})
+    exact = n_fields <= max_exact_fields
+    if mode == SolverMode.EXACT and not exact:
+        raise ValueError(
+            f"Cannot solve a component with {n_fields} fields exactly; "
+            f"the limit is {max_exact_fields}. Use the 'auto' or 'greedy' mode."
+        )
+    return exact and mode != SolverMode.GREEDY
+
+
+def _solve_component(
+    compiled: "RuleIndex",
+    rules: list[int],
+    pairs: list[tuple[int, int]],
+    objective: "Sequence[float] | np.ndarray",
+    weights: "Sequence[float]",
+    mode: SolverMode,
+    max_exact_fields: int,
+) -> list[int]:
+    """
+    Solve one component of rules that share condition fields.
+    """
+    if not _solves_exactly(compiled, rules, mode, max_exact_fields):
+        return _solve_greedy(compiled, rules, weights)
+    solve_exact = _solve_exact if compiled.vectorized else _solve_exact_python
+    return solve_exact(compiled, rules, pairs, objective)
+
+
+def solve_max_rules(
+    compiled: "RuleIndex",
+    objective: "Sequence[float] | np.ndarray",
+    mode: SolverMode = SolverMode.AUTO,
+    max_exact_fields: int = MAX_EXACT_FIELDS,
+) -> list[int]:
+    """
+    Find the set of rules that can apply together, after overlap exclusion, with
+    the highest total objective.
+
+    Rules with conditions are grouped into independent components. `EXACT` solves
+    every component by enumerating its combinations of present fields, `GREEDY`
+    picks rules by descending weight, and `AUTO` solves components exactly when
+    they have at most `max_exact_fields` fields and greedily otherwise.
+    Unconditional rules always apply; rules with only an `apply_condition` are
+    counted when their objective is not negative. Exact components are
+    enumerated with NumPy for a `CompiledRuleset` and in pure Python for a plain
+    `RuleIndex`.
+
+    Args:
+        compiled: The indexed or compiled ruleset.
+        objective: Value of each rule, e.g. its weight, or 1 to count rules.
+        mode: The solver mode.
+        max_exact_fields: Largest component solved exactly in `AUTO` mode.
+
+    Returns:
+        Indices of the selected rules, in ruleset order.
+
+    Raises:
+        ValueError: If `EXACT` is requested for a component with more than \
+        `max_exact_fields` fields.
+    """
+    mode = SolverMode(mode)
+    selected = _unconditional_rules(compiled, objective, mode)
+    components = _components(compiled)
+
+    for rules, pairs in zip(components, _component_pairs(compiled, components)):
+        selected.extend(
+            _solve_component(
+                compiled,
+                rules,
+                pairs,
+                objective,
+                compiled.rule_weights,
+                mode,
+                max_exact_fields,
+            )
+        )
+
+    return sorted(selected)
+
+
+class _GreedyReplay:
+    """
+    Replay the greedy pass of one component with a single rule weight changed.
+
+    Changing one weight only moves that rule in the greedy order. Wherever the
+    visited fields agree with the base pass, both passes pick the same rules, so
+    the replay skips ahead to the rule's old or new position and stops once both
+    are passed and the visited fields agree again. The difference in visited
+    fields is tracked as fields visited only by the replay (`added`) or only by
+    the base pass (`missing`).
+    """
+
+    def __init__(
+        self, compiled: "RuleIndex", rules: list[int], weights: "Sequence[float]"
+    ):
+        self.fields = compiled.rule_fields
+        self.weights = weights
+        self.order = sorted(rules, key=weights.__getitem__, reverse=True)
+        self.keys = [(-weights[idx], idx) for idx in self.order]
+        self.position = {idx: pos for pos, idx in enumerate(self.order)}
+        self.first: dict[int, int] = {}
+        self.selected = []
+        for pos, idx in enumerate(self.order):
+            new = [c for c in self.fields[idx] if c not in self.first]
+            self.first.update(dict.fromkeys(new, pos))
+            self.selected.append(bool(new))
+
+    def delta(self, rule: int, weight: float) -> float:
+        """
+        Change of the component value when `rule` has weight `weight`.
+        """
+        old = self.position[rule]
+        insert = bisect_left(self.keys, (-weight, rule))
+        if insert in (old, old + 1):
+            return (weight - self.weights[rule]) * self.selected[old]
+
+        self.added: set[int] = set()
+        self.missing: set[int] = set()
+        total, pending = 0.0, {insert, old}
+        pos = min(pending)
+        while pending or self.added or self.missing:
+            if not self.added and not self.missing:
+                pos = max(pos, min(pending))
+            if pos == insert:
+                total += weight * self._step(rule, pos, False, [])
+                pending.discard(insert)
+            if pos == len(self.order):
+                break
+            idx = self.order[pos]
+            base = [c for c in self.fields[idx] if self.first[c] == pos]
+            if idx == rule:
+                total -= self.weights[rule] * self._step(rule, pos, True, base)
+                pending.discard(old)
+            else:
+                replayed = self._step(idx, pos, False, base)
+                total += self.weights[idx] * (replayed - self.selected[pos])
+            pos += 1
+        return total
+
+    def _step(self, idx: int, pos: int, base_only: bool, base: list[int]) -> bool:
+        """
+        Apply one greedy step of the replay before base position `pos`, along
+        with the fields the base pass visits first at `pos`.
+
+        Returns:
+            Whether the rule is picked; by the base pass if `base_only`, by the \
+            replay otherwise.
+        """
+        new = (
+            [] if base_only else [c for c in self.fields[idx] if not self._seen(c, pos)]
+        )
+        for column in base:
+            if column in self.added:
+                self.added.remove(column)
+            elif column not in new:
+                self.missing.add(column)
+        for column in new:
+            if column in base:
+                continue
+            if self.first.get(column, math.inf) < pos:
+                self.missing.remove(column)
+            else:
+                self.added.add(column)
+        return bool(base) if base_only else bool(new)
+
+    def _seen(self, column: int, pos: int) -> bool:
+        """
+        Check whether the replay visited a field before base position `pos`.
+        """
+        if column in self.added:
+            return True
+        return self.first.get(column, math.inf) < pos and column not in self.missing
+
+
+def _scaled_component(
+    compiled: "RuleIndex",
+    rules: list[int],
+    pairs: list[tuple[int, int]],
+    weights: list[float],
+    factor: float,
+    mode: SolverMode,
+    max_exact_fields: int,
+) -> list[float]:
+    """
+    Change of a component's value when each of its rules is scaled on its own.
+
+    Greedy components are replayed from where the scaled rule moves; exact
+    components are solved again for every rule.
+    """
+    if not _solves_exactly(compiled, rules, mode, max_exact_fields):
+        replay = _GreedyReplay(compiled, rules, weights)
+        return [replay.delta(idx, weights[idx] * factor) for idx in rules]
+
+    solve_exact = _solve_exact if compiled.vectorized else _solve_exact_python
+    own = sum(weights[idx] for idx in solve_exact(compiled, rules, pairs, weights))
+    deltas = []
+    for perturbed in rules:
+        weight = weights[perturbed]
+        weights[perturbed] = weight * factor
+        chosen = solve_exact(compiled, rules, pairs, weights)
+        deltas.append(sum(weights[idx] for idx in chosen) - own)
+        weights[perturbed] = weight
+    return deltas
+
+
+def scaled_max_weights(compiled: "RuleIndex", factor: float) -> list[float]:
+    """
+    Compute the maximum possible weight with each rule's weight scaled on its own.
+
+    Scaling one rule only changes the solution of the component holding it, so
+    the other components keep their share of `compiled.max_possible_weight`.
+    Components solved exactly are solved again for each of their rules, which
+    stays cheap as they hold at most `MAX_EXACT_FIELDS` fields. Greedy
+    components are replayed from the position the scaled rule moves to until
+    the pass agrees with the base pass again, so large components are not
+    solved again from scratch.
+
+    Args:
+        compiled: The indexed or compiled ruleset, solved in its `solver_mode`.
+        factor: Multiplicative perturbation of the rule weight.
+
+    Returns:
+        For every rule, the maximum possible weight when only its weight is \
+        multiplied by `factor`.
+    """
+    mode = compiled.solver_mode
+    weights = list(compiled.rule_weights)
+    base = compiled.max_possible_weight
+    result = [base] * len(weights)
+
+    selected = set(_unconditional_rules(compiled, weights, mode))
+    for idx, rule in enumerate(compiled.rules):
+        if compiled.rule_fields[idx]:
+            continue
+        scaled = weights[idx] * factor
+        keeps = mode == SolverMode.GREEDY or not rule.apply_condition or scaled >= 0
+        result[idx] = (
+            base
+            - (weights[idx] if idx in selected else 0.0)
+            + (scaled if keeps else 0.0)
+        )
+
+    components = _components(compiled)
+    for rules, pairs in zip(components, _component_pairs(compiled, components)):
+        deltas = _scaled_component(
+            compiled, rules, pairs, weights, factor, mode, MAX_EXACT_FIELDS
+        )
+        for idx, delta in zip(rules, deltas):
+            result[idx] = base + delta
+
+    return result
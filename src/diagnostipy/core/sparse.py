@@ -0,0 +1,123 @@
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+
+class SparseRecords:
+    """
+    CSR-style records x fields matrix for wide, sparsely populated vocabularies.
+
+    Each record is stored as the column indices of its present (truthy) fields, so
+    memory scales with the number of present fields rather than the vocabulary
+    size.
+
+    Attributes:
+        indptr (np.ndarray): Offsets of each record's entries in `indices`.
+        indices (np.ndarray): Column indices of the present fields.
+        vocabulary (tuple[str, ...]): Field names, in column order.
+    """
+
+    def __init__(
+        self, indptr: np.ndarray, indices: np.ndarray, vocabulary: Sequence[str]
+    ):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.vocabulary = tuple(vocabulary)
+
+    @classmethod
+    def from_codes(
+        cls,
+        records: Iterable[Iterable[str]],
+        vocabulary: Optional[Sequence[str]] = None,
+    ) -> "SparseRecords":
+        """
+        Build sparse records from lists of present codes.
+
+        Args:
+            records: For each record, the codes (field names) that are present.
+            vocabulary: Optional fixed vocabulary. Codes outside it are dropped. \
+            If omitted, the vocabulary is built from the codes in order of first \
+            appearance.
+
+        Returns:
+            The sparse records.
+        """
+        fixed = vocabulary is not None
+        index = {code: col for col, code in enumerate(vocabulary or ())}
+        indptr = [0]
+        indices: list[int] = []
+
+        for codes in records:
+            columns = set()
+            for code in codes:
+                column = index.get(code)
+                if column is None:
+                    if fixed:
+                        continue
+                    column = index[code] = len(index)
+                columns.add(column)
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+
+        return cls(np.array(indptr), np.array(indices), tuple(index))
+
+    @property
+    def nnz(self) -> int:
+        """
+        Number of stored (present) fields.
+        """
+        return len(self.indices)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def __getitem__(self, item: slice) -> "SparseRecords":
+        """
+        Select a contiguous range of records.
+
+        Args:
+            item: A slice with a step of 1.
+
+        Returns:
+            The selected records, sharing the vocabulary.
+        """
+        start, stop, step = item.indices(len(self))
+        if step != 1:
+            raise ValueError("Only contiguous slices of sparse records are supported.")
+        stop = max(start, stop)
+        indptr = self.indptr[start : stop + 1]
+        return SparseRecords(
+            indptr - indptr[0],
+            self.indices[indptr[0] : indptr[-1]],
+            self.vocabulary,
+        )
+
+    def codes(self, row: int) -> list[str]:
+        """
+        Return the present codes of a single record.
+
+        Args:
+            row: Index of the record.
+
+        Returns:
+            The record's codes.
+        """
+        columns = self.indices[self.indptr[row] : self.indptr[row + 1]]
+        return [self.vocabulary[column] for column in columns]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over records as dictionaries of present codes, the form expected by
+        `SymptomRule.applies` and custom `apply_condition` callables.
+        """
+        for row in range(len(self)):
+            yield dict.fromkeys(self.codes(row), True)
+
+    def rows(self) -> np.ndarray:
+        """
+        Return the record index of every stored entry.
+
+        Returns:
+            An array aligned with `indices`.
+        """
+        return np.repeat(np.arange(len(self)), np.diff(self.indptr))
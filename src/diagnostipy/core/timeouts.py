@@ -0,0 +1,472 @@
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.enums import TimeoutPolicy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from diagnostipy.core.compiled import CompiledRuleset, RecordBatch
+
+
+class RuleTimeoutError(TimeoutError):
+    """
+    Raised under `TimeoutPolicy.RAISE` when rules did not finish in time.
+
+    Attributes:
+        rules (tuple[str, ...]): Names of the rules that timed out.
+    """
+
+    def __init__(self, rules: Sequence[str]):
+        super().__init__(f"Rules timed out: {', '.join(rules)}.")
+        self.rules = tuple(rules)
+
+
+class TimeoutMetrics:
+    """
+    Counters of guarded rule evaluations. Updates are thread-safe.
+
+    Attributes:
+        evaluations (int): Guarded `run` or `run_batch` calls.
+        calls (int): `apply_condition` calls submitted.
+        timeouts (int): Calls that did not finish within their rule timeout or \
+        the evaluation deadline.
+        deadlines_exceeded (int): Evaluations whose deadline passed.
+        rejected (int): Calls refused without running because every worker was \
+        stuck in an abandoned call. They are also counted as timeouts.
+        degraded (int): Diagnoses marked degraded.
+        by_rule (dict[str, int]): Timeouts per rule name.
+    """
+
+    def __init__(self) -> None:
+        self.evaluations = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.deadlines_exceeded = 0
+        self.rejected = 0
+        self.degraded = 0
+        self.by_rule: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        calls: int,
+        timed_out: Sequence[str],
+        deadline_exceeded: bool,
+        rejected: int = 0,
+    ) -> None:
+        """
+        Add the outcome of one guarded evaluation.
+
+        Args:
+            calls: Number of submitted calls.
+            timed_out: Name of the rule of every call that timed out.
+            deadline_exceeded: Whether the evaluation deadline passed.
+            rejected: Number of calls refused by a saturated worker pool.
+        """
+        with self._lock:
+            self.evaluations += 1
+            self.calls += calls
+            self.timeouts += len(timed_out)
+            self.deadlines_exceeded += deadline_exceeded
+            self.rejected += rejected
+            for name in timed_out:
+                self.by_rule[name] = self.by_rule.get(name, 0) + 1
+
+    def record_degraded(self) -> None:
+        """
+        Count a diagnosis marked degraded.
+        """
+        with self._lock:
+            self.degraded += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarise the counters.
+
+        Returns:
+            A dictionary of the counters.
+        """
+        with self._lock:
+            return {
+                "evaluations": self.evaluations,
+                "calls": self.calls,
+                "timeouts": self.timeouts,
+                "deadlines_exceeded": self.deadlines_exceeded,
+                "rejected": self.rejected,
+                "degraded": self.degraded,
+                "by_rule": dict(self.by_rule),
+            }
+
+    def render(self) -> list[str]:
+        """
+        Format the counters in the Prometheus text exposition format.
+
+        Returns:
+            The exposition lines.
+        """
+        counts = self.to_dict()
+        counters = [
+            ("rule_calls_total", "Guarded apply_condition calls.", counts["calls"]),
+            ("rule_timeouts_total", "Timed-out rule calls.", counts["timeouts"]),
+            (
+                "deadlines_exceeded_total",
+                "Evaluations past their deadline.",
+                counts["deadlines_exceeded"],
+            ),
+            (
+                "rule_calls_rejected_total",
+                "Calls refused by a saturated worker pool.",
+                counts["rejected"],
+            ),
+            ("degraded_total", "Diagnoses marked degraded.", counts["degraded"]),
+        ]
+        lines = []
+        for name, help, value in counters:
+            lines += [
+                f"# HELP diagnostipy_{name} {help}",
+                f"# TYPE diagnostipy_{name} counter",
+                f"diagnostipy_{name} {value}",
+            ]
+        lines += [
+            "# HELP diagnostipy_rule_timeouts Timed-out calls per rule.",
+            "# TYPE diagnostipy_rule_timeouts counter",
+        ]
+        lines += [
+            f'diagnostipy_rule_timeouts{{rule="{name}"}} {value}'
+            for name, value in sorted(counts["by_rule"].items())
+        ]
+        return lines
+
+
+class _Task:
+    """
+    A call queued on a `_WorkerPool`.
+    """
+
+    __slots__ = (
+        "rule",
+        "data",
+        "future",
+        "started",
+        "running",
+        "finished",
+        "abandoned",
+        "replaced",
+        "rejected",
+    )
+
+    def __init__(self, rule: SymptomRule, data: Any):
+        self.rule = rule
+        self.data = data
+        self.future: Future[bool] = Future()
+        self.started = 0.0
+        self.running = threading.Event()
+        self.finished = False
+        self.abandoned = False
+        self.replaced = False
+        self.rejected = False
+
+    def reject(self) -> None:
+        """
+        Refuse the call without running it, waking up its waiter.
+        """
+        self.rejected = True
+        self.future.cancel()
+        self.running.set()
+
+    def run(self) -> None:
+        if not self.future.set_running_or_notify_cancel():
+            return
+        self.started = time.perf_counter()
+        self.running.set()
+        try:
+            self.future.set_result(bool(self.rule.applies(self.data)))
+        except BaseException as error:
+            self.future.set_exception(error)
+
+
+class _WorkerPool:
+    """
+    Daemon thread pool that replaces workers stuck in abandoned calls.
+
+    Python threads cannot be interrupted, so a timed-out call keeps its worker
+    busy until it returns. Abandoning it starts a replacement worker, keeping
+    `max_workers` workers available, and the extra worker retires once the
+    abandoned call returns. At most `max_workers` replacements run at a time;
+    once every worker is stuck, queued and new calls are rejected instead of
+    waiting for a worker that may never come. Workers are daemon threads, so a
+    call that never returns does not block interpreter exit.
+    """
+
+    def __init__(self, max_workers: int):
+        if max_workers < 1:
+            raise ValueError("`max_workers` must be a positive integer.")
+        self._queue: queue.SimpleQueue[_Task] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._target = max_workers
+        self._limit = 2 * max_workers
+        self._live = 0
+        self._stuck = 0
+
+    @property
+    def saturated(self) -> bool:
+        """
+        Whether every worker is stuck in an abandoned call.
+        """
+        return self._stuck >= self._target
+
+    def submit(self, rule: SymptomRule, data: Any) -> _Task:
+        task = _Task(rule, data)
+        with self._lock:
+            if self.saturated:
+                task.reject()
+                return task
+            self._queue.put(task)
+            if self._live < self._target:
+                self._spawn()
+        return task
+
+    def abandon(self, task: _Task) -> None:
+        """
+        Give up on a task: cancel it if queued, or replace its worker if running
+        and the replacement limit allows.
+        """
+        if task.future.cancel():
+            return
+        with self._lock:
+            if task.finished:
+                return
+            task.abandoned = True
+            self._stuck += 1
+            if self._target < self._limit:
+                task.replaced = True
+                self._target += 1
+                self._spawn()
+            elif self.saturated:
+                self._reject_queued()
+
+    def _reject_queued(self) -> None:
+        while True:
+            try:
+                self._queue.get_nowait().reject()
+            except queue.Empty:
+                return
+
+    def _spawn(self) -> None:
+        self._live += 1
+        threading.Thread(
+            target=self._work, name="diagnostipy-rule-worker", daemon=True
+        ).start()
+
+    def _work(self) -> None:
+        while True:
+            task = self._queue.get()
+            task.run()
+            with self._lock:
+                task.finished = True
+                if task.abandoned:
+                    self._stuck -= 1
+                if task.replaced:
+                    self._target -= 1
+                if self._live > self._target:
+                    self._live -= 1
+                    return
+
+
+def _remaining(limit: Optional[float]) -> Optional[float]:
+    return None if limit is None else max(limit - time.perf_counter(), 0.0)
+
+
+class ConditionRunner:
+    """
+    Evaluates `apply_condition` callables on a managed thread pool with bounded
+    waits.
+
+    Every call must finish within `rule_timeout` seconds of starting, and all
+    calls of an evaluation before its deadline, `evaluation_timeout` seconds
+    after it started. Calls that miss either bound, or that are rejected because
+    every worker is stuck in an abandoned call, are handled by the policy.
+    Rules without `apply_condition` are evaluated inline.
+
+    Attributes:
+        rule_timeout (Optional[float]): Seconds a single call may run.
+        evaluation_timeout (Optional[float]): Seconds an evaluation may take.
+        policy (TimeoutPolicy): How timed-out rules are handled.
+        metrics (TimeoutMetrics): Timeout statistics.
+    """
+
+    def __init__(
+        self,
+        rule_timeout: Optional[float] = None,
+        evaluation_timeout: Optional[float] = None,
+        policy: TimeoutPolicy = TimeoutPolicy.SKIP,
+        max_workers: int = 4,
+    ):
+        for name, value in (
+            ("rule_timeout", rule_timeout),
+            ("evaluation_timeout", evaluation_timeout),
+        ):
+            if value is not None and value < 0:
+                raise ValueError(f"`{name}` must not be negative.")
+
+        self.rule_timeout = rule_timeout
+        self.evaluation_timeout = evaluation_timeout
+        self.policy = TimeoutPolicy(policy)
+        self.metrics = TimeoutMetrics()
+        self._pool = _WorkerPool(max_workers)
+
+    def _wait(self, task: _Task, deadline: Optional[float]) -> bool:
+        """
+        Wait for a task within its bounds, abandoning it if it misses them.
+
+        Returns:
+            True if the task finished in time.
+        """
+        if task.running.wait(_remaining(deadline)) and not task.rejected:
+            limit = deadline
+            if self.rule_timeout is not None:
+                limit = min(task.started + self.rule_timeout, deadline or math.inf)
+            if wait([task.future], _remaining(limit)).done:
+                return True
+        self._pool.abandon(task)
+        return False
+
+    def _run(
+        self, calls: Sequence[tuple[SymptomRule, Any]]
+    ) -> tuple[list[bool], list[int]]:
+        """
+        Run calls concurrently and collect their results.
+
+        Returns:
+            The result of every call, False where it timed out, and the positions \
+            of the calls that timed out.
+
+        Raises:
+            Exception: Any exception raised by an `apply_condition` callable.
+        """
+        deadline = (
+            None
+            if self.evaluation_timeout is None
+            else time.perf_counter() + self.evaluation_timeout
+        )
+        tasks = [self._pool.submit(rule, data) for rule, data in calls]
+        results, timed_out = [False] * len(tasks), []
+        for position, task in enumerate(tasks):
+            if self._wait(task, deadline):
+                results[position] = task.future.result()
+            else:
+                timed_out.append(position)
+
+        self.metrics.record(
+            len(tasks),
+            [calls[position][0].name for position in timed_out],
+            deadline is not None and time.perf_counter() > deadline,
+            sum(task.rejected for task in tasks),
+        )
+        return results, timed_out
+
+    def match_record(
+        self, rules: Sequence[SymptomRule], data: Any
+    ) -> tuple[list[int], list[int]]:
+        """
+        Determine which rules apply to a record, before overlap exclusion.
+
+        Args:
+            rules: The rules to match.
+            data: The input record.
+
+        Returns:
+            The indices of the matching rules and of the rules that timed out, \
+            both ascending. Rules that timed out do not match.
+        """
+        guarded = [idx for idx, rule in enumerate(rules) if rule.apply_condition]
+        matched, timed_out = self.match_callables(rules, guarded, data)
+        matched.extend(
+            idx
+            for idx, rule in enumerate(rules)
+            if not rule.apply_condition and rule.applies(data)
+        )
+        return sorted(matched), timed_out
+
+    def match_callables(
+        self, rules: Sequence[SymptomRule], indices: Sequence[int], data: Any
+    ) -> tuple[list[int], list[int]]:
+        """
+        Call the `apply_condition` functions of some rules on a record.
+
+        Args:
+            rules: The rules of the ruleset.
+            indices: Ascending indices of the rules to call.
+            data: The input record.
+
+        Returns:
+            The indices of the matching rules and of the rules that timed out, \
+            both ascending. Rules that timed out do not match.
+        """
+        results, timed_out = self._run([(rules[idx], data) for idx in indices])
+        matched = [idx for idx, result in zip(indices, results) if result]
+        return matched, [indices[position] for position in timed_out]
+
+    def match_batch(
+        self, compiled: "CompiledRuleset", records: "RecordBatch", applies: "np.ndarray"
+    ) -> "np.ndarray":
+        """
+        Fill the callable rule columns of a match matrix.
+
+        Args:
+            compiled: The compiled ruleset.
+            records: The raw input records.
+            applies: Match matrix from `CompiledRuleset.match` without callables, \
+            updated in place.
+
+        Returns:
+            A boolean array of the same shape marking the calls that timed out.
+        """
+        import numpy as np
+
+        rows = records if isinstance(records, Sequence) else list(records)
+        cells = [
+            (row, idx) for row in range(len(rows)) for idx in compiled.callable_rules
+        ]
+        results, timed_out = self._run(
+            [(compiled.rules[idx], rows[row]) for row, idx in cells]
+        )
+        for (row, idx), result in zip(cells, results):
+            applies[row, idx] = result
+
+        missed = np.zeros(applies.shape, dtype=bool)
+        for position in timed_out:
+            missed[cells[position]] = True
+        return missed
+
+    def resolve(self, timed_out: Sequence[str]) -> Optional[dict[str, Any]]:
+        """
+        Apply the policy to the rules of a record that timed out.
+
+        Args:
+            timed_out: Names of the rules that timed out.
+
+        Returns:
+            Diagnosis metadata describing the timeouts, or None if there were none.
+
+        Raises:
+            RuleTimeoutError: Under `TimeoutPolicy.RAISE`, if any rule timed out.
+        """
+        if not timed_out:
+            return None
+        if self.policy == TimeoutPolicy.RAISE:
+            raise RuleTimeoutError(timed_out)
+
+        metadata: dict[str, Any] = {
+            "timeouts": {"policy": self.policy.value, "rules": list(timed_out)}
+        }
+        if self.policy == TimeoutPolicy.DEGRADE:
+            metadata["degraded"] = True
+            self.metrics.record_degraded()
+        return metadata
@@ -0,0 +1,11 @@
+from diagnostipy.server.app import ScoringServer, load_ruleset
+from diagnostipy.server.batching import MicroBatcher
+from diagnostipy.server.metrics import Histogram, ServerMetrics
+
+__all__ = [
+    "ScoringServer",
+    "MicroBatcher",
+    "ServerMetrics",
+    "Histogram",
+    "load_ruleset",
+]
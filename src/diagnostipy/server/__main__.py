@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import json
+from typing import Any, Optional, Sequence
+
+from diagnostipy.server.app import ScoringServer
+
+
+def _json_object(value: str) -> dict[str, Any]:
+    """
+    Parse a command line option holding a JSON object.
+    """
+    try:
+        params = json.loads(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid JSON: {error}")
+    if not isinstance(params, dict):
+        raise argparse.ArgumentTypeError("expected a JSON object")
+    return params
+
+
+def build_server(argv: Optional[Sequence[str]] = None) -> ScoringServer:
+    """
+    Create the server described by command line arguments.
+
+    Args:
+        argv: Command line arguments, read from `sys.argv` if omitted.
+
+    Returns:
+        The server, not yet started. Exits with a usage error if the ruleset \
+        cannot be loaded or the evaluator is misconfigured.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m diagnostipy.server",
+        description="Serve a diagnostipy ruleset over HTTP.",
+    )
+    parser.add_argument("ruleset", help="Ruleset JSON written from to_dict().")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--max-latency-ms",
+        type=float,
+        default=5.0,
+        help="Batching window for concurrent requests, in milliseconds.",
+    )
+    parser.add_argument("--max-batch-size", type=int, default=1024)
+    parser.add_argument("--evaluation-function", default=None)
+    parser.add_argument("--confidence-function", default=None)
+    parser.add_argument(
+        "--evaluation-params",
+        type=_json_object,
+        default=None,
+        help='Evaluation function parameters as a JSON object, e.g. {"labels": '
+        '["Low", "High"]}.',
+    )
+    parser.add_argument(
+        "--confidence-params",
+        type=_json_object,
+        default=None,
+        help="Confidence function parameters as a JSON object.",
+    )
+    args = parser.parse_args(argv)
+
+    evaluator_kwargs = {
+        name: value
+        for name, value in (
+            ("evaluation_function", args.evaluation_function),
+            ("confidence_function", args.confidence_function),
+            ("evaluation_params", args.evaluation_params),
+            ("confidence_params", args.confidence_params),
+        )
+        if value is not None
+    }
+    try:
+        return ScoringServer.from_file(
+            args.ruleset,
+            evaluator_kwargs,
+            host=args.host,
+            port=args.port,
+            max_latency=args.max_latency_ms / 1000,
+            max_batch_size=args.max_batch_size,
+        )
+    except (OSError, TypeError, ValueError) as error:
+        parser.error(f"cannot serve {args.ruleset}: {error}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Serve a ruleset file over HTTP: `python -m diagnostipy.server ruleset.json`.
+
+    Args:
+        argv: Command line arguments, read from `sys.argv` if omitted.
+    """
+    server = build_server(argv)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+import asyncio
+import json
+import os
+import time
+from http import HTTPStatus
+from typing import Any, Optional
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.server.batching import MicroBatcher
+from diagnostipy.server.metrics import ServerMetrics
+from diagnostipy.utils.serialization import json_default
+
+MAX_BODY_SIZE = 64 * 1024 * 1024
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class HTTPError(Exception):
+    """
+    Error answered with an HTTP status and a JSON message.
+    """
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def load_ruleset(path: str | os.PathLike[str]) -> SymptomRuleset:
+    """
+    Load a ruleset serialized with `SymptomRuleset.to_dict` from a JSON file.
+
+    Args:
+        path: The JSON file.
+
+    Returns:
+        The ruleset.
+    """
+    with open(path, encoding="utf-8") as file:
+        return SymptomRuleset.from_dict(json.load(file))
+
+
+class ScoringServer:
+    """
+    Minimal HTTP/1.1 scoring server built on asyncio, without dependencies.
+
+    Routes:
+        POST /score: Score a JSON object (one record) or a JSON array of records. \
+        Responds with one diagnosis object or an array of diagnoses, with 400 \
+        if a record has values the rules cannot be evaluated on, or with 500 if \
+        scoring failed for another reason.
+        GET /metrics: Throughput, latency and batch size statistics in the \
+        Prometheus text format.
+        GET /health: Responds with {"status": "ok"}.
+
+    Concurrent scoring requests are micro-batched by a `MicroBatcher`, so records
+    arriving within `max_latency` seconds of each other are scored with one
+    vectorized batch evaluation. The evaluator is checked with `Evaluator.check`
+    when the server is created, so a misconfigured evaluator fails at startup
+    instead of answering every request with an error.
+
+    Attributes:
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free port, and the bound port is \
+        stored once the server has started.
+        batcher (MicroBatcher): The batcher scoring all requests.
+        metrics (ServerMetrics): Server statistics.
+    """
+
+    def __init__(
+        self,
+        evaluator: Evaluator,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_latency: float = 0.005,
+        max_batch_size: int = 1024,
+    ):
+        evaluator.check()
+        self.host = host
+        self.port = port
+        self.metrics = ServerMetrics()
+        self.metrics.timeouts = evaluator.timeout_metrics
+        self.batcher = MicroBatcher(
+            evaluator, max_latency, max_batch_size, metrics=self.metrics
+        )
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | os.PathLike[str],
+        evaluator_kwargs: Optional[dict[str, Any]] = None,
+        **kwargs,
+    ) -> "ScoringServer":
+        """
+        Create a server for a ruleset serialized as JSON.
+
+        Args:
+            path: The ruleset file, as written from `SymptomRuleset.to_dict`.
+            evaluator_kwargs: Keyword arguments passed to `Evaluator`.
+            **kwargs: Keyword arguments passed to the server.
+
+        Returns:
+            The server, not yet started.
+
+        Raises:
+            TypeError: If the evaluator is missing scoring parameters.
+            ValueError: If the evaluator's scoring parameters are invalid.
+        """
+        evaluator = Evaluator(load_ruleset(path), **(evaluator_kwargs or {}))
+        return cls(evaluator, **kwargs)
+
+    async def start(self) -> None:
+        """
+        Start listening for connections.
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """
+        Start the server if needed and serve until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Stop accepting connections and finish the pending batches.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.close()
+
+    async def __aenter__(self) -> "ScoringServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve requests on a connection until the client closes it.
+        """
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as error:
+                    self.metrics.errors += 1
+                    message = json.dumps({"error": error.message}).encode()
+                    _write_response(
+                        writer, error.status, "application/json", message, False
+                    )
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, content_type, payload = await self._respond(method, path, body)
+                _write_response(writer, status, content_type, payload, keep_alive)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[HTTPStatus, str, bytes]:
+        """
+        Route a request and build the response status, content type and body.
+        """
+        try:
+            if path == "/score":
+                _require_method(method, "POST")
+                return HTTPStatus.OK, "application/json", await self._score(body)
+            if path == "/metrics":
+                _require_method(method, "GET")
+                return (
+                    HTTPStatus.OK,
+                    METRICS_CONTENT_TYPE,
+                    self.metrics.render().encode(),
+                )
+            if path == "/health":
+                _require_method(method, "GET")
+                return HTTPStatus.OK, "application/json", b'{"status": "ok"}'
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}.")
+        except HTTPError as error:
+            self.metrics.errors += 1
+            message = json.dumps({"error": error.message}).encode()
+            return error.status, "application/json", message
+
+    async def _score(self, body: bytes) -> bytes:
+        """
+        Score the records of a request body and serialize the diagnoses.
+        """
+        start = time.perf_counter()
+        try:
+            data = json.loads(body)
+        except ValueError as error:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {error}")
+        if not isinstance(data, (dict, list)):
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, "Expected a record object or an array."
+            )
+
+        records = data if isinstance(data, list) else [data]
+        try:
+            diagnoses = await self.batcher.submit(records)
+        except (TypeError, ValueError) as error:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid record: {error}")
+        except Exception:
+            raise HTTPError(
+                HTTPStatus.INTERNAL_SERVER_ERROR, "Records could not be scored."
+            )
+
+        results = [diagnosis.model_dump() for diagnosis in diagnoses]
+        payload = json.dumps(
+            results if isinstance(data, list) else results[0], default=json_default
+        ).encode()
+
+        self.metrics.requests += 1
+        self.metrics.records += len(records)
+        self.metrics.request_latency.observe(time.perf_counter() - start)
+        return payload
+
+
+def _require_method(method: str, expected: str) -> None:
+    if method != expected:
+        raise HTTPError(
+            HTTPStatus.METHOD_NOT_ALLOWED, f"Use {expected} for this route."
+        )
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[tuple[str, str, dict[str, str], bytes]]:
+    """
+    Read one request from a connection.
+
+    Returns:
+        The method, path without query string, lower-cased headers and body, or \
+        None if the client closed the connection.
+
+    Raises:
+        HTTPError: If the request is malformed or its body is too large.
+    """
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+    method, target, _ = parts
+
+    headers = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = _content_length(headers)
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+def _content_length(headers: dict[str, str]) -> int:
+    """
+    Read the body length of a request.
+
+    Raises:
+        HTTPError: If the length is not a non-negative integer or is too large.
+    """
+    value = headers.get("content-length", "").strip()
+    if not value:
+        return 0
+    if not (value.isascii() and value.isdigit()):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+    length = int(value)
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large.")
+    return length
+
+
+def _write_response(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    content_type: str,
+    body: bytes,
+    keep_alive: bool,
+) -> None:
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
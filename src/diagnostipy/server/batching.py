@@ -0,0 +1,159 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.diagnosis import DiagnosisBase
+from diagnostipy.server.metrics import ServerMetrics
+
+
+class MicroBatcher:
+    """
+    Collects records submitted by concurrent requests and scores them together.
+
+    The first pending submission opens a batching window of `max_latency`
+    seconds; everything submitted before it closes, or until `max_batch_size`
+    records are pending, is evaluated with a single `Evaluator.run_batch` call.
+    Batches run one at a time on a worker thread, so the event loop keeps
+    accepting requests while a batch is scored and the evaluator is never used
+    concurrently. A record that fails evaluation only fails its own submission.
+
+    Attributes:
+        evaluator (Evaluator): The evaluator scoring every batch.
+        max_latency (float): Seconds to wait for more records before scoring.
+        max_batch_size (int): Number of pending records that triggers scoring \
+        immediately.
+        metrics (ServerMetrics): Statistics updated with every batch.
+    """
+
+    def __init__(
+        self,
+        evaluator: Evaluator,
+        max_latency: float = 0.005,
+        max_batch_size: int = 1024,
+        metrics: Optional[ServerMetrics] = None,
+    ):
+        if max_latency < 0:
+            raise ValueError("`max_latency` must not be negative.")
+        if max_batch_size < 1:
+            raise ValueError("`max_batch_size` must be a positive integer.")
+
+        self.evaluator = evaluator
+        self.max_latency = max_latency
+        self.max_batch_size = max_batch_size
+        self.metrics = metrics or ServerMetrics()
+        self._pending: list[tuple[list[Any], asyncio.Future[list[DiagnosisBase]]]] = []
+        self._pending_records = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._lock = asyncio.Lock()
+
+    async def submit(self, records: list[Any]) -> list[DiagnosisBase]:
+        """
+        Score records as part of the next batch.
+
+        Args:
+            records: Input records, either dictionaries or objects with attributes.
+
+        Returns:
+            One diagnosis per record, in input order.
+        """
+        if not records:
+            return []
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[DiagnosisBase]] = loop.create_future()
+        self._pending.append((records, future))
+        self._pending_records += len(records)
+
+        if self._pending_records >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """
+        Close the batching window and schedule the pending records for scoring.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        pending, self._pending, self._pending_records = self._pending, [], 0
+        task = asyncio.get_running_loop().create_task(self._score(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _score(
+        self, pending: list[tuple[list[Any], asyncio.Future[list[DiagnosisBase]]]]
+    ) -> None:
+        """
+        Evaluate a batch and hand every submission its slice of the diagnoses.
+        """
+        chunks = [chunk for chunk, _ in pending]
+        async with self._lock:
+            start = time.perf_counter()
+            outcomes = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._evaluate, chunks
+            )
+
+        self.metrics.batches += 1
+        self.metrics.batch_size.observe(sum(map(len, chunks)))
+        self.metrics.batch_latency.observe(time.perf_counter() - start)
+
+        for (_, future), outcome in zip(pending, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def _evaluate(
+        self, chunks: list[list[Any]]
+    ) -> list[list[DiagnosisBase] | Exception]:
+        """
+        Score the records of several submissions with one batch evaluation.
+
+        If the batch fails, every submission is scored again on its own, so only
+        the submissions with offending records receive an error, and only their
+        own.
+
+        Returns:
+            For each submission, its diagnoses or the error it raised.
+        """
+        try:
+            diagnoses = self.evaluator.run_batch(
+                [record for chunk in chunks for record in chunk]
+            )
+        except Exception as error:
+            if len(chunks) == 1:
+                return [error]
+            return [self._evaluate_alone(chunk) for chunk in chunks]
+
+        outcomes: list[list[DiagnosisBase] | Exception] = []
+        offset = 0
+        for chunk in chunks:
+            outcomes.append(diagnoses[offset : offset + len(chunk)])
+            offset += len(chunk)
+        return outcomes
+
+    def _evaluate_alone(self, records: list[Any]) -> list[DiagnosisBase] | Exception:
+        try:
+            return self.evaluator.run_batch(records)
+        except Exception as error:
+            return error
+
+    async def close(self) -> None:
+        """
+        Score the pending records, wait for running batches and stop the worker.
+        """
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True)
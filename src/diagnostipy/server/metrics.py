@@ -0,0 +1,145 @@
+import time
+from bisect import bisect_left
+from typing import Optional, Sequence
+
+from diagnostipy.core.timeouts import TimeoutMetrics
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+class Histogram:
+    """
+    Cumulative histogram in the Prometheus exposition format.
+
+    Attributes:
+        name (str): Metric name.
+        help (str): Description of the metric.
+        buckets (tuple[float, ...]): Upper bounds of the buckets, ascending.
+        counts (list[int]): Observations per bucket, with a last bucket for \
+        values above every bound.
+        sum (float): Sum of all observations.
+        count (int): Number of observations.
+    """
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: The observed value.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self) -> list[str]:
+        """
+        Format the histogram as exposition lines.
+
+        Returns:
+            The HELP, TYPE, bucket, sum and count lines.
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        lines += [f"{self.name}_sum {self.sum}", f"{self.name}_count {self.count}"]
+        return lines
+
+
+class ServerMetrics:
+    """
+    Throughput and latency statistics of a scoring server.
+
+    Attributes:
+        requests (int): Scoring requests served.
+        records (int): Records scored.
+        batches (int): Batch evaluations run.
+        errors (int): Requests that failed.
+        request_latency (Histogram): Seconds from receiving a scoring request to \
+        its response, including the batching window.
+        batch_latency (Histogram): Seconds spent evaluating each batch.
+        batch_size (Histogram): Records per batch evaluation.
+        timeouts (Optional[TimeoutMetrics]): Rule timeout statistics of a \
+        time-bounded evaluator, rendered along with the server metrics.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.records = 0
+        self.batches = 0
+        self.errors = 0
+        self.request_latency = Histogram(
+            "diagnostipy_request_latency_seconds",
+            "Scoring request latency in seconds.",
+            LATENCY_BUCKETS,
+        )
+        self.batch_latency = Histogram(
+            "diagnostipy_batch_latency_seconds",
+            "Batch evaluation time in seconds.",
+            LATENCY_BUCKETS,
+        )
+        self.batch_size = Histogram(
+            "diagnostipy_batch_size_records",
+            "Records per batch evaluation.",
+            BATCH_SIZE_BUCKETS,
+        )
+        self.timeouts: Optional[TimeoutMetrics] = None
+
+    @property
+    def uptime(self) -> float:
+        """
+        Seconds since the metrics were created.
+        """
+        return time.monotonic() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """
+        Records scored per second of uptime.
+        """
+        uptime = self.uptime
+        return self.records / uptime if uptime > 0 else 0.0
+
+    def render(self) -> str:
+        """
+        Format all metrics in the Prometheus text exposition format.
+
+        Returns:
+            The metrics document.
+        """
+        counters = [
+            ("requests_total", "Scoring requests served.", self.requests),
+            ("records_total", "Records scored.", self.records),
+            ("batches_total", "Batch evaluations run.", self.batches),
+            ("errors_total", "Failed requests.", self.errors),
+        ]
+        lines = []
+        for name, help, value in counters:
+            lines += [
+                f"# HELP diagnostipy_{name} {help}",
+                f"# TYPE diagnostipy_{name} counter",
+                f"diagnostipy_{name} {value}",
+            ]
+        lines += [
+            "# HELP diagnostipy_throughput_records_per_second Records scored per "
+            "second of uptime.",
+            "# TYPE diagnostipy_throughput_records_per_second gauge",
+            f"diagnostipy_throughput_records_per_second {self.throughput}",
+        ]
+        for histogram in (self.request_latency, self.batch_latency, self.batch_size):
+            lines += histogram.render()
+        if self.timeouts is not None:
+            lines += self.timeouts.render()
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,110 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TypeVar
+
+import numpy as np
+
+from diagnostipy.core.mapped import MappedRecords
+from diagnostipy.core.sparse import SparseRecords
+from diagnostipy.utils.enums import Parallelism
+
+R = TypeVar("R")
+
+_worker_func: Optional[Callable[[Any], Any]] = None
+
+
+def iter_chunks(
+    records: Iterable[Any] | np.ndarray | SparseRecords | MappedRecords,
+    chunk_size: int,
+) -> Iterator[Sequence[Any] | np.ndarray | SparseRecords]:
+    """
+    Split records into chunks without materialising the whole dataset.
+
+    Args:
+        records: Input records, an encoded matrix, sparse records, mapped records \
+        (yielded as decoded matrices), or any iterable of records.
+        chunk_size: Maximum number of records per chunk.
+
+    Yields:
+        Consecutive chunks of records.
+    """
+    if chunk_size < 1:
+        raise ValueError("`chunk_size` must be a positive integer.")
+
+    if isinstance(records, (np.ndarray, SparseRecords, MappedRecords, list, tuple)):
+        for start in range(0, len(records), chunk_size):
+            yield records[start : start + chunk_size]
+        return
+
+    iterator = iter(records)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _init_worker(func: Callable[[Any], Any]) -> None:
+    """
+    Store the chunk function in a worker process, so it is sent only once.
+    """
+    global _worker_func
+    _worker_func = func
+
+
+def _call_worker(chunk: Any) -> Any:
+    assert _worker_func is not None
+    return _worker_func(chunk)
+
+
+def map_chunks(
+    func: Callable[[Any], R],
+    chunks: Iterable[Any],
+    n_jobs: int = 1,
+    parallelism: Parallelism | str = Parallelism.THREADS,
+) -> Iterator[R]:
+    """
+    Apply a function to each chunk, optionally on a pool of workers.
+
+    Threads share the GIL, so with `Parallelism.THREADS` only code that releases
+    it, such as NumPy operations on large arrays, runs in parallel; Python-level
+    work such as reading fields from records does not get faster with more
+    threads. `Parallelism.PROCESSES` runs chunks on `n_jobs` processes and uses
+    as many cores, but `func` and every chunk must be picklable, e.g. rules
+    without lambda `apply_condition` functions. `func` is sent to each process
+    once.
+
+    At most `2 * n_jobs` chunks are in flight at once, so memory stays bounded
+    regardless of the number of chunks. Results are yielded in input order.
+
+    Args:
+        func: Function applied to every chunk.
+        chunks: Chunks to process.
+        n_jobs: Number of workers.
+        parallelism: Whether the workers are threads or processes.
+
+    Yields:
+        The result of `func` for each chunk.
+    """
+    if n_jobs < 1:
+        raise ValueError("`n_jobs` must be a positive integer.")
+
+    if n_jobs == 1:
+        yield from map(func, chunks)
+        return
+
+    executor: Executor
+    if Parallelism(parallelism) == Parallelism.PROCESSES:
+        executor = ProcessPoolExecutor(
+            n_jobs, initializer=_init_worker, initargs=(func,)
+        )
+        func = _call_worker
+    else:
+        executor = ThreadPoolExecutor(max_workers=n_jobs)
+
+    with executor:
+        pending: deque[Future[R]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= 2 * n_jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -6,9 +6,37 @@ class EvaluationFunctionEnum(str, Enum):
     BINARY_SCORING_BASED = "binary_scoring_based"
     MULTICLASS_SIMPLE = "multiclass_simple"
     MULTICLASS_SCORING_BASED = "multiclass_scoring_based"
+    BAYESIAN = "bayesian"
 
 
 class ConfidenceFunctionEnum(str, Enum):
     WEIGHTED = "weighted"
     ENTROPY = "entropy"
     RULE_COVERAGE = "rule_coverage"
+    POSTERIOR = "posterior"
+
+
+class SolverMode(str, Enum):
+    GREEDY = "greedy"
+    EXACT = "exact"
+    AUTO = "auto"
+
+
+class Comparator(str, Enum):
+    GT = ">"
+    GE = ">="
+    LT = "<"
+    LE = "<="
+    EQ = "=="
+    NE = "!="
+
+
+class TimeoutPolicy(str, Enum):
+    SKIP = "skip"
+    RAISE = "raise"
+    DEGRADE = "degrade"
+
+
+class Parallelism(str, Enum):
+    THREADS = "threads"
+    PROCESSES = "processes"
@@ -1,21 +1,38 @@
+from typing import Any, Callable, Optional
+
 from diagnostipy.utils.enums import ConfidenceFunctionEnum, EvaluationFunctionEnum
 from diagnostipy.utils.scoring.confidence_functions import (
     entropy_based_confidence,
+    posterior_confidence,
     rule_coverage_confidence,
     weighted_confidence,
 )
 from diagnostipy.utils.scoring.evaluation_functions import (
+    bayesian,
     binary_scoring_based,
     binary_simple,
     multiclass_scoring_based,
     multiclass_simple,
 )
+from diagnostipy.utils.scoring.strategies import (
+    BayesianStrategy,
+    BinaryScoringBasedStrategy,
+    BinarySimpleStrategy,
+    ConfidenceStrategy,
+    EvaluationStrategy,
+    MaxRulesConfidenceStrategy,
+    MaxWeightConfidenceStrategy,
+    MulticlassScoringBasedStrategy,
+    MulticlassSimpleStrategy,
+    PosteriorConfidenceStrategy,
+)
 from diagnostipy.utils.scoring.types import ConfidenceFunction, EvaluationFunction
 
 CONFIDENCE_FUNCTIONS: dict[ConfidenceFunctionEnum, ConfidenceFunction] = {
     ConfidenceFunctionEnum.WEIGHTED: weighted_confidence,
     ConfidenceFunctionEnum.ENTROPY: entropy_based_confidence,
     ConfidenceFunctionEnum.RULE_COVERAGE: rule_coverage_confidence,
+    ConfidenceFunctionEnum.POSTERIOR: posterior_confidence,
 }
 
 EVALUATION_FUNCTIONS: dict[EvaluationFunctionEnum, EvaluationFunction] = {
@@ -23,4 +40,86 @@ EVALUATION_FUNCTIONS: dict[EvaluationFunctionEnum, EvaluationFunction] = {
     EvaluationFunctionEnum.BINARY_SCORING_BASED: binary_scoring_based,
     EvaluationFunctionEnum.MULTICLASS_SIMPLE: multiclass_simple,
     EvaluationFunctionEnum.MULTICLASS_SCORING_BASED: multiclass_scoring_based,
+    EvaluationFunctionEnum.BAYESIAN: bayesian,
+}
+
+# Names in `batch_functions`, which loads NumPy and is imported on first batch.
+BATCH_EVALUATION_FUNCTIONS: dict[Callable[..., Any], str] = {
+    binary_simple: "binary_simple_batch",
+    binary_scoring_based: "binary_scoring_based_batch",
+    multiclass_simple: "multiclass_simple_batch",
+    multiclass_scoring_based: "multiclass_scoring_based_batch",
+    bayesian: "bayesian_batch",
+}
+
+BATCH_CONFIDENCE_FUNCTIONS: dict[Callable[..., Any], str] = {
+    weighted_confidence: "weighted_confidence_batch",
+    entropy_based_confidence: "entropy_based_confidence_batch",
+    rule_coverage_confidence: "rule_coverage_confidence_batch",
+    posterior_confidence: "posterior_confidence_batch",
+}
+
+EVALUATION_STRATEGIES: dict[Callable[..., Any], type[EvaluationStrategy]] = {
+    binary_simple: BinarySimpleStrategy,
+    binary_scoring_based: BinaryScoringBasedStrategy,
+    multiclass_simple: MulticlassSimpleStrategy,
+    multiclass_scoring_based: MulticlassScoringBasedStrategy,
+    bayesian: BayesianStrategy,
+}
+
+CONFIDENCE_STRATEGIES: dict[Callable[..., Any], type[ConfidenceStrategy]] = {
+    weighted_confidence: MaxWeightConfidenceStrategy,
+    entropy_based_confidence: MaxRulesConfidenceStrategy,
+    rule_coverage_confidence: MaxRulesConfidenceStrategy,
+    posterior_confidence: PosteriorConfidenceStrategy,
 }
+
+
+def build_evaluation_strategy(
+    function: EvaluationFunction, params: Optional[dict[str, Any]] = None
+) -> EvaluationStrategy:
+    """
+    Configure an evaluation function with its parameters.
+
+    Args:
+        function: A built-in or custom evaluation function, or an already \
+        configured strategy.
+        params: Keyword arguments for the function.
+
+    Returns:
+        The evaluation strategy.
+    """
+    if isinstance(function, EvaluationStrategy):
+        if params:
+            raise ValueError("Parameters cannot be given for a configured strategy.")
+        return function
+
+    strategy_type = EVALUATION_STRATEGIES.get(function, EvaluationStrategy)
+    return strategy_type(
+        function, BATCH_EVALUATION_FUNCTIONS.get(function), **(params or {})
+    )
+
+
+def build_confidence_strategy(
+    function: ConfidenceFunction, params: Optional[dict[str, Any]] = None
+) -> ConfidenceStrategy:
+    """
+    Configure a confidence function with its parameters.
+
+    Args:
+        function: A built-in or custom confidence function, or an already \
+        configured strategy.
+        params: Keyword arguments for the function.
+
+    Returns:
+        The confidence strategy.
+    """
+    if isinstance(function, ConfidenceStrategy):
+        if params:
+            raise ValueError("Parameters cannot be given for a configured strategy.")
+        return function
+
+    strategy_type = CONFIDENCE_STRATEGIES.get(function, ConfidenceStrategy)
+    return strategy_type(
+        function, BATCH_CONFIDENCE_FUNCTIONS.get(function), **(params or {})
+    )
@@ -0,0 +1,321 @@
+import math
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from diagnostipy.core.models.evaluation import BaseEvaluation, BayesianEvaluation
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+from diagnostipy.utils.scoring.thresholds import ThresholdTable
+
+
+class BatchEvaluation:
+    """
+    Evaluation results for a batch of records, stored as arrays.
+
+    Attributes:
+        labels (np.ndarray): Object array of labels.
+        scores (np.ndarray): Float array of scores.
+        next_thresholds (np.ndarray): Float array with the threshold of the next \
+        label, NaN where the label is already the highest one.
+    """
+
+    __slots__ = ("labels", "scores", "next_thresholds")
+
+    def __init__(
+        self, labels: np.ndarray, scores: np.ndarray, next_thresholds: np.ndarray
+    ):
+        self.labels = labels
+        self.scores = scores
+        self.next_thresholds = next_thresholds
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, row: int) -> BaseEvaluation:
+        next_threshold = float(self.next_thresholds[row])
+        return BaseEvaluation(
+            label=self.labels[row],
+            score=float(self.scores[row]),
+            next_threshold=None if np.isnan(next_threshold) else next_threshold,
+        )
+
+
+class BayesianBatchEvaluation(BatchEvaluation):
+    """
+    Bayesian evaluation results for a batch of records.
+
+    Attributes:
+        posteriors (np.ndarray): Records x labels array of posterior probabilities.
+        label_names (tuple[str, ...]): Labels, in the column order of `posteriors`.
+    """
+
+    __slots__ = ("posteriors", "label_names")
+
+    def __init__(self, posteriors: np.ndarray, label_names: Sequence[str]):
+        self.posteriors = posteriors
+        self.label_names = tuple(label_names)
+        best = posteriors.argmax(axis=1)
+        super().__init__(
+            np.array(self.label_names, dtype=object)[best],
+            posteriors[np.arange(len(posteriors)), best],
+            np.full(len(posteriors), np.nan),
+        )
+
+    def __getitem__(self, row: int) -> BayesianEvaluation:
+        return BayesianEvaluation(
+            label=self.labels[row],
+            score=float(self.scores[row]),
+            posteriors=dict(zip(self.label_names, self.posteriors[row].tolist())),
+        )
+
+
+def _apply_score_function(
+    score_function: Callable[[float], float], total_scores: np.ndarray
+) -> np.ndarray:
+    """
+    Apply a scalar score function to every score, keeping its exact semantics.
+    """
+    return np.fromiter(
+        (score_function(score) for score in total_scores.tolist()),
+        dtype=np.float64,
+        count=len(total_scores),
+    )
+
+
+def _label(table: ThresholdTable, scores: np.ndarray) -> BatchEvaluation:
+    labels, next_thresholds = table.lookup_many(scores)
+    return BatchEvaluation(labels, scores, next_thresholds)
+
+
+def binary_simple_batch(
+    total_scores: np.ndarray,
+    *args,
+    max_possible_weight: float,
+    **kwargs,
+) -> BatchEvaluation:
+    """
+    Batch counterpart of `binary_simple`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record.
+        max_possible_weight: Maximum possible weight of the ruleset.
+
+    Returns:
+        The batch evaluation.
+    """
+    table = ThresholdTable([max_possible_weight / 2], ["Low", "High"])
+    return _label(table, total_scores)
+
+
+def binary_scoring_based_batch(
+    total_scores: np.ndarray,
+    score_function: Callable[[float], float],
+    score_threshold: float = 0.5,
+    *args,
+    **kwargs,
+) -> BatchEvaluation:
+    """
+    Batch counterpart of `binary_scoring_based`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record.
+        score_function: Function to process the total score.
+        score_threshold: Threshold for categorization.
+
+    Returns:
+        The batch evaluation.
+    """
+    table = ThresholdTable([score_threshold], ["Low", "High"])
+    return _label(table, _apply_score_function(score_function, total_scores))
+
+
+def multiclass_simple_batch(
+    total_scores: np.ndarray,
+    labels: Sequence[str],
+    *args,
+    max_possible_weight: float,
+    threshold_table: Optional[ThresholdTable] = None,
+    **kwargs,
+) -> BatchEvaluation:
+    """
+    Batch counterpart of `multiclass_simple`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record.
+        labels: List of class labels in ascending order of severity.
+        max_possible_weight: Maximum possible weight of the ruleset.
+        threshold_table: Precompiled table from `ThresholdTable.uniform`.
+
+    Returns:
+        The batch evaluation.
+    """
+    if threshold_table is None:
+        threshold_table = ThresholdTable.uniform(labels, max_possible_weight)
+    return _label(threshold_table, total_scores)
+
+
+def multiclass_scoring_based_batch(
+    total_scores: np.ndarray,
+    score_function: Callable[[float], float],
+    threshold_label_map: dict[float, str] | ThresholdTable,
+    *args,
+    **kwargs,
+) -> BatchEvaluation:
+    """
+    Batch counterpart of `multiclass_scoring_based`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record.
+        score_function: Function to process the total score.
+        threshold_label_map: A dictionary mapping thresholds to labels, or a \
+        precompiled table.
+
+    Returns:
+        The batch evaluation.
+    """
+    if not isinstance(threshold_label_map, ThresholdTable):
+        threshold_label_map = ThresholdTable.from_map(threshold_label_map)
+    return _label(
+        threshold_label_map, _apply_score_function(score_function, total_scores)
+    )
+
+
+def bayesian_batch(
+    total_scores: np.ndarray,
+    labels: Sequence[str],
+    priors: Optional[dict[str, float]] = None,
+    *args,
+    mask: np.ndarray,
+    model: Optional[LikelihoodModel] = None,
+    rules: Sequence[SymptomRule] = (),
+    **kwargs,
+) -> BayesianBatchEvaluation:
+    """
+    Batch counterpart of `bayesian`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record. Unused.
+        labels: List of class labels.
+        priors: Prior probability of each label. Uniform if omitted.
+        mask: Boolean array of shape (n_records, n_rules) of applicable rules.
+        model: Likelihood model precompiled from the ruleset's rules.
+        rules: List of all rules, used to build the model if omitted.
+
+    Returns:
+        The batch evaluation.
+    """
+    if model is None:
+        model = LikelihoodModel(labels, priors, rules)
+    return BayesianBatchEvaluation(model.posterior_many(mask), model.labels)
+
+
+def weighted_confidence_batch(
+    total_scores: np.ndarray,
+    *args,
+    mask: np.ndarray,
+    max_possible_weight: float,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Batch counterpart of `weighted_confidence`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record.
+        mask: Boolean array of shape (n_records, n_rules) of applicable rules.
+        max_possible_weight: Maximum possible weight of the ruleset.
+
+    Returns:
+        A float array of confidences.
+    """
+    if max_possible_weight == 0:
+        return np.zeros(len(total_scores))
+    confidences = np.minimum(total_scores / max_possible_weight, 1.0)
+    return np.where(mask.any(axis=1), confidences, 0.0)
+
+
+def entropy_based_confidence_batch(
+    total_scores: np.ndarray,
+    *args,
+    mask: np.ndarray,
+    weights: np.ndarray,
+    max_possible_rule_count: int,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Batch counterpart of `entropy_based_confidence`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record.
+        mask: Boolean array of shape (n_records, n_rules) of applicable rules.
+        weights: Rule weights, shared or per record.
+        max_possible_rule_count: Size of the largest non-overlapping set of rules.
+
+    Returns:
+        A float array of confidences.
+    """
+    applicable = np.where(mask, weights, 0.0)
+    defined = total_scores != 0
+    totals = np.where(defined, total_scores, 1.0)[:, None]
+    probabilities = np.clip(applicable / totals, 1e-9, 1.0)
+    entropy = -np.sum(
+        np.where(applicable != 0, probabilities * np.log(probabilities), 0.0), axis=1
+    )
+
+    max_entropy = (
+        math.log(max_possible_rule_count) if max_possible_rule_count > 1 else 1
+    )
+    confidences = np.minimum(entropy / max_entropy, 1.0)
+    return np.where(mask.any(axis=1) & defined, confidences, 0.0)
+
+
+def rule_coverage_confidence_batch(
+    total_scores: np.ndarray,
+    *args,
+    mask: np.ndarray,
+    max_possible_rule_count: int,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Batch counterpart of `rule_coverage_confidence`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record. Unused.
+        mask: Boolean array of shape (n_records, n_rules) of applicable rules.
+        max_possible_rule_count: Size of the largest non-overlapping set of rules.
+
+    Returns:
+        A float array of confidences.
+    """
+    if max_possible_rule_count == 0:
+        return np.zeros(len(mask))
+    return mask.sum(axis=1) / max_possible_rule_count
+
+
+def posterior_confidence_batch(
+    total_scores: np.ndarray,
+    labels: Sequence[str],
+    priors: Optional[dict[str, float]] = None,
+    *args,
+    mask: np.ndarray,
+    model: Optional[LikelihoodModel] = None,
+    rules: Sequence[SymptomRule] = (),
+    **kwargs,
+) -> np.ndarray:
+    """
+    Batch counterpart of `posterior_confidence`.
+
+    Args:
+        total_scores: Total weight of the applicable rules of each record. Unused.
+        labels: List of class labels.
+        priors: Prior probability of each label. Uniform if omitted.
+        mask: Boolean array of shape (n_records, n_rules) of applicable rules.
+        model: Likelihood model precompiled from the ruleset's rules.
+        rules: List of all rules, used to build the model if omitted.
+
+    Returns:
+        A float array of confidences.
+    """
+    if model is None:
+        model = LikelihoodModel(labels, priors, rules)
+    return model.posterior_many(mask).max(axis=1)
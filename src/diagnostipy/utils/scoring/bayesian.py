@@ -0,0 +1,101 @@
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from diagnostipy.core.models.symptom_rule import SymptomRule
+
+
+class LikelihoodModel:
+    """
+    Precompiled priors and log-likelihood ratios for Bayesian scoring.
+
+    The log-odds of each label start at its log prior and add the
+    `log_likelihood_ratios` of every applicable rule. Posteriors are normalised
+    with log-sum-exp, so large ratios do not overflow. Ratios for labels outside
+    `labels` are ignored.
+
+    Attributes:
+        labels (tuple[str, ...]): Class labels, in column order.
+        log_priors (np.ndarray): Log prior probability of each label.
+        log_ratios (np.ndarray): Rules x labels matrix of log-likelihood ratios \
+        of the compiled rules.
+    """
+
+    __slots__ = ("labels", "log_priors", "log_ratios", "_label_index")
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        priors: Optional[dict[str, float]] = None,
+        rules: Iterable[SymptomRule] = (),
+    ):
+        if len(labels) < 2:
+            raise ValueError(
+                "At least two labels must be provided for Bayesian evaluation."
+            )
+        if len(set(labels)) != len(labels):
+            raise ValueError("Labels must be unique.")
+
+        self.labels = tuple(labels)
+        self._label_index = {label: col for col, label in enumerate(self.labels)}
+        self.log_priors = self._compile_priors(priors)
+
+        rows = [self._ratio_vector(rule) for rule in rules]
+        self.log_ratios = np.array(rows) if rows else np.zeros((0, len(self.labels)))
+
+    def _compile_priors(self, priors: Optional[dict[str, float]]) -> np.ndarray:
+        if priors is None:
+            return np.full(len(self.labels), -np.log(len(self.labels)))
+
+        if set(priors) != set(self.labels):
+            raise ValueError("Priors must be given for exactly the provided labels.")
+        values = np.array([priors[label] for label in self.labels], dtype=np.float64)
+        if np.any(values <= 0):
+            raise ValueError("Priors must be positive.")
+        return np.log(values / values.sum())
+
+    def _ratio_vector(self, rule: SymptomRule) -> np.ndarray:
+        vector = np.zeros(len(self.labels))
+        for label, ratio in (rule.log_likelihood_ratios or {}).items():
+            column = self._label_index.get(label)
+            if column is not None:
+                vector[column] = ratio
+        return vector
+
+    def posterior(self, applicable_rules: Iterable[SymptomRule]) -> list[float]:
+        """
+        Compute the posterior probabilities of a single record.
+
+        Args:
+            applicable_rules: The applicable rules of the record.
+
+        Returns:
+            The posterior probability of each label.
+        """
+        from diagnostipy.utils.scoring.kernels import KERNELS
+
+        rules = list(applicable_rules)
+        return KERNELS["posterior"](len(rules) * len(self.labels), self, rules)
+
+    def posterior_many(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Compute the posterior probabilities of many records at once.
+
+        Args:
+            mask: Boolean array of shape (n_records, n_rules) of applicable rules, \
+            aligned with the rules the model was built from.
+
+        Returns:
+            An array of shape (n_records, n_labels) of posterior probabilities.
+        """
+        if mask.shape[1] != len(self.log_ratios):
+            raise ValueError("The mask does not match the rules of the model.")
+        return _softmax(mask.astype(np.float64) @ self.log_ratios + self.log_priors)
+
+
+def _softmax(log_odds: np.ndarray) -> np.ndarray:
+    """
+    Normalise rows of log-odds to probabilities with log-sum-exp.
+    """
+    shifted = log_odds - log_odds.max(axis=1, keepdims=True)
+    return np.exp(shifted - np.log(np.exp(shifted).sum(axis=1, keepdims=True)))
@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable, Optional
+
+from diagnostipy.core.models.evaluation import BaseEvaluation
+
+if TYPE_CHECKING:
+    from diagnostipy.core.index import RuleIndex
+
+CachedScore = tuple[BaseEvaluation, float]
+
+
+class ScoreCache:
+    """
+    Bounded LRU cache of evaluation results and confidences, keyed by the set of
+    applicable rules.
+
+    Scores only depend on the applicable rules after overlap exclusion, so
+    records with different symptoms but the same applicable set share one entry.
+    The cache is bound to a ruleset snapshot and cleared when the ruleset is
+    recompiled.
+
+    Attributes:
+        maxsize (int): Maximum number of entries.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to be scored.
+        evictions (int): Entries dropped to stay within `maxsize`.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be a positive integer.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, CachedScore] = OrderedDict()
+        self._compiled: Optional["RuleIndex"] = None
+
+    @staticmethod
+    def key(
+        fired: tuple[int, ...],
+        weights: Optional[dict[int, Optional[float]]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Optional[Hashable]:
+        """
+        Build the fingerprint of a scoring call.
+
+        Args:
+            fired: Indices of the applicable rules, in ascending order.
+            weights: Record-specific weights of graded rules, by rule index.
+            args: Positional arguments for the evaluation and confidence functions.
+            kwargs: Keyword arguments for the evaluation and confidence functions.
+
+        Returns:
+            A hashable key, or None if the arguments are not hashable and the \
+            call cannot be cached.
+        """
+        key = (
+            fired,
+            tuple(sorted(weights.items())) if weights else (),
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def bind(self, compiled: "RuleIndex") -> None:
+        """
+        Attach the cache to a ruleset snapshot, clearing it if the ruleset changed.
+
+        Args:
+            compiled: The compiled ruleset the cached scores belong to.
+        """
+        if compiled is not self._compiled:
+            self._entries.clear()
+            self._compiled = compiled
+
+    def get(self, key: Hashable) -> Optional[CachedScore]:
+        """
+        Look up a cached score, marking it as recently used.
+
+        Args:
+            key: The key built by `key`.
+
+        Returns:
+            The cached evaluation and confidence, or None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, value: CachedScore) -> None:
+        """
+        Store a score, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The key built by `key`.
+            value: The evaluation and confidence.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the statistics.
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Share of lookups answered from the cache, i.e. the deduplication ratio.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Summarise the cache usage.
+
+        Returns:
+            A dictionary with the size, hits, misses, evictions and hit ratio.
+        """
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hit_ratio,
+        }
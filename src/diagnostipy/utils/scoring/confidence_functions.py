@@ -1,16 +1,20 @@
-import numpy as np
+import math
+from typing import TYPE_CHECKING, Optional, Sequence
 
 from diagnostipy.core.models.symptom_rule import SymptomRule
-from diagnostipy.utils.scoring.helpers import (
-    calculate_max_possible_rules,
-    calculate_max_possible_weight,
-)
+from diagnostipy.utils.scoring.summary import ScoringSummary, uses_summary
 
+if TYPE_CHECKING:
+    from diagnostipy.utils.scoring.bayesian import LikelihoodModel
 
+
+@uses_summary
 def weighted_confidence(
     applicable_rules: list[SymptomRule],
     all_rules: list[SymptomRule],
     *args,
+    max_possible_weight: Optional[float] = None,
+    summary: Optional[ScoringSummary] = None,
     **kwargs,
 ) -> float:
     """
@@ -19,15 +23,22 @@ def weighted_confidence(
     Args:
         applicable_rules: List of applicable rules.
         all_rules: List of all rules in the ruleset.
+        max_possible_weight: Precomputed maximum possible weight of `all_rules`. \
+        Computed from `all_rules` if omitted.
+        summary: Shared summary of `applicable_rules`. Computed if omitted.
 
     Returns:
         Confidence score as a float between 0 and 1.
     """
-    if not applicable_rules:
+    if summary is None:
+        summary = ScoringSummary(applicable_rules)
+
+    if not summary.count:
         return 0.0
 
-    total_weight = sum(rule.weight for rule in applicable_rules if rule.weight)
-    max_possible_weight = calculate_max_possible_weight(all_rules)
+    total_weight = summary.total_weight
+    if max_possible_weight is None:
+        max_possible_weight = summary.max_possible_weight(all_rules)
 
     if max_possible_weight == 0:
         return 0.0
@@ -35,10 +46,13 @@ def weighted_confidence(
     return min(total_weight / max_possible_weight, 1.0)
 
 
+@uses_summary
 def entropy_based_confidence(
     applicable_rules: list[SymptomRule],
     all_rules: list[SymptomRule],
     *args,
+    max_possible_rule_count: Optional[int] = None,
+    summary: Optional[ScoringSummary] = None,
     **kwargs,
 ) -> float:
     """
@@ -47,35 +61,43 @@ def entropy_based_confidence(
     Args:
         applicable_rules: List of applicable rules.
         all_rules: List of all rules in the ruleset.
+        max_possible_rule_count: Precomputed size of the largest non-overlapping \
+        set of `all_rules`. Computed from `all_rules` if omitted.
+        summary: Shared summary of `applicable_rules`. Computed if omitted.
 
     Returns:
         Confidence score as a float between 0 and 1.
     """
-    if not applicable_rules:
-        return 0.0
+    if summary is None:
+        summary = ScoringSummary(applicable_rules)
 
-    weights = np.array([rule.weight for rule in applicable_rules if rule.weight])
-
-    if weights.sum() == 0:
+    if not summary.count or summary.total_weight == 0:
         return 0.0
 
-    probabilities = weights / weights.sum()
-    probabilities = np.clip(probabilities, 1e-9, 1.0)
+    from diagnostipy.utils.scoring.kernels import KERNELS
 
-    entropy = -np.sum(probabilities * np.log(probabilities))
+    entropy = KERNELS["entropy"](
+        len(summary.weights), summary.weights, summary.total_weight
+    )
 
-    max_possible_rules = calculate_max_possible_rules(all_rules)
-    max_entropy = np.log(len(max_possible_rules)) if len(max_possible_rules) > 1 else 1
+    if max_possible_rule_count is None:
+        max_possible_rule_count = summary.max_possible_rule_count(all_rules)
+    max_entropy = (
+        math.log(max_possible_rule_count) if max_possible_rule_count > 1 else 1
+    )
 
     normalized_entropy = entropy / max_entropy if max_entropy > 0 else 0.0
 
     return min(normalized_entropy, 1.0)
 
 
+@uses_summary
 def rule_coverage_confidence(
     applicable_rules: list[SymptomRule],
     all_rules: list[SymptomRule],
     *args,
+    max_possible_rule_count: Optional[int] = None,
+    summary: Optional[ScoringSummary] = None,
     **kwargs,
 ) -> float:
     """
@@ -84,13 +106,51 @@ def rule_coverage_confidence(
     Args:
         applicable_rules: List of applicable rules.
         all_rules: List of all rules in the ruleset.
+        max_possible_rule_count: Precomputed size of the largest non-overlapping \
+        set of `all_rules`. Computed from `all_rules` if omitted.
+        summary: Shared summary of `applicable_rules`. Computed if omitted.
 
     Returns:
         Confidence score as a float between 0 and 1.
     """
-    max_possible_rules = calculate_max_possible_rules(all_rules)
+    if summary is None:
+        summary = ScoringSummary(applicable_rules)
+
+    if max_possible_rule_count is None:
+        max_possible_rule_count = summary.max_possible_rule_count(all_rules)
 
-    if len(max_possible_rules) == 0:
+    if max_possible_rule_count == 0:
         return 0.0
 
-    return len(applicable_rules) / len(max_possible_rules)
+    return summary.count / max_possible_rule_count
+
+
+def posterior_confidence(
+    applicable_rules: list[SymptomRule],
+    all_rules: list[SymptomRule],
+    labels: Sequence[str],
+    priors: Optional[dict[str, float]] = None,
+    *args,
+    model: Optional["LikelihoodModel"] = None,
+    **kwargs,
+) -> float:
+    """
+    Calculate confidence as the posterior probability of the most probable label.
+
+    Args:
+        applicable_rules: List of applicable rules.
+        all_rules: List of all rules in the ruleset.
+        labels: List of class labels.
+        priors: Prior probability of each label. Uniform if omitted.
+        model: Precompiled likelihood model. If given, `labels` and `priors` are \
+        not validated or used.
+
+    Returns:
+        Confidence score as a float between 0 and 1.
+    """
+    if model is None:
+        from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+
+        model = LikelihoodModel(labels, priors)
+
+    return float(max(model.posterior(applicable_rules)))
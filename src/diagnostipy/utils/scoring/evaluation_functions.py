@@ -1,14 +1,21 @@
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
 
-from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.models.evaluation import BaseEvaluation, BayesianEvaluation
 from diagnostipy.core.models.symptom_rule import SymptomRule
-from diagnostipy.utils.scoring.helpers import calculate_max_possible_weight
+from diagnostipy.utils.scoring.summary import ScoringSummary, uses_summary
+from diagnostipy.utils.scoring.thresholds import ThresholdTable
 
+if TYPE_CHECKING:
+    from diagnostipy.utils.scoring.bayesian import LikelihoodModel
 
+
+@uses_summary
 def binary_simple(
     applicable_rules: list[SymptomRule],
     all_rules: list[SymptomRule],
     *args,
+    max_possible_weight: Optional[float] = None,
+    summary: Optional[ScoringSummary] = None,
     **kwargs,
 ) -> BaseEvaluation:
     """
@@ -18,25 +25,39 @@ def binary_simple(
     Args:
         applicable_rules: List of applicable rules.
         all_rules: List of all rules in the ruleset.
+        max_possible_weight: Precomputed maximum possible weight of `all_rules`. \
+        Computed from `all_rules` if omitted.
+        summary: Shared summary of `applicable_rules`. Computed if omitted.
 
     Returns:
         A binary evaluation result (High/Low).
     """
-    total_score = sum(rule.weight or 0 for rule in applicable_rules)
-    total_possible_score = calculate_max_possible_weight(all_rules)
+    if summary is None:
+        summary = ScoringSummary(applicable_rules)
+
+    total_score = summary.total_weight
+    total_possible_score = (
+        max_possible_weight
+        if max_possible_weight is not None
+        else summary.max_possible_weight(all_rules)
+    )
+
+    threshold = total_possible_score / 2
 
-    if total_score >= (total_possible_score / 2):
+    if total_score >= threshold:
         return BaseEvaluation(label="High", score=total_score)
     else:
-        return BaseEvaluation(label="Low", score=total_score)
+        return BaseEvaluation(label="Low", score=total_score, next_threshold=threshold)
 
 
+@uses_summary
 def binary_scoring_based(
     applicable_rules: list[SymptomRule],
     all_rules: list[SymptomRule],
     score_function: Callable[[float], float],
     score_threshold: float = 0.5,
     *args,
+    summary: Optional[ScoringSummary] = None,
     **kwargs,
 ) -> BaseEvaluation:
     """
@@ -47,24 +68,33 @@ def binary_scoring_based(
         all_rules: List of all rules in the ruleset.
         score_function: Function to process the total score.
         threshold: Threshold for categorization.
+        summary: Shared summary of `applicable_rules`. Computed if omitted.
 
     Returns:
         Evaluation result using the custom score function and threshold.
     """
-    total_score = sum(rule.weight or 0 for rule in applicable_rules)
-    processed_score = score_function(total_score)
+    if summary is None:
+        summary = ScoringSummary(applicable_rules)
+
+    processed_score = score_function(summary.total_weight)
 
     if processed_score >= score_threshold:
         return BaseEvaluation(label="High", score=processed_score)
     else:
-        return BaseEvaluation(label="Low", score=processed_score)
+        return BaseEvaluation(
+            label="Low", score=processed_score, next_threshold=score_threshold
+        )
 
 
+@uses_summary
 def multiclass_simple(
     applicable_rules: list[SymptomRule],
     all_rules: list[SymptomRule],
-    labels: list[str],
+    labels: Sequence[str],
     *args,
+    max_possible_weight: Optional[float] = None,
+    threshold_table: Optional[ThresholdTable] = None,
+    summary: Optional[ScoringSummary] = None,
     **kwargs,
 ) -> BaseEvaluation:
     """
@@ -74,36 +104,42 @@ def multiclass_simple(
         applicable_rules: List of applicable rules.
         all_rules: List of all rules in the ruleset.
         labels: List of class labels in ascending order of severity.
+        max_possible_weight: Precomputed maximum possible weight of `all_rules`. \
+        Computed from `all_rules` if omitted.
+        threshold_table: Precompiled table from `ThresholdTable.uniform`. If \
+        given, `labels` and `max_possible_weight` are not validated or used.
+        summary: Shared summary of `applicable_rules`. Computed if omitted.
 
     Returns:
         Evaluation result assigning a class based on score thresholds.
     """
-    if len(labels) < 2:
-        raise ValueError(
-            "At least two labels must be provided for multiclass evaluation."
+    if summary is None:
+        summary = ScoringSummary(applicable_rules)
+
+    total_score = summary.total_weight
+
+    if threshold_table is None:
+        threshold_table = ThresholdTable.uniform(
+            labels,
+            (
+                max_possible_weight
+                if max_possible_weight is not None
+                else summary.max_possible_weight(all_rules)
+            ),
         )
 
-    total_score = sum(rule.weight or 0 for rule in applicable_rules)
-    total_possible_score = calculate_max_possible_weight(all_rules)
-
-    if total_possible_score == 0:
-        return BaseEvaluation(label=labels[0], score=total_score)
-
-    step = total_possible_score / len(labels)
-
-    for idx, threshold in enumerate(range(1, len(labels) + 1)):
-        if total_score < step * threshold:
-            return BaseEvaluation(label=labels[idx], score=total_score)
-
-    return BaseEvaluation(label=labels[-1], score=total_score)
+    label, next_threshold = threshold_table.lookup(total_score)
+    return BaseEvaluation(label=label, score=total_score, next_threshold=next_threshold)
 
 
+@uses_summary
 def multiclass_scoring_based(
     applicable_rules: list[SymptomRule],
     all_rules: list[SymptomRule],
     score_function: Callable[[float], float],
-    threshold_label_map: dict[float, str],
+    threshold_label_map: dict[float, str] | ThresholdTable,
     *args,
+    summary: Optional[ScoringSummary] = None,
     **kwargs,
 ) -> BaseEvaluation:
     """
@@ -113,22 +149,60 @@ def multiclass_scoring_based(
         applicable_rules: List of applicable rules.
         all_rules: List of all rules in the ruleset.
         score_function: Function to process the total score.
-        threshold_label_map: A dictionary mapping thresholds to labels. Thresholds
-            should be provided in ascending order.
+        threshold_label_map: A dictionary mapping thresholds to labels, or a \
+        table precompiled with `ThresholdTable.from_map`.
+        summary: Shared summary of `applicable_rules`. Computed if omitted.
 
     Returns:
         Evaluation result assigning a class based on score thresholds.
     """
-    if not threshold_label_map:
-        raise ValueError("The `threshold_label_map` dictionary cannot be empty.")
+    if not isinstance(threshold_label_map, ThresholdTable):
+        threshold_label_map = ThresholdTable.from_map(threshold_label_map)
+
+    if summary is None:
+        summary = ScoringSummary(applicable_rules)
+
+    processed_score = score_function(summary.total_weight)
 
-    total_score = sum(rule.weight or 0 for rule in applicable_rules)
-    processed_score = score_function(total_score)
+    label, next_threshold = threshold_label_map.lookup(processed_score)
+    return BaseEvaluation(
+        label=label, score=processed_score, next_threshold=next_threshold
+    )
 
-    sorted_thresholds = sorted(threshold_label_map.items())
 
-    for threshold, label in sorted_thresholds:
-        if processed_score < threshold:
-            return BaseEvaluation(label=label, score=processed_score)
+def bayesian(
+    applicable_rules: list[SymptomRule],
+    all_rules: list[SymptomRule],
+    labels: Sequence[str],
+    priors: Optional[dict[str, float]] = None,
+    *args,
+    model: Optional["LikelihoodModel"] = None,
+    **kwargs,
+) -> BayesianEvaluation:
+    """
+    Bayesian evaluation logic combining label priors with the log-likelihood \
+    ratios of the applicable rules.
 
-    return BaseEvaluation(label=sorted_thresholds[-1][1], score=processed_score)
+    Args:
+        applicable_rules: List of applicable rules.
+        all_rules: List of all rules in the ruleset.
+        labels: List of class labels.
+        priors: Prior probability of each label. Uniform if omitted.
+        model: Precompiled likelihood model. If given, `labels` and `priors` are \
+        not validated or used.
+
+    Returns:
+        Evaluation result with the most probable label and all posteriors.
+    """
+    if model is None:
+        from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+
+        model = LikelihoodModel(labels, priors)
+
+    posterior = model.posterior(applicable_rules)
+    best = max(range(len(posterior)), key=posterior.__getitem__)
+    return BayesianEvaluation(
+        label=model.labels[best],
+        score=posterior[best],
+        posteriors=dict(zip(model.labels, posterior)),
+    )
@@ -1,54 +1,44 @@
 from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.enums import SolverMode
 
 
-def calculate_max_possible_weight(rules: list[SymptomRule]) -> float:
+def calculate_max_possible_weight(
+    rules: list[SymptomRule], mode: SolverMode = SolverMode.AUTO
+) -> float:
     """
-    Calculate the maximum possible weight by prioritizing higher-weighted rules
-    without overlap.
+    Calculate the maximum weight that rules can reach together, taking overlap
+    exclusion into account.
+
+    Rulesets solve this value once; prefer `SymptomRuleset.index()` when scoring
+    many records.
 
     Args:
         rules: List of all rules in the ruleset.
+        mode: Whether to solve greedily, exactly, or exactly where tractable.
 
     Returns:
         Max possible weight as a float.
     """
-    max_possible_weight = 0.0
-    visited_conditions: set[str] = set()
-
-    for rule in sorted(rules, key=lambda r: r.weight or 0, reverse=True):
-        if rule.conditions and rule.conditions <= visited_conditions:
-            continue
-
-        max_possible_weight += rule.weight or 0
-
-        if rule.conditions:
-            visited_conditions.update(rule.conditions)
+    from diagnostipy.core.index import RuleIndex
 
-    return max_possible_weight
+    return RuleIndex(rules, solver_mode=mode).max_possible_weight
 
 
 def calculate_max_possible_rules(
-    rules: list[SymptomRule],
+    rules: list[SymptomRule], mode: SolverMode = SolverMode.AUTO
 ) -> list[SymptomRule]:
     """
-    Calculate the maximum number of non-overlapping rules.
+    Calculate the largest set of rules that can apply together, taking overlap
+    exclusion into account.
 
     Args:
         rules: List of all rules in the ruleset.
+        mode: Whether to solve greedily, exactly, or exactly where tractable.
 
     Returns:
-        Maximum number of non-overlapping rules as an integer.
+        The rules of the largest non-overlapping set.
     """
-    max_possible_rules = []
-    visited_conditions: set[str] = set()
-
-    for rule in sorted(rules, key=lambda r: r.weight or 0, reverse=True):
-        if rule.conditions and rule.conditions <= visited_conditions:
-            continue
-
-        max_possible_rules.append(rule)
-
-        if rule.conditions:
-            visited_conditions.update(rule.conditions)
+    from diagnostipy.core.index import RuleIndex
 
-    return max_possible_rules
+    index = RuleIndex(rules, solver_mode=mode)
+    return [index.rules[idx] for idx in index.max_possible_rules]
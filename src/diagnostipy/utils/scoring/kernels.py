@@ -0,0 +1,260 @@
+import math
+import os
+import time
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from diagnostipy.core.models.symptom_rule import SymptomRule
+    from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+    from diagnostipy.utils.scoring.thresholds import ThresholdTable
+
+CROSSOVER_ENV = "DIAGNOSTIPY_KERNEL_CROSSOVER"
+CALIBRATION_SIZES = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+CALIBRATION_REPEATS = 5
+
+
+class Kernel:
+    """
+    A computation with a pure-Python and a NumPy implementation, dispatched by
+    input size.
+
+    Inputs smaller than `crossover` use the pure-Python implementation, which
+    avoids the fixed cost of creating arrays; larger inputs use NumPy. The
+    crossover is measured on first use unless it is configured with
+    `set_crossover` or the `DIAGNOSTIPY_KERNEL_CROSSOVER` environment variable,
+    either as one size for every kernel ("64") or per kernel
+    ("entropy=32,threshold_lookup=128"). A crossover of 0 always selects NumPy.
+
+    Attributes:
+        name (str): Kernel name.
+        python (Callable[..., Any]): Pure-Python implementation.
+        numpy (Callable[..., Any]): NumPy implementation, returning the same \
+        results.
+        sample (Callable[[int], tuple[Any, ...]]): Builds the arguments of an \
+        input of a given size, used for calibration.
+        max_size (int): Largest input size timed during calibration.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        python: Callable[..., Any],
+        numpy: Callable[..., Any],
+        sample: Callable[[int], tuple[Any, ...]],
+        max_size: int = 4096,
+    ):
+        self.name = name
+        self.python = python
+        self.numpy = numpy
+        self.sample = sample
+        self.max_size = max_size
+        self._crossover: Optional[int] = None
+
+    @property
+    def crossover(self) -> int:
+        """
+        Input size from which the NumPy implementation is used.
+        """
+        if self._crossover is None:
+            configured = _configured_crossovers().get(self.name)
+            self._crossover = configured if configured is not None else self.calibrate()
+        return self._crossover
+
+    @crossover.setter
+    def crossover(self, size: Optional[int]) -> None:
+        if size is not None and size < 0:
+            raise ValueError("The crossover size must not be negative.")
+        self._crossover = size
+
+    def select(self, size: int) -> Callable[..., Any]:
+        """
+        Pick the implementation for an input size.
+
+        Args:
+            size: Number of elements of the input.
+
+        Returns:
+            The pure-Python or the NumPy implementation.
+        """
+        return self.python if size < self.crossover else self.numpy
+
+    def __call__(self, size: int, *args, **kwargs) -> Any:
+        return self.select(size)(*args, **kwargs)
+
+    def calibrate(self) -> int:
+        """
+        Time both implementations on inputs of doubling size, up to `max_size`.
+
+        Calibration stops once NumPy is faster at two consecutive sizes, so it
+        takes a few milliseconds.
+
+        Returns:
+            The smallest timed size from which NumPy was faster, or twice the \
+            largest size if it never was.
+        """
+        sizes = [size for size in CALIBRATION_SIZES if size <= self.max_size]
+        crossover, wins = None, 0
+        for size in sizes:
+            args = self.sample(size)
+            if _best_time(self.numpy, args) < _best_time(self.python, args):
+                crossover = size if crossover is None else crossover
+                wins += 1
+                if wins == 2:
+                    return crossover
+            else:
+                crossover, wins = None, 0
+        return crossover if crossover is not None else 2 * sizes[-1]
+
+
+def _best_time(function: Callable[..., Any], args: tuple[Any, ...]) -> float:
+    best = math.inf
+    for _ in range(CALIBRATION_REPEATS):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _configured_crossovers() -> dict[str, int]:
+    """
+    Parse the crossover sizes configured in the environment.
+
+    Returns:
+        Crossover sizes by kernel name.
+
+    Raises:
+        ValueError: If the configuration is malformed.
+    """
+    value = os.environ.get(CROSSOVER_ENV, "").strip()
+    if not value:
+        return {}
+    try:
+        if "=" not in value:
+            return dict.fromkeys(KERNELS, int(value))
+        pairs = (item.split("=", 1) for item in value.split(",") if item.strip())
+        return {name.strip(): int(size) for name, size in pairs}
+    except ValueError:
+        raise ValueError(
+            f"Invalid {CROSSOVER_ENV} value {value!r}; expected a size such as "
+            "'64' or sizes per kernel such as 'entropy=32,posterior=8'."
+        )
+
+
+def _entropy_python(weights: Sequence[float], total: float) -> float:
+    entropy = 0.0
+    for weight in weights:
+        probability = min(max(weight / total, 1e-9), 1.0)
+        entropy -= probability * math.log(probability)
+    return entropy
+
+
+def _entropy_numpy(weights: Sequence[float], total: float) -> float:
+    probabilities = np.clip(np.array(weights) / total, 1e-9, 1.0)
+    return float(-np.sum(probabilities * np.log(probabilities)))
+
+
+def _entropy_sample(size: int) -> tuple[Any, ...]:
+    weights = [1.0 + idx % 5 for idx in range(size)]
+    return weights, sum(weights)
+
+
+def _lookup_python(
+    table: "ThresholdTable", scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    bounds, labels = table._bounds, table.labels
+    indices = [bisect_right(bounds, score) for score in scores.tolist()]
+    label_array = np.empty(len(indices), dtype=object)
+    label_array[:] = [labels[idx] for idx in indices]
+    next_thresholds = np.array(
+        [bounds[idx] if idx < len(bounds) else math.nan for idx in indices],
+        dtype=np.float64,
+    )
+    return label_array, next_thresholds
+
+
+def _lookup_numpy(
+    table: "ThresholdTable", scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    thresholds, label_array = table._as_arrays()
+    indices = np.searchsorted(thresholds, scores, side="right")
+    return label_array[indices], np.append(thresholds, np.nan)[indices]
+
+
+def _lookup_sample(size: int) -> tuple[Any, ...]:
+    from diagnostipy.utils.scoring.thresholds import ThresholdTable
+
+    table = ThresholdTable([1.0, 2.0, 3.0], ["a", "b", "c", "d"])
+    return table, np.linspace(0.0, 4.0, size)
+
+
+def _posterior_python(
+    model: "LikelihoodModel", applicable_rules: Sequence["SymptomRule"]
+) -> list[float]:
+    log_odds = model.log_priors.tolist()
+    for rule in applicable_rules:
+        for label, ratio in (rule.log_likelihood_ratios or {}).items():
+            column = model._label_index.get(label)
+            if column is not None:
+                log_odds[column] += ratio
+    highest = max(log_odds)
+    exps = [math.exp(value - highest) for value in log_odds]
+    total = sum(exps)
+    return [value / total for value in exps]
+
+
+def _posterior_numpy(
+    model: "LikelihoodModel", applicable_rules: Iterable["SymptomRule"]
+) -> list[float]:
+    log_odds = model.log_priors.copy()
+    for rule in applicable_rules:
+        if rule.log_likelihood_ratios:
+            log_odds += model._ratio_vector(rule)
+    shifted = log_odds - log_odds.max()
+    return np.exp(shifted - np.log(np.exp(shifted).sum())).tolist()
+
+
+def _posterior_sample(size: int) -> tuple[Any, ...]:
+    from diagnostipy.core.models.symptom_rule import SymptomRule
+    from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+
+    rule = SymptomRule(
+        name="rule", weight=1.0, log_likelihood_ratios={"a": 0.5, "b": -0.5}
+    )
+    return LikelihoodModel(["a", "b", "c"]), [rule] * size
+
+
+KERNELS: dict[str, Kernel] = {
+    kernel.name: kernel
+    for kernel in (
+        Kernel("entropy", _entropy_python, _entropy_numpy, _entropy_sample),
+        Kernel("threshold_lookup", _lookup_python, _lookup_numpy, _lookup_sample),
+        Kernel(
+            "posterior",
+            _posterior_python,
+            _posterior_numpy,
+            _posterior_sample,
+            max_size=256,
+        ),
+    )
+}
+
+
+def set_crossover(name: Optional[str], size: Optional[int]) -> None:
+    """
+    Override the crossover size of a kernel.
+
+    Args:
+        name: Kernel name, or None for every kernel.
+        size: Input size from which NumPy is used; 0 always selects NumPy. \
+        None discards the override, so the crossover is configured from the \
+        environment or measured again on next use.
+
+    Raises:
+        KeyError: If the kernel does not exist.
+    """
+    kernels = KERNELS.values() if name is None else [KERNELS[name]]
+    for kernel in kernels:
+        kernel.crossover = size
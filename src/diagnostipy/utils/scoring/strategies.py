@@ -0,0 +1,290 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional, TypeVar
+
+from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.scoring.summary import ScoringSummary
+from diagnostipy.utils.scoring.thresholds import ThresholdTable
+from diagnostipy.utils.scoring.types import (
+    BatchConfidenceFunction,
+    BatchEvaluationFunction,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from diagnostipy.core.index import RuleIndex
+    from diagnostipy.utils.scoring.batch_functions import BatchEvaluation
+
+R = TypeVar("R")
+
+
+class ScoringStrategy(Generic[R]):
+    """
+    A scoring function configured once with its parameters.
+
+    Parameters are validated at construction. Values that depend on the ruleset,
+    such as the maximum possible weight, are precomputed when the strategy is
+    bound to a ruleset snapshot, so a call only forwards the applicable rules.
+
+    A batch counterpart may be given by its name in
+    `diagnostipy.utils.scoring.batch_functions`, which is imported on first use
+    so that single-record scoring does not load NumPy.
+
+    Attributes:
+        function (Callable[..., R]): The underlying scoring function.
+        params (dict[str, Any]): Keyword arguments passed on every call.
+        uses_summary (bool): Whether the function accepts a shared \
+        `ScoringSummary`, as marked by `uses_summary`.
+    """
+
+    # Precomputed arguments, mapped to the parameters they are derived from.
+    derived_params: dict[str, tuple[str, ...]] = {}
+
+    def __init__(
+        self,
+        function: Callable[..., R],
+        batch_function: Optional[Callable[..., Any] | str] = None,
+        **params: Any,
+    ):
+        self.function = function
+        self._batch_function = batch_function
+        self.params = params
+        self.uses_summary = getattr(function, "uses_summary", False)
+        self.validate()
+        self._compiled: Optional["RuleIndex"] = None
+        self._call_params = self.params
+
+    def validate(self) -> None:
+        """
+        Validate and normalise `params`. Called once at construction.
+        """
+
+    def precompute(self, compiled: "RuleIndex") -> dict[str, Any]:
+        """
+        Compute keyword arguments that depend on the ruleset.
+
+        Args:
+            compiled: The compiled ruleset.
+
+        Returns:
+            Keyword arguments merged under `params`.
+        """
+        return {}
+
+    def bind(self, compiled: "RuleIndex") -> None:
+        """
+        Precompute the ruleset-dependent arguments, unless already bound to the
+        same snapshot.
+
+        Args:
+            compiled: The compiled ruleset.
+        """
+        if compiled is not self._compiled:
+            self._call_params = {**self.precompute(compiled), **self.params}
+            self._compiled = compiled
+
+    def _merge_params(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """
+        Merge per-call arguments over the configured ones, dropping precomputed
+        arguments derived from an overridden parameter so they are rebuilt.
+        """
+        if not kwargs:
+            return self._call_params
+        params = {**self._call_params, **kwargs}
+        for name, sources in self.derived_params.items():
+            if name not in kwargs and any(source in kwargs for source in sources):
+                params.pop(name, None)
+        return params
+
+    def _resolve_batch_function(self) -> Optional[Callable[..., Any]]:
+        """
+        Import the batch counterpart on first use if it was given by name.
+        """
+        batch_function = self._batch_function
+        if isinstance(batch_function, str):
+            module = import_module("diagnostipy.utils.scoring.batch_functions")
+            batch_function = getattr(module, batch_function)
+            self._batch_function = batch_function
+        return batch_function
+
+    def __call__(
+        self,
+        applicable_rules: list[SymptomRule],
+        all_rules: list[SymptomRule],
+        *args,
+        summary: Optional[ScoringSummary] = None,
+        **kwargs,
+    ) -> R:
+        """
+        Score a list of applicable rules.
+
+        The summary is only passed on to functions that use it. Extra arguments
+        are forwarded for backwards compatibility with per-call parameters and
+        override the configured ones, including arguments precomputed from them.
+        """
+        params = self._merge_params(kwargs)
+        if summary is not None and self.uses_summary:
+            return self.function(
+                applicable_rules, all_rules, *args, summary=summary, **params
+            )
+        return self.function(applicable_rules, all_rules, *args, **params)
+
+
+class EvaluationStrategy(ScoringStrategy[BaseEvaluation]):
+    """
+    A configured evaluation function, optionally with a batch counterpart.
+    """
+
+    @property
+    def batch_function(self) -> Optional[BatchEvaluationFunction]:
+        """
+        The batch counterpart of the evaluation function, if any.
+        """
+        return self._resolve_batch_function()
+
+    def batch(
+        self, total_scores: "np.ndarray", *args, **kwargs
+    ) -> Optional["BatchEvaluation"]:
+        """
+        Label a batch of total scores at once.
+
+        Args:
+            total_scores: Total weight of the applicable rules of each record.
+
+        Returns:
+            The batch evaluation, or None if the function has no batch counterpart.
+        """
+        batch_function = self.batch_function
+        if batch_function is None:
+            return None
+        return batch_function(total_scores, *args, **self._merge_params(kwargs))
+
+
+class ConfidenceStrategy(ScoringStrategy[float]):
+    """
+    A configured confidence function, optionally with a batch counterpart.
+    """
+
+    @property
+    def batch_function(self) -> Optional[BatchConfidenceFunction]:
+        """
+        The batch counterpart of the confidence function, if any.
+        """
+        return self._resolve_batch_function()
+
+    def batch(
+        self,
+        total_scores: "np.ndarray",
+        *args,
+        mask: "np.ndarray",
+        weights: "np.ndarray",
+        **kwargs,
+    ) -> Optional["np.ndarray"]:
+        """
+        Compute the confidence of a batch of records at once.
+
+        Args:
+            total_scores: Total weight of the applicable rules of each record.
+            mask: Boolean array of shape (n_records, n_rules) of applicable rules.
+            weights: Rule weights, shared or per record as from \
+            `CompiledRuleset.record_weights`.
+
+        Returns:
+            A float array of confidences, or None if the function has no batch \
+            counterpart.
+        """
+        batch_function = self.batch_function
+        if batch_function is None:
+            return None
+        return batch_function(
+            total_scores,
+            *args,
+            mask=mask,
+            weights=weights,
+            **self._merge_params(kwargs),
+        )
+
+
+class BinarySimpleStrategy(EvaluationStrategy):
+    def precompute(self, compiled: "RuleIndex") -> dict[str, Any]:
+        return {"max_possible_weight": compiled.max_possible_weight}
+
+
+class BinaryScoringBasedStrategy(EvaluationStrategy):
+    def validate(self) -> None:
+        score_function = self.params.get("score_function")
+        if score_function is not None and not callable(score_function):
+            raise TypeError("`score_function` must be callable.")
+
+
+class MulticlassSimpleStrategy(EvaluationStrategy):
+    derived_params = {"threshold_table": ("labels", "max_possible_weight")}
+
+    def validate(self) -> None:
+        if "labels" in self.params:
+            ThresholdTable.uniform(self.params["labels"], 1.0)
+
+    def precompute(self, compiled: "RuleIndex") -> dict[str, Any]:
+        max_possible_weight = compiled.max_possible_weight
+        params: dict[str, Any] = {"max_possible_weight": max_possible_weight}
+        if "labels" in self.params:
+            params["threshold_table"] = ThresholdTable.uniform(
+                self.params["labels"], max_possible_weight
+            )
+        return params
+
+
+class MulticlassScoringBasedStrategy(BinaryScoringBasedStrategy):
+    def validate(self) -> None:
+        super().validate()
+        threshold_label_map = self.params.get("threshold_label_map")
+        if isinstance(threshold_label_map, dict):
+            self.params["threshold_label_map"] = ThresholdTable.from_map(
+                threshold_label_map
+            )
+
+
+class MaxWeightConfidenceStrategy(ConfidenceStrategy):
+    def precompute(self, compiled: "RuleIndex") -> dict[str, Any]:
+        return {"max_possible_weight": compiled.max_possible_weight}
+
+
+class MaxRulesConfidenceStrategy(ConfidenceStrategy):
+    def precompute(self, compiled: "RuleIndex") -> dict[str, Any]:
+        return {"max_possible_rule_count": len(compiled.max_possible_rules)}
+
+
+def _likelihood_params(params: dict[str, Any], compiled: "RuleIndex") -> dict[str, Any]:
+    """
+    Compile the likelihood model of the ruleset if labels are configured.
+    """
+    from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+
+    if "labels" not in params:
+        return {"rules": compiled.rules}
+    return {
+        "model": LikelihoodModel(params["labels"], params.get("priors"), compiled.rules)
+    }
+
+
+class BayesianStrategy(EvaluationStrategy):
+    def validate(self) -> None:
+        if "labels" in self.params:
+            from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+
+            LikelihoodModel(self.params["labels"], self.params.get("priors"))
+
+    def precompute(self, compiled: "RuleIndex") -> dict[str, Any]:
+        return _likelihood_params(self.params, compiled)
+
+
+class PosteriorConfidenceStrategy(ConfidenceStrategy):
+    def validate(self) -> None:
+        if "labels" in self.params:
+            from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+
+            LikelihoodModel(self.params["labels"], self.params.get("priors"))
+
+    def precompute(self, compiled: "RuleIndex") -> dict[str, Any]:
+        return _likelihood_params(self.params, compiled)
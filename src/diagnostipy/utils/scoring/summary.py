@@ -0,0 +1,81 @@
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, TypeVar
+
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.scoring.helpers import (
+    calculate_max_possible_rules,
+    calculate_max_possible_weight,
+)
+
+if TYPE_CHECKING:
+    from diagnostipy.core.index import RuleIndex
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ScoringSummary:
+    """
+    Intermediate sums over the applicable rules of a record, computed in a single
+    pass and shared by the evaluation and confidence functions.
+
+    Attributes:
+        weights (tuple[float, ...]): Non-zero weights of the applicable rules, in \
+        rule order.
+        total_weight (float): Sum of the applicable rules' weights.
+        count (int): Number of applicable rules.
+    """
+
+    __slots__ = ("weights", "total_weight", "count", "_compiled")
+
+    def __init__(
+        self,
+        applicable_rules: Sequence[SymptomRule],
+        compiled: Optional["RuleIndex"] = None,
+    ):
+        self.weights = tuple(rule.weight for rule in applicable_rules if rule.weight)
+        self.total_weight = sum(self.weights)
+        self.count = len(applicable_rules)
+        self._compiled = compiled
+
+    def max_possible_weight(self, all_rules: Sequence[SymptomRule]) -> float:
+        """
+        Return the maximum possible weight, from the ruleset snapshot if available.
+
+        Args:
+            all_rules: List of all rules in the ruleset.
+
+        Returns:
+            The maximum possible weight.
+        """
+        if self._compiled is not None:
+            return self._compiled.max_possible_weight
+        return calculate_max_possible_weight(list(all_rules))
+
+    def max_possible_rule_count(self, all_rules: Sequence[SymptomRule]) -> int:
+        """
+        Return the size of the largest set of rules that can apply together, from
+        the ruleset snapshot if available.
+
+        Args:
+            all_rules: List of all rules in the ruleset.
+
+        Returns:
+            The maximum possible number of applicable rules.
+        """
+        if self._compiled is not None:
+            return len(self._compiled.max_possible_rules)
+        return len(calculate_max_possible_rules(list(all_rules)))
+
+
+def uses_summary(function: F) -> F:
+    """
+    Mark a scoring function as accepting a `summary` keyword argument, so the
+    evaluator passes it the shared `ScoringSummary` of each record.
+
+    Args:
+        function: An evaluation or confidence function.
+
+    Returns:
+        The same function.
+    """
+    setattr(function, "uses_summary", True)
+    return function
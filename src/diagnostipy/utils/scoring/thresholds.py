@@ -0,0 +1,127 @@
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class ThresholdTable:
+    """
+    Precompiled mapping of score bands to labels.
+
+    A score below `thresholds[0]` gets `labels[0]`, a score in
+    `[thresholds[i - 1], thresholds[i])` gets `labels[i]`, and a score at or above
+    the last threshold gets `labels[-1]`. Thresholds and labels are validated once
+    at construction; lookups use binary search. NumPy is only needed for
+    `lookup_many`, which dispatches to the "threshold_lookup" kernel.
+
+    Attributes:
+        labels (tuple[str, ...]): One more label than thresholds.
+    """
+
+    __slots__ = ("labels", "_bounds", "_arrays")
+
+    def __init__(self, thresholds: Sequence[float], labels: Sequence[str]):
+        bounds = [float(threshold) for threshold in thresholds]
+        if len(labels) != len(bounds) + 1:
+            raise ValueError("A threshold table needs exactly one label per band.")
+        if any(a >= b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError("Thresholds must be strictly ascending.")
+
+        self._bounds = bounds
+        self.labels = tuple(labels)
+        self._arrays: Optional[tuple["np.ndarray", "np.ndarray"]] = None
+
+    @property
+    def thresholds(self) -> "np.ndarray":
+        """
+        Strictly ascending band boundaries.
+        """
+        return self._as_arrays()[0]
+
+    def _as_arrays(self) -> tuple["np.ndarray", "np.ndarray"]:
+        if self._arrays is None:
+            import numpy as np
+
+            self._arrays = (
+                np.array(self._bounds, dtype=np.float64),
+                np.array(self.labels, dtype=object),
+            )
+        return self._arrays
+
+    @classmethod
+    def from_map(cls, threshold_label_map: dict[float, str]) -> "ThresholdTable":
+        """
+        Build a table from a `multiclass_scoring_based` threshold map.
+
+        Each label applies to scores below its threshold; scores at or above the
+        highest threshold keep the last label.
+
+        Args:
+            threshold_label_map: A dictionary mapping thresholds to labels.
+
+        Returns:
+            The threshold table.
+        """
+        if not threshold_label_map:
+            raise ValueError("The `threshold_label_map` dictionary cannot be empty.")
+
+        thresholds, labels = zip(*sorted(threshold_label_map.items()))
+        return cls(thresholds[:-1], labels)
+
+    @classmethod
+    def uniform(cls, labels: Sequence[str], max_score: float) -> "ThresholdTable":
+        """
+        Build a table splitting `[0, max_score)` into equal bands, as used by
+        `multiclass_simple`. If no positive score is possible, every score gets
+        the first label.
+
+        Args:
+            labels: Class labels in ascending order of severity.
+            max_score: The maximum possible score.
+
+        Returns:
+            The threshold table.
+        """
+        if len(labels) < 2:
+            raise ValueError(
+                "At least two labels must be provided for multiclass evaluation."
+            )
+        if max_score <= 0:
+            return cls([], labels[:1])
+
+        step = max_score / len(labels)
+        return cls([step * k for k in range(1, len(labels))], labels)
+
+    def lookup(self, score: float) -> tuple[str, Optional[float]]:
+        """
+        Find the label of a single score.
+
+        Args:
+            score: The score to label.
+
+        Returns:
+            The label and the threshold of the next band, or None if the score is \
+            in the highest band.
+        """
+        idx = bisect_right(self._bounds, score)
+        next_threshold = self._bounds[idx] if idx < len(self._bounds) else None
+        return self.labels[idx], next_threshold
+
+    def lookup_many(self, scores: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Label many scores at once.
+
+        Args:
+            scores: Array of scores.
+
+        Returns:
+            An object array of labels and a float array with the threshold of the \
+            next band, NaN where the score is in the highest band.
+        """
+        from diagnostipy.utils.scoring.kernels import KERNELS
+
+        return KERNELS["threshold_lookup"](len(scores), self, scores)
+
+    def __repr__(self) -> str:
+        return f"ThresholdTable(thresholds={self._bounds}, labels={self.labels})"
@@ -1,8 +1,13 @@
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
 from diagnostipy.core.models.evaluation import BaseEvaluation
 from diagnostipy.core.models.symptom_rule import SymptomRule
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from diagnostipy.utils.scoring.batch_functions import BatchEvaluation
+
 
 class ConfidenceFunction(Protocol):
     def __call__(
@@ -22,3 +27,13 @@ class EvaluationFunction(Protocol):
         *args,
         **kwargs
     ) -> BaseEvaluation: ...
+
+
+class BatchEvaluationFunction(Protocol):
+    def __call__(
+        self, total_scores: "np.ndarray", *args, **kwargs
+    ) -> "BatchEvaluation": ...
+
+
+class BatchConfidenceFunction(Protocol):
+    def __call__(self, total_scores: "np.ndarray", *args, **kwargs) -> "np.ndarray": ...
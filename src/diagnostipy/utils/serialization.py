@@ -0,0 +1,21 @@
+from typing import Any
+
+
+def json_default(value: Any) -> Any:
+    """
+    Serialize values JSON does not support, such as explanations.
+
+    Pass it as `default` to `json.dumps`.
+
+    Args:
+        value: A value the JSON encoder cannot serialize.
+
+    Returns:
+        The value's `to_dict()` or `model_dump()` if it has one, otherwise its \
+        string form.
+    """
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
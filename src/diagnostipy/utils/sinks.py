@@ -0,0 +1,287 @@
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import IO, Any, Optional, Sequence
+
+import numpy as np
+
+from diagnostipy.core.models.diagnosis import DiagnosisBase
+from diagnostipy.utils.serialization import json_default
+
+DEFAULT_FIELDS = ("label", "total_score", "confidence")
+PARQUET_TYPES = {"label": "string", "total_score": "float64", "confidence": "float64"}
+
+PathOrFile = str | os.PathLike[str] | IO[str]
+
+
+def _flatten(value: Any) -> Any:
+    """
+    Encode nested values as JSON for flat, columnar formats.
+    """
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=json_default)
+    return value
+
+
+def _chunk_length(columns: dict[str, np.ndarray]) -> int:
+    """
+    Number of records in a chunk of columns.
+    """
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+def _as_text(value: Any) -> Optional[str]:
+    """
+    Encode a value for a string column, with nested values as JSON.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return _flatten(value)
+    return str(value)
+
+
+class ResultSink(ABC):
+    """
+    Destination for diagnoses written chunk by chunk.
+
+    Sinks keep only the selected fields of each diagnosis, so the diagnosis
+    objects of a chunk can be released as soon as it is written. Chunks scored
+    in batch can also be written as one array per field, without diagnoses.
+
+    Attributes:
+        fields (tuple[str, ...]): Diagnosis fields to write, including extra fields \
+        of custom `DiagnosisBase` subclasses.
+        count (int): Number of diagnoses written so far.
+    """
+
+    def __init__(self, fields: Sequence[str] = DEFAULT_FIELDS):
+        self.fields = tuple(fields)
+        self.count = 0
+
+    def _rows(self, diagnoses: Sequence[DiagnosisBase]) -> list[tuple[Any, ...]]:
+        return [
+            tuple(getattr(diagnosis, field, None) for field in self.fields)
+            for diagnosis in diagnoses
+        ]
+
+    def write(self, diagnoses: Sequence[DiagnosisBase]) -> None:
+        """
+        Write a chunk of diagnoses.
+
+        Args:
+            diagnoses: The diagnoses of one chunk, in record order.
+        """
+        self._write_rows(self._rows(diagnoses))
+        self.count += len(diagnoses)
+
+    def write_columns(self, columns: dict[str, np.ndarray]) -> None:
+        """
+        Write a chunk given as one array per field.
+
+        Args:
+            columns: The values of every field in `fields`, in record order.
+        """
+        values = [columns[field].tolist() for field in self.fields]
+        self._write_rows(list(zip(*values)))
+        self.count += _chunk_length(columns)
+
+    @abstractmethod
+    def _write_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        """
+        Write rows of field values, in `fields` order.
+        """
+
+    def close(self) -> None:
+        """
+        Flush and release the sink's resources.
+        """
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ArraySink(ResultSink):
+    """
+    Writes diagnoses into preallocated NumPy arrays.
+
+    Scores and confidences are stored as floats, with NaN for missing values;
+    other fields are stored as objects unless a dtype is given.
+
+    Attributes:
+        capacity (int): Maximum number of diagnoses.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        dtypes: Optional[dict[str, Any]] = None,
+    ):
+        super().__init__(fields)
+        self.capacity = capacity
+        dtypes = {"total_score": np.float64, "confidence": np.float64, **(dtypes or {})}
+        self._columns = {
+            field: np.empty(capacity, dtype=dtypes.get(field, object))
+            for field in self.fields
+        }
+        if capacity:
+            for column in self._columns.values():
+                if column.dtype.kind == "f":
+                    column.fill(np.nan)
+
+    def _span(self, length: int) -> slice:
+        """
+        Reserve the rows of the next chunk, checking the capacity.
+        """
+        start, stop = self.count, self.count + length
+        if stop > self.capacity:
+            raise ValueError(
+                f"ArraySink capacity of {self.capacity} diagnoses exceeded."
+            )
+        return slice(start, stop)
+
+    def _write_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        span = self._span(len(rows))
+        for values, column in zip(zip(*rows), self._columns.values()):
+            if column.dtype.kind == "f":
+                values = tuple(np.nan if value is None else value for value in values)
+            column[span] = values
+
+    def write_columns(self, columns: dict[str, np.ndarray]) -> None:
+        length = _chunk_length(columns)
+        span = self._span(length)
+        for field, column in self._columns.items():
+            column[span] = columns[field]
+        self.count += length
+
+    @property
+    def arrays(self) -> dict[str, np.ndarray]:
+        """
+        The written values of each field, trimmed to the number of diagnoses.
+        """
+        return {field: column[: self.count] for field, column in self._columns.items()}
+
+
+class _FileSink(ResultSink):
+    """
+    Base class of sinks writing to a path or an open text file.
+    """
+
+    def __init__(self, target: PathOrFile, fields: Sequence[str] = DEFAULT_FIELDS):
+        super().__init__(fields)
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        self._file: IO[str] = (
+            open(target, "w", newline="", encoding="utf-8")
+            if isinstance(target, (str, os.PathLike))
+            else target
+        )
+
+    def close(self) -> None:
+        if self._owns_file and not self._file.closed:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class CSVSink(_FileSink):
+    """
+    Streams diagnoses to a CSV file with a header row. Nested values such as
+    `metadata` are written as JSON.
+    """
+
+    def __init__(self, target: PathOrFile, fields: Sequence[str] = DEFAULT_FIELDS):
+        super().__init__(target, fields)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.fields)
+
+    def _write_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        self._writer.writerows(tuple(map(_flatten, row)) for row in rows)
+
+
+class JSONLSink(_FileSink):
+    """
+    Streams diagnoses to a JSON Lines file, one object per diagnosis.
+    """
+
+    def _write_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        self._file.writelines(
+            json.dumps(dict(zip(self.fields, row)), default=json_default) + "\n"
+            for row in rows
+        )
+
+
+class ParquetSink(ResultSink):
+    """
+    Streams diagnoses to a Parquet file, one row group per chunk.
+
+    Requires the optional `pyarrow` dependency. The file is written with an
+    explicit schema, so every chunk has the same column types even when a chunk
+    holds only missing values. By default, scores and confidences are doubles and
+    other fields are strings, with nested values written as JSON.
+
+    Attributes:
+        path (str | os.PathLike[str]): The output file.
+        schema (pyarrow.Schema): The schema of the output file.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        schema: Any = None,
+    ):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError(
+                "ParquetSink requires pyarrow. Install it with `pip install pyarrow`."
+            ) from error
+
+        super().__init__(fields)
+        if schema is None:
+            schema = pyarrow.schema(
+                [
+                    (field, getattr(pyarrow, PARQUET_TYPES.get(field, "string"))())
+                    for field in self.fields
+                ]
+            )
+        elif tuple(schema.names) != self.fields:
+            raise ValueError(
+                f"The schema fields {tuple(schema.names)} do not match {self.fields}."
+            )
+
+        self.path = path
+        self.schema = schema
+        self._pyarrow = pyarrow
+        self._writer: Any = pyarrow.parquet.ParquetWriter(path, schema)
+
+    def _write_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        if not rows:
+            return
+
+        columns = {}
+        for field, values in zip(self.fields, zip(*rows)):
+            if self.schema.field(field).type == self._pyarrow.string():
+                values = tuple(map(_as_text, values))
+            columns[field] = values
+        self._writer.write_table(self._pyarrow.table(columns, schema=self.schema))
+
+    def write_columns(self, columns: dict[str, np.ndarray]) -> None:
+        length = _chunk_length(columns)
+        if length:
+            table = self._pyarrow.table(
+                {field: columns[field] for field in self.fields}, schema=self.schema
+            )
+            self._writer.write_table(table)
+        self.count += length
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
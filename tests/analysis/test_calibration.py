@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from diagnostipy.analysis.calibration import (
+    RuleWeightCalibrator,
+    _minimize_lbfgs,
+    _OrdinalLogit,
+    calibrate_ruleset,
+)
+from diagnostipy.core.models.numeric import GradedWeight
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+
+TRUE_WEIGHTS = {"a": 2.0, "b": 0.5, "c": -1.0}
+TRUE_CUTS = (0.0, 1.5)
+LABELS = ("Low", "Medium", "High")
+
+
+@pytest.fixture
+def calibration_ruleset():
+    return SymptomRuleset(
+        [SymptomRule(name=field, weight=1.0, conditions={field}) for field in "abc"]
+    )
+
+
+@pytest.fixture
+def labeled_records():
+    rng = np.random.default_rng(0)
+    present = rng.random((20_000, 3)) < 0.5
+    records = [dict(zip("abc", row.tolist())) for row in present]
+    scores = present @ np.array(list(TRUE_WEIGHTS.values()))
+    at_most = 1.0 / (1.0 + np.exp(scores[:, None] - np.array(TRUE_CUTS)))
+    codes = (rng.random(len(scores))[:, None] > at_most).sum(axis=1)
+    return records, [LABELS[code] for code in codes]
+
+
+def test_calibrate_ruleset_recovers_weights(calibration_ruleset, labeled_records):
+    records, outcomes = labeled_records
+
+    result = calibrate_ruleset(
+        calibration_ruleset, records, outcomes, LABELS, l2=0.0, chunk_size=3000
+    )
+
+    assert result.converged
+    assert result.n_records == len(records)
+    assert result.n_patterns == 8
+    fitted = {rule.name: rule.weight for rule in result.ruleset.rules}
+    assert fitted == pytest.approx(TRUE_WEIGHTS, abs=0.15)
+    assert result.thresholds == pytest.approx(TRUE_CUTS, abs=0.15)
+    assert list(result.threshold_label_map.values()) == list(LABELS)
+
+    diagnoses = result.evaluator().run_batch(records)
+    scores = [diagnosis.total_score for diagnosis in diagnoses]
+    expected = result.ruleset.compile().total_scores(
+        result.ruleset.compile().match(records)
+    )
+    assert scores == pytest.approx(expected.tolist())
+
+
+def test_calibration_is_independent_of_chunking(calibration_ruleset, labeled_records):
+    records, outcomes = labeled_records
+    small = calibrate_ruleset(
+        calibration_ruleset, records[:500], outcomes[:500], LABELS, chunk_size=7
+    )
+    large = calibrate_ruleset(
+        calibration_ruleset, records[:500], outcomes[:500], LABELS
+    )
+
+    assert small.thresholds == pytest.approx(large.thresholds)
+    assert small.log_loss == pytest.approx(large.log_loss)
+
+
+def test_fit_thresholds_only_keeps_weights(calibration_ruleset, labeled_records):
+    records, outcomes = labeled_records
+
+    result = calibrate_ruleset(
+        calibration_ruleset, records, outcomes, LABELS, fit_weights=False
+    )
+
+    assert [rule.weight for rule in result.ruleset.rules] == [1.0, 1.0, 1.0]
+    assert len(result.thresholds) == 2
+    assert result.thresholds[0] < result.thresholds[1]
+
+
+def test_graded_weights_are_rescaled():
+    rule = SymptomRule(
+        name="fever",
+        weight=1.0,
+        graded_weight=GradedWeight(field="temperature", points=((37, 0.0), (40, 2.0))),
+    )
+    calibrator = RuleWeightCalibrator(SymptomRuleset([rule]), ["Low", "High"])
+    records = [{"temperature": value} for value in (36.0, 38.5, 40.0, 41.0)] * 10
+    calibrator.add(records, ["Low", "Low", "High", "High"] * 10)
+
+    fitted = calibrator.fit().ruleset.rules[0]
+
+    assert fitted.weight and rule.weight and fitted.graded_weight
+    factor = fitted.weight / rule.weight
+    assert factor > 0
+    assert fitted.graded_weight.points == ((37, 0.0), (40, pytest.approx(2 * factor)))
+
+
+def test_ordinal_logit_gradient():
+    rng = np.random.default_rng(1)
+    objective = _OrdinalLogit(rng.random((6, 3)), rng.random((6, 4)), 0.1, None)
+    params = rng.normal(size=6)
+
+    _, gradient = objective(params)
+
+    eps = 1e-6
+    numeric = [
+        (objective(params + eps * unit)[0] - objective(params - eps * unit)[0])
+        / (2 * eps)
+        for unit in np.eye(len(params))
+    ]
+    assert gradient == pytest.approx(numeric, abs=1e-6)
+
+
+def test_lbfgs_minimizes_large_quadratic():
+    rng = np.random.default_rng(0)
+    n_params = 500
+    factors = rng.normal(size=(n_params, n_params)) / np.sqrt(n_params)
+    hessian = factors @ factors.T + np.eye(n_params)
+    target = rng.normal(size=n_params)
+
+    def objective(params):
+        residual = params - target
+        gradient = hessian @ residual
+        return 0.5 * residual @ gradient, gradient
+
+    params, n_iter, converged = _minimize_lbfgs(
+        objective, np.zeros(n_params), max_iter=500, tol=1e-8
+    )
+
+    assert converged
+    assert n_iter < 500
+    np.testing.assert_allclose(params, target, atol=1e-6)
+
+
+def test_calibration_rejects_invalid_outcomes(calibration_ruleset):
+    with pytest.raises(ValueError, match="Unknown labels"):
+        calibrate_ruleset(calibration_ruleset, [{"a": True}], ["Severe"], LABELS)
+    with pytest.raises(ValueError, match="exactly one outcome"):
+        calibrate_ruleset(calibration_ruleset, [{"a": True}], [], LABELS)
+    with pytest.raises(ValueError, match="No labeled records"):
+        RuleWeightCalibrator(calibration_ruleset, LABELS).fit()
@@ -0,0 +1,113 @@
+import time
+from itertools import combinations
+
+from diagnostipy.analysis.counterfactual import (
+    CounterfactualResult,
+    _expand,
+    _Search,
+    find_counterfactuals,
+)
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+
+
+def _brute_force(evaluator, record, target, fields, max_changes):
+    for size in range(max_changes + 1):
+        found = set()
+        for subset in combinations(fields, size):
+            changed = {**record, **{field: not record.get(field) for field in subset}}
+            if evaluator.run(changed).label == target:
+                found.add(frozenset(subset))
+        if found:
+            return found
+    return set()
+
+
+def test_find_counterfactuals_matches_brute_force(overlapping_rules):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules))
+    record = {"cough": True, "fever": False, "fatigue": False, "age": 30}
+    assert evaluator.run(record).label == "Low"
+
+    result = find_counterfactuals(
+        evaluator, record, "High", max_changes=3, max_results=100
+    )
+
+    expected = _brute_force(evaluator, record, "High", ["cough", "fever", "fatigue"], 3)
+    assert result.complete
+    assert {frozenset(cf.added + cf.removed) for cf in result.counterfactuals} == (
+        expected
+    )
+    assert all(cf.label == "High" for cf in result.counterfactuals)
+
+
+def test_find_counterfactuals_prunes_unreachable_branches():
+    rules = [
+        SymptomRule(name=f"minor_{idx}", weight=0.1, conditions={f"minor_{idx}"})
+        for idx in range(12)
+    ]
+    rules.append(SymptomRule(name="major", weight=10.0, conditions={"major"}))
+    evaluator = Evaluator(SymptomRuleset(rules))
+
+    result = find_counterfactuals(evaluator, {}, "High", max_changes=3)
+
+    assert [cf.added for cf in result.counterfactuals] == [("major",)]
+    assert result.explored == 1 + len(rules)
+
+    unreachable = find_counterfactuals(
+        evaluator, {}, "High", max_changes=3, fields=[f"minor_{i}" for i in range(12)]
+    )
+    assert unreachable.counterfactuals == []
+    assert unreachable.pruned > 0
+    assert unreachable.explored == 1
+
+
+def test_find_counterfactuals_removals_and_existing_label(overlapping_rules):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules))
+    record = {"cough": True, "fever": True, "fatigue": True, "age": 70}
+
+    lower = find_counterfactuals(
+        evaluator, record, "Low", allow_additions=False, max_results=1
+    )
+    same = find_counterfactuals(evaluator, record, "High")
+
+    assert lower.counterfactuals[0].added == ()
+    assert (
+        evaluator.run(
+            {**record, **dict.fromkeys(lower.counterfactuals[0].removed, False)}
+        ).label
+        == "Low"
+    )
+    assert same.counterfactuals[0].n_changes == 0
+
+
+def test_find_counterfactuals_time_budget(overlapping_rules):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules))
+
+    result = find_counterfactuals(evaluator, {}, "High", time_budget=0.0)
+
+    assert not result.complete
+    assert result.counterfactuals == []
+
+
+def test_expand_generates_children_lazily_until_the_deadline():
+    rules = [
+        SymptomRule(name=f"minor_{idx}", weight=0.1, conditions={f"minor_{idx}"})
+        for idx in range(300)
+    ]
+    evaluator = Evaluator(SymptomRuleset(rules))
+    changes = [(f"minor_{idx}", True) for idx in range(300)]
+    search = _Search(evaluator, {}, changes, "High", None, (), {})
+    frontier: list[tuple[tuple[int, ...], float]] = [
+        ((idx,), 0.0) for idx in range(300)
+    ]
+
+    result = CounterfactualResult()
+    children = _expand(search, frontier, 2, result, deadline=None)
+    assert next(children) == (0, 1)
+    assert result.complete
+
+    expired = CounterfactualResult()
+    children = _expand(search, frontier, 2, expired, time.perf_counter() - 1.0)
+    assert list(children) == []
+    assert not expired.complete
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from diagnostipy.analysis.coverage import analyze_rule_coverage
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.numeric import GradedWeight
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.core.sparse import SparseRecords
+
+
+def _expected_counts(ruleset, records):
+    fired = np.zeros(len(ruleset.rules), dtype=np.int64)
+    matched = np.zeros(len(ruleset.rules), dtype=np.int64)
+    for record in records:
+        fired[ruleset.get_applicable_indices(record)] += 1
+        matched[[r.applies(record) for r in ruleset.rules]] += 1
+    return matched, fired
+
+
+@pytest.mark.parametrize("n_jobs", [1, 3])
+def test_analyze_rule_coverage_counts(overlapping_rules, symptom_records, n_jobs):
+    ruleset = SymptomRuleset(overlapping_rules)
+    records = symptom_records * 5
+
+    report = analyze_rule_coverage(ruleset, iter(records), chunk_size=7, n_jobs=n_jobs)
+
+    matched, fired = _expected_counts(ruleset, records)
+    assert report.n_records == len(records)
+    assert report.match_counts.tolist() == matched.tolist()
+    assert report.fire_counts.tolist() == fired.tolist()
+    assert report.shadow_counts.tolist() == (matched - fired).tolist()
+    assert report.co_firing is not None
+    assert report.co_firing.diagonal().tolist() == fired.tolist()
+    assert report.label_counts == {}
+
+
+def test_analyze_rule_coverage_label_distribution(overlapping_rules, symptom_records):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules))
+
+    report = analyze_rule_coverage(evaluator, symptom_records, chunk_size=4)
+
+    expected: dict[str, int] = {}
+    for record in symptom_records:
+        label = evaluator.run(record).label
+        assert label is not None
+        expected[label] = expected.get(label, 0) + 1
+    assert report.label_counts == expected
+
+
+@pytest.mark.parametrize("parallelism", ["threads", "processes"])
+def test_analyze_rule_coverage_uses_graded_weights(parallelism):
+    graded = GradedWeight(field="temperature", points=((37.0, 0.0), (41.0, 8.0)))
+    evaluator = Evaluator(
+        SymptomRuleset(
+            [
+                SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+                SymptomRule(name="fever", weight=1.0, graded_weight=graded),
+            ]
+        )
+    )
+    records = [
+        {"cough": True, "temperature": t} for t in (36.5, 38.0, 39.5, 40.5, None)
+    ] * 4
+
+    report = analyze_rule_coverage(
+        evaluator, records, chunk_size=3, n_jobs=2, parallelism=parallelism
+    )
+
+    expected: dict[str, int] = {}
+    for record in records:
+        label = evaluator.run(record).label
+        assert label is not None
+        expected[label] = expected.get(label, 0) + 1
+    assert report.label_counts == expected
+    assert len(expected) == 2
+
+
+def test_analyze_rule_coverage_never_fired():
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+            SymptomRule(name="rash", weight=1.0, conditions={"rash"}),
+        ]
+    )
+
+    report = analyze_rule_coverage(ruleset, [{"cough": True}], co_firing=False)
+
+    assert report.never_fired() == ["rash"]
+    assert report.co_firing is None
+    assert report.to_dict()["rules"]["cough"] == {
+        "matched": 1,
+        "fired": 1,
+        "shadowed": 0,
+    }
+
+
+def test_analyze_rule_coverage_sparse_records(overlapping_rules):
+    ruleset = SymptomRuleset(overlapping_rules[:-1])
+    codes = [["cough"], ["cough", "fever"], ["fatigue"], ["fever", "fatigue"]] * 3
+
+    report = analyze_rule_coverage(
+        ruleset, SparseRecords.from_codes(codes), chunk_size=5
+    )
+
+    matched, fired = _expected_counts(
+        ruleset, [dict.fromkeys(record, True) for record in codes]
+    )
+    assert report.match_counts.tolist() == matched.tolist()
+    assert report.fire_counts.tolist() == fired.tolist()
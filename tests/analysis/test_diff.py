@@ -0,0 +1,117 @@
+import math
+from typing import Any, Optional
+
+import numpy as np
+import pytest
+
+from diagnostipy.analysis.diff import diff_rulesets
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import EvaluationFunctionEnum
+
+
+def _versions(overlapping_rules):
+    old = SymptomRuleset(overlapping_rules)
+    new_rules = [rule for rule in overlapping_rules if rule.name != "fatigue_late"]
+    new_rules[1] = SymptomRule(
+        name="cough_fever", weight=6.0, conditions={"cough", "fever"}
+    )
+    new_rules.append(SymptomRule(name="elderly", weight=1.0, condition="age > 80"))
+    return old, SymptomRuleset(new_rules)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_diff_rulesets_matches_separate_runs(
+    overlapping_rules, symptom_records, n_jobs
+):
+    old, new = _versions(overlapping_rules)
+    records = symptom_records * 3
+    kwargs: dict[str, Any] = {
+        "evaluation_function": EvaluationFunctionEnum.MULTICLASS_SIMPLE,
+        "evaluation_params": {"labels": ["Low", "Medium", "High"]},
+    }
+    old_evaluator, new_evaluator = Evaluator(old, **kwargs), Evaluator(new, **kwargs)
+
+    report = diff_rulesets(
+        old_evaluator, new_evaluator, iter(records), chunk_size=5, n_jobs=n_jobs
+    )
+
+    before = [old_evaluator.run(record) for record in records]
+    after = [new_evaluator.run(record) for record in records]
+    changed = [
+        idx for idx, (a, b) in enumerate(zip(before, after)) if a.label != b.label
+    ]
+    deltas = np.array([b.total_score for b in after], dtype=float) - np.array(
+        [a.total_score for a in before], dtype=float
+    )
+    expected: dict[tuple[Optional[str], Optional[str]], int] = {}
+    for a, b in zip(before, after):
+        expected[(a.label, b.label)] = expected.get((a.label, b.label), 0) + 1
+
+    assert report.removed_rules == ("cough_fever", "fatigue_late")
+    assert report.added_rules == ("cough_fever", "elderly")
+    assert report.n_records == len(records)
+    assert report.transitions == expected
+    assert report.n_label_changed == len(changed)
+    assert report.changed_records == changed
+    assert report.n_score_changed == np.count_nonzero(deltas)
+    assert report.score_delta_stats()["mean"] == pytest.approx(deltas.mean())
+    assert report.score_delta_stats()["max"] == pytest.approx(deltas.max())
+    assert report.rule_matches["+elderly"] == 0
+    assert report.rule_matches["-fatigue_late"] == len(records) // 2
+
+
+def test_diff_rulesets_identical_versions(overlapping_rules, symptom_records):
+    ruleset = SymptomRuleset(overlapping_rules)
+
+    report = diff_rulesets(ruleset, ruleset, symptom_records, max_examples=2)
+
+    assert report.n_label_changed == 0
+    assert report.n_score_changed == 0
+    assert report.to_dict()["removed_rules"] == []
+    assert report.to_dict()["n_records"] == len(symptom_records)
+
+
+def test_diff_rulesets_empty_dataset(overlapping_rules):
+    report = diff_rulesets(SymptomRuleset(overlapping_rules), SymptomRuleset([]), [])
+
+    assert report.n_records == 0
+    assert math.isnan(report.score_delta_stats()["mean"])
+
+
+def test_diff_rulesets_without_batch_function(overlapping_rules, symptom_records):
+    def by_count(applicable_rules, all_rules, *args, **kwargs):
+        return BaseEvaluation(
+            label="many" if len(applicable_rules) > 2 else "few",
+            score=float(len(applicable_rules)),
+        )
+
+    old, new = _versions(overlapping_rules)
+    old_evaluator = Evaluator(old, evaluation_function=by_count)
+    new_evaluator = Evaluator(new, evaluation_function=by_count)
+
+    report = diff_rulesets(old_evaluator, new_evaluator, symptom_records)
+
+    changed = [
+        idx
+        for idx, record in enumerate(symptom_records)
+        if old_evaluator.run(record).label != new_evaluator.run(record).label
+    ]
+    assert report.changed_records == changed
+
+
+def test_diff_rulesets_on_processes(overlapping_rules, symptom_records):
+    rules = [rule for rule in overlapping_rules if not rule.apply_condition]
+    old, new = _versions(rules)
+    records = symptom_records * 3
+
+    threads = diff_rulesets(old, new, records, chunk_size=5)
+    processes = diff_rulesets(
+        old, new, records, chunk_size=5, n_jobs=2, parallelism="processes"
+    )
+
+    assert processes.transitions == threads.transitions
+    assert processes.changed_records == threads.changed_records
+    assert processes.rule_matches == threads.rule_matches
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from diagnostipy.analysis.profiling import profile_ruleset
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+
+
+def _slow(data):
+    return sum(range(20_000)) > 0 and bool(data.get("cough"))
+
+
+def _ruleset():
+    return SymptomRuleset(
+        [
+            SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+            SymptomRule(name="slow", weight=2.0, apply_condition=_slow),
+            SymptomRule(name="elderly", weight=1.0, condition="age > 60"),
+        ]
+    )
+
+
+def test_profile_ruleset_reports_rules_and_stages():
+    records = [{"cough": idx % 2 == 0, "age": idx} for idx in range(100)]
+
+    report = profile_ruleset(Evaluator(_ruleset(), explain=True), records)
+
+    assert report.n_records == 100
+    assert report.rule_kinds == ("conditions", "apply_condition", "expression")
+    assert report.match_counts.tolist() == [50, 50, 39]
+    assert report.top_rules(1)[0][0] == "slow"
+    assert all(elapsed > 0 for elapsed in report.stage_ns.values())
+    assert sum(report.stage_shares.values()) == pytest.approx(1.0)
+    assert report.allocated_blocks is not None and report.allocated_blocks > 0
+    assert report.peak_bytes is not None and report.peak_bytes > 0
+
+
+def test_profile_ruleset_sample_is_reproducible():
+    records = [{"cough": True, "age": idx} for idx in range(100)]
+
+    first = profile_ruleset(_ruleset(), records, sample_size=20, seed=3)
+    second = profile_ruleset(_ruleset(), records, sample_size=20, seed=3)
+
+    assert first.n_records == 20
+    assert first.match_counts.tolist() == second.match_counts.tolist()
+
+
+def test_profile_report_outputs():
+    report = profile_ruleset(
+        _ruleset(), [{"cough": True, "age": 70}], trace_allocations=False
+    )
+
+    data = json.loads(report.to_json())
+    text = report.to_text(top=2)
+
+    assert data["n_records"] == 1
+    assert [rule["name"] for rule in data["rules"]][0] == "slow"
+    assert set(data["stages"]) == {"matching", "overlap_exclusion", "scoring"}
+    assert data["allocations"]["peak_bytes"] is None
+    assert "Allocations" not in text
+    assert "slow" in text and "overlap exclusion" in text
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from diagnostipy.analysis.sensitivity import (
+    WeightSensitivity,
+    analyze_weight_sensitivity,
+)
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import EvaluationFunctionEnum
+
+
+def _scaled(rules, rule_idx, factor):
+    return SymptomRuleset(
+        [
+            (
+                rule.model_copy(update={"weight": rule.weight * factor})
+                if idx == rule_idx
+                else rule
+            )
+            for idx, rule in enumerate(rules)
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "evaluation_function, params",
+    [
+        (EvaluationFunctionEnum.BINARY_SIMPLE, None),
+        (
+            EvaluationFunctionEnum.MULTICLASS_SIMPLE,
+            {"labels": ["Low", "Medium", "High"]},
+        ),
+    ],
+)
+def test_sensitivity_matches_rescoring(
+    overlapping_rules, symptom_records, evaluation_function, params
+):
+    kwargs = {"evaluation_function": evaluation_function, "evaluation_params": params}
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules), **kwargs)
+    factors = (0.5, 2.0)
+
+    report = analyze_weight_sensitivity(evaluator, symptom_records, factors=factors)
+
+    base = evaluator.run_batch(symptom_records)
+    base_sum = sum(diagnosis.total_score or 0.0 for diagnosis in base)
+    for rule_idx in range(len(overlapping_rules)):
+        for column, factor in enumerate(factors):
+            scaled = Evaluator(_scaled(overlapping_rules, rule_idx, factor), **kwargs)
+            rescored = scaled.run_batch(symptom_records)
+            flips = np.mean(
+                [a.label != b.label for a, b in zip(base, rescored)], dtype=float
+            )
+            elasticity = (
+                (sum(d.total_score or 0.0 for d in rescored) - base_sum)
+                / base_sum
+                / (factor - 1.0)
+            )
+            assert report.flip_rates[rule_idx, column] == pytest.approx(flips)
+            assert report.elasticities[rule_idx, column] == pytest.approx(elasticity)
+
+
+def test_weight_sensitivity_score_weight_sets(overlapping_rules, symptom_records):
+    sensitivity = WeightSensitivity(
+        SymptomRuleset(overlapping_rules), symptom_records, renormalize=False
+    )
+    n_rules = len(overlapping_rules)
+
+    labels, scores = sensitivity.score(np.stack([np.ones(n_rules), np.zeros(n_rules)]))
+
+    assert labels[:, 0].tolist() == sensitivity.base_labels.tolist()
+    assert scores[:, 1].tolist() == [0.0] * len(symptom_records)
+    assert sensitivity.mask.shape == (len(symptom_records), n_rules)
+
+
+def test_sensitivity_report_ranking(overlapping_rules, symptom_records):
+    report = analyze_weight_sensitivity(
+        SymptomRuleset(overlapping_rules), symptom_records
+    )
+
+    ranked = report.most_sensitive(None)
+
+    assert sorted(ranked) == sorted(rule.name for rule in overlapping_rules)
+    assert report.to_dict()["rules"][ranked[0]]["flip_rate"]["0.9"] >= 0.0
+
+
+def test_sensitivity_requires_batch_function(ruleset):
+    def by_count(applicable_rules, all_rules, *args, **kwargs):
+        return BaseEvaluation(label="any", score=float(len(applicable_rules)))
+
+    evaluator = Evaluator(ruleset, evaluation_function=by_count)
+
+    with pytest.raises(ValueError, match="batch counterpart"):
+        WeightSensitivity(evaluator, [{}])
@@ -61,3 +61,37 @@ def rules_with_zero_weight():
 @pytest.fixture
 def ruleset(rules_with_conditions):
     return SymptomRuleset(rules_with_conditions)
+
+
+@pytest.fixture
+def overlapping_rules():
+    """
+    Fixture providing rules with overlapping conditions and a custom condition.
+    """
+    return [
+        SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+        SymptomRule(name="cough_fever", weight=3.0, conditions={"cough", "fever"}),
+        SymptomRule(name="fever", weight=2.0, conditions={"fever"}),
+        SymptomRule(name="fatigue", weight=1.5, conditions={"fatigue"}),
+        SymptomRule(name="all", weight=4.0, conditions={"cough", "fever", "fatigue"}),
+        SymptomRule(name="fatigue_late", weight=0.5, conditions={"fatigue"}),
+        SymptomRule(
+            name="old_age",
+            weight=2.5,
+            apply_condition=lambda data: data.get("age", 0) > 65,
+        ),
+    ]
+
+
+@pytest.fixture
+def symptom_records():
+    """
+    Fixture providing every combination of the overlapping rules' symptoms.
+    """
+    return [
+        {"cough": cough, "fever": fever, "fatigue": fatigue, "age": age}
+        for cough in (False, True)
+        for fever in (False, True)
+        for fatigue in (0, 1)
+        for age in (30, 70)
+    ]
@@ -0,0 +1,30 @@
+from diagnostipy.core.models.explanation import Explanation
+from diagnostipy.core.models.symptom_rule import SymptomRule
+
+
+def test_explanation_resolves_names_lazily():
+    rules = [
+        SymptomRule(name="rule1", weight=1.0),
+        SymptomRule(name="rule2", weight=None),
+        SymptomRule(name="rule3", weight=4.0),
+    ]
+    explanation = Explanation(
+        rules, fired=(1, 2), suppressed=((0, 2),), threshold_distance=0.5
+    )
+
+    assert explanation.fired_rules == ["rule2", "rule3"]
+    assert explanation.suppressed_rules == {"rule1": "rule3"}
+    assert explanation.contributions == {"rule2": 0.0, "rule3": 4.0}
+    assert explanation.to_dict() == {
+        "fired_rules": ["rule2", "rule3"],
+        "suppressed_rules": {"rule1": "rule3"},
+        "contributions": {"rule2": 0.0, "rule3": 4.0},
+        "threshold_distance": 0.5,
+    }
+
+
+def test_explanation_is_slotted():
+    explanation = Explanation([], fired=())
+
+    assert not hasattr(explanation, "__dict__")
+    assert explanation.threshold_distance is None
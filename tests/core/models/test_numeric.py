@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.numeric import GradedWeight, NumericCondition
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import Comparator
+
+
+def test_numeric_condition_holds_and_evaluates():
+    numeric = NumericCondition(
+        field="temperature", comparator=Comparator.GE, threshold=38.5
+    )
+    values = [37.0, 38.5, 40.0, None, "high"]
+
+    column = np.array([37.0, 38.5, 40.0, np.nan, np.nan])
+
+    assert numeric.key == "temperature >= 38.5"
+    assert [numeric.holds(value) for value in values] == [
+        False,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert numeric.evaluate(column).tolist() == [False, True, True, False, False]
+
+
+def test_graded_weight_matches_interp():
+    graded = GradedWeight(field="temperature", points=((37.5, 0.0), (40.0, 5.0)))
+    values = [36.0, 37.5, 38.0, 39.25, 40.0, 41.0]
+
+    assert graded.max_weight == 5.0
+    assert [graded.weight(value) for value in values] == pytest.approx(
+        graded.weights(np.array(values)).tolist()
+    )
+    assert graded.weight(38.75) == pytest.approx(2.5)
+
+
+def test_graded_weight_rejects_unordered_points():
+    with pytest.raises(ValidationError, match="ascending"):
+        GradedWeight(field="age", points=((10, 1.0), (5, 2.0)))
+    with pytest.raises(ValidationError, match="at least one point"):
+        GradedWeight(field="age", points=())
+
+
+def test_symptom_rule_numeric_conditions_and_graded_weight():
+    rule = SymptomRule(
+        name="fever",
+        weight=1.0,
+        conditions={"cough"},
+        numeric_conditions=[
+            NumericCondition(
+                field="temperature", comparator=Comparator.GT, threshold=38
+            )
+        ],
+        graded_weight=GradedWeight(
+            field="temperature", points=((38.0, 1.0), (40.0, 3.0))
+        ),
+    )
+
+    assert rule.condition_keys == {"cough", "temperature > 38"}
+    assert rule.applies({"cough": True, "temperature": 39.0})
+    assert not rule.applies({"cough": True, "temperature": 38.0})
+    assert not rule.applies({"cough": True})
+    assert rule.weight_for({"temperature": 39.0}) == pytest.approx(2.0)
+    assert rule.weight_for({}) == 1.0
+
+
+def test_numeric_condition_keys_keep_exact_thresholds():
+    low = NumericCondition(field="t", comparator=Comparator.GT, threshold=100.0)
+    high = NumericCondition(field="t", comparator=Comparator.GT, threshold=100.0004)
+    evaluator = Evaluator(
+        SymptomRuleset(
+            [
+                SymptomRule(name="low", weight=1.0, numeric_conditions=[low]),
+                SymptomRule(name="high", weight=1.0, numeric_conditions=[high]),
+            ]
+        )
+    )
+    record = {"t": 100.0002}
+
+    assert low.key == "t > 100"
+    assert high.key == "t > 100.0004"
+    assert evaluator.run(record).total_score == 1.0
+    assert evaluator.run_batch([record])[0].total_score == 1.0
+
+
+@pytest.mark.parametrize("value", [np.int64(5), np.float32(5.0), np.float64(5.0)])
+def test_numeric_conditions_accept_numpy_scalars(value):
+    rule = SymptomRule(
+        name="t",
+        weight=1.0,
+        numeric_conditions=[
+            NumericCondition(field="t", comparator=Comparator.GT, threshold=1)
+        ],
+    )
+
+    assert rule.applies({"t": value})
+    assert SymptomRuleset([rule]).compile().match([{"t": value}]).tolist() == [[True]]
@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from diagnostipy.core.models.numeric import GradedWeight, NumericCondition
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import Comparator
+
+
+@pytest.mark.parametrize("exclude_overlaps", [True, False])
+def test_applicable_mask_matches_ruleset(
+    overlapping_rules, symptom_records, exclude_overlaps
+):
+    ruleset = SymptomRuleset(overlapping_rules, exclude_overlaps=exclude_overlaps)
+    compiled = ruleset.compile()
+
+    mask = compiled.applicable_mask(symptom_records)
+
+    for row, record in zip(mask, symptom_records):
+        assert np.flatnonzero(row).tolist() == ruleset.get_applicable_indices(record)
+
+
+def test_suppressors_match_ruleset(overlapping_rules, symptom_records):
+    ruleset = SymptomRuleset(overlapping_rules)
+    compiled = ruleset.compile()
+
+    applies = compiled.match(symptom_records)
+
+    for row, record in zip(applies, symptom_records):
+        suppressed: dict[int, int] = {}
+        ruleset.get_applicable_indices(record, suppressed)
+        assert compiled.suppressors(row) == suppressed
+
+
+def test_encoded_matrix_input():
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(name="a", weight=1.0, conditions={"x"}),
+            SymptomRule(name="ab", weight=1.0, conditions={"x", "y"}),
+        ]
+    )
+    compiled = ruleset.compile()
+    encoded = np.array([[True, False], [True, True]])
+
+    assert compiled.fields == ("x", "y")
+    assert compiled.applicable_mask(encoded).tolist() == [
+        [True, False],
+        [False, True],
+    ]
+
+
+def test_encoded_matrix_rejected_for_apply_condition(overlapping_rules):
+    compiled = SymptomRuleset(overlapping_rules).compile()
+
+    with pytest.raises(ValueError, match="require raw records"):
+        compiled.match(np.zeros((1, len(compiled.fields)), dtype=bool))
+
+
+def test_compile_is_cached_until_rules_change(overlapping_rules):
+    ruleset = SymptomRuleset(overlapping_rules)
+    compiled = ruleset.compile()
+
+    assert ruleset.compile() is compiled
+
+    ruleset.add_rule(SymptomRule(name="new", weight=1.0))
+    recompiled = ruleset.compile()
+    assert recompiled is not compiled
+    assert ruleset.compile(force=True) is not recompiled
+
+
+def test_condition_expressions_match_ruleset(symptom_records):
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(name="elderly", weight=1.0, condition="age > 65"),
+            SymptomRule(
+                name="elderly_cough",
+                weight=2.0,
+                conditions={"cough"},
+                condition="age > 65",
+            ),
+            SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+            SymptomRule(
+                name="not_fever", weight=1.0, condition="not fever or age <= 30"
+            ),
+        ]
+    )
+    compiled = ruleset.compile()
+
+    mask = compiled.applicable_mask(symptom_records)
+
+    assert compiled.expression_rules == (0, 1, 3)
+    assert compiled.expression_fields == ("age", "fever")
+    for row, record in zip(mask, symptom_records):
+        assert np.flatnonzero(row).tolist() == ruleset.get_applicable_indices(record)
+    with pytest.raises(ValueError, match="raw records"):
+        compiled.match(np.zeros((1, len(compiled.fields)), dtype=bool))
+
+
+def test_numeric_conditions_are_index_columns():
+    mild = NumericCondition(field="temperature", comparator=Comparator.GT, threshold=38)
+    high = NumericCondition(
+        field="temperature", comparator=Comparator.GT, threshold=39.5
+    )
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(name="fever", weight=1.0, numeric_conditions=[mild]),
+            SymptomRule(name="high_fever", weight=2.0, numeric_conditions=[mild, high]),
+            SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+        ]
+    )
+    records = [
+        {"temperature": 38.5, "cough": True},
+        {"temperature": 40.0},
+        {"temperature": None, "cough": True},
+        {"temperature": 37.0},
+    ]
+    compiled = ruleset.compile()
+
+    mask = compiled.applicable_mask(records)
+
+    assert set(compiled.fields) == {"cough", mild.key, high.key}
+    for row, record in zip(mask, records):
+        assert np.flatnonzero(row).tolist() == ruleset.get_applicable_indices(record)
+    assert mask[1].tolist() == [False, True, False]
+
+
+def test_record_weights_interpolate_graded_rules():
+    graded = GradedWeight(field="temperature", points=((38.0, 1.0), (40.0, 5.0)))
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(name="fever", weight=0.5, graded_weight=graded),
+            SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+        ]
+    )
+    compiled = ruleset.compile()
+
+    weights = compiled.record_weights([{"temperature": 39.0}, {"cough": True}])
+
+    assert compiled.graded_rules == (0,)
+    assert compiled.weights.tolist() == [5.0, 1.0]
+    assert weights.tolist() == [[3.0, 1.0], [0.5, 1.0]]
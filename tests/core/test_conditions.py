@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from diagnostipy.core.conditions import extract_columns, parse_condition
+
+RECORDS = [
+    {"temperature": 39.2, "cough": True, "blood_type": "A", "age": 70},
+    {"temperature": 37.0, "cough": False, "blood_type": "O", "age": 30},
+    {"temperature": None, "cough": 1, "blood_type": "AB"},
+    {},
+    SimpleNamespace(temperature=38.0, cough=0, blood_type=None, age=65),
+]
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("temperature > 38.5", [True, False, False, False, False]),
+        ("38 <= temperature < 40", [True, False, False, False, True]),
+        ("cough", [True, False, True, False, False]),
+        ("not cough", [False, True, False, True, True]),
+        ("blood_type in ['A', 'AB']", [True, False, True, False, False]),
+        ("blood_type not in ('A', 'AB')", [False, True, False, False, False]),
+        ("temperature != 37", [True, False, False, False, True]),
+        (
+            "(temperature >= 38 or cough) and not age < 65",
+            [True, False, True, False, True],
+        ),
+    ],
+)
+def test_condition_single_and_batch(source, expected):
+    condition = parse_condition(source)
+
+    assert [condition(record) for record in RECORDS] == expected
+    assert condition.evaluate(extract_columns(RECORDS, condition.fields)).tolist() == (
+        expected
+    )
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "temperature + 1 > 38",
+        "__import__('os').system('true')",
+        "record.temperature > 38",
+        "1 < 2",
+        "blood_type in other_field",
+        "temperature is None",
+        "temperature >",
+        "age > -True",
+        "age > -'1'",
+    ],
+)
+def test_condition_rejects_unsupported_syntax(source):
+    with pytest.raises(ValueError, match="condition"):
+        parse_condition(source)
+
+
+def test_condition_is_parsed_once():
+    condition = parse_condition("age >= 65 and age >= 70")
+
+    assert parse_condition("age >= 65 and age >= 70") is condition
+    assert condition.fields == ("age",)
+
+
+def test_extract_columns_types():
+    columns = extract_columns(RECORDS, ["temperature", "blood_type"])
+
+    assert columns["temperature"].dtype == np.float64
+    assert np.isnan(columns["temperature"][2])
+    assert columns["blood_type"].dtype == object
+    assert columns["blood_type"].tolist() == ["A", "O", "AB", None, None]
+
+
+def test_condition_accepts_signed_numbers():
+    records = [{"base_excess": -3}, {"base_excess": -1}, {"base_excess": 2}]
+    condition = parse_condition("base_excess < -2 or base_excess in (+2, -1.5)")
+
+    assert [condition(record) for record in records] == [True, False, True]
+    assert condition.evaluate(extract_columns(records, condition.fields)).tolist() == [
+        True,
+        False,
+        True,
+    ]
+
+
+@pytest.mark.parametrize(
+    "source", ["t != 5", "t", "not t", "t not in (1, 2)", "label != 'x'"]
+)
+def test_condition_reads_nan_as_missing(source):
+    records = [
+        {"t": float("nan"), "label": float("nan")},
+        {"t": np.float32("nan"), "label": "x"},
+        {"t": None, "label": None},
+        {},
+    ]
+    condition = parse_condition(source)
+
+    single = [condition(record) for record in records]
+    batch = condition.evaluate(extract_columns(records, condition.fields)).tolist()
+    assert single == batch
+    assert single == [condition({}) for _ in records]
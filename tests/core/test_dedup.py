@@ -0,0 +1,126 @@
+import random
+
+import numpy as np
+import pytest
+
+from diagnostipy.core.dedup import DedupStats, group_profiles
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.diagnosis import Diagnosis
+from diagnostipy.core.models.numeric import GradedWeight
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import ConfidenceFunctionEnum
+
+
+def _summaries(diagnoses):
+    return [(d.label, d.total_score, d.confidence) for d in diagnoses]
+
+
+def _fired(diagnoses):
+    fired = []
+    for diagnosis in diagnoses:
+        assert isinstance(diagnosis, Diagnosis) and diagnosis.metadata
+        fired.append(diagnosis.metadata["explanation"].fired)
+    return fired
+
+
+@pytest.mark.parametrize("explain", [False, True])
+def test_deduplicated_batch_matches_plain_batch(
+    overlapping_rules, symptom_records, explain
+):
+    records = symptom_records * 20
+    random.Random(0).shuffle(records)
+    evaluator = Evaluator(
+        SymptomRuleset(overlapping_rules),
+        confidence_function=ConfidenceFunctionEnum.ENTROPY,
+        explain=explain,
+    )
+
+    expected = evaluator.run_batch(records)
+    deduplicated = evaluator.run_batch(records, deduplicate=True)
+
+    assert _summaries(deduplicated) == _summaries(expected)
+    if explain:
+        assert _fired(deduplicated) == _fired(expected)
+    assert evaluator.dedup_stats.records == len(records)
+    assert evaluator.dedup_stats.profiles == len(symptom_records)
+    assert evaluator.dedup_stats.ratio == 20.0
+
+
+def test_group_profiles_projects_onto_condition_fields(overlapping_rules):
+    compiled = SymptomRuleset(overlapping_rules[:-1]).compile()
+    records = [
+        {"cough": True, "name": "a"},
+        {"cough": 1, "name": "b"},
+        {"fever": True},
+        {"cough": "yes"},
+        {},
+    ]
+
+    first, inverse = group_profiles(compiled, records)
+
+    assert first.tolist() == [0, 2, 4]
+    assert inverse.tolist() == [0, 0, 1, 0, 2]
+
+
+def test_group_profiles_keeps_callable_results_apart(overlapping_rules):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules))
+    records = [{"cough": True, "age": 30}, {"cough": True, "age": 70}] * 3
+
+    diagnoses = evaluator.run_batch(records, deduplicate=True)
+
+    assert [d.total_score for d in diagnoses] == [1.0, 3.5] * 3
+    assert evaluator.dedup_stats.profiles == 2
+
+
+def test_group_profiles_reads_graded_and_expression_values():
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(
+                name="fever",
+                weight=1.0,
+                graded_weight=GradedWeight(
+                    field="temperature", points=((37, 0.0), (40, 3.0))
+                ),
+            ),
+            SymptomRule(name="type", weight=2.0, condition="blood_type == 'A'"),
+        ]
+    )
+    records = [
+        {"temperature": 38.0, "blood_type": "A"},
+        {"temperature": 38.0, "blood_type": "A"},
+        {"temperature": 39.0, "blood_type": "A"},
+        {"temperature": 38.0, "blood_type": "B"},
+        {"temperature": 38.0, "blood_type": ["A"]},
+        {"temperature": 38.0, "blood_type": ["A"]},
+    ]
+    evaluator = Evaluator(ruleset)
+
+    first, inverse = group_profiles(ruleset.compile(), records)
+    diagnoses = evaluator.run_batch(records, deduplicate=True)
+
+    assert first.tolist() == [0, 2, 3, 4, 5]
+    assert inverse.tolist() == [0, 0, 1, 2, 3, 4]
+    assert _summaries(diagnoses) == _summaries(evaluator.run_batch(records))
+
+
+def test_deduplicate_encoded_matrix(overlapping_rules):
+    ruleset = SymptomRuleset(overlapping_rules[:-1])
+    matrix = np.array([[1, 0, 1], [1, 0, 1], [0, 1, 0]], dtype=bool)
+    evaluator = Evaluator(ruleset)
+
+    diagnoses = evaluator.run_batch(matrix, deduplicate=True)
+
+    assert diagnoses[0] is diagnoses[1]
+    assert _summaries(diagnoses) == _summaries(evaluator.run_batch(matrix))
+    assert evaluator.run_batch(matrix[:0], deduplicate=True) == []
+
+
+def test_dedup_stats():
+    stats = DedupStats()
+    assert stats.ratio == 1.0
+
+    stats.add(100, 4)
+    stats.add(20, 2)
+
+    assert stats.to_dict() == {"records": 120, "profiles": 6, "ratio": 20.0}
@@ -3,8 +3,13 @@ from typing import Optional
 import pytest
 
 from diagnostipy.core.evaluator import Evaluator
-from diagnostipy.core.models.diagnosis import DiagnosisBase
+from diagnostipy.core.models.diagnosis import Diagnosis, DiagnosisBase
 from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.models.explanation import Explanation
+from diagnostipy.core.models.numeric import GradedWeight, NumericCondition
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import Comparator, EvaluationFunctionEnum, SolverMode
 
 
 @pytest.fixture
@@ -142,3 +147,219 @@ def test_invalid_evaluation_function(ruleset):
 def test_invalid_evaluation_function_type(ruleset):
     with pytest.raises(TypeError, match="Invalid type for evaluation_function"):
         Evaluator(ruleset, evaluation_function=123)  # type: ignore
+
+
+def test_evaluator_explain_mode():
+    rule_a = SymptomRule(name="rule_a", conditions={"cough"}, weight=1.0)
+    rule_b = SymptomRule(name="rule_b", conditions={"cough", "fever"}, weight=2.0)
+    rule_c = SymptomRule(name="rule_c", conditions={"fatigue"}, weight=3.0)
+    ruleset = SymptomRuleset([rule_a, rule_b, rule_c])
+
+    evaluator = Evaluator(ruleset=ruleset, explain=True)
+    results = evaluator.run(data={"cough": True, "fever": True})
+
+    assert isinstance(results, Diagnosis) and results.metadata is not None
+    explanation = results.metadata["explanation"]
+    assert isinstance(explanation, Explanation)
+    assert explanation.fired_rules == ["rule_b"]
+    assert explanation.suppressed_rules == {"rule_a": "rule_b"}
+    assert explanation.contributions == {"rule_b": 2.0}
+    assert explanation.threshold_distance == pytest.approx(5.0 / 2 - 2.0)
+
+
+def test_explained_diagnoses_round_trip_through_json(overlapping_rules):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules), explain=True)
+    record = {"cough": True, "fever": True, "age": 70}
+
+    diagnosis = evaluator.run(record)
+    restored = Diagnosis.model_validate_json(diagnosis.model_dump_json())
+
+    assert isinstance(diagnosis, Diagnosis)
+    assert diagnosis.metadata is not None and restored.metadata is not None
+    explanation = diagnosis.metadata["explanation"]
+    assert restored.metadata["explanation"] == explanation.to_dict()
+    assert diagnosis.model_dump()["metadata"]["explanation"] == explanation.to_dict()
+    assert evaluator.run(record) == diagnosis
+    assert evaluator.run({"fatigue": 1}) != diagnosis
+
+
+def test_evaluator_explain_disabled_by_default(ruleset, input_data):
+    results = Evaluator(ruleset=ruleset).run(data=input_data)
+
+    assert isinstance(results, Diagnosis) and results.metadata is None
+    assert "next_threshold" not in results.model_dump()
+
+
+def test_evaluator_run_batch_matches_run(overlapping_rules, symptom_records):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules), explain=True)
+
+    results = evaluator.run_batch(symptom_records)
+
+    for result, record in zip(results, symptom_records):
+        expected = evaluator.run(record)
+        assert result.label == expected.label
+        assert result.total_score == expected.total_score
+        assert result.confidence == expected.confidence
+        assert isinstance(result, Diagnosis) and result.metadata
+        assert isinstance(expected, Diagnosis) and expected.metadata
+        assert (
+            result.metadata["explanation"].to_dict()
+            == expected.metadata["explanation"].to_dict()
+        )
+
+
+def test_evaluator_run_batch_matches_run_on_nan_values():
+    evaluator = Evaluator(
+        SymptomRuleset(
+            [
+                SymptomRule(name="a", weight=1.0, condition="t != 5"),
+                SymptomRule(name="b", weight=2.0, condition="flag"),
+                SymptomRule(name="c", weight=3.0, condition="t >= 1"),
+            ]
+        ),
+        explain=True,
+    )
+    records = [{"t": float("nan"), "flag": "x"}, {"t": float("nan")}, {"t": 2.0}]
+
+    results = evaluator.run_batch(records)
+
+    for result, record in zip(results, records):
+        expected = evaluator.run(record)
+        assert result.model_dump() == expected.model_dump()
+    assert results[0].total_score == evaluator.run({"flag": "x"}).total_score
+
+
+def test_evaluator_uses_compiled_normalizers():
+    rules = [
+        SymptomRule(name="x", weight=5.0, conditions={"x"}),
+        SymptomRule(name="xy", weight=1.0, conditions={"x", "y"}),
+        SymptomRule(name="y", weight=5.0, conditions={"y"}),
+    ]
+
+    exact = Evaluator(SymptomRuleset(rules, solver_mode=SolverMode.EXACT))
+    greedy = Evaluator(SymptomRuleset(rules, solver_mode=SolverMode.GREEDY))
+
+    assert exact.run({"x": True}).label == "High"
+    assert exact.run({"x": True}).confidence == pytest.approx(5.0 / 6.0)
+    assert greedy.run({"x": True}).label == "High"
+    assert greedy.run({"x": True}).confidence == pytest.approx(5.0 / 10.0)
+
+
+@pytest.mark.parametrize(
+    "evaluation_function, kwargs",
+    [
+        ("binary_simple", {}),
+        ("multiclass_simple", {"labels": ["Low", "Medium", "High"]}),
+        (
+            "multiclass_scoring_based",
+            {
+                "score_function": lambda x: x / 10,
+                "threshold_label_map": {0.2: "Low", 0.5: "Medium", 0.8: "High"},
+            },
+        ),
+    ],
+)
+def test_evaluator_run_batch_labels_all_records_at_once(
+    overlapping_rules, symptom_records, evaluation_function, kwargs
+):
+    evaluator = Evaluator(
+        SymptomRuleset(overlapping_rules), evaluation_function=evaluation_function
+    )
+
+    results = evaluator.run_batch(symptom_records, **kwargs)
+
+    assert [r.model_dump() for r in results] == [
+        evaluator.run(record, **kwargs).model_dump() for record in symptom_records
+    ]
+
+
+@pytest.mark.parametrize(
+    "evaluation_function, params",
+    [
+        ("multiclass_simple", {"labels": ["Low", "Medium", "High"]}),
+        (
+            "multiclass_scoring_based",
+            {
+                "score_function": lambda x: x / 10,
+                "threshold_label_map": {0.2: "Low", 0.5: "Medium", 0.8: "High"},
+            },
+        ),
+    ],
+)
+def test_evaluator_with_configured_params(
+    overlapping_rules, symptom_records, evaluation_function, params
+):
+    ruleset = SymptomRuleset(overlapping_rules)
+    legacy = Evaluator(ruleset, evaluation_function=evaluation_function)
+    configured = Evaluator(
+        ruleset, evaluation_function=evaluation_function, evaluation_params=params
+    )
+
+    expected = [legacy.run(r, **params).model_dump() for r in symptom_records]
+
+    assert [configured.run(r).model_dump() for r in symptom_records] == expected
+    assert [r.model_dump() for r in configured.run_batch(symptom_records)] == expected
+
+
+def test_evaluator_validates_params_at_construction(ruleset):
+    with pytest.raises(ValueError, match="At least two labels"):
+        Evaluator(
+            ruleset,
+            evaluation_function=EvaluationFunctionEnum.MULTICLASS_SIMPLE,
+            evaluation_params={"labels": ["Low"]},
+        )
+
+
+def test_evaluator_graded_weights_match_batch():
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(
+                name="fever",
+                weight=1.0,
+                numeric_conditions=[
+                    NumericCondition(
+                        field="temperature", comparator=Comparator.GT, threshold=38
+                    )
+                ],
+                graded_weight=GradedWeight(
+                    field="temperature", points=((38.0, 1.0), (41.0, 4.0))
+                ),
+            ),
+            SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+        ]
+    )
+    records = [
+        {"temperature": 39.7, "cough": True},
+        {"temperature": 41.5},
+        {"temperature": 37.0, "cough": True},
+    ]
+    evaluator = Evaluator(ruleset, explain=True)
+
+    batch = evaluator.run_batch(records)
+
+    for record, diagnosis in zip(records, batch):
+        single = evaluator.run(record)
+        assert diagnosis.label == single.label
+        assert diagnosis.total_score == pytest.approx(single.total_score)
+        assert diagnosis.confidence == pytest.approx(single.confidence)
+    assert batch[0].total_score == pytest.approx(3.7)
+    assert isinstance(batch[1], Diagnosis) and batch[1].metadata
+    explanation = batch[1].metadata["explanation"]
+    assert explanation.contributions == {"fever": pytest.approx(4.0)}
+
+
+def test_evaluator_cache_reuses_identical_applicable_sets(
+    overlapping_rules, symptom_records
+):
+    records = symptom_records * 4
+    cached = Evaluator(SymptomRuleset(overlapping_rules), cache_size=64)
+    plain = Evaluator(SymptomRuleset(overlapping_rules))
+
+    results = cached.run_batch(records)
+
+    assert cached.cache is not None
+    assert cached.cache.hits >= len(records) - len(symptom_records)
+    assert cached.cache.hit_ratio >= 0.75
+    for result, expected in zip(results, plain.run_batch(records)):
+        assert result.model_dump() == expected.model_dump()
+    assert cached.run(records[0]).confidence == results[0].confidence
@@ -0,0 +1,107 @@
+from typing import Any, Optional
+from unittest import mock
+
+import pytest
+from pydantic import Field, field_validator
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.factory import DiagnosisFactory
+from diagnostipy.core.models.diagnosis import Diagnosis, DiagnosisBase
+from diagnostipy.core.models.evaluation import BaseEvaluation, BayesianEvaluation
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import ConfidenceFunctionEnum
+
+
+class TaggedDiagnosis(DiagnosisBase):
+    tags: list[str] = Field(default_factory=list)
+    metadata: Optional[dict[str, Any]] = None
+
+
+class UpperDiagnosis(DiagnosisBase):
+    @field_validator("label")
+    @classmethod
+    def upper(cls, label: Optional[str]) -> Optional[str]:
+        return label.upper() if label else label
+
+
+class CountEvaluation(BaseEvaluation):
+    count: int = 1
+
+
+class CountDiagnosis(DiagnosisBase):
+    count: Optional[float] = None
+
+
+@pytest.mark.parametrize(
+    "evaluation",
+    [
+        BaseEvaluation(label="High", score=2.0, next_threshold=3.0),
+        BayesianEvaluation(label="a", score=0.7, posteriors={"a": 0.7, "b": 0.3}),
+        CountEvaluation(label="Low", score=0.0, count=3),
+    ],
+)
+@pytest.mark.parametrize("model", [Diagnosis, DiagnosisBase, TaggedDiagnosis])
+def test_build_equals_validated_construction(model, evaluation):
+    factory = DiagnosisFactory(model)
+    metadata = {"timeouts": {"rules": ["slow"]}}
+
+    built = factory.build(evaluation, 0.5, metadata)
+    expected = factory.validated(evaluation, 0.5, metadata)
+
+    assert factory.fast
+    assert built == expected
+    assert built.model_fields_set == expected.model_fields_set
+    assert built.model_dump_json() == expected.model_dump_json()
+
+
+def test_default_factories_are_called_per_diagnosis():
+    factory = DiagnosisFactory(TaggedDiagnosis)
+    evaluation = BaseEvaluation(label="Low", score=0.0)
+
+    first, second = (factory.build(evaluation, None) for _ in range(2))
+
+    assert isinstance(first, TaggedDiagnosis) and isinstance(second, TaggedDiagnosis)
+    assert first.tags == [] and first.tags is not second.tags
+
+
+def test_models_with_validators_are_always_validated():
+    factory = DiagnosisFactory(UpperDiagnosis)
+
+    assert not factory.fast
+    assert factory.build(BaseEvaluation(label="low", score=0.0), None).label == "LOW"
+
+
+def test_evaluation_fields_of_another_type_are_validated():
+    factory = DiagnosisFactory(CountDiagnosis)
+
+    diagnosis = factory.build(CountEvaluation(label="Low", score=0.0, count=3), None)
+
+    assert factory.fast
+    assert isinstance(diagnosis, CountDiagnosis)
+    assert isinstance(diagnosis.count, float)
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_strict_evaluator_validates_every_diagnosis(
+    overlapping_rules, symptom_records, strict
+):
+    evaluator = Evaluator(
+        SymptomRuleset(overlapping_rules),
+        confidence_function=ConfidenceFunctionEnum.ENTROPY,
+        explain=True,
+        strict=strict,
+    )
+    factory = evaluator.diagnosis_factory
+
+    with mock.patch.object(factory, "validated", wraps=factory.validated) as spy:
+        diagnoses = evaluator.run_batch(symptom_records)
+
+    assert spy.call_count == (len(symptom_records) if strict else 0)
+    reference = Evaluator(
+        SymptomRuleset(overlapping_rules),
+        confidence_function=ConfidenceFunctionEnum.ENTROPY,
+        strict=True,
+    ).run_batch(symptom_records)
+    assert [d.model_dump(exclude={"metadata"}) for d in diagnoses] == [
+        d.model_dump(exclude={"metadata"}) for d in reference
+    ]
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+from diagnostipy.core.index import RuleIndex
+from diagnostipy.core.models.numeric import NumericCondition
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.enums import Comparator
+
+
+def _applies(rules, record, callables=True):
+    return [
+        idx
+        for idx, rule in enumerate(rules)
+        if (callables or not rule.apply_condition) and rule.applies(record)
+    ]
+
+
+@pytest.mark.parametrize("callables", [True, False])
+def test_match_record_matches_rules(overlapping_rules, symptom_records, callables):
+    index = RuleIndex(overlapping_rules)
+
+    for record in symptom_records:
+        expected = _applies(overlapping_rules, record, callables)
+        assert index.match_record(record, callables) == expected
+
+
+def test_match_record_reads_conditions_and_objects():
+    fever = NumericCondition(
+        field="temperature", comparator=Comparator.GT, threshold=38
+    )
+    rules = [
+        SymptomRule(name="fever", weight=1.0, numeric_conditions=[fever]),
+        SymptomRule(
+            name="elderly_cough", weight=2.0, conditions={"cough"}, condition="age > 65"
+        ),
+        SymptomRule(name="young", weight=1.0, condition="age <= -1 or age < 30"),
+        SymptomRule(name="always", weight=0.5),
+    ]
+    index = RuleIndex(rules)
+    records = [
+        {"temperature": 38.5, "cough": True, "age": 70},
+        {"temperature": float("nan"), "cough": True, "age": 20},
+        {"age": float("nan")},
+        SimpleNamespace(temperature=39, cough=False, age=10),
+        {},
+    ]
+
+    for record in records:
+        assert index.match_record(record) == _applies(rules, record)
+
+
+def test_match_record_calls_apply_condition_on_request():
+    calls = []
+
+    def condition(data):
+        calls.append(data)
+        return True
+
+    rules = [
+        SymptomRule(name="a", weight=1.0, conditions={"x"}),
+        SymptomRule(name="b", weight=1.0, apply_condition=condition),
+    ]
+    index = RuleIndex(rules)
+
+    assert index.match_record({"x": 1}, callables=False) == [0]
+    assert calls == []
+    assert index.match_record({"x": 1}) == [0, 1]
+    assert calls == [{"x": 1}]
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.mapped import MappedRecords, MappedScores
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import EvaluationFunctionEnum
+from diagnostipy.utils.sinks import ArraySink
+
+
+@pytest.fixture
+def mapped_setup(overlapping_rules, symptom_records):
+    ruleset = SymptomRuleset(overlapping_rules[:-1])
+    compiled = ruleset.compile()
+    records = symptom_records * 7
+    return ruleset, records, compiled.encode(records)
+
+
+def test_npy_and_raw_packed_files_decode_to_the_same_matrix(mapped_setup, tmp_path):
+    ruleset, _, matrix = mapped_setup
+    n_fields = matrix.shape[1]
+    np.save(tmp_path / "plain.npy", matrix)
+    np.save(tmp_path / "packed.npy", np.packbits(matrix, axis=1))
+    np.packbits(matrix, axis=1).tofile(tmp_path / "packed.bin")
+
+    for name in ("plain.npy", "packed.npy", "packed.bin"):
+        mapped = MappedRecords.open(tmp_path / name, n_fields)
+        assert len(mapped) == len(matrix)
+        assert mapped.packed == (name != "plain.npy")
+        np.testing.assert_array_equal(mapped[3:40], matrix[3:40])
+
+
+def test_run_mapped_matches_run_batch(mapped_setup, tmp_path):
+    ruleset, records, matrix = mapped_setup
+    evaluator = Evaluator(
+        ruleset,
+        evaluation_function=EvaluationFunctionEnum.MULTICLASS_SIMPLE,
+        evaluation_params={"labels": ["Low", "Medium", "High"]},
+    )
+    np.packbits(matrix, axis=1).tofile(tmp_path / "records.bin")
+    mapped = MappedRecords.open(tmp_path / "records.bin", matrix.shape[1])
+
+    result = evaluator.run_mapped(mapped, tmp_path / "scores.npy", window_size=10)
+
+    expected = evaluator.run_batch(records)
+    loaded = MappedScores.load(tmp_path / "scores.npy")
+    scores = loaded.array()
+    assert loaded.labels == result.labels
+    assert loaded.decode(scores["label"]).tolist() == [d.label for d in expected]
+    np.testing.assert_allclose(
+        scores["total_score"], np.array([d.total_score for d in expected], dtype=float)
+    )
+
+
+def test_run_to_sink_reads_mapped_records_in_windows(mapped_setup, tmp_path):
+    ruleset, records, matrix = mapped_setup
+    evaluator = Evaluator(ruleset)
+    np.save(tmp_path / "records.npy", matrix)
+    mapped = MappedRecords.open(tmp_path / "records.npy")
+
+    sink = ArraySink(len(matrix))
+    evaluator.run_to_sink(mapped, sink, chunk_size=9)
+
+    expected = evaluator.run_batch(records)
+    assert sink.arrays["label"].tolist() == [d.label for d in expected]
+
+
+def test_run_mapped_validates_alignment_and_rules(
+    overlapping_rules, mapped_setup, tmp_path
+):
+    ruleset, _, matrix = mapped_setup
+    np.save(tmp_path / "records.npy", matrix[:, 1:])
+    with pytest.raises(ValueError, match="fields"):
+        Evaluator(ruleset).run_mapped(
+            MappedRecords.open(tmp_path / "records.npy"), tmp_path / "out.npy"
+        )
+
+    np.save(tmp_path / "records.npy", matrix)
+    with pytest.raises(ValueError, match="raw records"):
+        Evaluator(SymptomRuleset(overlapping_rules)).run_mapped(
+            MappedRecords.open(tmp_path / "records.npy"), tmp_path / "out.npy"
+        )
+
+
+def test_raw_files_require_whole_rows(tmp_path):
+    np.zeros(5, dtype=np.uint8).tofile(tmp_path / "records.bin")
+
+    with pytest.raises(ValueError, match="multiple"):
+        MappedRecords.open(tmp_path / "records.bin", n_fields=10)
+    with pytest.raises(ValueError, match="n_fields"):
+        MappedRecords.open(tmp_path / "records.bin")
+
+
+def test_run_mapped_checks_the_stored_field_order(mapped_setup, tmp_path):
+    ruleset, records, matrix = mapped_setup
+    evaluator = Evaluator(ruleset)
+    fields = ruleset.compile().fields
+    np.save(tmp_path / "records.npy", matrix)
+
+    MappedRecords.save_fields(tmp_path / "records.npy", fields)
+    mapped = MappedRecords.open(tmp_path / "records.npy")
+    assert mapped.fields == fields
+    evaluator.run_mapped(mapped, tmp_path / "out.npy")
+
+    MappedRecords.save_fields(tmp_path / "records.npy", fields[::-1])
+    with pytest.raises(ValueError, match="field order"):
+        evaluator.run_mapped(
+            MappedRecords.open(tmp_path / "records.npy"), tmp_path / "out.npy"
+        )
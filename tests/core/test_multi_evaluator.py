@@ -0,0 +1,106 @@
+from unittest import mock
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.index import RuleIndex
+from diagnostipy.core.models.diagnosis import Diagnosis
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.multi_evaluator import MultiEvaluator
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.core.sparse import SparseRecords
+from diagnostipy.utils.enums import EvaluationFunctionEnum
+
+
+def make_rulesets(overlapping_rules):
+    return {
+        "full": SymptomRuleset(overlapping_rules),
+        "respiratory": SymptomRuleset(
+            [
+                SymptomRule(name="cough", weight=2.0, conditions={"cough"}),
+                SymptomRule(name="dyspnea", weight=3.0, conditions={"dyspnea"}),
+                SymptomRule(
+                    name="cough_fever", weight=4.0, conditions={"cough", "fever"}
+                ),
+            ]
+        ),
+    }
+
+
+def test_multi_evaluator_matches_individual_evaluators(
+    overlapping_rules, symptom_records
+):
+    rulesets = make_rulesets(overlapping_rules)
+    function = EvaluationFunctionEnum.MULTICLASS_SIMPLE
+    multi = MultiEvaluator.from_rulesets(
+        rulesets, evaluation_function=function, explain=True
+    )
+    single = {
+        name: Evaluator(ruleset, evaluation_function=function, explain=True)
+        for name, ruleset in rulesets.items()
+    }
+    labels = ["Low", "Medium", "High"]
+
+    results = multi.run_batch(symptom_records, labels=labels)
+
+    for record, result in zip(symptom_records, results):
+        assert set(result) == set(rulesets)
+        for name, evaluator in single.items():
+            expected = evaluator.run(record, labels=labels)
+            assert result[name].label == expected.label
+            assert result[name].total_score == expected.total_score
+            assert result[name].confidence == expected.confidence
+            diagnosis = result[name]
+            assert isinstance(diagnosis, Diagnosis) and diagnosis.metadata
+            assert isinstance(expected, Diagnosis) and expected.metadata
+            assert (
+                diagnosis.metadata["explanation"].to_dict()
+                == expected.metadata["explanation"].to_dict()
+            )
+
+
+def test_multi_evaluator_merges_vocabulary(overlapping_rules):
+    multi = MultiEvaluator.from_rulesets(make_rulesets(overlapping_rules))
+
+    assert sorted(multi.fields) == ["cough", "dyspnea", "fatigue", "fever"]
+
+    sparse = SparseRecords.from_codes([["cough", "fever"], ["dyspnea"]])
+    results = multi.run_batch(sparse)
+    assert results[0]["respiratory"].total_score == 4.0
+    assert results[1]["respiratory"].total_score == 3.0
+    assert multi.run({"cough": True})["full"].total_score == 1.0
+
+
+def test_multi_evaluator_recompiles_changed_rulesets(overlapping_rules):
+    rulesets = make_rulesets(overlapping_rules)
+    multi = MultiEvaluator.from_rulesets(rulesets)
+    compiled = multi.compile()
+
+    assert multi.compile() is compiled
+
+    rulesets["respiratory"].add_rule(
+        SymptomRule(name="wheeze", weight=1.0, conditions={"wheeze"})
+    )
+
+    assert multi.compile() is not compiled
+    assert multi.run({"wheeze": True})["respiratory"].total_score == 1.0
+
+
+def test_multi_evaluator_matches_single_records_once(
+    overlapping_rules, symptom_records
+):
+    rulesets = make_rulesets(overlapping_rules)
+    multi = MultiEvaluator.from_rulesets(rulesets)
+
+    with mock.patch.object(
+        RuleIndex, "match_record", autospec=True, side_effect=RuleIndex.match_record
+    ) as match:
+        results = [multi.run(record) for record in symptom_records]
+
+    assert match.call_count == len(symptom_records)
+    assert {id(call.args[0]) for call in match.call_args_list} == {id(multi.index())}
+    assert all(evaluator.data is None for evaluator in multi.evaluators.values())
+    assert [
+        {name: d.model_dump() for name, d in result.items()} for result in results
+    ] == [
+        {name: d.model_dump() for name, d in result.items()}
+        for result in multi.run_batch(symptom_records)
+    ]
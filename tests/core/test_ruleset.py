@@ -1,6 +1,10 @@
+import json
+
 import pytest
 
 from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import SolverMode
 
 
 def test_add_rule(ruleset):
@@ -100,3 +104,66 @@ def test_exclude_overlaps_specific_rule(ruleset):
     assert rule_a not in filtered_rules
     assert rule_c in filtered_rules
     assert rule_b not in filtered_rules
+
+
+def test_exclude_overlaps_uses_indexed_rules():
+    rule_a = SymptomRule(name="rule_a", conditions={"symptom1"}, weight=1.0)
+    rule_b = SymptomRule(name="rule_b", conditions={"symptom1", "symptom2"}, weight=2.0)
+    rule_c = SymptomRule(name="rule_c", weight=3.0)
+    ruleset = SymptomRuleset([rule_a, rule_b, rule_c])
+
+    assert ruleset._exclude_overlaps([rule_a, rule_c], rule_b) == [rule_c]
+    assert ruleset._exclude_overlaps([rule_b, rule_c], rule_a) == [rule_b, rule_c]
+
+
+def test_get_applicable_indices_reports_suppressed_rules():
+    rule_a = SymptomRule(name="rule_a", conditions={"symptom1"}, weight=1.0)
+    rule_b = SymptomRule(name="rule_b", conditions={"symptom1", "symptom2"}, weight=2.0)
+    rule_c = SymptomRule(name="rule_c", conditions={"symptom3"}, weight=3.0)
+    ruleset = SymptomRuleset([rule_a, rule_b, rule_c])
+    input_data = {"symptom1": True, "symptom2": True, "symptom3": True}
+
+    suppressed: dict[int, int] = {}
+    indices = ruleset.get_applicable_indices(input_data, suppressed)
+
+    assert indices == [1, 2]
+    assert suppressed == {0: 1}
+    assert ruleset.get_applicable_rules(input_data) == [rule_b, rule_c]
+
+
+def test_ruleset_serialization_round_trip():
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(name="fever", weight=2.0, conditions={"fever", "chills"}),
+            SymptomRule(name="hyperthermia", weight=3.0, condition="temperature > 40"),
+            SymptomRule(
+                name="anosmia",
+                weight=None,
+                critical=True,
+                log_likelihood_ratios={"covid": 2.5},
+            ),
+        ],
+        exclude_overlaps=False,
+        solver_mode=SolverMode.EXACT,
+    )
+
+    data = json.loads(json.dumps(ruleset.to_dict()))
+    restored = SymptomRuleset.from_dict(data)
+
+    assert data["rules"][0]["conditions"] == ["chills", "fever"]
+    assert restored.rules == ruleset.rules
+    assert restored.exclude_overlaps is False
+    assert restored.solver_mode == SolverMode.EXACT
+
+
+def test_ruleset_serialization_rejects_callables():
+    ruleset = SymptomRuleset(
+        [SymptomRule(name="custom", weight=1.0, apply_condition=lambda data: True)]
+    )
+
+    with pytest.raises(ValueError, match="cannot be serialized"):
+        ruleset.to_dict()
+    with pytest.raises(ValueError, match="Unsupported syntax"):
+        SymptomRuleset.from_dict(
+            {"rules": [{"name": "bad", "weight": 1.0, "condition": "f(x)"}]}
+        )
@@ -0,0 +1,176 @@
+from itertools import chain, combinations
+
+import numpy as np
+import pytest
+
+from diagnostipy.core.compiled import CompiledRuleset
+from diagnostipy.core.index import RuleIndex
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.core.solver import scaled_max_weights, solve_max_rules
+from diagnostipy.utils.enums import SolverMode
+from diagnostipy.utils.scoring.helpers import (
+    calculate_max_possible_rules,
+    calculate_max_possible_weight,
+)
+
+
+@pytest.fixture
+def conflicting_rules():
+    """
+    Rules where the greedy pass counts rules that can never apply together.
+    """
+    return [
+        SymptomRule(name="x", weight=5.0, conditions={"x"}),
+        SymptomRule(name="xy", weight=1.0, conditions={"x", "y"}),
+        SymptomRule(name="y", weight=5.0, conditions={"y"}),
+    ]
+
+
+def _brute_force_max_weight(rules):
+    ruleset = SymptomRuleset(rules)
+    fields = sorted(set(chain.from_iterable(r.conditions or () for r in rules)))
+    subsets = chain.from_iterable(
+        combinations(fields, size) for size in range(len(fields) + 1)
+    )
+    return max(
+        sum(r.weight or 0 for r in ruleset.get_applicable_rules(dict.fromkeys(s, 1)))
+        for s in subsets
+    )
+
+
+def test_exact_solver_finds_achievable_maximum(conflicting_rules):
+    assert calculate_max_possible_weight(conflicting_rules, SolverMode.GREEDY) == 10.0
+    assert calculate_max_possible_weight(conflicting_rules, SolverMode.EXACT) == 6.0
+    assert _brute_force_max_weight(conflicting_rules) == 6.0
+
+
+def test_exact_solver_matches_brute_force():
+    rng = np.random.default_rng(0)
+    fields = ["a", "b", "c", "d", "e"]
+    for _ in range(20):
+        rules = [
+            SymptomRule(
+                name=f"rule{i}",
+                weight=float(rng.integers(-2, 6)),
+                conditions=set(rng.choice(fields, rng.integers(1, 4), replace=False)),
+            )
+            for i in range(6)
+        ]
+        assert calculate_max_possible_weight(
+            rules, SolverMode.EXACT
+        ) == _brute_force_max_weight(rules)
+
+
+def test_python_solver_matches_vectorized_solver():
+    rng = np.random.default_rng(1)
+    fields = ["a", "b", "c", "d", "e"]
+    for _ in range(20):
+        rules = [
+            SymptomRule(
+                name=f"rule{i}",
+                weight=float(rng.integers(-2, 3)),
+                conditions=set(rng.choice(fields, rng.integers(1, 4), replace=False)),
+            )
+            for i in range(6)
+        ]
+        index = RuleIndex(rules, solver_mode=SolverMode.EXACT)
+        compiled = CompiledRuleset(rules, solver_mode=SolverMode.EXACT)
+
+        assert index.solve(index.rule_weights) == compiled.solve(compiled.weights)
+        assert index.max_possible_rules == compiled.max_possible_rules
+        assert index.max_possible_weight == compiled.max_possible_weight
+
+
+@pytest.mark.parametrize(
+    "mode, n_fields",
+    [(SolverMode.GREEDY, 6), (SolverMode.AUTO, 6), (SolverMode.AUTO, 20)],
+)
+def test_scaled_max_weights_matches_scaled_rulesets(mode, n_fields):
+    rng = np.random.default_rng(2)
+    fields = [f"f{i}" for i in range(n_fields)]
+    for _ in range(5):
+        rules = [
+            SymptomRule(
+                name=f"rule{i}",
+                weight=float(rng.integers(-1, 4)),
+                conditions=set(rng.choice(fields, rng.integers(0, 4), replace=False))
+                or None,
+            )
+            for i in range(24)
+        ]
+        index = RuleIndex(rules, solver_mode=mode)
+        for factor in (0.0, 0.5, 2.0, -1.0):
+            expected = [
+                RuleIndex(
+                    [
+                        (
+                            rule.model_copy(
+                                update={"weight": (rule.weight or 0.0) * factor}
+                            )
+                            if idx == scaled
+                            else rule
+                        )
+                        for idx, rule in enumerate(rules)
+                    ],
+                    solver_mode=mode,
+                ).max_possible_weight
+                for scaled in range(len(rules))
+            ]
+            assert scaled_max_weights(index, factor) == pytest.approx(expected)
+
+
+def test_max_possible_rules(conflicting_rules):
+    rules = calculate_max_possible_rules(conflicting_rules, SolverMode.EXACT)
+    assert [rule.name for rule in rules] == ["xy", "y"]
+
+    rules = calculate_max_possible_rules(conflicting_rules, SolverMode.GREEDY)
+    assert [rule.name for rule in rules] == ["x", "y"]
+
+
+def test_apply_condition_rules_are_optional():
+    rules = [
+        SymptomRule(name="good", weight=2.0, apply_condition=lambda data: True),
+        SymptomRule(name="bad", weight=-1.0, apply_condition=lambda data: True),
+        SymptomRule(name="always", weight=-0.5),
+    ]
+
+    assert calculate_max_possible_weight(rules, SolverMode.EXACT) == 1.5
+    assert calculate_max_possible_weight(rules, SolverMode.GREEDY) == 0.5
+
+
+def test_exact_mode_rejects_large_components():
+    rules = [
+        SymptomRule(name=f"rule{i}", weight=1.0, conditions={f"f{i}", f"f{i + 1}"})
+        for i in range(20)
+    ]
+    compiled = CompiledRuleset(rules)
+
+    with pytest.raises(ValueError, match="Cannot solve a component"):
+        solve_max_rules(compiled, compiled.weights, SolverMode.EXACT)
+
+    selected = solve_max_rules(compiled, compiled.weights, SolverMode.AUTO)
+    greedy = solve_max_rules(compiled, compiled.weights, SolverMode.GREEDY)
+    assert selected == greedy
+
+
+def test_ruleset_compiles_normalizers_once(conflicting_rules):
+    ruleset = SymptomRuleset(conflicting_rules, solver_mode=SolverMode.EXACT)
+    compiled = ruleset.compile()
+
+    assert compiled.max_possible_weight == 6.0
+    assert compiled.max_possible_rules == (1, 2)
+
+    ruleset.solver_mode = SolverMode.GREEDY
+    assert ruleset.compile().max_possible_weight == 10.0
+
+
+def test_ruleset_index_reuses_fresh_compiled_snapshot(conflicting_rules):
+    ruleset = SymptomRuleset(conflicting_rules)
+
+    index = ruleset.index()
+    assert type(index) is RuleIndex
+    assert ruleset.index() is index
+
+    compiled = ruleset.compile()
+    assert ruleset.index() is compiled
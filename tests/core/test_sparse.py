@@ -0,0 +1,87 @@
+import pytest
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.core.sparse import SparseRecords
+
+
+def test_from_codes_builds_vocabulary():
+    records = SparseRecords.from_codes([["b", "a"], [], ["a", "c", "a"]])
+
+    assert records.vocabulary == ("b", "a", "c")
+    assert records.indptr.tolist() == [0, 2, 2, 4]
+    assert records.indices.tolist() == [0, 1, 1, 2]
+    assert records.nnz == 4
+    assert len(records) == 3
+    assert records.codes(2) == ["a", "c"]
+    assert list(records)[0] == {"b": True, "a": True}
+
+
+def test_from_codes_with_fixed_vocabulary_drops_unknown_codes():
+    records = SparseRecords.from_codes([["x", "a"]], vocabulary=["a", "b"])
+
+    assert records.vocabulary == ("a", "b")
+    assert records.codes(0) == ["a"]
+
+
+def test_slicing():
+    records = SparseRecords.from_codes([["a"], ["b", "c"], ["c"]])
+
+    sliced = records[1:3]
+
+    assert len(sliced) == 2
+    assert sliced.codes(0) == ["b", "c"]
+    assert sliced.codes(1) == ["c"]
+    assert len(records[5:]) == 0
+
+    with pytest.raises(ValueError, match="contiguous"):
+        records[::2]
+
+
+@pytest.mark.parametrize("exclude_overlaps", [True, False])
+def test_sparse_matching_matches_dict_path(
+    overlapping_rules, symptom_records, exclude_overlaps
+):
+    ruleset = SymptomRuleset(overlapping_rules, exclude_overlaps=exclude_overlaps)
+    codes = [
+        [key for key, value in record.items() if value and key != "age"]
+        + (["noise"] if record["age"] > 65 else [])
+        for record in symptom_records
+    ]
+    ruleset.rules[-1].apply_condition = lambda data: data.get("noise", False)
+
+    sparse = SparseRecords.from_codes(codes)
+    batch = ruleset.get_applicable_rules_batch(sparse)
+
+    assert batch == [
+        ruleset.get_applicable_rules(dict.fromkeys(record, True)) for record in codes
+    ]
+
+
+def test_sparse_matching_with_large_vocabulary():
+    ruleset = SymptomRuleset(
+        [
+            SymptomRule(name="a", weight=1.0, conditions={"code_7"}),
+            SymptomRule(name="ab", weight=1.0, conditions={"code_7", "code_49999"}),
+        ]
+    )
+    vocabulary = [f"code_{i}" for i in range(50_000)]
+    sparse = SparseRecords.from_codes(
+        [["code_7"], ["code_7", "code_49999", "code_3"], []], vocabulary
+    )
+
+    mask = ruleset.compile().applicable_mask(sparse)
+
+    assert mask.tolist() == [[True, False], [False, True], [False, False]]
+
+
+def test_evaluator_run_batch_with_sparse_records(overlapping_rules):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules[:-1]))
+    codes = [["cough"], ["cough", "fever"], ["fatigue", "unrelated"], []]
+
+    results = evaluator.run_batch(SparseRecords.from_codes(codes))
+
+    assert [r.model_dump() for r in results] == [
+        evaluator.run(dict.fromkeys(record, True)).model_dump() for record in codes
+    ]
@@ -0,0 +1,186 @@
+import threading
+import time
+
+import pytest
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.multi_evaluator import MultiEvaluator
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.core.timeouts import ConditionRunner, RuleTimeoutError
+from diagnostipy.server.metrics import ServerMetrics
+from diagnostipy.utils.enums import TimeoutPolicy
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def slow_ruleset(release):
+    def stalls(data):
+        release.wait(5.0)
+        return True
+
+    return SymptomRuleset(
+        [
+            SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+            SymptomRule(name="slow", weight=5.0, apply_condition=stalls),
+            SymptomRule(
+                name="fast", weight=2.0, apply_condition=lambda data: data.get("fever")
+            ),
+        ]
+    )
+
+
+def test_timed_out_rule_is_skipped(slow_ruleset):
+    evaluator = Evaluator(slow_ruleset, rule_timeout=0.05)
+
+    start = time.perf_counter()
+    diagnosis = evaluator.run({"cough": True, "fever": True})
+
+    assert time.perf_counter() - start < 1.0
+    assert diagnosis.total_score == 3.0
+    assert diagnosis.model_dump()["metadata"] == {
+        "timeouts": {"policy": "skip", "rules": ["slow"]}
+    }
+    assert evaluator.timeout_metrics is not None
+    metrics = evaluator.timeout_metrics.to_dict()
+    assert metrics["calls"] == 2
+    assert metrics["timeouts"] == 1
+    assert metrics["by_rule"] == {"slow": 1}
+
+
+def test_timeout_policy_raise(slow_ruleset):
+    evaluator = Evaluator(slow_ruleset, rule_timeout=0.05, timeout_policy="raise")
+
+    with pytest.raises(RuleTimeoutError) as error:
+        evaluator.run({"cough": True})
+    assert error.value.rules == ("slow",)
+
+
+def test_timeout_policy_degrade_in_batch(slow_ruleset):
+    evaluator = Evaluator(
+        slow_ruleset,
+        evaluation_timeout=0.1,
+        timeout_policy=TimeoutPolicy.DEGRADE,
+    )
+    records = [{"cough": True, "fever": True}, {"fever": False}]
+
+    diagnoses = evaluator.run_batch(records)
+
+    assert [d.total_score for d in diagnoses] == [3.0, 0.0]
+    for diagnosis in diagnoses:
+        metadata = diagnosis.model_dump()["metadata"]
+        assert metadata["degraded"] is True
+        assert metadata["timeouts"]["rules"] == ["slow"]
+    assert evaluator.timeout_metrics is not None
+    metrics = evaluator.timeout_metrics.to_dict()
+    assert metrics["deadlines_exceeded"] == 1
+    assert metrics["degraded"] == 2
+
+
+def test_multi_evaluator_applies_each_evaluators_timeouts(slow_ruleset):
+    bounded = Evaluator(slow_ruleset, rule_timeout=0.05)
+    multi = MultiEvaluator(
+        {
+            "bounded": bounded,
+            "plain": Evaluator(
+                SymptomRuleset(
+                    [
+                        SymptomRule(
+                            name="fever", weight=1.0, apply_condition=lambda d: True
+                        )
+                    ]
+                )
+            ),
+        }
+    )
+
+    start = time.perf_counter()
+    result = multi.run({"cough": True, "fever": True})
+
+    assert time.perf_counter() - start < 1.0
+    assert result["bounded"].total_score == 3.0
+    assert result["bounded"].model_dump()["metadata"] == {
+        "timeouts": {"policy": "skip", "rules": ["slow"]}
+    }
+    assert result["plain"].total_score == 1.0
+    assert bounded.timeout_metrics is not None
+    assert bounded.timeout_metrics.to_dict()["by_rule"] == {"slow": 1}
+
+
+def test_bounded_evaluation_without_timeouts_matches(rules_with_conditions):
+    ruleset = SymptomRuleset(rules_with_conditions)
+    records = [{"symptom1": 2, "symptom2": 0.3, "symptom3": True}, {"symptom1": 0}]
+    bounded = Evaluator(ruleset, rule_timeout=1.0)
+    plain = Evaluator(ruleset)
+
+    assert bounded.run_batch(records) == plain.run_batch(records)
+    assert bounded.run(records[0]) == plain.run(records[0])
+    assert bounded.run(records[0]).model_dump()["metadata"] is None
+    assert bounded.timeout_metrics is not None
+    assert bounded.timeout_metrics.timeouts == 0
+    assert plain.timeout_metrics is None
+
+
+def test_stuck_worker_is_replaced(release):
+    stuck = SymptomRule(
+        name="stuck", weight=1.0, apply_condition=lambda data: release.wait(5.0)
+    )
+    quick = SymptomRule(name="quick", weight=1.0, apply_condition=bool)
+    runner = ConditionRunner(rule_timeout=0.05, max_workers=1)
+
+    assert runner.match_record([stuck], {}) == ([], [0])
+    assert runner.match_record([quick], {"a": 1}) == ([0], [])
+
+
+def test_saturated_pool_rejects_calls_until_workers_return(release):
+    stuck = SymptomRule(
+        name="stuck", weight=1.0, apply_condition=lambda data: release.wait(5.0)
+    )
+    quick = SymptomRule(name="quick", weight=1.0, apply_condition=bool)
+    runner = ConditionRunner(rule_timeout=0.05, max_workers=1)
+
+    assert runner.match_record([stuck, stuck], {}) == ([], [0, 1])
+    start = time.perf_counter()
+    assert runner.match_record([quick], {"a": 1}) == ([], [0])
+    assert time.perf_counter() - start < 0.05
+    assert runner.metrics.rejected == 1
+    assert runner._pool._live == 2
+
+    release.set()
+    deadline = time.perf_counter() + 2.0
+    while runner._pool.saturated and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert runner.match_record([quick], {"a": 1}) == ([0], [])
+
+
+def test_apply_condition_errors_propagate():
+    def broken(data):
+        raise KeyError("missing")
+
+    evaluator = Evaluator(
+        SymptomRuleset(
+            [SymptomRule(name="broken", weight=1.0, apply_condition=broken)]
+        ),
+        rule_timeout=1.0,
+    )
+
+    with pytest.raises(KeyError):
+        evaluator.run({})
+
+
+def test_server_metrics_render_timeouts(slow_ruleset):
+    evaluator = Evaluator(slow_ruleset, rule_timeout=0.05)
+    evaluator.run({})
+    metrics = ServerMetrics()
+    metrics.timeouts = evaluator.timeout_metrics
+
+    rendered = metrics.render()
+
+    assert "diagnostipy_rule_timeouts_total 1" in rendered
+    assert 'diagnostipy_rule_timeouts{rule="slow"} 1' in rendered
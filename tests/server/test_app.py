@@ -0,0 +1,157 @@
+import asyncio
+import json
+
+import pytest
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.server import MicroBatcher, ScoringServer
+from diagnostipy.utils.enums import EvaluationFunctionEnum
+
+
+async def _request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode()
+        + payload
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, content = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, content.decode()
+
+
+async def _raw_request(port, head):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head.encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+def test_server_micro_batches_concurrent_requests(
+    tmp_path, overlapping_rules, symptom_records
+):
+    rules = [rule for rule in overlapping_rules if not rule.apply_condition]
+    rules.append(SymptomRule(name="old_age", weight=2.5, condition="age > 65"))
+    path = tmp_path / "ruleset.json"
+    path.write_text(json.dumps(SymptomRuleset(rules).to_dict()))
+    expected = Evaluator(SymptomRuleset(rules)).run_batch(symptom_records)
+
+    async def scenario():
+        server = ScoringServer.from_file(path, port=0, max_latency=0.05)
+        async with server:
+            single = [
+                _request(server.port, "POST", "/score", record)
+                for record in symptom_records
+            ]
+            bulk = _request(server.port, "POST", "/score", symptom_records)
+            responses = await asyncio.gather(*single, bulk)
+            metrics = await _request(server.port, "GET", "/metrics")
+        return server, responses, metrics
+
+    server, responses, (_, metrics) = asyncio.run(scenario())
+
+    *single, (bulk_status, bulk) = responses
+    for (status, content), diagnosis in zip(single, expected):
+        assert status == 200
+        assert json.loads(content)["label"] == diagnosis.label
+        assert json.loads(content)["confidence"] == pytest.approx(diagnosis.confidence)
+    assert bulk_status == 200
+    assert [item["label"] for item in json.loads(bulk)] == [
+        diagnosis.label for diagnosis in expected
+    ]
+    assert server.metrics.requests == len(symptom_records) + 1
+    assert server.metrics.records == 2 * len(symptom_records)
+    assert server.metrics.batches < server.metrics.requests
+    assert f"diagnostipy_records_total {2 * len(symptom_records)}" in metrics
+    assert 'diagnostipy_request_latency_seconds_bucket{le="+Inf"}' in metrics
+
+
+def test_server_rejects_invalid_requests(ruleset):
+    async def scenario():
+        async with ScoringServer(Evaluator(ruleset), port=0) as server:
+            return await asyncio.gather(
+                _request(server.port, "GET", "/score"),
+                _request(server.port, "POST", "/score", "text"),
+                _request(server.port, "GET", "/missing"),
+                _request(server.port, "GET", "/health"),
+            )
+
+    statuses = [status for status, _ in asyncio.run(scenario())]
+
+    assert statuses == [405, 400, 404, 200]
+
+
+def test_micro_batcher_flushes_at_max_batch_size(ruleset):
+    async def scenario():
+        batcher = MicroBatcher(Evaluator(ruleset), max_latency=10, max_batch_size=3)
+        results = await asyncio.gather(
+            batcher.submit([{"symptom1": True}] * 2),
+            batcher.submit([{"symptom2": True}]),
+        )
+        await batcher.close()
+        return batcher, results
+
+    batcher, (first, second) = asyncio.run(scenario())
+
+    assert (len(first), len(second)) == (2, 1)
+    assert batcher.metrics.batches == 1
+    assert batcher.metrics.batch_size.count == 1
+
+
+def test_server_fails_only_the_request_with_invalid_records():
+    ruleset = SymptomRuleset(
+        [SymptomRule(name="fever", weight=1.0, condition="t > 38")]
+    )
+
+    async def scenario():
+        async with ScoringServer(
+            Evaluator(ruleset), port=0, max_latency=0.05
+        ) as server:
+            responses = await asyncio.gather(
+                _request(server.port, "POST", "/score", {"t": 39}),
+                _request(server.port, "POST", "/score", {"t": "high"}),
+            )
+        return server, responses
+
+    server, ((ok_status, ok), (bad_status, bad)) = asyncio.run(scenario())
+
+    assert server.metrics.batches == 1
+    assert ok_status == 200
+    assert json.loads(ok)["total_score"] == 1.0
+    assert bad_status == 400
+    assert json.loads(bad)["error"].startswith("Invalid record")
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1e3", "²"])
+def test_server_rejects_invalid_content_length(ruleset, length):
+    async def scenario():
+        async with ScoringServer(Evaluator(ruleset), port=0) as server:
+            status = await _raw_request(
+                server.port,
+                f"POST /score HTTP/1.1\r\nContent-Length: {length}\r\n\r\n",
+            )
+            health, _ = await _request(server.port, "GET", "/health")
+        return server, status, health
+
+    server, status, health = asyncio.run(scenario())
+
+    assert (status, health) == (400, 200)
+    assert server.metrics.errors == 1
+
+
+def test_server_checks_evaluator_at_startup(ruleset):
+    evaluator = Evaluator(
+        ruleset, evaluation_function=EvaluationFunctionEnum.MULTICLASS_SIMPLE
+    )
+
+    with pytest.raises(TypeError, match="labels"):
+        ScoringServer(evaluator, port=0)
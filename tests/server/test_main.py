@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.server.__main__ import build_server
+
+
+@pytest.fixture
+def ruleset_path(tmp_path, overlapping_rules):
+    rules = [rule for rule in overlapping_rules if not rule.apply_condition]
+    path = tmp_path / "ruleset.json"
+    path.write_text(json.dumps(SymptomRuleset(rules).to_dict()))
+    return str(path)
+
+
+def test_build_server_passes_scoring_params(ruleset_path, symptom_records):
+    server = build_server(
+        [
+            ruleset_path,
+            "--evaluation-function",
+            "multiclass_simple",
+            "--evaluation-params",
+            '{"labels": ["Low", "Medium", "High"]}',
+        ]
+    )
+
+    diagnoses = server.batcher.evaluator.run_batch(symptom_records)
+    assert {diagnosis.label for diagnosis in diagnoses} <= {"Low", "Medium", "High"}
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--evaluation-function", "multiclass_simple"],
+        ["--evaluation-params", "{labels}"],
+        ["--evaluation-params", "[1, 2]"],
+    ],
+)
+def test_build_server_rejects_invalid_configuration(ruleset_path, options, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        build_server([ruleset_path, *options])
+
+    assert exit_info.value.code == 2
+    assert "error" in capsys.readouterr().err
@@ -0,0 +1,78 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def run_python(code: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "statement, absent",
+    [
+        ("import diagnostipy", ["numpy", "pydantic", "diagnostipy.core"]),
+        (
+            "from diagnostipy import SymptomRule, SymptomRuleset",
+            ["numpy", "diagnostipy.core.compiled"],
+        ),
+        (
+            "from diagnostipy import Evaluator",
+            [
+                "diagnostipy.analysis",
+                "diagnostipy.server",
+                "diagnostipy.utils.scoring.kernels",
+                "fastapi",
+                "scipy",
+            ],
+        ),
+    ],
+)
+def test_import_defers_heavy_modules(statement, absent):
+    result = run_python(
+        f"import sys\n{statement}\n"
+        f"print([m for m in {absent!r} if m in sys.modules])"
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_lazy_attributes_resolve():
+    result = run_python(
+        "import diagnostipy\n"
+        "from diagnostipy.core.evaluator import Evaluator\n"
+        "print(diagnostipy.Evaluator is Evaluator, 'Evaluator' in dir(diagnostipy))"
+    )
+
+    assert result.stdout.split() == ["True", "True"]
+
+
+def test_single_record_evaluation_skips_numpy():
+    result = run_python(
+        "import sys\n"
+        "from diagnostipy import Evaluator, SymptomRule, SymptomRuleset\n"
+        "from diagnostipy.core.models.numeric import GradedWeight\n"
+        "rs = SymptomRuleset([\n"
+        "    SymptomRule(name='a', weight=1.0, conditions={'x'}),\n"
+        "    SymptomRule(name='b', weight=2.0, conditions={'x', 'y'},"
+        " condition='t > -2'),\n"
+        "    SymptomRule(name='c', weight=None,"
+        " graded_weight=GradedWeight(field='t', points=((0, 0), (10, 3)))),\n"
+        "])\n"
+        "Evaluator(rs, explain=True).run({'x': True, 'y': 1, 't': 4})\n"
+        "print('numpy' in sys.modules)"
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+def test_unknown_attribute():
+    import diagnostipy
+
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        diagnostipy.Missing
@@ -0,0 +1,115 @@
+from math import tanh
+
+import numpy as np
+import pytest
+
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.scoring.batch_functions import (
+    binary_scoring_based_batch,
+    binary_simple_batch,
+    entropy_based_confidence_batch,
+    multiclass_scoring_based_batch,
+    multiclass_simple_batch,
+    posterior_confidence_batch,
+    rule_coverage_confidence_batch,
+    weighted_confidence_batch,
+)
+from diagnostipy.utils.scoring.confidence_functions import (
+    entropy_based_confidence,
+    posterior_confidence,
+    rule_coverage_confidence,
+    weighted_confidence,
+)
+from diagnostipy.utils.scoring.evaluation_functions import (
+    binary_scoring_based,
+    binary_simple,
+    multiclass_scoring_based,
+    multiclass_simple,
+)
+from diagnostipy.utils.scoring.thresholds import ThresholdTable
+
+SCORES = np.array([0.0, 0.5, 1.5, 3.0, 4.5, 6.0, 9.0, 12.0])
+THRESHOLDS = {0.3: "Low", 0.6: "Medium", 0.9: "High"}
+
+
+@pytest.mark.parametrize(
+    "scalar, batch, kwargs",
+    [
+        (binary_simple, binary_simple_batch, {"max_possible_weight": 9.0}),
+        (
+            binary_scoring_based,
+            binary_scoring_based_batch,
+            {"score_function": tanh, "score_threshold": 0.9},
+        ),
+        (
+            multiclass_simple,
+            multiclass_simple_batch,
+            {"labels": ["Low", "Medium", "High"], "max_possible_weight": 9.0},
+        ),
+        (
+            multiclass_simple,
+            multiclass_simple_batch,
+            {
+                "labels": [],
+                "max_possible_weight": 9.0,
+                "threshold_table": ThresholdTable.uniform(["A", "B", "C", "D"], 9.0),
+            },
+        ),
+        (
+            multiclass_scoring_based,
+            multiclass_scoring_based_batch,
+            {"score_function": lambda x: x / 10, "threshold_label_map": THRESHOLDS},
+        ),
+    ],
+)
+def test_batch_functions_match_scalar_functions(scalar, batch, kwargs):
+    results = batch(SCORES, **kwargs)
+
+    assert len(results) == len(SCORES)
+    for row, score in enumerate(SCORES):
+        rules = [SymptomRule(name="rule", weight=float(score))]
+        assert results[row] == scalar(rules, rules, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "scalar, batch, kwargs",
+    [
+        (weighted_confidence, weighted_confidence_batch, {"max_possible_weight": 6.0}),
+        (weighted_confidence, weighted_confidence_batch, {"max_possible_weight": 0.0}),
+        (
+            entropy_based_confidence,
+            entropy_based_confidence_batch,
+            {"max_possible_rule_count": 3},
+        ),
+        (
+            rule_coverage_confidence,
+            rule_coverage_confidence_batch,
+            {"max_possible_rule_count": 3},
+        ),
+        (
+            posterior_confidence,
+            posterior_confidence_batch,
+            {"labels": ["Low", "High"], "priors": {"Low": 0.7, "High": 0.3}},
+        ),
+    ],
+)
+def test_batch_confidence_functions_match_scalar_functions(scalar, batch, kwargs):
+    rules = [
+        SymptomRule(name="a", weight=2.0, log_likelihood_ratios={"High": 1.2}),
+        SymptomRule(name="b", weight=0.0),
+        SymptomRule(name="c", weight=3.0, log_likelihood_ratios={"High": -0.5}),
+        SymptomRule(name="d", weight=-1.0),
+    ]
+    weights = np.array([rule.weight for rule in rules])
+    mask = np.array(
+        [[a, b, c, d] for a in (0, 1) for b in (0, 1) for c in (0, 1) for d in (0, 1)],
+        dtype=bool,
+    )
+    total_scores = np.where(mask, weights, 0.0).sum(axis=1)
+
+    results = batch(total_scores, mask=mask, weights=weights, rules=rules, **kwargs)
+
+    assert len(results) == len(mask)
+    for row, applies in enumerate(mask):
+        applicable = [rule for rule, kept in zip(rules, applies) if kept]
+        assert results[row] == pytest.approx(scalar(applicable, rules, **kwargs))
@@ -0,0 +1,135 @@
+import math
+
+import numpy as np
+import pytest
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import ConfidenceFunctionEnum, EvaluationFunctionEnum
+from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+from diagnostipy.utils.scoring.confidence_functions import posterior_confidence
+from diagnostipy.utils.scoring.evaluation_functions import bayesian
+
+LABELS = ["flu", "covid", "healthy"]
+
+
+@pytest.fixture
+def bayesian_rules():
+    return [
+        SymptomRule(
+            name="fever",
+            weight=None,
+            conditions={"fever"},
+            log_likelihood_ratios={"flu": 1.5, "covid": 1.2, "healthy": -2.0},
+        ),
+        SymptomRule(
+            name="anosmia",
+            weight=None,
+            conditions={"anosmia"},
+            log_likelihood_ratios={"covid": 2.5, "other": 9.0},
+        ),
+        SymptomRule(
+            name="fever_anosmia",
+            weight=None,
+            conditions={"fever", "anosmia"},
+            log_likelihood_ratios={"covid": 3.0},
+        ),
+        SymptomRule(name="cough", weight=1.0, conditions={"cough"}),
+    ]
+
+
+def test_posterior_matches_bayes_rule(bayesian_rules):
+    priors = {"flu": 0.2, "covid": 0.1, "healthy": 0.7}
+    model = LikelihoodModel(LABELS, priors)
+
+    posterior = model.posterior(bayesian_rules[:2])
+
+    unnormalized = [0.2 * math.exp(1.5), 0.1 * math.exp(3.7), 0.7 * math.exp(-2.0)]
+    expected = [value / sum(unnormalized) for value in unnormalized]
+    assert posterior == pytest.approx(expected)
+
+
+def test_posterior_is_numerically_stable():
+    rule = SymptomRule(
+        name="extreme",
+        weight=None,
+        log_likelihood_ratios={"flu": 1000.0, "covid": 999.0},
+    )
+    model = LikelihoodModel(LABELS, rules=[rule])
+
+    posterior = model.posterior_many(np.array([[True], [False]]))
+
+    assert np.all(np.isfinite(posterior))
+    assert posterior.sum(axis=1) == pytest.approx([1.0, 1.0])
+    assert posterior[0] == pytest.approx([1 / (1 + math.exp(-1)), 0.2689414, 0.0])
+    assert posterior[1] == pytest.approx([1 / 3] * 3)
+
+
+@pytest.mark.parametrize(
+    "labels, priors, message",
+    [
+        (["flu"], None, "At least two labels"),
+        (["flu", "flu"], None, "unique"),
+        (LABELS, {"flu": 1.0}, "exactly the provided labels"),
+        (LABELS, {"flu": 1.0, "covid": 0.0, "healthy": 1.0}, "positive"),
+    ],
+)
+def test_likelihood_model_validation(labels, priors, message):
+    with pytest.raises(ValueError, match=message):
+        LikelihoodModel(labels, priors)
+
+
+def test_bayesian_functions(bayesian_rules):
+    evaluation = bayesian(bayesian_rules[:2], bayesian_rules, LABELS)
+
+    assert evaluation.label == "covid"
+    assert evaluation.score == max(evaluation.posteriors.values())
+    assert sum(evaluation.posteriors.values()) == pytest.approx(1.0)
+    assert posterior_confidence(
+        bayesian_rules[:2], bayesian_rules, LABELS
+    ) == pytest.approx(evaluation.score)
+
+
+def test_evaluator_bayesian_mode(bayesian_rules):
+    params = {"labels": LABELS, "priors": {"flu": 0.3, "covid": 0.1, "healthy": 0.6}}
+    evaluator = Evaluator(
+        SymptomRuleset(bayesian_rules),
+        evaluation_function=EvaluationFunctionEnum.BAYESIAN,
+        confidence_function=ConfidenceFunctionEnum.POSTERIOR,
+        evaluation_params=params,
+        confidence_params=params,
+    )
+    records = [
+        {},
+        {"fever": True},
+        {"anosmia": True},
+        {"fever": True, "anosmia": True, "cough": True},
+    ]
+
+    batch = evaluator.run_batch(records)
+    single = [evaluator.run(record) for record in records]
+
+    assert [d.label for d in single] == ["healthy", "flu", "covid", "covid"]
+    for batch_result, single_result in zip(batch, single):
+        assert batch_result.label == single_result.label
+        assert batch_result.total_score == pytest.approx(single_result.total_score)
+        assert batch_result.confidence == pytest.approx(single_result.total_score)
+        assert batch_result.model_dump()["posteriors"] == pytest.approx(
+            single_result.model_dump()["posteriors"]
+        )
+
+
+def test_evaluator_bayesian_mode_with_call_kwargs(bayesian_rules):
+    evaluator = Evaluator(
+        SymptomRuleset(bayesian_rules),
+        evaluation_function=EvaluationFunctionEnum.BAYESIAN,
+        confidence_function=ConfidenceFunctionEnum.POSTERIOR,
+    )
+
+    [batch] = evaluator.run_batch([{"fever": True}], labels=LABELS)
+    single = evaluator.run({"fever": True}, labels=LABELS)
+
+    assert batch.model_dump()["posteriors"] == pytest.approx(
+        single.model_dump()["posteriors"]
+    )
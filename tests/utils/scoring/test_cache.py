@@ -0,0 +1,44 @@
+from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.utils.scoring.cache import ScoreCache
+
+
+def _score(label):
+    return BaseEvaluation(label=label, score=1.0), 0.5
+
+
+def test_score_cache_evicts_least_recently_used():
+    cache = ScoreCache(maxsize=2)
+    cache.put((0,), _score("a"))
+    cache.put((1,), _score("b"))
+
+    assert cache.get((0,)) is not None
+    cache.put((2,), _score("c"))
+
+    assert cache.get((1,)) is None
+    assert cache.get((2,)) is not None
+    assert cache.stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "hit_ratio": 2 / 3,
+    }
+
+
+def test_score_cache_key():
+    assert ScoreCache.key((0, 2), None, (), {}) == ScoreCache.key((0, 2), {}, (), {})
+    assert ScoreCache.key((0,), {0: 1.5}, (), {}) != ScoreCache.key((0,), None, (), {})
+    assert ScoreCache.key((0,), None, (), {"thresholds": [1, 2]}) is None
+
+
+def test_score_cache_clears_on_new_compiled_ruleset(ruleset):
+    cache = ScoreCache()
+    cache.bind(ruleset.compile())
+    cache.put((0,), _score("a"))
+
+    cache.bind(ruleset.compile())
+    assert len(cache) == 1
+
+    cache.bind(ruleset.compile(force=True))
+    assert len(cache) == 0
@@ -3,6 +3,7 @@ from math import tanh
 import pytest
 
 from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.models.symptom_rule import SymptomRule
 from diagnostipy.utils.scoring.evaluation_functions import (
     binary_scoring_based,
     binary_simple,
@@ -188,3 +189,33 @@ def test_multiclass_scoring_based_last_label(rules_with_conditions):
 
     assert result.label == "High"
     assert result.score >= max(threshold_label_map.keys())
+
+
+def test_multiclass_scoring_based_reports_next_threshold(rules_with_conditions):
+    threshold_label_map = {0.3: "Low", 0.6: "Medium", 0.9: "High"}
+
+    result = multiclass_scoring_based(
+        [],
+        rules_with_conditions,
+        score_function=lambda x: 0.4,
+        threshold_label_map=threshold_label_map,
+    )
+    assert result.label == "Medium"
+    assert result.next_threshold == 0.6
+
+    result = multiclass_scoring_based(
+        [],
+        rules_with_conditions,
+        score_function=lambda x: 0.95,
+        threshold_label_map=threshold_label_map,
+    )
+    assert result.next_threshold is None
+
+
+def test_multiclass_simple_with_only_negative_weights():
+    rules = [SymptomRule(name="a", weight=-1)]
+
+    result = multiclass_simple(rules, rules, labels=["Low", "Medium", "High"])
+
+    assert result.label == "Low"
+    assert result.score == -1.0
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.scoring.bayesian import LikelihoodModel
+from diagnostipy.utils.scoring.kernels import CROSSOVER_ENV, KERNELS, set_crossover
+from diagnostipy.utils.scoring.thresholds import ThresholdTable
+
+
+@pytest.fixture(autouse=True)
+def restore_crossovers():
+    saved = {name: kernel._crossover for name, kernel in KERNELS.items()}
+    yield
+    for name, crossover in saved.items():
+        KERNELS[name]._crossover = crossover
+
+
+@pytest.mark.parametrize("name", sorted(KERNELS))
+@pytest.mark.parametrize("size", [1, 3, 64])
+def test_kernel_implementations_agree(name, size):
+    kernel = KERNELS[name]
+    args = kernel.sample(size)
+
+    python, numpy = kernel.python(*args), kernel.numpy(*args)
+
+    if isinstance(python, tuple):
+        assert python[0].tolist() == numpy[0].tolist()
+        np.testing.assert_allclose(python[1], numpy[1])
+    else:
+        np.testing.assert_allclose(python, numpy, rtol=1e-12)
+
+
+def test_edge_cases_agree():
+    entropy = KERNELS["entropy"]
+    assert entropy.python([2.0, -1.0], 1.0) == pytest.approx(
+        entropy.numpy([2.0, -1.0], 1.0)
+    )
+
+    lookup = KERNELS["threshold_lookup"]
+    table = ThresholdTable([1.0, 2.0], ["a", "b", "c"])
+    scores = np.array([-1.0, 1.0, 2.0, 5.0, np.nan])
+    labels, next_thresholds = lookup.python(table, scores)
+    expected_labels, expected_next = lookup.numpy(table, scores)
+    assert labels.tolist() == expected_labels.tolist()
+    np.testing.assert_array_equal(next_thresholds, expected_next)
+
+    posterior = KERNELS["posterior"]
+    model = LikelihoodModel(["a", "b"], {"a": 0.2, "b": 0.8})
+    rules = [
+        SymptomRule(name="r", weight=1.0, log_likelihood_ratios={"a": 800.0, "z": 1.0})
+    ]
+    np.testing.assert_allclose(
+        posterior.python(model, rules), posterior.numpy(model, rules)
+    )
+
+
+def test_posterior_kernels_return_plain_floats():
+    kernel = KERNELS["posterior"]
+    args = kernel.sample(3)
+
+    for posterior in (kernel.python(*args), kernel.numpy(*args)):
+        assert isinstance(posterior, list)
+        assert all(type(value) is float for value in posterior)
+
+
+def test_set_crossover_selects_kernel():
+    kernel = KERNELS["entropy"]
+
+    set_crossover("entropy", 4)
+    assert kernel.select(3) is kernel.python
+    assert kernel.select(4) is kernel.numpy
+
+    set_crossover(None, 0)
+    assert all(k.select(1) is k.numpy for k in KERNELS.values())
+
+    with pytest.raises(ValueError):
+        set_crossover("entropy", -1)
+    with pytest.raises(KeyError):
+        set_crossover("unknown", 1)
+
+
+def test_crossover_from_environment(monkeypatch):
+    monkeypatch.setenv(CROSSOVER_ENV, "entropy=7, posterior=0")
+    set_crossover(None, None)
+    assert KERNELS["entropy"].crossover == 7
+    assert KERNELS["posterior"].crossover == 0
+
+    monkeypatch.setenv(CROSSOVER_ENV, "12")
+    set_crossover(None, None)
+    assert {kernel.crossover for kernel in KERNELS.values()} == {12}
+
+    monkeypatch.setenv(CROSSOVER_ENV, "entropy=many")
+    set_crossover(None, None)
+    with pytest.raises(ValueError, match=CROSSOVER_ENV):
+        KERNELS["entropy"].crossover
+
+
+def test_crossover_is_calibrated(monkeypatch):
+    monkeypatch.delenv(CROSSOVER_ENV, raising=False)
+    set_crossover("threshold_lookup", None)
+
+    crossover = KERNELS["threshold_lookup"].crossover
+
+    assert 1 <= crossover <= 2 * KERNELS["threshold_lookup"].max_size
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from diagnostipy.core.compiled import CompiledRuleset
+from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.utils.scoring import (
+    build_confidence_strategy,
+    build_evaluation_strategy,
+)
+from diagnostipy.utils.scoring.confidence_functions import weighted_confidence
+from diagnostipy.utils.scoring.evaluation_functions import (
+    multiclass_scoring_based,
+    multiclass_simple,
+)
+from diagnostipy.utils.scoring.strategies import (
+    EvaluationStrategy,
+    MulticlassSimpleStrategy,
+)
+from diagnostipy.utils.scoring.thresholds import ThresholdTable
+
+
+@pytest.fixture
+def compiled():
+    return CompiledRuleset(
+        [
+            SymptomRule(name="a", weight=3.0, conditions={"a"}),
+            SymptomRule(name="b", weight=6.0, conditions={"b"}),
+        ]
+    )
+
+
+def test_build_evaluation_strategy_for_builtin(compiled):
+    strategy = build_evaluation_strategy(
+        multiclass_simple, {"labels": ["Low", "Medium", "High"]}
+    )
+    strategy.bind(compiled)
+
+    assert isinstance(strategy, MulticlassSimpleStrategy)
+    assert strategy([compiled.rules[0]], list(compiled.rules)).label == "Medium"
+
+    batch = strategy.batch(np.array([0.0, 3.0, 6.0]))
+    assert batch is not None
+    assert list(batch.labels) == ["Low", "Medium", "High"]
+
+
+def test_per_call_labels_override_configured_labels(compiled):
+    strategy = build_evaluation_strategy(
+        multiclass_simple, {"labels": ["Low", "Medium", "High"]}
+    )
+    strategy.bind(compiled)
+    rules = list(compiled.rules)
+    labels = ["None", "Mild", "Moderate", "Severe"]
+
+    evaluation = strategy([compiled.rules[0]], rules, labels=labels)
+    assert evaluation == multiclass_simple(
+        [compiled.rules[0]], rules, labels=labels, max_possible_weight=9.0
+    )
+    assert evaluation.label == "Mild"
+
+    batch = strategy.batch(np.array([0.0, 3.0, 9.0]), labels=labels)
+    assert batch is not None
+    assert list(batch.labels) == ["None", "Mild", "Severe"]
+
+    assert strategy([compiled.rules[0]], rules).label == "Medium"
+
+
+def test_threshold_map_is_compiled_at_construction():
+    strategy = build_evaluation_strategy(
+        multiclass_scoring_based,
+        {
+            "score_function": lambda x: x,
+            "threshold_label_map": {0.5: "Low", 1.0: "High"},
+        },
+    )
+
+    assert isinstance(strategy.params["threshold_label_map"], ThresholdTable)
+
+    with pytest.raises(ValueError, match="cannot be empty"):
+        build_evaluation_strategy(
+            multiclass_scoring_based,
+            {"score_function": lambda x: x, "threshold_label_map": {}},
+        )
+    with pytest.raises(TypeError, match="must be callable"):
+        build_evaluation_strategy(multiclass_scoring_based, {"score_function": 1})
+
+
+def test_bind_precomputes_once_per_compiled_ruleset(compiled):
+    strategy = build_confidence_strategy(weighted_confidence)
+
+    strategy.bind(compiled)
+    call_params = strategy._call_params
+    strategy.bind(compiled)
+
+    assert strategy._call_params is call_params
+    assert call_params == {"max_possible_weight": 9.0}
+    assert strategy([compiled.rules[0]], list(compiled.rules)) == pytest.approx(1 / 3)
+
+
+def test_custom_function_strategy():
+    def evaluate(applicable_rules, all_rules, prefix):
+        return BaseEvaluation(label=f"{prefix}{len(applicable_rules)}", score=0.0)
+
+    strategy = build_evaluation_strategy(evaluate, {"prefix": "n="})
+
+    assert type(strategy) is EvaluationStrategy
+    assert strategy([], []).label == "n=0"
+    assert strategy([], [], prefix="count=").label == "count=0"
+    assert strategy.batch(np.zeros(2)) is None
+
+
+def test_configured_strategy_is_reused():
+    strategy = build_evaluation_strategy(multiclass_simple, {"labels": ["A", "B"]})
+
+    assert build_evaluation_strategy(strategy) is strategy
+    with pytest.raises(ValueError, match="configured strategy"):
+        build_evaluation_strategy(strategy, {"labels": ["A", "B"]})
@@ -0,0 +1,82 @@
+import pytest
+
+from diagnostipy.core.compiled import CompiledRuleset
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.evaluation import BaseEvaluation
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.scoring.confidence_functions import (
+    entropy_based_confidence,
+    rule_coverage_confidence,
+    weighted_confidence,
+)
+from diagnostipy.utils.scoring.evaluation_functions import binary_simple
+from diagnostipy.utils.scoring.summary import ScoringSummary, uses_summary
+
+
+@pytest.fixture
+def rules():
+    return [
+        SymptomRule(name="a", weight=2.0, conditions={"a"}),
+        SymptomRule(name="b", weight=None, conditions={"b"}),
+        SymptomRule(name="c", weight=3.0, conditions={"c"}),
+    ]
+
+
+def test_summary_single_pass(rules):
+    summary = ScoringSummary(rules)
+
+    assert summary.weights == (2.0, 3.0)
+    assert summary.total_weight == 5.0
+    assert summary.count == 3
+    assert summary.max_possible_weight(rules) == 5.0
+    assert summary.max_possible_rule_count(rules) == 3
+
+
+def test_summary_uses_compiled_normalizers(rules):
+    compiled = CompiledRuleset(rules)
+    summary = ScoringSummary(rules[:1], compiled)
+
+    assert summary.max_possible_weight([]) == compiled.max_possible_weight
+    assert summary.max_possible_rule_count([]) == len(compiled.max_possible_rules)
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        binary_simple,
+        weighted_confidence,
+        entropy_based_confidence,
+        rule_coverage_confidence,
+    ],
+)
+def test_builtins_match_with_and_without_summary(rules, function):
+    applicable = rules[:2]
+
+    assert function(applicable, rules) == function(
+        applicable, rules, summary=ScoringSummary(applicable, CompiledRuleset(rules))
+    )
+
+
+def test_custom_functions_opt_into_summary(rules):
+    received = {}
+
+    @uses_summary
+    def evaluate(applicable_rules, all_rules, summary=None, **kwargs):
+        received["evaluation"] = summary
+        return BaseEvaluation(label="Any", score=summary.total_weight)
+
+    def confidence(applicable_rules, all_rules, **kwargs):
+        received["confidence_kwargs"] = kwargs
+        return 1.0
+
+    evaluator = Evaluator(
+        SymptomRuleset(rules),
+        evaluation_function=evaluate,
+        confidence_function=confidence,
+    )
+    result = evaluator.run({"a": True, "c": True})
+
+    assert result.total_score == 5.0
+    assert isinstance(received["evaluation"], ScoringSummary)
+    assert received["confidence_kwargs"] == {}
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from diagnostipy.utils.scoring.thresholds import ThresholdTable
+
+
+def test_from_map_lookup():
+    table = ThresholdTable.from_map({0.9: "High", 0.3: "Low", 0.6: "Medium"})
+
+    assert table.lookup(0.1) == ("Low", 0.3)
+    assert table.lookup(0.3) == ("Medium", 0.6)
+    assert table.lookup(0.7) == ("High", None)
+    assert table.lookup(5.0) == ("High", None)
+
+
+def test_uniform_lookup():
+    table = ThresholdTable.uniform(["Low", "Medium", "High"], 9.0)
+
+    assert table.lookup(0.0) == ("Low", 3.0)
+    assert table.lookup(3.0) == ("Medium", 6.0)
+    assert table.lookup(8.9) == ("High", None)
+    assert ThresholdTable.uniform(["Low", "High"], 0.0).lookup(5.0) == ("Low", None)
+
+
+def test_uniform_with_negative_max_score_uses_first_label():
+    table = ThresholdTable.uniform(["Low", "Medium", "High"], -1.0)
+
+    assert table.lookup(-1.0) == ("Low", None)
+    assert table.lookup(0.0) == ("Low", None)
+
+
+def test_lookup_many_matches_lookup():
+    table = ThresholdTable.from_map({0.3: "Low", 0.6: "Medium", 0.9: "High"})
+    scores = np.array([-1.0, 0.0, 0.3, 0.45, 0.6, 0.89, 0.9, 2.0])
+
+    labels, next_thresholds = table.lookup_many(scores)
+
+    for score, label, next_threshold in zip(scores, labels, next_thresholds):
+        expected_label, expected_next = table.lookup(score)
+        assert label == expected_label
+        if expected_next is None:
+            assert np.isnan(next_threshold)
+        else:
+            assert next_threshold == expected_next
+
+
+def test_validation_happens_at_construction():
+    with pytest.raises(ValueError, match="cannot be empty"):
+        ThresholdTable.from_map({})
+    with pytest.raises(ValueError, match="At least two labels"):
+        ThresholdTable.uniform(["Only"], 1.0)
+    with pytest.raises(ValueError, match="strictly ascending"):
+        ThresholdTable([0.5, 0.5], ["a", "b", "c"])
+    with pytest.raises(ValueError, match="one label per band"):
+        ThresholdTable([0.5], ["a"])
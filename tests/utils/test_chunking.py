@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from diagnostipy.utils.chunking import iter_chunks, map_chunks
+
+
+def test_iter_chunks_from_sequence_and_iterator():
+    assert [len(c) for c in iter_chunks(list(range(10)), 4)] == [4, 4, 2]
+    assert list(iter_chunks(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert [np.asarray(c).shape for c in iter_chunks(np.zeros((5, 2)), 3)] == [
+        (3, 2),
+        (2, 2),
+    ]
+
+
+def test_iter_chunks_invalid_size():
+    with pytest.raises(ValueError, match="chunk_size"):
+        list(iter_chunks([1], 0))
+
+
+@pytest.mark.parametrize(
+    "n_jobs, parallelism", [(1, "threads"), (4, "threads"), (2, "processes")]
+)
+def test_map_chunks_preserves_order(n_jobs, parallelism):
+    chunks = iter_chunks(range(100), 7)
+
+    results = list(map_chunks(sum, chunks, n_jobs=n_jobs, parallelism=parallelism))
+
+    assert results == [sum(range(s, min(s + 7, 100))) for s in range(0, 100, 7)]
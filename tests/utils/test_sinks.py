@@ -0,0 +1,179 @@
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+
+from diagnostipy.core.evaluator import Evaluator
+from diagnostipy.core.models.diagnosis import Diagnosis, DiagnosisBase
+from diagnostipy.core.models.numeric import GradedWeight
+from diagnostipy.core.models.symptom_rule import SymptomRule
+from diagnostipy.core.ruleset import SymptomRuleset
+from diagnostipy.utils.enums import ConfidenceFunctionEnum
+from diagnostipy.utils.sinks import ArraySink, CSVSink, JSONLSink, ParquetSink
+
+
+class TriageDiagnosis(DiagnosisBase):
+    priority: int = 0
+
+
+def test_array_sink_writes_preallocated_columns():
+    sink = ArraySink(3, fields=("label", "total_score", "confidence", "priority"))
+
+    sink.write([TriageDiagnosis(label="High", total_score=2.0, priority=1)])
+    sink.write([Diagnosis(label="Low", total_score=0.0, confidence=0.5)])
+
+    arrays = sink.arrays
+    assert sink.count == 2
+    assert list(arrays["label"]) == ["High", "Low"]
+    assert arrays["total_score"].tolist() == [2.0, 0.0]
+    assert np.isnan(arrays["confidence"][0])
+    assert list(arrays["priority"]) == [1, None]
+
+    with pytest.raises(ValueError, match="capacity"):
+        sink.write([Diagnosis()] * 2)
+
+
+def test_evaluator_run_to_sink_matches_run_batch(overlapping_rules, symptom_records):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules))
+    expected = evaluator.run_batch(symptom_records)
+
+    sink = ArraySink(len(symptom_records))
+    evaluator.run_to_sink(iter(symptom_records), sink, chunk_size=5)
+
+    assert sink.count == len(expected)
+    assert list(sink.arrays["label"]) == [d.label for d in expected]
+    assert sink.arrays["total_score"].tolist() == [d.total_score for d in expected]
+    assert sink.arrays["confidence"].tolist() == [d.confidence for d in expected]
+
+
+@pytest.mark.parametrize(
+    "confidence_function",
+    [
+        ConfidenceFunctionEnum.WEIGHTED,
+        ConfidenceFunctionEnum.ENTROPY,
+        ConfidenceFunctionEnum.RULE_COVERAGE,
+    ],
+)
+@pytest.mark.parametrize("deduplicate", [False, True])
+def test_run_to_sink_writes_batch_arrays_without_diagnoses(
+    monkeypatch, overlapping_rules, symptom_records, confidence_function, deduplicate
+):
+    rules = [
+        *overlapping_rules,
+        SymptomRule(
+            name="age_graded",
+            weight=None,
+            graded_weight=GradedWeight(field="age", points=((30, 0.0), (90, 3.0))),
+        ),
+    ]
+    evaluator = Evaluator(
+        SymptomRuleset(rules), confidence_function=confidence_function
+    )
+    expected = evaluator.run_batch(symptom_records)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Diagnoses were built.")
+
+    monkeypatch.setattr(Evaluator, "_diagnose_matches", fail)
+    sink = ArraySink(len(symptom_records))
+    evaluator.run_to_sink(symptom_records, sink, chunk_size=5, deduplicate=deduplicate)
+
+    arrays = sink.arrays
+    assert list(arrays["label"]) == [d.label for d in expected]
+    assert arrays["total_score"].tolist() == [d.total_score for d in expected]
+    assert arrays["confidence"].tolist() == pytest.approx(
+        [d.confidence for d in expected]
+    )
+
+
+def test_text_sinks(overlapping_rules, symptom_records):
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules), explain=True)
+    expected = evaluator.run_batch(symptom_records)
+    csv_file, jsonl_file = io.StringIO(), io.StringIO()
+
+    with CSVSink(csv_file, fields=("label", "metadata")) as csv_sink:
+        evaluator.run_to_sink(symptom_records, csv_sink, chunk_size=4)
+    with JSONLSink(jsonl_file) as jsonl_sink:
+        evaluator.run_to_sink(symptom_records, jsonl_sink, chunk_size=4)
+
+    rows = list(csv.DictReader(io.StringIO(csv_file.getvalue())))
+    assert [row["label"] for row in rows] == [d.label for d in expected]
+    last = expected[-1]
+    assert isinstance(last, Diagnosis) and last.metadata
+    assert json.loads(rows[-1]["metadata"])["explanation"] == (
+        last.metadata["explanation"].to_dict()
+    )
+
+    lines = [json.loads(line) for line in jsonl_file.getvalue().splitlines()]
+    assert lines == [
+        {"label": d.label, "total_score": d.total_score, "confidence": d.confidence}
+        for d in expected
+    ]
+
+
+def test_parquet_sink(tmp_path, overlapping_rules, symptom_records):
+    import pyarrow.parquet as pq
+
+    evaluator = Evaluator(SymptomRuleset(overlapping_rules))
+
+    with ParquetSink(tmp_path / "results.parquet") as sink:
+        evaluator.run_to_sink(symptom_records, sink, chunk_size=5)
+
+    table = pq.read_table(tmp_path / "results.parquet")
+    expected = evaluator.run_batch(symptom_records)
+    assert table.column("label").to_pylist() == [d.label for d in expected]
+    assert table.column("confidence").to_pylist() == [d.confidence for d in expected]
+
+
+def test_parquet_sink_keeps_schema_after_missing_values(tmp_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = ("label", "total_score", "confidence", "priority", "metadata")
+    with ParquetSink(tmp_path / "results.parquet", fields=fields) as sink:
+        sink.write([Diagnosis(label="Low", metadata=None)])
+        sink.write(
+            [
+                TriageDiagnosis(
+                    label="High", total_score=2.0, confidence=0.5, priority=1
+                ),
+                Diagnosis(label="Low", metadata={"source": "triage"}),
+            ]
+        )
+
+    table = pq.read_table(tmp_path / "results.parquet")
+    assert table.schema.field("confidence").type == pa.float64()
+    assert table.to_pylist() == [
+        {
+            "label": "Low",
+            "total_score": None,
+            "confidence": None,
+            "priority": None,
+            "metadata": None,
+        },
+        {
+            "label": "High",
+            "total_score": 2.0,
+            "confidence": 0.5,
+            "priority": "1",
+            "metadata": None,
+        },
+        {
+            "label": "Low",
+            "total_score": None,
+            "confidence": None,
+            "priority": None,
+            "metadata": '{"source": "triage"}',
+        },
+    ]
+
+
+def test_parquet_sink_rejects_mismatched_schema(tmp_path):
+    import pyarrow as pa
+
+    with pytest.raises(ValueError, match="schema fields"):
+        ParquetSink(
+            tmp_path / "results.parquet", schema=pa.schema([("label", pa.string())])
+        )